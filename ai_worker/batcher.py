@@ -0,0 +1,159 @@
+"""
+Micro-batcher for the diffusion pipeline.
+
+Requests are queued (bounded) and a single consumer drains them in batches:
+after the first request arrives it waits up to `window_seconds` for more, up to
+`max_batch_size`, then runs one pipeline call for the whole group. Requests
+whose settings differ (steps, guidance) cannot share a call and are grouped
+separately. The pipeline runs on one dedicated thread, so it is never entered
+concurrently and the event loop stays free to accept requests.
+
+If a batched call fails, its items are retried one by one so a single bad
+request only fails itself.
+"""
+
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger("ai_worker.batcher")
+
+
+class BatchQueueFullError(Exception):
+    """Raised when the request queue is at capacity."""
+    pass
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        group_key: Callable[[Any], Hashable] = lambda item: None,
+        max_batch_size: int = 4,
+        window_seconds: float = 0.05,
+        max_queue_size: int = 64,
+    ):
+        self.process_batch = process_batch
+        self.group_key = group_key
+        self.max_batch_size = max(1, max_batch_size)
+        self.window_seconds = max(0.0, window_seconds)
+        self.max_queue_size = max(1, max_queue_size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline")
+        self._batches = 0
+        self._items = 0
+        self._failed_items = 0
+        self._last_batch_size = 0
+        self._last_batch_seconds = 0.0
+
+    def start(self) -> None:
+        if self._consumer is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._consumer = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._consumer is not None:
+            self._consumer.cancel()
+            await asyncio.gather(self._consumer, return_exceptions=True)
+            self._consumer = None
+        self._executor.shutdown(wait=False)
+
+    def _enqueue(self, items: List[Any]) -> List[asyncio.Future]:
+        if self._consumer is None:
+            self.start()
+        if self._queue.qsize() + len(items) > self.max_queue_size:
+            raise BatchQueueFullError(
+                f"Generation queue is full ({self._queue.qsize()}/{self.max_queue_size} waiting)"
+            )
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in items:
+            future = loop.create_future()
+            self._queue.put_nowait((item, future))
+            futures.append(future)
+        return futures
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result (raises the item's error)."""
+        (future,) = self._enqueue([item])
+        return await future
+
+    async def submit_many(self, items: List[Any]) -> List[Any]:
+        """Queue several items at once; returns a result or exception per item, in order."""
+        futures = self._enqueue(items)
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.window_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            groups: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+            for entry in batch:
+                groups.setdefault(self.group_key(entry[0]), []).append(entry)
+            for entries in groups.values():
+                live = [(item, future) for item, future in entries if not future.cancelled()]
+                if live:
+                    await self._process(live)
+
+    async def _process(self, entries: List[Tuple[Any, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        items = [item for item, _ in entries]
+        started = time.perf_counter()
+        try:
+            results = await loop.run_in_executor(self._executor, self.process_batch, items)
+            if len(results) != len(items):
+                raise RuntimeError(f"Pipeline returned {len(results)} results for {len(items)} prompts")
+        except Exception as e:
+            if len(entries) > 1:
+                logger.warning(f"Batch of {len(entries)} failed ({e}); retrying items individually")
+                for entry in entries:
+                    await self._process([entry])
+                return
+            self._failed_items += 1
+            self._resolve(entries[0][1], error=e)
+            return
+
+        self._batches += 1
+        self._items += len(items)
+        self._last_batch_size = len(items)
+        self._last_batch_seconds = time.perf_counter() - started
+        for (_, future), result in zip(entries, results):
+            self._resolve(future, result=result)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Any = None, error: Optional[Exception] = None) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "window_ms": round(self.window_seconds * 1000),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queue_size": self.max_queue_size,
+            "batches": self._batches,
+            "items": self._items,
+            "failed_items": self._failed_items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else None,
+            "last_batch_size": self._last_batch_size,
+            "last_batch_seconds": round(self._last_batch_seconds, 3),
+        }
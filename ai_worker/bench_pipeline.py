@@ -0,0 +1,80 @@
+"""
+Benchmark: AI worker cold start and throughput.
+
+Reports, for one pipeline configuration:
+    - cold start: pipeline load time (Hub vs. local safetensors snapshot)
+    - warm-up inference time
+    - images/sec at each batch size (one pipeline call per batch)
+
+Run it once per configuration to compare, e.g.:
+    python bench_pipeline.py --snapshot-dir ""                      # Hub load, float32
+    python bench_pipeline.py --snapshot-dir /models/sdxs-snapshot    # snapshot load
+    python bench_pipeline.py --dtype bfloat16 --channels-last        # CPU fast path
+
+Run each configuration in a fresh process; the OS page cache makes a second
+snapshot load in the same container faster than a true cold start.
+"""
+
+import argparse
+import os
+import time
+
+import torch
+
+from pipeline_loader import SD_SNAPSHOT_DIR, load_pipeline, warm_up
+
+
+def images_per_second(pipe, batch_size: int, images: int, steps: int) -> float:
+    prompts = [f"benchmark prompt {i}" for i in range(batch_size)]
+    done = 0
+    started = time.perf_counter()
+    while done < images:
+        pipe(
+            prompts,
+            num_inference_steps=steps,
+            guidance_scale=0.0,
+            height=512,
+            width=512,
+        )
+        done += batch_size
+    return done / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-id", default=os.getenv("SD_MODEL_ID", "IDKiro/sdxs-512-0.9"))
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--dtype", default="float32", choices=["float32", "bfloat16", "float16"])
+    parser.add_argument("--channels-last", action="store_true")
+    parser.add_argument("--snapshot-dir", default=SD_SNAPSHOT_DIR, help='"" to force a Hub load')
+    parser.add_argument("--save-snapshot", action="store_true", help="write the snapshot after a Hub load")
+    parser.add_argument("--batch-sizes", default="1,2,4")
+    parser.add_argument("--images", type=int, default=8, help="images per batch size")
+    parser.add_argument("--steps", type=int, default=1)
+    args = parser.parse_args()
+
+    process_started = time.perf_counter()
+    pipe, info = load_pipeline(
+        args.model_id,
+        args.device,
+        dtype=args.dtype,
+        channels_last=args.channels_last,
+        snapshot_dir=args.snapshot_dir,
+        save_snapshot=args.save_snapshot,
+    )
+    warmup_seconds = warm_up(pipe, steps=args.steps)
+    ready_seconds = time.perf_counter() - process_started
+
+    print(f"model         {args.model_id} on {args.device}")
+    print(f"config        dtype={info['dtype']} channels_last={info['channels_last']} source={info['source']}")
+    print(f"load          {info['load_seconds']:.2f} s")
+    print(f"warm-up       {warmup_seconds:.2f} s")
+    print(f"cold start    {ready_seconds:.2f} s (load + warm-up)")
+
+    for batch_size in [int(b) for b in args.batch_sizes.split(",") if b.strip()]:
+        rate = images_per_second(pipe, batch_size, args.images, args.steps)
+        print(f"batch {batch_size:<3}     {rate:.2f} images/s")
+
+
+if __name__ == "__main__":
+    main()
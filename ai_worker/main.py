@@ -1,12 +1,16 @@
 import os
+import asyncio
 import torch
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from diffusers import StableDiffusionPipeline
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 from io import BytesIO
+from typing import List
 import base64
 
-app = FastAPI(title="C(AI)DENCE AI Worker")
+from batcher import BatchQueueFullError, MicroBatcher
+from pipeline_loader import SD_WARMUP, load_pipeline, warm_up
 
 # Configuration
 # Switching to SDXS-512-0.9 for fast CPU inference
@@ -16,19 +20,40 @@ DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 if torch.backends.mps.is_available():
     DEVICE = "mps"
 
-print(f"Loading Fast SDXS ({MODEL_ID}) on {DEVICE}...")
+# Micro-batching: requests arriving within BATCH_WINDOW_MS share one pipeline call
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "4"))
+BATCH_WINDOW_MS = float(os.getenv("BATCH_WINDOW_MS", "50"))
+BATCH_QUEUE_SIZE = int(os.getenv("BATCH_QUEUE_SIZE", "64"))
+# Max items accepted by one /generate/batch request
+BATCH_MAX_REQUEST_ITEMS = int(os.getenv("BATCH_MAX_REQUEST_ITEMS", "16"))
 
-# Load Pipeline
-try:
-    pipe = StableDiffusionPipeline.from_pretrained(MODEL_ID, torch_dtype=torch.float32)
-    pipe.to(DEVICE)
-    # Enable memory saving optimizations
-    if DEVICE == "cpu":
-        pipe.enable_attention_slicing()
-    print("Model loaded successfully.")
-except Exception as e:
-    print(f"Failed to load model: {e}")
-    pipe = None
+# Pipeline is loaded in the background after the server starts; /ready reports
+# "loading" -> "warming_up" -> "ready" (or "failed").
+pipe = None
+model_state = {"state": "loading", "device": DEVICE, "model": MODEL_ID}
+
+def _load_and_warm_up() -> None:
+    global pipe
+    print(f"Loading Fast SDXS ({MODEL_ID}) on {DEVICE}...")
+    try:
+        loaded, info = load_pipeline(MODEL_ID, DEVICE)
+        model_state.update(info)
+        print(f"Model loaded from {info['source']} in {info['load_seconds']}s.")
+        if SD_WARMUP:
+            model_state["state"] = "warming_up"
+            model_state["warmup_seconds"] = warm_up(loaded)
+            print(f"Warm-up inference took {model_state['warmup_seconds']}s.")
+        pipe = loaded
+        model_state["state"] = "ready"
+    except Exception as e:
+        print(f"Failed to load model: {e}")
+        model_state.update({"state": "failed", "error": str(e)})
+
+def _require_ready() -> None:
+    if pipe is None:
+        if model_state["state"] == "failed":
+            raise HTTPException(status_code=500, detail=f"Model failed to load: {model_state.get('error')}")
+        raise HTTPException(status_code=503, detail="Model is loading", headers={"Retry-After": "10"})
 
 class ImageRequest(BaseModel):
     prompt: str
@@ -36,35 +61,99 @@ class ImageRequest(BaseModel):
     steps: int = 1         # SDXS is 1-step model
     guidance_scale: float = 0.0 # SDXS usually works best with 0 guidance (distilled)
 
+class BatchImageRequest(BaseModel):
+    items: List[ImageRequest] = Field(..., min_length=1)
+
+def _encode_png(image) -> str:
+    buffered = BytesIO()
+    image.save(buffered, format="PNG")
+    return base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+def run_pipeline(batch: List[ImageRequest]) -> List[str]:
+    """One pipeline call for a group of requests sharing steps/guidance."""
+    first = batch[0]
+    # SDXS is optimized for 512x512
+    images = pipe(
+        [req.prompt for req in batch],
+        negative_prompt=[req.negative_prompt for req in batch],
+        num_inference_steps=first.steps,
+        guidance_scale=first.guidance_scale,
+        height=512,
+        width=512
+    ).images
+    return [_encode_png(image) for image in images]
+
+batcher = MicroBatcher(
+    run_pipeline,
+    group_key=lambda req: (req.steps, req.guidance_scale),
+    max_batch_size=BATCH_MAX_SIZE,
+    window_seconds=BATCH_WINDOW_MS / 1000,
+    max_queue_size=BATCH_QUEUE_SIZE,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    batcher.start()
+    loader = asyncio.create_task(asyncio.to_thread(_load_and_warm_up))
+    yield
+    loader.cancel()
+    await batcher.stop()
+
+app = FastAPI(title="C(AI)DENCE AI Worker", lifespan=lifespan)
+
 @app.get("/health")
 def health():
-    return {"status": "ok", "device": DEVICE, "model": MODEL_ID}
+    """Liveness: the process is up (the model may still be loading; see /ready)."""
+    return {"status": "ok", "device": DEVICE, "model": MODEL_ID, "model_state": model_state, "batching": batcher.stats()}
+
+@app.get("/ready")
+def ready():
+    """Readiness: 200 once the model is loaded and warmed up, 503 before that."""
+    return JSONResponse(status_code=200 if pipe is not None else 503, content=model_state)
 
 @app.post("/generate")
-def generate(req: ImageRequest):
-    if not pipe:
-        raise HTTPException(status_code=500, detail="Model not loaded")
+async def generate(req: ImageRequest):
+    _require_ready()
     
     try:
-        # SDXS is optimized for 512x512
-        image = pipe(
-            req.prompt, 
-            negative_prompt=req.negative_prompt, 
-            num_inference_steps=req.steps,
-            guidance_scale=req.guidance_scale,
-            height=512,
-            width=512
-        ).images[0]
-        
-        # Convert to Base64
-        buffered = BytesIO()
-        image.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
-        
+        # Concurrent single requests are micro-batched into one pipeline call
+        img_str = await batcher.submit(req)
         return {"image_base64": img_str}
+    except BatchQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "2"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/generate/batch")
+async def generate_batch(req: BatchImageRequest):
+    """
+    Generate several images in one request.
+    Returns one result per item, in order: {"index", "image_base64"} or {"index", "error"}.
+    """
+    _require_ready()
+    if len(req.items) > BATCH_MAX_REQUEST_ITEMS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {BATCH_MAX_REQUEST_ITEMS} items per batch request",
+        )
+
+    try:
+        outcomes = await batcher.submit_many(req.items)
+    except BatchQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "2"})
+
+    results = []
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, Exception):
+            results.append({"index": index, "error": str(outcome)})
+        else:
+            results.append({"index": index, "image_base64": outcome})
+    return {
+        "results": results,
+        "succeeded": sum(1 for r in results if "image_base64" in r),
+        "failed": sum(1 for r in results if "error" in r),
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -0,0 +1,101 @@
+"""
+Pipeline loading for the AI worker.
+
+Loads the diffusion pipeline either from a local pre-serialized snapshot
+(safetensors, memory-mapped; no Hub round-trips) or from the Hub, optionally
+writing the snapshot for the next start. Optional CPU speedups: bfloat16
+weights and channels-last memory format. A short warm-up inference runs before
+the worker reports ready, so the first real request does not pay kernel
+selection / allocator warm-up.
+
+Configuration (environment):
+    SD_SNAPSHOT_DIR    local snapshot directory (default /models/sdxs-snapshot)
+    SD_SAVE_SNAPSHOT   write the snapshot after a Hub load (default true)
+    SD_DTYPE           float32 | bfloat16 (default float32)
+    SD_CHANNELS_LAST   true | false (default false)
+    SD_WARMUP          run a warm-up inference (default true)
+"""
+
+import os
+import time
+from typing import Any, Dict, Tuple
+
+import torch
+from diffusers import StableDiffusionPipeline
+
+SD_SNAPSHOT_DIR = os.getenv("SD_SNAPSHOT_DIR", "/models/sdxs-snapshot")
+SD_SAVE_SNAPSHOT = os.getenv("SD_SAVE_SNAPSHOT", "true").lower() == "true"
+SD_DTYPE = os.getenv("SD_DTYPE", "float32").lower()
+SD_CHANNELS_LAST = os.getenv("SD_CHANNELS_LAST", "false").lower() == "true"
+SD_WARMUP = os.getenv("SD_WARMUP", "true").lower() == "true"
+
+_DTYPES = {"float32": torch.float32, "bfloat16": torch.bfloat16, "float16": torch.float16}
+
+
+def has_snapshot(snapshot_dir: str) -> bool:
+    return bool(snapshot_dir) and os.path.isfile(os.path.join(snapshot_dir, "model_index.json"))
+
+
+def load_pipeline(
+    model_id: str,
+    device: str,
+    dtype: str = SD_DTYPE,
+    channels_last: bool = SD_CHANNELS_LAST,
+    snapshot_dir: str = SD_SNAPSHOT_DIR,
+    save_snapshot: bool = SD_SAVE_SNAPSHOT,
+) -> Tuple[StableDiffusionPipeline, Dict[str, Any]]:
+    """Load (and place) the pipeline; returns it with timing/source info."""
+    torch_dtype = _DTYPES.get(dtype, torch.float32)
+    if device == "cpu" and torch_dtype == torch.float16:
+        print("float16 is not supported for CPU inference; using bfloat16.")
+        torch_dtype = torch.bfloat16
+
+    started = time.perf_counter()
+    if has_snapshot(snapshot_dir):
+        source = "snapshot"
+        pipe = StableDiffusionPipeline.from_pretrained(
+            snapshot_dir,
+            torch_dtype=torch_dtype,
+            use_safetensors=True,
+            local_files_only=True,
+        )
+    else:
+        source = "hub"
+        pipe = StableDiffusionPipeline.from_pretrained(model_id, torch_dtype=torch_dtype)
+        if save_snapshot and snapshot_dir:
+            try:
+                pipe.save_pretrained(snapshot_dir, safe_serialization=True)
+                print(f"Saved pipeline snapshot to {snapshot_dir}")
+            except Exception as e:
+                print(f"Could not save pipeline snapshot to {snapshot_dir}: {e}")
+
+    pipe.to(device)
+    # Enable memory saving optimizations
+    if device == "cpu":
+        pipe.enable_attention_slicing()
+    if channels_last:
+        pipe.unet.to(memory_format=torch.channels_last)
+        pipe.vae.to(memory_format=torch.channels_last)
+    pipe.set_progress_bar_config(disable=True)
+
+    info = {
+        "source": source,
+        "dtype": str(torch_dtype).replace("torch.", ""),
+        "channels_last": channels_last,
+        "load_seconds": round(time.perf_counter() - started, 2),
+    }
+    return pipe, info
+
+
+def warm_up(pipe: StableDiffusionPipeline, steps: int = 1) -> float:
+    """Run one small inference; returns its duration in seconds."""
+    started = time.perf_counter()
+    with torch.inference_mode():
+        pipe(
+            "warm-up",
+            num_inference_steps=steps,
+            guidance_scale=0.0,
+            height=512,
+            width=512,
+        )
+    return round(time.perf_counter() - started, 2)
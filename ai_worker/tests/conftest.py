@@ -0,0 +1,8 @@
+"""
+Pytest configuration for the AI worker tests.
+The worker runs as a flat script directory (`from batcher import ...`), so put it on the path.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,179 @@
+"""
+Unit Tests for MicroBatcher
+- A partial batch is flushed when the batching window expires
+- Batches never exceed max_batch_size
+- A failing item's error reaches only its own caller
+- A full queue raises BatchQueueFullError (503 from /generate)
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from batcher import BatchQueueFullError, MicroBatcher
+
+
+def upper(batch):
+    return [item.upper() for item in batch]
+
+
+async def blocked_batcher(max_queue_size):
+    """A batcher whose pipeline is stuck on its first item; returns (batcher, first, release)."""
+    started, release = threading.Event(), threading.Event()
+
+    def process(batch):
+        started.set()
+        release.wait(5)
+        return upper(batch)
+
+    batcher = MicroBatcher(process, max_batch_size=1, window_seconds=0, max_queue_size=max_queue_size)
+    first = asyncio.ensure_future(batcher.submit("first"))
+    while not started.is_set():
+        await asyncio.sleep(0.001)
+    return batcher, first, release
+
+
+class TestBatching:
+    """Test window and size limits"""
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushes_when_window_expires(self):
+        sizes = []
+
+        def process(batch):
+            sizes.append(len(batch))
+            return upper(batch)
+
+        batcher = MicroBatcher(process, max_batch_size=10, window_seconds=0.05)
+        try:
+            started = time.monotonic()
+            results = await asyncio.wait_for(
+                asyncio.gather(*(batcher.submit(item) for item in ["a", "b", "c"])), timeout=2
+            )
+            elapsed = time.monotonic() - started
+        finally:
+            await batcher.stop()
+
+        assert results == ["A", "B", "C"]
+        assert sizes == [3]
+        assert 0.04 <= elapsed < 1
+        assert batcher.stats()["batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batches_are_capped_at_max_size(self):
+        sizes = []
+
+        def process(batch):
+            sizes.append(len(batch))
+            return upper(batch)
+
+        batcher = MicroBatcher(process, max_batch_size=2, window_seconds=0.1)
+        try:
+            results = await batcher.submit_many(["a", "b", "c", "d", "e"])
+        finally:
+            await batcher.stop()
+
+        assert results == ["A", "B", "C", "D", "E"]
+        assert sizes == [2, 2, 1]
+        assert batcher.stats()["avg_batch_size"] == round(5 / 3, 2)
+
+    @pytest.mark.asyncio
+    async def test_groups_with_different_settings_run_separately(self):
+        calls = []
+
+        def process(batch):
+            calls.append(list(batch))
+            return upper(batch)
+
+        batcher = MicroBatcher(process, group_key=len, max_batch_size=10, window_seconds=0.05)
+        try:
+            results = await batcher.submit_many(["a", "bb", "c"])
+        finally:
+            await batcher.stop()
+
+        assert results == ["A", "BB", "C"]
+        assert sorted(calls) == [["a", "c"], ["bb"]]
+
+
+class TestFailureIsolation:
+    """Test that one bad item fails only itself"""
+
+    @pytest.mark.asyncio
+    async def test_failing_item_error_reaches_only_its_caller(self):
+        def process(batch):
+            if "bad" in batch:
+                raise ValueError("NSFW prompt rejected")
+            return upper(batch)
+
+        batcher = MicroBatcher(process, max_batch_size=10, window_seconds=0.05)
+        try:
+            results = await asyncio.gather(
+                batcher.submit("a"), batcher.submit("bad"), batcher.submit("c"), return_exceptions=True
+            )
+            many = await batcher.submit_many(["d", "bad"])
+        finally:
+            await batcher.stop()
+
+        assert results[0] == "A" and results[2] == "C"
+        assert isinstance(results[1], ValueError) and "NSFW" in str(results[1])
+        assert many[0] == "D" and isinstance(many[1], ValueError)
+        assert batcher.stats()["failed_items"] == 2
+
+    @pytest.mark.asyncio
+    async def test_wrong_result_count_fails_the_batch(self):
+        batcher = MicroBatcher(lambda batch: [], max_batch_size=10, window_seconds=0)
+        try:
+            with pytest.raises(RuntimeError, match="returned 0 results"):
+                await batcher.submit("a")
+        finally:
+            await batcher.stop()
+
+
+class TestBackpressure:
+    """Test the bounded queue"""
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects(self):
+        batcher, first, release = await blocked_batcher(max_queue_size=2)
+        try:
+            queued = [asyncio.ensure_future(batcher.submit(item)) for item in ["b", "c"]]
+            await asyncio.sleep(0)
+
+            with pytest.raises(BatchQueueFullError):
+                await batcher.submit("d")
+            with pytest.raises(BatchQueueFullError):
+                await batcher.submit_many(["d"])
+            assert batcher.stats()["queued"] == 2
+        finally:
+            release.set()
+        assert await first == "FIRST"
+        assert await asyncio.gather(*queued) == ["B", "C"]
+        await batcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_maps_to_503(self, monkeypatch):
+        pytest.importorskip("torch")
+        pytest.importorskip("diffusers")
+        import main
+
+        batcher, first, release = await blocked_batcher(max_queue_size=1)
+        monkeypatch.setattr(main, "batcher", batcher)
+        monkeypatch.setattr(main, "pipe", object())
+        try:
+            queued = asyncio.ensure_future(batcher.submit("b"))
+            await asyncio.sleep(0)
+
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                single = await client.post("/generate", json={"prompt": "p"})
+                many = await client.post("/generate/batch", json={"items": [{"prompt": "p"}]})
+        finally:
+            release.set()
+        await asyncio.gather(first, queued)
+        await batcher.stop()
+
+        assert single.status_code == 503 and single.headers["retry-after"] == "2"
+        assert many.status_code == 503
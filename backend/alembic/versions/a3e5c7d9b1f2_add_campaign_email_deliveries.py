@@ -0,0 +1,47 @@
+"""add campaign email deliveries
+
+Revision ID: a3e5c7d9b1f2
+Revises: f3c8b2a1d0e9
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a3e5c7d9b1f2"
+down_revision: Union[str, Sequence[str], None] = "f3c8b2a1d0e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "campaign_email_deliveries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("campaign_id", sa.Integer(), nullable=True),
+        sa.Column("send_id", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+        sa.Column("provider", sa.String(), nullable=True),
+        sa.Column("message_id", sa.String(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["campaign_id"], ["campaigns.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("send_id", "email", name="uq_campaign_email_deliveries_send_email"),
+    )
+    op.create_index(op.f("ix_campaign_email_deliveries_id"), "campaign_email_deliveries", ["id"], unique=False)
+    op.create_index(op.f("ix_campaign_email_deliveries_campaign_id"), "campaign_email_deliveries", ["campaign_id"], unique=False)
+    op.create_index(op.f("ix_campaign_email_deliveries_send_id"), "campaign_email_deliveries", ["send_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_campaign_email_deliveries_send_id"), table_name="campaign_email_deliveries")
+    op.drop_index(op.f("ix_campaign_email_deliveries_campaign_id"), table_name="campaign_email_deliveries")
+    op.drop_index(op.f("ix_campaign_email_deliveries_id"), table_name="campaign_email_deliveries")
+    op.drop_table("campaign_email_deliveries")
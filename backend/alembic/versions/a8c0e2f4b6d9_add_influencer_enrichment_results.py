@@ -0,0 +1,58 @@
+"""add influencer enrichment results
+
+Revision ID: a8c0e2f4b6d9
+Revises: f7b9d1e3a5c8
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a8c0e2f4b6d9"
+down_revision: Union[str, Sequence[str], None] = "f7b9d1e3a5c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "influencer_enrichment_results",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("batch_id", sa.String(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("platform", sa.String(), nullable=False),
+        sa.Column("handle", sa.String(), nullable=False),
+        sa.Column("mode", sa.String(), nullable=False, server_default="raw"),
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("enriched_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("batch_id", "platform", "handle", name="uq_influencer_enrichment_results_batch_handle"),
+    )
+    op.create_index(op.f("ix_influencer_enrichment_results_id"), "influencer_enrichment_results", ["id"], unique=False)
+    op.create_index(op.f("ix_influencer_enrichment_results_batch_id"), "influencer_enrichment_results", ["batch_id"], unique=False)
+    op.create_index(op.f("ix_influencer_enrichment_results_organization_id"), "influencer_enrichment_results", ["organization_id"], unique=False)
+    op.create_index(
+        "ix_influencer_enrichment_results_lookup",
+        "influencer_enrichment_results",
+        ["platform", "handle", "mode", "enriched_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_influencer_enrichment_results_lookup", table_name="influencer_enrichment_results")
+    op.drop_index(op.f("ix_influencer_enrichment_results_organization_id"), table_name="influencer_enrichment_results")
+    op.drop_index(op.f("ix_influencer_enrichment_results_batch_id"), table_name="influencer_enrichment_results")
+    op.drop_index(op.f("ix_influencer_enrichment_results_id"), table_name="influencer_enrichment_results")
+    op.drop_table("influencer_enrichment_results")
@@ -0,0 +1,56 @@
+"""add user_hierarchy_closure table
+
+Revision ID: b8d2f4a6c1e3
+Revises: a3e5c7d9b1f2
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b8d2f4a6c1e3"
+down_revision: Union[str, Sequence[str], None] = "a3e5c7d9b1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Every user is its own depth-0 ancestor; walk parent_user_id downwards from each.
+# The depth guard stops a corrupt (cyclic) tree from recursing forever.
+BACKFILL_SQL = """
+WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+    SELECT id, id, 0 FROM users
+    UNION ALL
+    SELECT tree.ancestor_id, users.id, tree.depth + 1
+    FROM tree JOIN users ON users.parent_user_id = tree.descendant_id
+    WHERE tree.depth < 1000
+)
+INSERT INTO user_hierarchy_closure (ancestor_id, descendant_id, depth)
+SELECT ancestor_id, descendant_id, depth FROM tree
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_hierarchy_closure",
+        sa.Column("ancestor_id", sa.Integer(), nullable=False),
+        sa.Column("descendant_id", sa.Integer(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index(
+        "ix_user_hierarchy_closure_descendant_id",
+        "user_hierarchy_closure",
+        ["descendant_id", "ancestor_id"],
+        unique=False,
+    )
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_hierarchy_closure_descendant_id", table_name="user_hierarchy_closure")
+    op.drop_table("user_hierarchy_closure")
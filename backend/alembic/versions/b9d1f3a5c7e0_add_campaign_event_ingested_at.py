@@ -0,0 +1,32 @@
+"""add occurred_at and ingested_at to campaign events
+
+Revision ID: b9d1f3a5c7e0
+Revises: a8c0e2f4b6d9
+Create Date: 2026-10-18 09:00:00.000000
+
+`ingested_at` is set by the database on insert and is the rollup settle
+clock; `occurred_at` keeps the client-reported event time separately.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b9d1f3a5c7e0"
+down_revision: Union[str, Sequence[str], None] = "a8c0e2f4b6d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("campaign_events", sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        "campaign_events",
+        sa.Column("ingested_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("campaign_events", "ingested_at")
+    op.drop_column("campaign_events", "occurred_at")
@@ -0,0 +1,39 @@
+"""add campaign_events (campaign_id, type, created_at) index
+
+Revision ID: c4e6a8b0d2f5
+Revises: b8d2f4a6c1e3
+Create Date: 2026-10-17 14:00:00.000000
+
+The index is built CONCURRENTLY outside the migration transaction so inserts
+into campaign_events are not blocked while it builds. If a concurrent build
+fails it leaves an INVALID index behind; drop it and re-run the upgrade.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "c4e6a8b0d2f5"
+down_revision: Union[str, Sequence[str], None] = "b8d2f4a6c1e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_campaign_events_campaign_type_created",
+            "campaign_events",
+            ["campaign_id", "type", "created_at"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_campaign_events_campaign_type_created",
+            table_name="campaign_events",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,54 @@
+"""add platform stats snapshot and daily usage tables
+
+Revision ID: e6a8c0d2f4b7
+Revises: d5f7b9c1e3a6
+Create Date: 2026-10-17 18:00:00.000000
+
+The snapshot starts empty; the first /admin/overview request (or the
+in-process platform stats worker) computes it. Usage counters start at zero.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e6a8c0d2f4b7"
+down_revision: Union[str, Sequence[str], None] = "d5f7b9c1e3a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "platform_stats_snapshot",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("total_organizations", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("active_subscriptions", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_users", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pending_approvals", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_brands", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("mrr", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_table(
+        "platform_usage_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("api_calls", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("active_users", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("day"),
+    )
+    op.create_table(
+        "user_activity_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("day", "user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_activity_daily")
+    op.drop_table("platform_usage_daily")
+    op.drop_table("platform_stats_snapshot")
@@ -0,0 +1,85 @@
+"""add creator location and full-text search indexes
+
+Revision ID: f7b9d1e3a5c8
+Revises: e6a8c0d2f4b7
+Create Date: 2026-10-17 20:00:00.000000
+
+PostgreSQL only: a generated `search_vector` tsvector column on creators
+(handle A, name B, category C, bio D) with a GIN index, and pg_trgm GIN
+indexes on creator and influencer handles. Other databases use the in-memory index in
+app.services.creator_search and only get the location column.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f7b9d1e3a5c8"
+down_revision: Union[str, Sequence[str], None] = "e6a8c0d2f4b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CREATOR_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(handle, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(category, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(bio, '')), 'D')"
+)
+HANDLE_TABLES = ("creators", "influencers")
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def _has_table(table_name: str) -> bool:
+    return table_name in _inspector().get_table_names()
+
+
+def _has_column(table_name: str, column_name: str) -> bool:
+    if not _has_table(table_name):
+        return False
+    return any(col["name"] == column_name for col in _inspector().get_columns(table_name))
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    if _has_table("creators") and not _has_column("creators", "location"):
+        with op.batch_alter_table("creators", schema=None) as batch_op:
+            batch_op.add_column(sa.Column("location", sa.String(), nullable=True))
+
+    if not _is_postgresql():
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    if _has_table("creators"):
+        if not _has_column("creators", "search_vector"):
+            op.execute(
+                "ALTER TABLE creators ADD COLUMN search_vector tsvector "
+                f"GENERATED ALWAYS AS ({CREATOR_SEARCH_VECTOR}) STORED"
+            )
+        op.execute("CREATE INDEX IF NOT EXISTS ix_creators_search_vector ON creators USING gin (search_vector)")
+    for table_name in HANDLE_TABLES:
+        if _has_table(table_name):
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table_name}_handle_trgm "
+                f"ON {table_name} USING gin (handle gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    if _is_postgresql():
+        for table_name in HANDLE_TABLES:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table_name}_handle_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_creators_search_vector")
+        if _has_table("creators"):
+            op.execute("ALTER TABLE creators DROP COLUMN IF EXISTS search_vector")
+
+    if _has_column("creators", "location"):
+        with op.batch_alter_table("creators", schema=None) as batch_op:
+            batch_op.drop_column("location")
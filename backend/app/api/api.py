@@ -3,7 +3,7 @@ from app.api.endpoints import (
     dashboard, projects, chat, content, design, workflow, presentation,
     campaigns, agent, communications, analytics, discovery, crm,
     auth, organizations, brands, creators, admin, marcom, jobs, profile,
-    teams, rbac, social, onboarding
+    teams, rbac, social, onboarding, events
 )
 
 api_router = APIRouter()
@@ -20,6 +20,7 @@ api_router.include_router(campaigns.router, prefix="/campaigns", tags=["campaign
 api_router.include_router(agent.router, prefix="/agent", tags=["agent"])
 api_router.include_router(communications.router, prefix="/communications", tags=["communications"])
 api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
 api_router.include_router(discovery.router, prefix="/discovery", tags=["discovery"])
 api_router.include_router(crm.router, prefix="/crm", tags=["crm"])
 
@@ -9,6 +9,9 @@ from app.core.database import get_db
 from app.core.config import settings
 from app.models.models import User
 from app.services.auth_service import decode_access_token
+from app.services.principal_cache import Principal, principal_cache
+from app.services.platform_stats_service import usage_counters
+from app.services.rate_limiter import set_rate_limit_tenant
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
@@ -18,6 +21,8 @@ async def get_current_user(
 ) -> User:
     """
     Extract and validate user from JWT token.
+    Returns a read-only Principal snapshot (cached by user id + token iat, see
+    app.services.principal_cache); use load_current_user_row() to modify the user.
     In development only: falls back to a mock super_admin when NO token is provided.
     Invalid/expired tokens always raise 401. Production never uses mock users.
     """
@@ -50,6 +55,14 @@ async def get_current_user(
     if token_data is None:
         raise credentials_exception
 
+    # API-call / daily-active-user counters behind /admin/usage
+    usage_counters.record(token_data.user_id)
+
+    principal = await principal_cache.get(token_data.user_id, token_data.issued_at)
+    if principal is not None:
+        _bind_rate_limit_tenant(principal)
+        return principal
+
     from sqlalchemy.orm import selectinload
     result = await db.execute(
         select(User).options(
@@ -62,6 +75,31 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
 
+    principal = Principal.from_user(user)
+    await principal_cache.set(principal, token_data.issued_at)
+    _bind_rate_limit_tenant(principal)
+    return principal
+
+
+def _bind_rate_limit_tenant(user) -> None:
+    """Queue this request's provider calls (Influencers Club, Modash) under the caller's organization."""
+    if user.organization_id is not None:
+        set_rate_limit_tenant(f"org:{user.organization_id}")
+    else:
+        set_rate_limit_tenant(f"user:{user.id}")
+
+
+async def load_current_user_row(current_user: User, db: AsyncSession) -> User:
+    """
+    The caller's User row attached to `db`, for endpoints that modify it.
+    get_current_user returns a read-only Principal; writers load the row here
+    and call principal_cache.invalidate_user() after committing.
+    """
+    if isinstance(current_user, User):
+        return current_user
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
     return user
 
 async def get_current_active_user(
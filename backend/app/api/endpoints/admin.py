@@ -11,10 +11,12 @@ from datetime import datetime
 
 from app.core.database import get_db
 from sqlalchemy.orm import selectinload
-from app.models import User, Organization, Brand, Creator
+from app.models import User, Organization, Creator
 from app.models.rbac import Permission, Role
 from app.api.endpoints.auth import get_current_active_user
 from app.services.auth_service import is_super_admin, get_password_hash
+from app.services.principal_cache import principal_cache
+from app.services.platform_stats_service import PLAN_PRICES, platform_stats
 from app.services.rbac_scope import (
     visible_users_where_clause,
     can_manage_user,
@@ -38,6 +40,7 @@ class PlatformOverviewResponse(BaseModel):
     pending_approvals: int
     mrr: float
     active_subscriptions: int
+    refreshed_at: Optional[datetime] = None
 
 
 class PermissionSchema(BaseModel):
@@ -107,47 +110,10 @@ async def get_platform_overview(
 ):
     """
     Get platform overview statistics.
+    Served from the platform stats snapshot (refreshed in the background, see
+    platform_stats_service); `refreshed_at` is when it was computed.
     """
-    from sqlalchemy import func
-    
-    # Count all users
-    total_users_result = await db.execute(select(func.count(User.id)))
-    total_users = total_users_result.scalar() or 0
-    
-    # Count pending approvals
-    pending_result = await db.execute(
-        select(func.count(User.id)).where(User.is_approved == False)
-    )
-    pending_approvals = pending_result.scalar() or 0
-    
-    # Count organizations
-    total_orgs_result = await db.execute(select(func.count(Organization.id)))
-    total_organizations = total_orgs_result.scalar() or 0
-    
-    # Count brands
-    total_brands_result = await db.execute(select(func.count(Brand.id)))
-    total_brands = total_brands_result.scalar() or 0
-    
-    # Count active subscriptions (active organizations)
-    active_subs_result = await db.execute(
-        select(func.count(Organization.id)).where(Organization.is_active == True)
-    )
-    active_subscriptions = active_subs_result.scalar() or 0
-    
-    # Calculate MRR based on plan tiers
-    orgs_result = await db.execute(select(Organization))
-    orgs = orgs_result.scalars().all()
-    plan_prices = {"free": 0, "pro": 99, "enterprise": 499}
-    mrr = sum(plan_prices.get(org.plan_tier, 0) for org in orgs if org.is_active)
-    
-    return PlatformOverviewResponse(
-        total_organizations=total_organizations,
-        total_users=total_users,
-        total_brands=total_brands,
-        pending_approvals=pending_approvals,
-        mrr=float(mrr),
-        active_subscriptions=active_subscriptions
-    )
+    return PlatformOverviewResponse(**await platform_stats.overview(db))
 
 
 @router.get("/users", response_model=List[UserAdminResponse])
@@ -217,6 +183,7 @@ async def update_user(
         user.organization_id = user_data.organization_id
     
     await db.commit()
+    await principal_cache.invalidate_user(user_id)
     await db.refresh(user)
     return user
 
@@ -251,6 +218,7 @@ async def update_user_permission(
         db.add(new_perm)
     
     await db.commit()
+    await principal_cache.invalidate_user(user_id)
     return {"message": "Permission updated"}
 
 
@@ -276,6 +244,7 @@ async def remove_user_permission(
     
     await db.delete(perm)
     await db.commit()
+    await principal_cache.invalidate_user(user_id)
     return {"message": "Permission removed"}
 
 
@@ -346,6 +315,7 @@ async def invite_team_member(
         existing_user.is_active = True
         existing_user.is_approved = True
         await db.commit()
+        await principal_cache.invalidate_user(existing_user.id)
         await db.refresh(existing_user)
         invited_user = existing_user
     else:
@@ -420,14 +390,12 @@ async def list_subscriptions(
     result = await db.execute(select(Organization))
     orgs = result.scalars().all()
     
-    plan_prices = {"free": 0, "pro": 99, "enterprise": 499}
-    
     return [
         SubscriptionResponse(
             org_id=org.id,
             org_name=org.name,
             plan_tier=org.plan_tier,
-            monthly_amount=plan_prices.get(org.plan_tier, 0),
+            monthly_amount=PLAN_PRICES.get(org.plan_tier, 0),
             status="active" if org.is_active else "inactive"
         )
         for org in orgs
@@ -455,6 +423,9 @@ async def update_organization_plan(
     
     org.plan_tier = plan_tier
     await db.commit()
+
+    # MRR changed: don't wait for the scheduled snapshot refresh
+    await platform_stats.refresh(db)
     
     return {"message": f"Organization plan updated to {plan_tier}"}
 
@@ -465,19 +436,10 @@ async def get_platform_usage(
     current_user: User = Depends(require_super_admin)
 ):
     """
-    Get platform usage analytics (mock data).
+    Get platform usage analytics: daily active users for the last 7 UTC days
+    and today's authenticated API calls, from the usage counters (see
+    platform_stats_service). Other workers' counts arrive with their next
+    background flush.
     """
-    return {
-        "daily_active_users": [
-            {"date": "2026-01-15", "count": 145},
-            {"date": "2026-01-16", "count": 162},
-            {"date": "2026-01-17", "count": 158},
-            {"date": "2026-01-18", "count": 171},
-            {"date": "2026-01-19", "count": 189},
-            {"date": "2026-01-20", "count": 142},
-            {"date": "2026-01-21", "count": 198},
-        ],
-        "api_calls_today": 24567,
-        "storage_used_gb": 45.7,
-        "bandwidth_used_gb": 128.3,
-    }
+    await platform_stats.flush_usage(db)
+    return await platform_stats.usage(db, days=7)
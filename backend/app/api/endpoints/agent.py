@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Optional
 from app.services.ai_service import AIService
+from app.services.llm_cache import llm_cache
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import get_db
@@ -19,6 +20,7 @@ class AgentInput(BaseModel):
     goal: str
     product: str
     audience: str
+    regenerate: bool = False
 
 class CampaignDraft(BaseModel):
     title: str
@@ -32,12 +34,14 @@ class CampaignDraft(BaseModel):
 class EnhanceInput(BaseModel):
     text: str
     model: Optional[str] = None
+    regenerate: bool = False
 
 class StrategyInput(BaseModel):
     role: str
     project_type: str
     objective: str
     assets: List[str] = []
+    regenerate: bool = False
 
 class StrategyResponse(BaseModel):
     project_id: int
@@ -48,7 +52,8 @@ class StrategyResponse(BaseModel):
 @router.post("/enhance_description")
 async def enhance_description(input: EnhanceInput):
     try:
-        enhanced = await AIService.enhance_text(input.text, input.model)
+        with llm_cache.bypass(input.regenerate):
+            enhanced = await AIService.enhance_text(input.text, input.model)
         return {"enhanced_text": enhanced}
     except Exception as e:
         print(f"Enhance Error: {e}")
@@ -100,7 +105,8 @@ async def draft_campaign(input: AgentInput, db: AsyncSession = Depends(get_db)):
 
     try:
         # PLAN A - Use _call_llm
-        response_text = await AIService._call_llm(prompt, json_mode=True)
+        with llm_cache.bypass(input.regenerate):
+            response_text = await AIService._call_llm(prompt, json_mode=True)
         response_text = response_text.replace("```json", "").replace("```", "").strip()
         data = json.loads(response_text)
         
@@ -160,11 +166,12 @@ async def generate_strategy(
     Generates a full marketing strategy using Ollama and saves it as a new Project.
     """
     # 1. Generate Strategy via AI Service
-    strategy_json_str = await AIService.generate_campaign_strategy(
-        role=input.role,
-        project_type=input.project_type,
-        objective=input.objective
-    )
+    with llm_cache.bypass(input.regenerate):
+        strategy_json_str = await AIService.generate_campaign_strategy(
+            role=input.role,
+            project_type=input.project_type,
+            objective=input.objective
+        )
     
     # Verify it's valid JSON (AIService ensures this or returns mock)
     try:
@@ -2,12 +2,11 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Dict, Any
 from pydantic import BaseModel
 import random
-from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, extract
-from app.core.database import get_db
-from app.models.models import Campaign, Influencer, CampaignEvent, CampaignInfluencer, User
+from app.core.database import get_read_db
+from app.models.models import User
 from app.api.deps import require_analytics_read
+from app.services.analytics_service import analytics_service
 
 router = APIRouter()
 
@@ -24,67 +23,39 @@ class AnalyticsDashboardResponse(BaseModel):
 
 @router.get("/dashboard", response_model=AnalyticsDashboardResponse)
 async def get_analytics_dashboard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_analytics_read)
 ):
     """
     Returns aggregated analytics for the Analytics Suite.
     Uses real data from CampaignEvent table, with smart fallback for empty databases.
+    Cached per organization for a short TTL (see analytics_service).
     """
+    return await analytics_service.cached(
+        "dashboard", current_user, lambda: _build_analytics_dashboard(db, current_user)
+    )
+
+
+async def _build_analytics_dashboard(db: AsyncSession, current_user: User) -> AnalyticsDashboardResponse:
     data_source = "real"
-    
-    # Build org filter
-    if current_user.role == "super_admin":
-        campaign_filter = select(Campaign.id)
-        event_filter = select(CampaignEvent.id)
-        influencer_filter = select(Influencer.id)
-    else:
-        campaign_filter = select(Campaign.id).join(User, Campaign.owner_id == User.id).where(User.organization_id == current_user.organization_id)
-        event_filter = select(CampaignEvent.id).join(Campaign, CampaignEvent.campaign_id == Campaign.id).join(User, Campaign.owner_id == User.id).where(User.organization_id == current_user.organization_id)
-        influencer_filter = select(Influencer.id)
-    
-    # 1. Real Counts from DB
-    active_campaigns_count = await db.scalar(
-        select(func.count(Campaign.id)).where((Campaign.status == "active") & (Campaign.id.in_(campaign_filter)))
-    ) or 0
 
-    total_influencers = await db.scalar(
-        select(func.count(Influencer.id))
-    ) or 0
-    
-    # Count events by type
-    total_events = await db.scalar(
-        select(func.count(CampaignEvent.id)).where(CampaignEvent.id.in_(event_filter))
-    ) or 0
-    
-    # Get conversion events specifically
-    conversion_events = await db.scalar(
-        select(func.count(CampaignEvent.id)).where((CampaignEvent.type == "conversion") & (CampaignEvent.id.in_(event_filter)))
-    ) or 0
-    
-    # Calculate Total Reach from influencers
-    real_reach_result = await db.execute(select(func.sum(Influencer.followers)))
-    real_reach = real_reach_result.scalar() or 0
-    
-    # Get real engagement data from events
-    click_events = await db.scalar(
-        select(func.count(CampaignEvent.id)).where((CampaignEvent.type == "click") & (CampaignEvent.id.in_(event_filter)))
-    ) or 0
-    view_events = await db.scalar(
-        select(func.count(CampaignEvent.id)).where((CampaignEvent.type == "view") & (CampaignEvent.id.in_(event_filter)))
-    ) or 0
-    
+    # 1. Real totals from DB, scoped to the caller's org, in one query
+    totals = await analytics_service.dashboard_totals(db, current_user)
+    active_campaigns_count = totals["active_campaigns"]
+    total_influencers = totals["influencers"]
+    total_events = totals["total_events"]
+    conversion_events = totals["conversions"]
+    real_reach = totals["reach"]
+    click_events = totals["clicks"]
+    view_events = totals["views"]
+    total_revenue = totals["revenue"]
+
     # Calculate engagement rate from real data
     if view_events > 0:
         real_engagement = round((click_events / view_events) * 100, 2)
     else:
         real_engagement = 0.0
-    
-    # Calculate ROI from event values
-    total_revenue = await db.scalar(
-        select(func.sum(CampaignEvent.value)).where((CampaignEvent.type == "conversion") & (CampaignEvent.id.in_(event_filter)))
-    ) or 0
-    
+
     # 2. Determine if we have real data or need demo fallback
     has_real_data = total_events > 0 or real_reach > 0
     
@@ -150,48 +121,21 @@ async def _get_traffic_timeline(db: AsyncSession, current_user: User) -> List[Di
                    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
     
     try:
-        twelve_months_ago = datetime.now() - timedelta(days=365)
-        
-        if current_user.role == "super_admin":
-            result = await db.execute(
-                select(
-                    extract('month', CampaignEvent.created_at).label('month'),
-                    func.count(CampaignEvent.id).label('count')
-                )
-                .where(CampaignEvent.created_at >= twelve_months_ago)
-                .group_by(extract('month', CampaignEvent.created_at))
-                .order_by(extract('month', CampaignEvent.created_at))
-            )
-        else:
-            result = await db.execute(
-                select(
-                    extract('month', CampaignEvent.created_at).label('month'),
-                    func.count(CampaignEvent.id).label('count')
-                )
-                .join(Campaign, CampaignEvent.campaign_id == Campaign.id)
-                .join(User, Campaign.owner_id == User.id)
-                .where(
-                    (CampaignEvent.created_at >= twelve_months_ago) &
-                    (User.organization_id == current_user.organization_id)
-                )
-                .group_by(extract('month', CampaignEvent.created_at))
-                .order_by(extract('month', CampaignEvent.created_at))
-            )
-        
-        rows = result.all()
+        # Daily rollups plus the not-yet-rolled-up tail (see analytics_service)
+        rows = await analytics_service.monthly_events(db, current_user, days=365)
         
         if not rows:
             return []
         
         timeline = []
         for row in rows:
-            month_idx = int(row.month) - 1
+            month_idx = row["month"] - 1
             if 0 <= month_idx < 12:
                 # Create engagement metric (simulated as % of value)
-                engagement = int(row.count * 0.7)  # 70% of traffic is engagement
+                engagement = int(row["count"] * 0.7)  # 70% of traffic is engagement
                 timeline.append({
                     "date": month_names[month_idx],
-                    "value": row.count,
+                    "value": row["count"],
                     "engagement": engagement
                 })
         
@@ -8,7 +8,7 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.api.deps import get_current_active_user, get_current_authenticated_user, get_db, require_super_admin
+from app.api.deps import get_current_active_user, get_current_authenticated_user, get_db, load_current_user_row, require_super_admin
 from app.models.models import User
 from app.models.rbac import Role
 from app.services.auth_service import (
@@ -18,6 +18,7 @@ from app.services.auth_service import (
     create_refresh_token,
     decode_token_payload,
 )
+from app.services.principal_cache import principal_cache
 from app.core.config import settings
 
 router = APIRouter()
@@ -172,6 +173,7 @@ async def set_password(
     user.hashed_password = get_password_hash(password)
     user.must_reset_password = True
     await db.commit()
+    await principal_cache.invalidate_user(user.id)
 
     return {"message": "Password set successfully"}
 
@@ -191,17 +193,20 @@ async def change_password(
     Change current user's password.
     Also clears first-login reset requirement.
     """
-    if not verify_password(payload.current_password, current_user.hashed_password):
+    # The cached principal carries no password hash; check against the row
+    user = await load_current_user_row(current_user, db)
+    if not verify_password(payload.current_password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
 
     if len(payload.new_password) < 8:
         raise HTTPException(status_code=422, detail="New password must be at least 8 characters")
-    if verify_password(payload.new_password, current_user.hashed_password):
+    if verify_password(payload.new_password, user.hashed_password):
         raise HTTPException(status_code=422, detail="New password must be different from temporary password")
 
-    current_user.hashed_password = get_password_hash(payload.new_password)
-    current_user.must_reset_password = False
+    user.hashed_password = get_password_hash(payload.new_password)
+    user.must_reset_password = False
     await db.commit()
+    await principal_cache.invalidate_user(user.id)
 
     return {"message": "Password updated successfully"}
 
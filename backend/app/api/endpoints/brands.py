@@ -12,8 +12,10 @@ import re
 from app.core.database import get_db
 from app.models import Brand, User, Organization, Creator, SocialConnection, ContentGeneration, ScheduledPost, DesignAsset
 from app.api.endpoints.auth import get_current_active_user
+from app.api.deps import load_current_user_row
 from app.services.auth_service import is_super_admin, is_agency_level
 from app.services.permission_engine import PermissionEngine
+from app.services.principal_cache import principal_cache
 
 router = APIRouter()
 
@@ -48,9 +50,10 @@ async def _ensure_organization_for_user(
     await db.commit()
     await db.refresh(new_org)
 
-    current_user.organization_id = new_org.id
+    user = await load_current_user_row(current_user, db)
+    user.organization_id = new_org.id
     await db.commit()
-    await db.refresh(current_user)
+    await principal_cache.invalidate_user(user.id)
 
     return new_org.id
 
@@ -1,13 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.sse import SSE_HEADERS, sse_event
 from app.models.models import ChatMessage, User
 from app.services.ai_service import AIService
 from pydantic import BaseModel
 import uuid
+import logging
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 class ChatRequest(BaseModel):
@@ -47,9 +52,8 @@ async def get_sessions(db: AsyncSession = Depends(get_db)):
     sessions = result.scalars().all()
     return sessions
 
-@router.post("/message", response_model=ChatResponse)
-async def chat_message(request: ChatRequest, db: AsyncSession = Depends(get_db)):
-    user_id = 1 # Default demo user
+async def _prepare_chat(request: ChatRequest, db: AsyncSession, user_id: int):
+    """Save the user's message and build the model input (system prompt + history)."""
     session_id = request.session_id or str(uuid.uuid4())
 
     # 1. Fetch User Profile for context
@@ -82,7 +86,14 @@ async def chat_message(request: ChatRequest, db: AsyncSession = Depends(get_db))
     ollama_messages = [{"role": "system", "content": system_prompt}]
     for msg in history:
         ollama_messages.append({"role": msg["role"], "content": msg["content"]})
-    
+    return session_id, ollama_messages
+
+
+@router.post("/message", response_model=ChatResponse)
+async def chat_message(request: ChatRequest, db: AsyncSession = Depends(get_db)):
+    user_id = 1 # Default demo user
+    session_id, ollama_messages = await _prepare_chat(request, db, user_id)
+
     # 4. Call AI Service
     ai_result = await AIService.chat_completion(
         ollama_messages,
@@ -108,3 +119,50 @@ async def chat_message(request: ChatRequest, db: AsyncSession = Depends(get_db))
         "session_id": session_id,
         "model_used": model_used,
     }
+
+
+@router.post("/message/stream")
+async def chat_message_stream(request: ChatRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Streaming variant of /message (server-sent events).
+
+    Emits `start` with the session id, one `token` event per text delta, and a
+    final `done` event with the full response once the assistant message has
+    been saved. Failures after the stream has started arrive as an `error`
+    event.
+    """
+    user_id = 1 # Default demo user
+    session_id, ollama_messages = await _prepare_chat(request, db, user_id)
+
+    async def event_stream():
+        yield sse_event("start", {"session_id": session_id})
+        try:
+            async for event in AIService.stream_chat_completion(ollama_messages, model=request.model):
+                if event["type"] == "delta":
+                    yield sse_event("token", {"delta": event["delta"]})
+                    continue
+
+                # Persist with a fresh session: the request-scoped one may be
+                # closed before the response body finishes streaming.
+                async with AsyncSessionLocal() as session:
+                    session.add(ChatMessage(
+                        session_id=session_id,
+                        role="assistant",
+                        content=event["text"],
+                        model_used=event["model_used"],
+                        user_id=user_id,
+                    ))
+                    await session.commit()
+
+                yield sse_event("done", {
+                    "response": event["text"],
+                    "session_id": session_id,
+                    "model_used": event["model_used"],
+                    "ttft_ms": event["ttft_ms"],
+                    "duration_ms": event["duration_ms"],
+                })
+        except Exception as e:
+            logger.error(f"Chat stream failed for session {session_id}: {e}")
+            yield sse_event("error", {"detail": str(e), "session_id": session_id})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
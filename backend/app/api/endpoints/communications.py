@@ -2,13 +2,15 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.services.cpaas_service import cpaas_service
 from app.api.deps import (
     get_current_active_user, require_marcom_read, require_marcom_write
 )
-from app.models.models import User
+from app.models.models import User, Campaign, CampaignEmailDelivery
+from app.services.rbac_scope import visible_user_filter
 
 router = APIRouter()
 
@@ -77,3 +79,52 @@ async def send_whatsapp(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+
+@router.get("/deliveries/{send_id}")
+async def get_email_deliveries(
+    send_id: str,
+    status: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_marcom_read)
+):
+    """Per-recipient results of a bulk campaign email send (send_id is the job id)."""
+    # Only sends for campaigns the caller can see; other tenants' sends are a 404
+    scope = (
+        CampaignEmailDelivery.send_id == send_id,
+        CampaignEmailDelivery.campaign_id.in_(
+            select(Campaign.id).where(visible_user_filter(current_user, Campaign.owner_id))
+        ),
+    )
+    counts_result = await db.execute(
+        select(CampaignEmailDelivery.status, func.count(CampaignEmailDelivery.id))
+        .where(*scope)
+        .group_by(CampaignEmailDelivery.status)
+    )
+    counts = {row_status: count for row_status, count in counts_result.all()}
+    if not counts:
+        raise HTTPException(status_code=404, detail=f"No deliveries found for send: {send_id}")
+
+    query = select(CampaignEmailDelivery).where(*scope)
+    if status:
+        query = query.where(CampaignEmailDelivery.status == status)
+    rows = await db.execute(query.order_by(CampaignEmailDelivery.id).offset(skip).limit(min(limit, 1000)))
+
+    return {
+        "send_id": send_id,
+        "counts": counts,
+        "deliveries": [
+            {
+                "email": row.email,
+                "status": row.status,
+                "provider": row.provider,
+                "message_id": row.message_id,
+                "error": row.error,
+                "attempts": row.attempts,
+                "updated_at": row.updated_at or row.created_at,
+            }
+            for row in rows.scalars().all()
+        ],
+    }
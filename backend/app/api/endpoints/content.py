@@ -3,17 +3,20 @@ import asyncio
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import (
     get_current_active_user,
 )
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.sse import SSE_HEADERS, sse_event
 from app.models import models
 from app.models.models import User
 from app.schemas import schemas
 from app.services.ai_service import AIService
+from app.services.llm_cache import llm_cache
 from app.services.auth_service import is_super_admin
 from app.services.permission_engine import PermissionEngine
 from app.services.rbac_scope import visible_user_filter
@@ -120,69 +123,166 @@ async def generate_content(
     current_user: User = Depends(get_current_active_user),
 ):
     _require_content_action(current_user, "create")
-    try:
-        normalized_title = _normalize_platform_title(request.title, request.platform)
-        generate_with_image = bool(request.generate_with_image)
-        if request.adapt_from_base and (request.base_result or "").strip():
-            generated_text = await AIService.adapt_content_for_platform(
-                base_text=request.base_result or "",
-                platform=request.platform,
-                content_type=request.content_type,
-                model=request.model,
-            )
-            generated_image = request.image_url
-            image_model_used = "provided"
-            image_fallback_used = False
-        else:
-            generated_text, generated_image_payload = await asyncio.gather(
-                AIService.generate_content(
-                    normalized_title,
-                    request.platform,
-                    request.content_type,
-                    request.prompt,
-                    request.model,
-                ),
-                AIService.generate_image(
-                    title=normalized_title,
-                    style="Minimalist",
-                    prompt=request.prompt,
-                    aspect_ratio="1:1",
-                    brand_colors=request.brand_colors,
-                    model="NanoBanana",
-                    return_meta=True,
-                ) if generate_with_image else asyncio.sleep(0, result=None),
-            )
-            generated_image = (
-                generated_image_payload.get("image_url")
-                if isinstance(generated_image_payload, dict)
-                else None
-            )
-            image_model_used = (
-                generated_image_payload.get("image_model_used")
-                if isinstance(generated_image_payload, dict)
-                else None
-            )
-            image_fallback_used = bool(
-                generated_image_payload.get("image_fallback_used")
-            ) if isinstance(generated_image_payload, dict) else False
-        return {
-            "title": normalized_title,
-            "platform": request.platform,
-            "content_type": request.content_type,
-            "prompt": request.prompt,
-            "result": generated_text,
-            "image_url": generated_image,
-            "brand_colors": request.brand_colors,
-            "generate_with_image": generate_with_image,
-            "brand_id": request.brand_id,
-            "text_model_used": AIService.get_effective_content_model_name(request.model),
-            "image_model_used": image_model_used if generate_with_image else None,
-            "image_fallback_used": image_fallback_used if generate_with_image else False,
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    with llm_cache.bypass(request.regenerate):
+        try:
+            normalized_title = _normalize_platform_title(request.title, request.platform)
+            generate_with_image = bool(request.generate_with_image)
+            if request.adapt_from_base and (request.base_result or "").strip():
+                generated_text = await AIService.adapt_content_for_platform(
+                    base_text=request.base_result or "",
+                    platform=request.platform,
+                    content_type=request.content_type,
+                    model=request.model,
+                )
+                generated_image = request.image_url
+                image_model_used = "provided"
+                image_fallback_used = False
+            else:
+                generated_text, generated_image_payload = await asyncio.gather(
+                    AIService.generate_content(
+                        normalized_title,
+                        request.platform,
+                        request.content_type,
+                        request.prompt,
+                        request.model,
+                        coalesce=not request.regenerate,
+                    ),
+                    AIService.generate_image(
+                        title=normalized_title,
+                        style="Minimalist",
+                        prompt=request.prompt,
+                        aspect_ratio="1:1",
+                        brand_colors=request.brand_colors,
+                        model="NanoBanana",
+                        return_meta=True,
+                        coalesce=not request.regenerate,
+                    ) if generate_with_image else asyncio.sleep(0, result=None),
+                )
+                generated_image = (
+                    generated_image_payload.get("image_url")
+                    if isinstance(generated_image_payload, dict)
+                    else None
+                )
+                image_model_used = (
+                    generated_image_payload.get("image_model_used")
+                    if isinstance(generated_image_payload, dict)
+                    else None
+                )
+                image_fallback_used = bool(
+                    generated_image_payload.get("image_fallback_used")
+                ) if isinstance(generated_image_payload, dict) else False
+            return {
+                "title": normalized_title,
+                "platform": request.platform,
+                "content_type": request.content_type,
+                "prompt": request.prompt,
+                "result": generated_text,
+                "image_url": generated_image,
+                "brand_colors": request.brand_colors,
+                "generate_with_image": generate_with_image,
+                "brand_id": request.brand_id,
+                "text_model_used": AIService.get_effective_content_model_name(request.model),
+                "image_model_used": image_model_used if generate_with_image else None,
+                "image_fallback_used": image_fallback_used if generate_with_image else False,
+            }
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/generate/stream")
+async def generate_content_stream(
+    request: schemas.ContentGenerationCreate,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Streaming variant of /generate (server-sent events).
+
+    Emits `token` events ({"delta", "phase"}) while the draft and then the
+    proofread ("final") text are generated, and a `done` event carrying the
+    saved ContentGeneration once the stream completes. The optional image is
+    generated concurrently and attached before saving.
+    """
+    _require_content_action(current_user, "create")
+    normalized_title = _normalize_platform_title(request.title, request.platform)
+    generate_with_image = bool(request.generate_with_image)
+    adapt = bool(request.adapt_from_base and (request.base_result or "").strip())
+    user_id = current_user.id
+
+    async def event_stream():
+        image_task = None
+        if generate_with_image and not adapt:
+            image_task = asyncio.create_task(AIService.generate_image(
+                title=normalized_title,
+                style="Minimalist",
+                prompt=request.prompt,
+                aspect_ratio="1:1",
+                brand_colors=request.brand_colors,
+                model="NanoBanana",
+                return_meta=True,
+                coalesce=not request.regenerate,
+            ))
+        try:
+            yield sse_event("start", {
+                "title": normalized_title,
+                "platform": request.platform,
+                "text_model_used": AIService.get_effective_content_model_name(request.model),
+            })
+            async for event in AIService.stream_content(
+                normalized_title,
+                request.platform,
+                request.content_type,
+                request.prompt,
+                request.model,
+                base_text=request.base_result if adapt else None,
+            ):
+                if event["type"] == "delta":
+                    yield sse_event("token", {"delta": event["delta"], "phase": event["phase"]})
+                    continue
+
+                image_url, image_model_used, image_fallback_used = request.image_url, None, False
+                if adapt:
+                    image_model_used = "provided"
+                elif image_task is not None:
+                    payload = await image_task
+                    if isinstance(payload, dict):
+                        image_url = payload.get("image_url")
+                        image_model_used = payload.get("image_model_used")
+                        image_fallback_used = bool(payload.get("image_fallback_used"))
+
+                async with AsyncSessionLocal() as session:
+                    db_content = models.ContentGeneration(
+                        title=normalized_title,
+                        platform=request.platform,
+                        content_type=request.content_type,
+                        prompt=request.prompt,
+                        result=event["text"],
+                        image_url=image_url,
+                        brand_colors=request.brand_colors,
+                        generate_with_image=generate_with_image,
+                        user_id=user_id,
+                        brand_id=request.brand_id,
+                    )
+                    session.add(db_content)
+                    await session.commit()
+                    await session.refresh(db_content)
+
+                yield sse_event("done", {
+                    **schemas.ContentGeneration.model_validate(db_content).model_dump(mode="json"),
+                    "text_model_used": event["model_used"],
+                    "image_model_used": image_model_used if generate_with_image else None,
+                    "image_fallback_used": image_fallback_used if generate_with_image else False,
+                    "ttft_ms": event["ttft_ms"],
+                    "duration_ms": event["duration_ms"],
+                })
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+        finally:
+            if image_task is not None and not image_task.done():
+                image_task.cancel()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 
 @router.post("/save", response_model=schemas.ContentGeneration)
@@ -288,13 +388,15 @@ async def update_content(
                 detail="Posted content is read-only. Create a new content draft to edit.",
             )
 
-        new_text = await AIService.generate_content(
-            normalized_title,
-            request.platform,
-            request.content_type,
-            request.prompt,
-            request.model,
-        )
+        # Updating regenerates the text, so never serve it from the cache
+        with llm_cache.bypass():
+            new_text = await AIService.generate_content(
+                normalized_title,
+                request.platform,
+                request.content_type,
+                request.prompt,
+                request.model,
+            )
 
         db_content.title = normalized_title
         db_content.platform = request.platform
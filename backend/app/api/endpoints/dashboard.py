@@ -1,156 +1,85 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
 from typing import List
+import random
 
-from app.core.database import get_db
+from app.api.deps import get_current_active_user
+from app.core.database import get_read_db
 from app.models import models
 from app.schemas import schemas
+from app.services.analytics_service import (
+    DASHBOARD_RANGES, DEFAULT_DASHBOARD_RANGE, analytics_service, org_user_ids
+)
 
 router = APIRouter()
 
 @router.get("/stats", response_model=schemas.DashboardData)
-async def get_dashboard_stats(time_range: str = Query("6m", alias="range"), db: AsyncSession = Depends(get_db)):
-    # 1. Stats (Global or filtered? Usually global stats, but performance chart is specific. 
-    # The requirement is "Performance Overview should have tabs". 
-    # So I should probably ONLY filter the 'performance' part of the response, OR typical dashboards filter everything. 
-    # Given the UI structure, "Performance Overview" is a separate card. 
-    # However, the user asked for tabs *on that card*. 
-    # If I filter the whole endpoint, the top stats might jump around which might be confusing. 
-    # But usually "Dashboard Filters" apply to everything. 
-    # "Performance Overview should have tabs..." suggests strictly that component.
-    # Refactoring to a separate endpoint strictly for performance would be cleaner as per plan, 
-    # BUT I am editing `get_dashboard_stats`.
-    # I will stick to filtering ONLY the performance list in this response for now, 
-    # to avoid breaking the top stats if they are meant to be "Total".
-    # Actually, the user might expect the whole dashboard to filter, but the request was specific to Performance Overview.
-    # I will filter the *performance metrics* based on range. The top cards (Active Campaigns etc) usually show "Current Active", not "Active in last 7 days".
-    # Activity log is "recent", so that stays.
-    
-    # 1. Stats (Current state, not time-series)
-    active_campaigns_query = select(func.count(models.Campaign.id)).where(models.Campaign.status == "active")
-    active_campaigns = await db.execute(active_campaigns_query)
-    active_count = active_campaigns.scalar() or 0
-    
-    workflows_query = select(func.count(models.Workflow.id))
-    workflows = await db.execute(workflows_query)
-    
-    content_query = select(func.count(models.ContentGeneration.id))
-    content = await db.execute(content_query)
-    
-    conversations_query = select(func.count(models.ChatMessage.id))
-    conversations = await db.execute(conversations_query)
+async def get_dashboard_stats(
+    time_range: str = Query("6m", alias="range"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_active_user)
+):
+    """
+    Main dashboard: stat cards, recent activity, campaign performance series
+    and a featured campaign, scoped to the caller's organization
+    (platform-wide for super_admin).
 
+    The performance series is bucketed in SQL (day / ISO week / month per
+    range). The payload is cached per organization and range (see
+    analytics_service) and dropped when one of the org's campaigns changes.
+    """
+    if time_range not in DASHBOARD_RANGES:
+        time_range = DEFAULT_DASHBOARD_RANGE
+    return await analytics_service.cached(
+        f"dashboard_stats:{time_range}", current_user,
+        lambda: _build_dashboard_stats(db, current_user, time_range)
+    )
+
+
+async def _build_dashboard_stats(db: AsyncSession, current_user: models.User, time_range: str) -> dict:
+    user_ids = org_user_ids(current_user)
+
+    # 1. Stats (current state, not time-series) in one query.
+    # The top cards show "current" totals; only the performance series follows the range.
+    counts = await analytics_service.dashboard_counts(db, current_user)
+    active_count = counts["active_campaigns"]
     stats = {
         "active_campaigns": active_count,
         "active_campaigns_growth": 2.5 if active_count > 0 else 0,
-        "ai_workflows": workflows.scalar() or 0,
-        "content_generated": content.scalar() or 0,
-        "ai_conversations": conversations.scalar() or 0,
+        "ai_workflows": counts["ai_workflows"],
+        "content_generated": counts["content_generated"],
+        "ai_conversations": counts["ai_conversations"],
     }
 
     # 2. Activities
-    activities_result = await db.execute(select(models.ActivityLog).limit(5).order_by(models.ActivityLog.timestamp.desc()))
-    activities = activities_result.scalars().all()
+    activities_query = select(models.ActivityLog).limit(5).order_by(models.ActivityLog.timestamp.desc())
+    if user_ids is not None:
+        activities_query = activities_query.where(models.ActivityLog.user_id.in_(user_ids))
+    activities_result = await db.execute(activities_query)
+    activities = [schemas.ActivityLog.model_validate(a) for a in activities_result.scalars().all()]
 
-    # 3. Performance (Dynamic Aggregation)
-    import datetime
-    from collections import defaultdict
-    
-    today = datetime.date.today()
-    performance_map = defaultdict(lambda: {"campaigns": 0, "engagement": 0})
-    labels = []
-    
-    # Determine bucket size and range
-    if time_range == "7d":
-        days_back = 7
-        date_format = "%a" # Mon, Tue
-        # Generate last 7 days keys
-        for i in range(days_back - 1, -1, -1):
-             d = today - datetime.timedelta(days=i)
-             labels.append(d.strftime(date_format))
-    elif time_range == "30d":
-        days_back = 30
-        date_format = "%d %b" # 12 Jan
-        # Show every 5th day for 30d view to avoid clutter, or all days if UI handles it. 
-        # For simplicity, we track all days but UI might sample ticks.
-        for i in range(days_back - 1, -1, -1):
-             d = today - datetime.timedelta(days=i)
-             labels.append(d.strftime(date_format))
-    elif time_range == "3m":
-        days_back = 90
-        date_format = "%d %b" # 12 Jan
-        # Weekly buckets might be better for 3 months, or daily? 
-        # Let's do weekly to prevent 90 items.
-        # Actually for simplicity of implementation vs UI, let's do 12 weeks.
-        for i in range(12, 0, -1):
-            d = today - datetime.timedelta(weeks=i)
-            # Find start of that week
-            labels.append(f"W {d.strftime('%V')}") # W 05
-    else: # 6m default or YTD
-        days_back = 180
-        date_format = "%b" # Jan
-        # Generate last 6 months keys
-        for i in range(5, -1, -1):
-            d = today - datetime.timedelta(days=i*30) 
-            l = d.strftime(date_format)
-            if l not in labels: labels.append(l)
-
-    # Initialize map with 0s for ensure alignment
-    for l in labels:
-        performance_map[l]
-
-    # Fetch relevant campaigns
-    start_date = today - datetime.timedelta(days=days_back)
-    campaigns_query = select(models.Campaign).where(models.Campaign.created_at >= start_date)
-    campaigns_result = await db.execute(campaigns_query)
-    filtered_campaigns = campaigns_result.scalars().all()
-    
-    for camp in filtered_campaigns:
-        if camp.created_at:
-            if time_range == "3m":
-                 key = f"W {camp.created_at.strftime('%V')}"
-            elif time_range == "6m": # Default logic
-                 key = camp.created_at.strftime(date_format)
-            else:
-                 key = camp.created_at.strftime(date_format)
-            
-            if key in performance_map:
-                performance_map[key]["campaigns"] += 1
-                # Mock engagement calculation logic based on status
-                if camp.status == "active":
-                    performance_map[key]["engagement"] += 150 # Simulated data
-                else: 
-                     performance_map[key]["engagement"] += 50
+    # 3. Performance: one row per bucket from the database, zero-filled
+    performance = await analytics_service.dashboard_timeline(db, current_user, time_range)
 
     # Increase simulated data if empty for "demo" effect on fresh accounts
     # This ensures the charts aren't completely flat for the new admin
-    if len(filtered_campaigns) == 0:
-         import random
-         for key in labels:
-             performance_map[key]["campaigns"] = random.randint(0, 3)
-             performance_map[key]["engagement"] = random.randint(10, 500)
-    
-    # Construct list (sorted by labels order)
-    performance = []
-    for key in labels:
-        performance.append({
-            "name": key,
-            "campaigns": performance_map[key]["campaigns"],
-            "engagement": performance_map[key]["engagement"]
-        })
+    if not any(point["campaigns"] for point in performance):
+        for point in performance:
+            point["campaigns"] = random.randint(0, 3)
+            point["engagement"] = random.randint(10, 500)
 
     # 4. Featured Campaign (active first, then any recent campaign)
     featured = None
-    feat_query = await db.execute(
-        select(models.Campaign).order_by(
-            # Prefer active campaigns, then most recently updated
-            (models.Campaign.status == "active").desc(),
-            models.Campaign.updated_at.desc()
-        ).limit(1)
-    )
-    feat_campaign = feat_query.scalar_one_or_none()
+    feat_query = select(models.Campaign).order_by(
+        # Prefer active campaigns, then most recently updated
+        (models.Campaign.status == "active").desc(),
+        models.Campaign.updated_at.desc()
+    ).limit(1)
+    if user_ids is not None:
+        feat_query = feat_query.where(models.Campaign.owner_id.in_(user_ids))
+    feat_result = await db.execute(feat_query)
+    feat_campaign = feat_result.scalar_one_or_none()
     if feat_campaign:
         featured = {
             "title": feat_campaign.title,
@@ -169,13 +98,13 @@ async def get_dashboard_stats(time_range: str = Query("6m", alias="range"), db:
     }
 
 @router.get("/activities", response_model=List[schemas.ActivityLog])
-async def get_recent_activities(skip: int = 0, limit: int = 5, db: AsyncSession = Depends(get_db)):
+async def get_recent_activities(skip: int = 0, limit: int = 5, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(models.ActivityLog).offset(skip).limit(limit).order_by(models.ActivityLog.timestamp.desc()))
     activities = result.scalars().all()
     return activities
 
 @router.get("/campaigns", response_model=List[schemas.Campaign])
-async def get_campaigns(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)):
+async def get_campaigns(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(models.Campaign).offset(skip).limit(limit))
     campaigns = result.scalars().all()
     return campaigns
@@ -136,6 +136,7 @@ async def generate_design(
             reference_image=request.reference_image,
             model=request.model,
             return_meta=True,
+            coalesce=not request.regenerate,
         )
         image_url = image_payload.get("image_url") if isinstance(image_payload, dict) else image_payload
 
@@ -7,7 +7,6 @@ Documentation: https://app.theneo.io/influencers-club/influencers-public-api
 """
 
 import logging
-import os
 from typing import Optional, List
 import re
 import json
@@ -24,9 +23,19 @@ from app.api.deps import require_discovery_read
 
 # Credit tracking
 from app.services.credit_service import CreditService, CREDIT_COSTS
+from app.services.discovery_cache import discovery_cache, discovery_cache_key, discovery_cache_scope
+from app.services.rate_limiter import ProviderRateLimited
+from app.services.batch_enrichment import (
+    ENRICHMENT_BATCH_MAX_HANDLES,
+    ENRICHMENT_MODES,
+    batch_report,
+    normalize_handles,
+)
+from app.services.enrichment_cache import enrichment_cache
+from app.schemas.schemas import BatchEnrichRequest
 
 # Influencers Club API Integration
-from app.integrations.influencers_club import get_influencers_client
+from app.integrations.influencers_club import get_api_key_from_env, get_influencers_client
 import httpx
 
 logger = logging.getLogger(__name__)
@@ -75,13 +84,18 @@ def _extract_external_error_message(error_msg: str) -> str:
             pass
     return error_msg
 
+def _rate_limited_error(error: ProviderRateLimited) -> HTTPException:
+    """429 for calls the shared provider limiter could not schedule in time."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Discovery provider is busy. Please retry shortly.",
+        headers={"Retry-After": str(int(error.retry_after + 0.999))},
+    )
+
+
 def _get_influencers_club_api_key() -> Optional[str]:
     """Resolve API key directly from environment/.env."""
-    key = (os.getenv("INFLUENCERS_CLUB_API_KEY") or "").strip()
-    key = key.strip("'").strip('"')
-    if key.lower().startswith("bearer "):
-        key = key[7:].strip()
-    return key or None
+    return get_api_key_from_env()
 
 
 async def get_ic_client():
@@ -463,6 +477,75 @@ def _apply_basic_filter_constraints_to_accounts(result: dict, filters: dict) ->
     return result
 
 
+async def _fetch_discovery_page(
+    client,
+    platform: str,
+    filters: dict,
+    limit: int,
+    page: int,
+    ai_search: Optional[str],
+    username: Optional[str],
+):
+    """Run one discovery search against Influencers Club, with the exact-handle fallbacks.
+
+    Returns the post-processed result and the filters actually sent (locations resolved).
+    """
+    if platform and filters.get("location"):
+        filters = await _resolve_location_filter_for_platform(client, platform, filters)
+    
+    # Call real API
+    try:
+        result = await client.discover_creators(
+            platform=platform,
+            filters=filters,
+            limit=limit,
+            page=page
+        )
+    except (ValueError, PermissionError) as e:
+        external_msg = _extract_external_error_message(str(e))
+        # Fallback path: if discovery search trial is expired, still try direct handle enrich.
+        if _is_trial_expired_message(external_msg) and username:
+            logger.warning(
+                "Discovery trial expired; attempting enrich fallback for username=%s platform=%s",
+                username,
+                platform,
+            )
+            enriched = await client.enrich_creator_handle(
+                platform=platform,
+                handle=username,
+                enrichment_mode="raw",
+            )
+            result = _build_discovery_result_from_enrich(enriched, platform)
+        else:
+            raise
+
+    result = _apply_identity_result_filter(result, ai_search)
+    result = _dedupe_accounts_in_result(result)
+
+    # Discovery may miss exact handles on some platforms; enrich fallback improves exact-match reliability.
+    if username and len(result.get("accounts", []) or []) == 0:
+        try:
+            enriched = await client.enrich_creator_handle(
+                platform=platform,
+                handle=username,
+                enrichment_mode="raw",
+            )
+            result = _build_discovery_result_from_enrich(enriched, platform)
+            result = _apply_basic_filter_constraints_to_accounts(result, filters)
+            result = _apply_identity_result_filter(result, ai_search)
+            result = _dedupe_accounts_in_result(result)
+            result["source"] = "enrich_zero_result_fallback"
+        except Exception as e:
+            logger.info(
+                "Zero-result enrich fallback failed for username=%s platform=%s: %s",
+                username,
+                platform,
+                e,
+            )
+
+    return result, filters
+
+
 # ============================================================================
 # CREATOR DISCOVERY API
 # ============================================================================
@@ -507,27 +590,13 @@ async def discover_creators(
     - Verification status
     - And more...
 
-    **Cost:** 0.01 credits per creator
+    **Cost:** 0.01 credits per creator. Repeating a search your organization ran
+    recently is served from the discovery cache (`cache.hit`) and costs nothing.
     
     **Example:**
     - `/discovery/search?platform=instagram&ai_search=fashion%20influencers&min_followers=10000`
     """
     try:
-        # Check user credits - get_balance now auto-initializes if needed
-        estimated_credits = limit * CREDIT_COSTS['discovery_search']
-        balance, monthly_limit = await CreditService.get_balance(db, current_user.id)
-        
-        logger.info(
-            f"User {current_user.id} credit check: balance={balance}, "
-            f"estimated cost={estimated_credits}, limit={monthly_limit}"
-        )
-        
-        if balance < estimated_credits:
-            raise HTTPException(
-                status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                detail=f"Insufficient credits. Balance: {balance:.2f}, Required: {estimated_credits:.2f}"
-            )
-        
         # Build filter dictionary and accept JSON body `{ query, filters }` for compatibility
         filters = {}
 
@@ -589,59 +658,43 @@ async def discover_creators(
         if is_verified is not None:
             filters["is_verified"] = is_verified
 
-        if platform and filters.get("location"):
-            filters = await _resolve_location_filter_for_platform(client, platform, filters)
+        cache_key = discovery_cache_key(discovery_cache_scope(current_user), platform, filters, limit, page)
+        cached = await discovery_cache.get(cache_key)
+        if cached is not None:
+            if cached.stale:
+                async def refetch():
+                    fresh, _ = await _fetch_discovery_page(client, platform, dict(filters), limit, page, ai_search, username)
+                    return fresh
+                discovery_cache.revalidate(cache_key, refetch)
+            # Already paid for by this organization: no credit deduction
+            result = dict(cached.result)
+            result["cache"] = cached.info()
+            result["credits_deducted"] = 0
+            logger.info(f"Discovery: cached page served on {platform} (stale={cached.stale})")
+            return result
+
+        # Check user credits - get_balance now auto-initializes if needed
+        estimated_credits = limit * CREDIT_COSTS['discovery_search']
+        balance, monthly_limit = await CreditService.get_balance(db, current_user.id)
         
-        # Call real API
-        try:
-            result = await client.discover_creators(
-                platform=platform,
-                filters=filters,
-                limit=limit,
-                page=page
-            )
-        except (ValueError, PermissionError) as e:
-            external_msg = _extract_external_error_message(str(e))
-            # Fallback path: if discovery search trial is expired, still try direct handle enrich.
-            if _is_trial_expired_message(external_msg) and username:
-                logger.warning(
-                    "Discovery trial expired; attempting enrich fallback for username=%s platform=%s",
-                    username,
-                    platform,
-                )
-                enriched = await client.enrich_creator_handle(
-                    platform=platform,
-                    handle=username,
-                    enrichment_mode="raw",
-                )
-                result = _build_discovery_result_from_enrich(enriched, platform)
-            else:
-                raise
-
-        result = _apply_identity_result_filter(result, ai_search)
-        result = _dedupe_accounts_in_result(result)
-
-        # Discovery may miss exact handles on some platforms; enrich fallback improves exact-match reliability.
-        if username and len(result.get("accounts", []) or []) == 0:
-            try:
-                enriched = await client.enrich_creator_handle(
-                    platform=platform,
-                    handle=username,
-                    enrichment_mode="raw",
-                )
-                result = _build_discovery_result_from_enrich(enriched, platform)
-                result = _apply_basic_filter_constraints_to_accounts(result, filters)
-                result = _apply_identity_result_filter(result, ai_search)
-                result = _dedupe_accounts_in_result(result)
-                result["source"] = "enrich_zero_result_fallback"
-            except Exception as e:
-                logger.info(
-                    "Zero-result enrich fallback failed for username=%s platform=%s: %s",
-                    username,
-                    platform,
-                    e,
-                )
+        logger.info(
+            f"User {current_user.id} credit check: balance={balance}, "
+            f"estimated cost={estimated_credits}, limit={monthly_limit}"
+        )
         
+        if balance < estimated_credits:
+            raise HTTPException(
+                status_code=status.HTTP_402_PAYMENT_REQUIRED,
+                detail=f"Insufficient credits. Balance: {balance:.2f}, Required: {estimated_credits:.2f}"
+            )
+
+        result, filters = await _fetch_discovery_page(
+            client, platform, filters, limit, page, ai_search, username
+        )
+        await discovery_cache.set(cache_key, result)
+        result = dict(result)
+        result["cache"] = {"hit": False, "stale": False, "age_seconds": 0}
+
         # Get actual result count
         result_count = len(result.get('accounts', []))
         actual_credits_cost = result_count * CREDIT_COSTS['discovery_search']
@@ -682,6 +735,8 @@ async def discover_creators(
     
     except HTTPException:
         raise
+    except ProviderRateLimited as e:
+        raise _rate_limited_error(e)
     except ValueError as e:
         error_msg = str(e)
         logger.warning(f"Validation error in discovery_creators: {error_msg}")
@@ -753,6 +808,8 @@ async def find_similar_creators(
         logger.info(f"Found {result.get('total', 0)} similar creators to {handle}")
         return result
     
+    except ProviderRateLimited as e:
+        raise _rate_limited_error(e)
     except ValueError as e:
         error_msg = str(e)
         external_msg = _extract_external_error_message(error_msg)
@@ -804,15 +861,16 @@ async def enrich_creator(
     - Complete engagement metrics
     """
     try:
-        result = await client.enrich_creator_handle(
-            platform=platform,
-            handle=handle,
-            enrichment_mode=mode
-        )
+        result, cache_info = await enrichment_cache.enrich(client, platform, handle, mode)
         
-        logger.info(f"Enriched {handle} on {platform} ({mode} mode)")
-        return result
+        if cache_info["hit"]:
+            logger.info(f"Served stored enrichment for {handle} on {platform} ({mode} mode)")
+        else:
+            logger.info(f"Enriched {handle} on {platform} ({mode} mode)")
+        return {**result, "cache": cache_info} if isinstance(result, dict) else result
     
+    except ProviderRateLimited as e:
+        raise _rate_limited_error(e)
     except ValueError as e:
         error_msg = str(e)
         external_msg = _extract_external_error_message(error_msg)
@@ -830,6 +888,81 @@ async def enrich_creator(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/enrich/batch",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Enrich a list of creator handles in the background",
+    tags=["discovery"]
+)
+async def enrich_creators_batch(
+    request: BatchEnrichRequest,
+    current_user: User = Depends(require_discovery_read),
+    client = Depends(get_ic_client)
+):
+    """
+    Enqueue a batch enrichment job.
+    
+    Handles are enriched with bounded concurrency and per-handle retries;
+    handles enriched within ENRICHMENT_DEDUP_HOURS are served from stored
+    results. Follow progress at /jobs/status/{job_id} or /jobs/stream/{job_id};
+    the per-handle report is at /discovery/enrich/batch/{job_id}.
+    """
+    from app.services.job_queue import job_queue
+    from app.services.local_job_pool import JobPoolFullError, JobPoolClosedError
+    
+    if request.mode not in ENRICHMENT_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(ENRICHMENT_MODES)}")
+    handles = normalize_handles(request.handles)
+    if not handles:
+        raise HTTPException(status_code=400, detail="No handles to enrich")
+    if len(handles) > ENRICHMENT_BATCH_MAX_HANDLES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {ENRICHMENT_BATCH_MAX_HANDLES} handles per batch",
+        )
+    
+    try:
+        job_id = await job_queue.enqueue(
+            "batch_enrich_handles",
+            request.platform.lower(),
+            handles,
+            request.mode,
+            organization_id=current_user.organization_id,
+            user_id=current_user.id,
+        )
+    except JobPoolFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except JobPoolClosedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    logger.info(f"Queued batch enrichment {job_id}: {len(handles)} handles on {request.platform}")
+    return {"job_id": job_id, "status": "pending", "handles": len(handles), "mode": request.mode}
+
+
+@router.get(
+    "/enrich/batch/{batch_id}",
+    summary="Per-handle report of a batch enrichment",
+    tags=["discovery"]
+)
+async def get_enrichment_batch(
+    batch_id: str,
+    current_user: User = Depends(require_discovery_read),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stored outcome of every handle finished so far in a batch."""
+    results = await batch_report(
+        db, batch_id,
+        organization_id=current_user.organization_id,
+        user_id=current_user.id,
+    )
+    if not results:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    counts = {"enriched": 0, "cached": 0, "failed": 0}
+    for row in results:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+    return {"batch_id": batch_id, "completed": len(results), **counts, "results": results}
+
+
 # ============================================================================
 # POST ENGAGEMENT METRICS
 # ============================================================================
@@ -867,6 +1000,8 @@ async def get_post_engagement(
         logger.info(f"Retrieved {content_type} for post {post_id}")
         return result
     
+    except ProviderRateLimited as e:
+        raise _rate_limited_error(e)
     except ValueError as e:
         error_msg = str(e)
         if "Invalid request format" in error_msg or "format" in error_msg.lower():
@@ -1077,6 +1212,8 @@ async def get_external_credits(
             "used_credits": used,
             "total_credits": available + used,
         }
+    except ProviderRateLimited as e:
+        raise _rate_limited_error(e)
     except ValueError as e:
         error_msg = str(e)
         external_msg = _extract_external_error_message(error_msg)
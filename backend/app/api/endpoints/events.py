@@ -0,0 +1,172 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from datetime import datetime, timedelta, timezone
+import json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.models.models import Campaign, User
+from app.api.deps import require_campaign_write
+from app.services.rbac_scope import visible_user_filter
+from app.services.event_ingest import (
+    EVENT_INGEST_MAX_BATCH,
+    EVENT_INGEST_MAX_BODY_BYTES,
+    EVENT_OCCURRED_AT_MAX_AGE_DAYS,
+    EVENT_OCCURRED_AT_MAX_FUTURE_SECONDS,
+    IngestBackpressure,
+    event_ingestor,
+)
+
+router = APIRouter()
+
+
+class CampaignEventIn(BaseModel):
+    campaign_id: int = Field(gt=0)
+    type: Literal["launch", "click", "view", "conversion"]
+    value: int = Field(default=1, ge=0)
+    metadata: Optional[Dict[str, Any]] = None
+    occurred_at: Optional[datetime] = None
+
+
+class RejectedEvent(BaseModel):
+    index: int
+    error: str
+
+
+class EventBatchResponse(BaseModel):
+    accepted: int
+    rejected: List[RejectedEvent]
+
+
+_batch_adapter = TypeAdapter(List[CampaignEventIn])
+_event_adapter = TypeAdapter(CampaignEventIn)
+
+
+def _error_text(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'event'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+def _parse_events(body: bytes, ndjson: bool):
+    """Validate a JSON array or NDJSON body into (events by index, rejected)."""
+    if not ndjson:
+        try:
+            # Fast path: the whole array validated in one pass (pydantic-core parses the JSON)
+            return dict(enumerate(_batch_adapter.validate_json(body))), []
+        except ValidationError:
+            pass
+        try:
+            items = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of events")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of events")
+        validate = _event_adapter.validate_python
+    else:
+        items = [line for line in body.splitlines() if line.strip()]
+        validate = _event_adapter.validate_json
+
+    events, rejected = {}, []
+    for index, item in enumerate(items):
+        try:
+            events[index] = validate(item)
+        except ValidationError as exc:
+            rejected.append(RejectedEvent(index=index, error=_error_text(exc)))
+    return events, rejected
+
+
+def _occurred_at(event: CampaignEventIn) -> Optional[datetime]:
+    if event.occurred_at is None:
+        return None
+    if event.occurred_at.tzinfo is None:
+        return event.occurred_at.replace(tzinfo=timezone.utc)
+    return event.occurred_at.astimezone(timezone.utc)
+
+
+def _occurred_at_error(event: CampaignEventIn, received_at: datetime) -> Optional[str]:
+    """Reject client timestamps too far in the past or future to be real events."""
+    occurred_at = _occurred_at(event)
+    if occurred_at is None:
+        return None
+    if occurred_at < received_at - timedelta(days=EVENT_OCCURRED_AT_MAX_AGE_DAYS):
+        return f"occurred_at: more than {EVENT_OCCURRED_AT_MAX_AGE_DAYS:g} days in the past"
+    if occurred_at > received_at + timedelta(seconds=EVENT_OCCURRED_AT_MAX_FUTURE_SECONDS):
+        return "occurred_at: in the future"
+    return None
+
+
+def _to_row(event: CampaignEventIn, received_at: datetime) -> Dict[str, Any]:
+    # ingested_at is set by the database; the rollup settle clock never uses client time
+    occurred_at = _occurred_at(event)
+    return {
+        "campaign_id": event.campaign_id,
+        "type": event.type,
+        "value": event.value,
+        "metadata_json": json.dumps(event.metadata) if event.metadata is not None else None,
+        "created_at": occurred_at or received_at,
+        "occurred_at": occurred_at,
+    }
+
+
+@router.post("/batch", response_model=EventBatchResponse, status_code=status.HTTP_202_ACCEPTED)
+async def ingest_event_batch(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_campaign_write)
+):
+    """
+    Bulk-ingest campaign tracking events (click, view, conversion, launch).
+
+    Accepts a JSON array, or NDJSON (one event per line) with
+    Content-Type: application/x-ndjson. Valid events for campaigns the caller
+    can see are accepted; the rest are reported by index in `rejected`.
+    Returns once accepted events are durable (committed, or spooled while the
+    database is unavailable); 429 with Retry-After when the ingest buffer is full.
+    """
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > EVENT_INGEST_MAX_BODY_BYTES:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {EVENT_INGEST_MAX_BODY_BYTES} bytes")
+    body = b"".join(chunks)
+
+    ndjson = "ndjson" in request.headers.get("content-type", "")
+    events, rejected = _parse_events(body, ndjson)
+    if len(events) + len(rejected) > EVENT_INGEST_MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {EVENT_INGEST_MAX_BATCH} events")
+
+    # One query for the visibility of every campaign referenced in the batch
+    campaign_ids = {event.campaign_id for event in events.values()}
+    visible = set()
+    if campaign_ids:
+        result = await db.execute(
+            select(Campaign.id).where(
+                Campaign.id.in_(campaign_ids),
+                visible_user_filter(current_user, Campaign.owner_id),
+            )
+        )
+        visible = set(result.scalars().all())
+
+    received_at = datetime.now(timezone.utc)
+    rows = []
+    for index, event in events.items():
+        if event.campaign_id not in visible:
+            rejected.append(RejectedEvent(index=index, error="campaign_id: Campaign not found"))
+            continue
+        error = _occurred_at_error(event, received_at)
+        if error:
+            rejected.append(RejectedEvent(index=index, error=error))
+            continue
+        rows.append(_to_row(event, received_at))
+
+    try:
+        await event_ingestor.submit(rows)
+    except IngestBackpressure as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(int(e.retry_after))})
+    except OSError:
+        raise HTTPException(status_code=503, detail="Event storage unavailable, retry later")
+
+    return EventBatchResponse(accepted=len(rows), rejected=sorted(rejected, key=lambda item: item.index))
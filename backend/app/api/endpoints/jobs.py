@@ -5,6 +5,8 @@ Provides REST API for enqueuing and monitoring background jobs.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from app.core.sse import SSE_HEADERS, SSE_KEEPALIVE, sse_event
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 from datetime import datetime
@@ -29,9 +31,35 @@ class JobResponse(BaseModel):
 class JobStatusResponse(BaseModel):
     job_id: str
     status: str
+    task_name: Optional[str] = None
+    progress: Optional[float] = None
+    message: Optional[str] = None
+    partial_results: Optional[List[Any]] = None
     result: Optional[Any] = None
     error: Optional[str] = None
     created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    duration_ms: Optional[int] = None
+
+
+# --- Helpers ---
+
+async def _enqueue_or_429(task_name: str, *args, **kwargs) -> str:
+    """Enqueue a job, mapping a full/closed local queue to 429/503."""
+    from app.services.job_queue import job_queue
+    from app.services.local_job_pool import JobPoolFullError, JobPoolClosedError
+    
+    try:
+        return await job_queue.enqueue(task_name, *args, **kwargs)
+    except JobPoolFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except JobPoolClosedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def _queued_message(connected: bool, default: str) -> str:
+    return default if connected else f"{default} (local worker pool, Redis unavailable)"
 
 
 # --- Endpoints ---
@@ -60,16 +88,18 @@ async def enqueue_job(request: JobEnqueueRequest):
     
     # Enqueue the job
     try:
-        job_id = await job_queue.enqueue(
+        job_id = await _enqueue_or_429(
             request.task_name,
             *request.args,
             **request.kwargs
         )
         return JobResponse(
             job_id=job_id,
-            status="queued" if job_queue.is_connected() else "completed",
-            message="Job enqueued successfully" if job_queue.is_connected() else "Job executed synchronously (Redis unavailable)"
+            status="queued",
+            message=_queued_message(job_queue.is_connected(), "Job enqueued successfully")
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -87,6 +117,50 @@ async def get_job_status(job_id: str):
     return JobStatusResponse(**result)
 
 
+# Seconds between backend polls / keep-alive comments on the event stream
+STREAM_POLL_INTERVAL = 0.5
+STREAM_KEEPALIVE_INTERVAL = 15.0
+STREAM_MAX_DURATION = 3600.0
+
+
+@router.get("/stream/{job_id}")
+async def stream_job_status(job_id: str):
+    """
+    Stream job updates as server-sent events.
+    
+    Emits an `update` event with the full job state whenever it changes and a
+    final `end` event once the job completes or fails. Use this instead of
+    polling /status/{job_id} in a loop.
+    """
+    from app.services.job_state import job_state
+    
+    if not await job_state.get(job_id):
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    
+    async def event_stream():
+        idle_polls = 0
+        keepalive_every = max(1, int(STREAM_KEEPALIVE_INTERVAL / STREAM_POLL_INTERVAL))
+        last_state = None
+        async for state in job_state.watch(job_id, poll_interval=STREAM_POLL_INTERVAL, timeout=STREAM_MAX_DURATION):
+            if state is None:
+                idle_polls += 1
+                if idle_polls % keepalive_every == 0:
+                    yield SSE_KEEPALIVE
+                continue
+            idle_polls = 0
+            last_state = state
+            payload = JobStatusResponse(**state).model_dump()
+            yield sse_event("update", payload)
+        final_status = last_state.get("status") if last_state else "unknown"
+        yield sse_event("end", {"job_id": job_id, "status": final_status})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 @router.get("/health")
 async def queue_health():
     """Get the health status of the job queue."""
@@ -109,7 +183,7 @@ async def enqueue_content_generation(request: ContentGenerationRequest):
     """Enqueue a content generation job."""
     from app.services.job_queue import job_queue
     
-    job_id = await job_queue.enqueue(
+    job_id = await _enqueue_or_429(
         "generate_content",
         request.platform,
         request.content_type,
@@ -119,8 +193,8 @@ async def enqueue_content_generation(request: ContentGenerationRequest):
     
     return JobResponse(
         job_id=job_id,
-        status="queued" if job_queue.is_connected() else "completed",
-        message="Content generation job enqueued"
+        status="queued",
+        message=_queued_message(job_queue.is_connected(), "Content generation job enqueued")
     )
 
 
@@ -135,7 +209,7 @@ async def enqueue_design_generation(request: DesignGenerationRequest):
     """Enqueue a design generation job."""
     from app.services.job_queue import job_queue
     
-    job_id = await job_queue.enqueue(
+    job_id = await _enqueue_or_429(
         "generate_design",
         request.style,
         request.prompt,
@@ -144,6 +218,6 @@ async def enqueue_design_generation(request: DesignGenerationRequest):
     
     return JobResponse(
         job_id=job_id,
-        status="queued" if job_queue.is_connected() else "completed",
-        message="Design generation job enqueued"
+        status="queued",
+        message=_queued_message(job_queue.is_connected(), "Design generation job enqueued")
     )
@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Dict
 from app.services.ai_service import AIService
+from app.services.llm_cache import llm_cache
 from app.api import deps
 from sqlalchemy.orm import Session
 
@@ -10,6 +11,7 @@ router = APIRouter()
 class MarcomRequest(BaseModel):
     tool_id: str
     inputs: Dict[str, str]
+    regenerate: bool = False
 
 class MarcomResponse(BaseModel):
     content: str
@@ -25,7 +27,8 @@ async def generate_marcom(
     Authorized users only.
     """
     try:
-        content = await AIService.generate_marcom_content(request.tool_id, request.inputs)
+        with llm_cache.bypass(request.regenerate):
+            content = await AIService.generate_marcom_content(request.tool_id, request.inputs)
         return MarcomResponse(
             content=content,
             tool_id=request.tool_id
@@ -6,6 +6,7 @@ from app.models import models
 from app.models.models import User
 from app.schemas import schemas
 from app.services.ai_service import AIService
+from app.services.llm_cache import llm_cache
 from typing import List
 from app.api.deps import require_permission
 from app.services.rbac_scope import visible_user_filter
@@ -19,7 +20,8 @@ async def generate_presentation(
     current_user: User = Depends(require_permission("write", "presentation_studio")),
 ):
     # 1. Generate Slides via Service
-    slides_json = await AIService.generate_presentation_slides(request.source_type, request.title)
+    with llm_cache.bypass(request.regenerate):
+        slides_json = await AIService.generate_presentation_slides(request.source_type, request.title)
     
     # 2. Save to DB
     db_presentation = models.Presentation(
@@ -2,10 +2,11 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_authenticated_user
+from app.api.deps import get_current_authenticated_user, load_current_user_row
 from app.core.database import get_db
 from app.models.models import User
 from app.schemas.schemas import UserResponse, ProfileUpdate
+from app.services.principal_cache import principal_cache
 
 router = APIRouter()
 
@@ -22,12 +23,14 @@ async def update_profile(
     current_user: User = Depends(get_current_authenticated_user),
 ):
     """Update the current user's profile."""
+    user = await load_current_user_row(current_user, db)
     # Update only provided fields
     update_data = profile.model_dump(exclude_unset=True)
     for field, value in update_data.items():
-        if hasattr(current_user, field):
-            setattr(current_user, field, value)
+        if hasattr(user, field):
+            setattr(user, field, value)
     
     await db.commit()
-    await db.refresh(current_user)
-    return current_user
+    await principal_cache.invalidate_user(user.id)
+    await db.refresh(user)
+    return user
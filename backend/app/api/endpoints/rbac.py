@@ -11,6 +11,7 @@ from app.models.team import Team
 from app.api.endpoints.auth import get_current_active_user
 from app.services.auth_service import is_super_admin, ROLE_HIERARCHY
 from app.services.permission_engine import PermissionEngine
+from app.services.principal_cache import principal_cache
 from app.services.rbac_scope import can_manage_user, is_role_assignable
 from app.schemas import rbac_schemas as schemas
 
@@ -139,6 +140,7 @@ async def update_role(
         details={"role_id": role_id, "role_name": role.name, "changes": update_data, "old_values": old_values}
     )
     await db.commit()
+    await principal_cache.invalidate_all()
     await db.refresh(role)
     return role
 
@@ -220,6 +222,7 @@ async def update_role_permissions(
         details={"role_id": role_id, "role_name": role.name, "old_permissions": old_perms, "new_permissions": checked_permissions}
     )
     await db.commit()
+    await principal_cache.invalidate_all()
     await db.refresh(role)
     return role
 
@@ -283,6 +286,7 @@ async def assign_role(
         details={"old_role": old_role, "new_role": role_obj.name, "scope_type": assignment.scope_type, "scope_id": assignment.scope_id}
     )
     await db.commit()
+    await principal_cache.invalidate_user(target_user.id)
 
     return {"message": f"Role {role_obj.name} assigned to user {target_user.email}"}
 
@@ -391,6 +395,7 @@ async def create_override(
         details={"resource": data.resource, "action": data.action, "scope": data.scope_type, "is_allowed": data.is_allowed}
     )
     await db.commit()
+    await principal_cache.invalidate_user(data.user_id)
     await db.refresh(perm)
     return perm
 
@@ -426,6 +431,7 @@ async def update_override(
         details={"override_id": override_id, "changes": update_data, "old_values": old_values}
     )
     await db.commit()
+    await principal_cache.invalidate_user(perm.user_id)
     await db.refresh(perm)
     return perm
 
@@ -454,6 +460,7 @@ async def delete_override(
     )
     await db.delete(perm)
     await db.commit()
+    await principal_cache.invalidate_user(perm.user_id)
     return {"message": "Permission override deleted"}
 
 
@@ -509,6 +516,7 @@ async def bulk_update_permissions(
         details={"count": len(data.permissions), "created": created, "updated": updated}
     )
     await db.commit()
+    await principal_cache.invalidate_users(item.user_id for item in data.permissions)
 
     return schemas.BulkPermissionResult(created=created, updated=updated, errors=errors)
 
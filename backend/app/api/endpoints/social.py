@@ -8,7 +8,6 @@ import json
 from datetime import datetime, timezone
 from typing import Optional, Literal
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
@@ -17,6 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_authenticated_user
 from app.core.config import settings
+from app.core.http_clients import get_http_client
 from app.core.database import get_db
 from app.models.models import Campaign, ContentGeneration, DesignAsset, ScheduledPost, User
 from app.models.crm_generate_post import CRMGeneratePost
@@ -1385,8 +1385,8 @@ async def _resolve_linkedin_image_bytes(image_url: str) -> bytes:
 
     if value.startswith(("http://", "https://")):
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.get(value, follow_redirects=True)
+            client = get_http_client("social")
+            resp = await client.get(value, follow_redirects=True)
             if resp.status_code < 200 or resp.status_code >= 300:
                 raise ValueError(f"LinkedIn image URL returned HTTP {resp.status_code}")
             return resp.content
@@ -0,0 +1,74 @@
+"""
+Bounded concurrency with queue metrics.
+
+A named asyncio semaphore that also reports how many callers are waiting and
+how long they waited, so saturation of an upstream (e.g. Gemini) is visible
+on /health instead of showing up as unexplained latency elsewhere.
+
+Usage:
+    gemini_limiter = ConcurrencyLimiter("gemini", limit=8)
+    async with gemini_limiter.slot():
+        response = await model.generate_content_async(prompt)
+"""
+
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+
+def percentile(samples, pct: float) -> Optional[float]:
+    """Nearest-rank percentile of a sample window (None when empty)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return round(ordered[index], 1)
+
+
+class ConcurrencyLimiter:
+    """At most `limit` concurrent holders; FIFO waiters; wait-time samples."""
+
+    def __init__(self, name: str, limit: int, window: int = 500):
+        self.name = name
+        self.limit = max(1, limit)
+        self._semaphore = asyncio.Semaphore(self.limit)
+        self._active = 0
+        self._waiting = 0
+        self._max_waiting = 0
+        self._completed = 0
+        self._wait_ms: Deque[float] = deque(maxlen=max(1, window))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        """Hold one slot for the duration of the block; yields the seconds spent waiting."""
+        started = time.perf_counter()
+        self._waiting += 1
+        self._max_waiting = max(self._max_waiting, self._waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        waited = time.perf_counter() - started
+        self._wait_ms.append(waited * 1000)
+
+        self._active += 1
+        try:
+            yield waited
+        finally:
+            self._active -= 1
+            self._completed += 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "active": self._active,
+            "waiting": self._waiting,
+            "max_waiting": self._max_waiting,
+            "completed": self._completed,
+            "wait_ms_p50": percentile(self._wait_ms, 50),
+            "wait_ms_p95": percentile(self._wait_ms, 95),
+            "wait_ms_max": round(max(self._wait_ms), 1) if self._wait_ms else None,
+        }
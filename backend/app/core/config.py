@@ -41,6 +41,18 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "cadence_ai"
     POSTGRES_PORT: str = "5432"
     DATABASE_URL: Optional[str] = None
+    # Optional read replica for read-only endpoints (get_read_db); falls back to the primary
+    DATABASE_READ_REPLICA_URL: Optional[str] = None
+
+    # Engine / pool tuning (pool settings apply to server databases, not SQLite)
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 disables (PostgreSQL only)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100  # asyncpg; set 0 behind PgBouncer transaction pooling
     
     # Initial Superuser Seeding
     FIRST_SUPERUSER: str = "admin@caidence.ai"
@@ -123,6 +135,12 @@ class Settings(BaseSettings):
         # Default to SQLite for easier local development if Postgres is not explicitly set in env
         return "sqlite+aiosqlite:///./sql_app.db"
 
+    def assemble_replica_db_url(self) -> Optional[str]:
+        url = self.DATABASE_READ_REPLICA_URL
+        if url and url.startswith("postgresql://"):
+            url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
+        return url or None
+
     model_config = SettingsConfigDict(
         env_file=".env",
         extra="ignore"  # Ignore extra env vars not defined in this class
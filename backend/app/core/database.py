@@ -1,18 +1,53 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.db_metrics import TimedAsyncQueuePool, instrument_engine
+
+
+def _engine_kwargs(url: str, name: str) -> dict:
+    """Engine options from settings; pool sizing does not apply to SQLite."""
+    kwargs = {"echo": settings.DB_ECHO, "future": True}
+    if url.startswith("sqlite"):
+        return kwargs
+
+    kwargs.update(
+        poolclass=TimedAsyncQueuePool,
+        pool_logging_name=name,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if "+asyncpg" in url:
+        connect_args = {"statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        kwargs["connect_args"] = connect_args
+    return kwargs
+
 
 # Create async engine
-engine = create_async_engine(
-    settings.assemble_db_url(),
-    echo=True,
-    future=True,
-)
+_db_url = settings.assemble_db_url()
+engine = create_async_engine(_db_url, **_engine_kwargs(_db_url, "primary"))
+instrument_engine(engine, "primary")
+
+# Read-only endpoints can opt into the replica via get_read_db; without one
+# configured they share the primary engine
+_replica_url = settings.assemble_replica_db_url()
+if _replica_url:
+    read_engine = create_async_engine(_replica_url, **_engine_kwargs(_replica_url, "replica"))
+    instrument_engine(read_engine, "replica")
+else:
+    read_engine = engine
 
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+ReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 Base = declarative_base()
 
@@ -23,3 +58,13 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+
+# Dependency for read-only endpoints; may lag the primary by replication delay,
+# so never use it for read-after-write flows
+async def get_read_db():
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -0,0 +1,376 @@
+"""
+Database metrics - pool checkout waits and per-request query counts.
+
+Every engine created in app.core.database is instrumented:
+    - TimedAsyncQueuePool records how long each connection checkout waited
+      (a long wait means the pool is too small for the concurrency)
+    - cursor execute hooks count statements and their duration, globally per
+      engine and for the current request (QueryMetricsMiddleware)
+    - statements slower than DB_SLOW_QUERY_MS are logged with the route that
+      issued them
+
+Per request, QueryMetricsMiddleware adds a Server-Timing header
+(`db;dur=<ms>;desc="<n> queries"`) and aggregates counts per route.
+/health exposes db_metrics.snapshot(), /metrics db_metrics.prometheus().
+
+Usage outside a request (jobs, scripts):
+    with track_queries() as stats:
+        await do_work()
+    print(stats.count, stats.duration_ms)
+
+In tests, guard an endpoint against N+1 regressions:
+    with assert_max_queries(3):
+        response = await client.get("/api/v1/crm/relationships")
+"""
+
+import os
+import time
+import logging
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.concurrency import percentile
+
+logger = logging.getLogger(__name__)
+
+
+# Number of recent samples kept for percentile estimates
+DB_METRICS_WINDOW = int(os.getenv("DB_METRICS_WINDOW", "1000"))
+# Statements slower than this are logged with their route (0 disables)
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+# Add a Server-Timing header with the request's DB time and statement count
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+# GET /metrics lists every route with its query counts and timings: off unless enabled,
+# and when METRICS_TOKEN is set scrapers must send "Authorization: Bearer <token>"
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Prometheus histogram buckets for statements per request
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class RequestQueryStats:
+    """Statements executed (and time spent in them) within one tracked scope."""
+
+    __slots__ = ("count", "duration_ms", "statements", "scope", "parent")
+
+    def __init__(self, scope: Optional[dict] = None, capture: bool = False, parent: Optional["RequestQueryStats"] = None):
+        self.count = 0
+        self.duration_ms = 0.0
+        self.statements: Optional[List[str]] = [] if capture else None
+        self.scope = scope
+        self.parent = parent
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+@contextmanager
+def track_queries(scope: Optional[dict] = None, capture: bool = False):
+    """Count statements executed in this context (and tasks it spawns).
+
+    Scopes nest: an enclosing tracker also sees the statements of inner ones.
+    `capture=True` keeps the SQL text of each statement.
+    """
+    stats = RequestQueryStats(scope, capture, _current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """Fail (AssertionError listing the SQL) if the block issues more than max_queries statements."""
+    with track_queries(capture=True) as stats:
+        yield stats
+    if stats.count > max_queries:
+        listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(stats.statements, 1))
+        raise AssertionError(f"Expected at most {max_queries} queries, got {stats.count}:\n{listing}")
+
+
+def route_label(scope: Optional[dict]) -> str:
+    """Route template ("/api/v1/crm/relationships/{id}") for a request scope.
+
+    Unmatched requests share one label so scanners cannot blow up metric cardinality.
+    """
+    if not scope:
+        return "-"
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else "unmatched"
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _EngineStats:
+    def __init__(self, window: int):
+        self.queries = 0
+        self.query_ms_total = 0.0
+        self.slow_queries = 0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_ms: Deque[float] = deque(maxlen=window)
+        self.checkout_wait_ms_total = 0.0
+        self.pool: Optional[Any] = None
+
+
+class _RouteStats:
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.db_ms_total = 0.0
+        self.max_queries = 0
+        # cumulative histogram counts, one per QUERY_COUNT_BUCKETS entry
+        self.buckets = [0] * len(QUERY_COUNT_BUCKETS)
+
+
+class DatabaseMetrics:
+    """Rolling pool / query statistics per engine and per request."""
+
+    def __init__(self, window: int = DB_METRICS_WINDOW, slow_query_ms: float = DB_SLOW_QUERY_MS):
+        self.window = max(1, window)
+        self.slow_query_ms = slow_query_ms
+        self._engines: Dict[str, _EngineStats] = {}
+        self._routes: Dict[Tuple[str, str], _RouteStats] = {}
+        self._requests = 0
+        self._request_queries: Deque[int] = deque(maxlen=self.window)
+        self._request_db_ms: Deque[float] = deque(maxlen=self.window)
+
+    def _engine(self, name: str) -> _EngineStats:
+        stats = self._engines.get(name)
+        if stats is None:
+            stats = self._engines[name] = _EngineStats(self.window)
+        return stats
+
+    def record_checkout(self, name: str, wait_ms: float, timed_out: bool = False) -> None:
+        stats = self._engine(name)
+        if timed_out:
+            stats.checkout_timeouts += 1
+        else:
+            stats.checkouts += 1
+        stats.checkout_wait_ms.append(wait_ms)
+        stats.checkout_wait_ms_total += wait_ms
+
+    def record_query(self, name: str, duration_ms: float, statement: Optional[str] = None) -> None:
+        stats = self._engine(name)
+        stats.queries += 1
+        stats.query_ms_total += duration_ms
+
+        scope = None
+        tracked = _current_stats.get()
+        while tracked is not None:
+            tracked.count += 1
+            tracked.duration_ms += duration_ms
+            if tracked.statements is not None and statement is not None:
+                tracked.statements.append(statement)
+            scope = scope or tracked.scope
+            tracked = tracked.parent
+
+        if self.slow_query_ms and duration_ms >= self.slow_query_ms:
+            stats.slow_queries += 1
+            sql = " ".join((statement or "").split())[:500]
+            method = scope.get("method", "") if scope else ""
+            logger.warning(f"Slow query ({duration_ms:.0f} ms, {name}) in {method} {route_label(scope)}: {sql}")
+
+    def record_request(self, stats: RequestQueryStats, method: str = "-", route: str = "-") -> None:
+        self._requests += 1
+        self._request_queries.append(stats.count)
+        self._request_db_ms.append(stats.duration_ms)
+
+        key = (method, route)
+        route_stats = self._routes.get(key)
+        if route_stats is None:
+            route_stats = self._routes[key] = _RouteStats()
+        route_stats.requests += 1
+        route_stats.queries += stats.count
+        route_stats.db_ms_total += stats.duration_ms
+        route_stats.max_queries = max(route_stats.max_queries, stats.count)
+        for i, bound in enumerate(QUERY_COUNT_BUCKETS):
+            if stats.count <= bound:
+                route_stats.buckets[i] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        engines = {}
+        for name, stats in self._engines.items():
+            pool = stats.pool
+            engines[name] = {
+                "pool": pool.status() if pool is not None else None,
+                "checkouts": stats.checkouts,
+                "checkout_timeouts": stats.checkout_timeouts,
+                "checkout_wait_ms_p50": percentile(stats.checkout_wait_ms, 50),
+                "checkout_wait_ms_p95": percentile(stats.checkout_wait_ms, 95),
+                "checkout_wait_ms_max": round(max(stats.checkout_wait_ms), 2) if stats.checkout_wait_ms else None,
+                "queries": stats.queries,
+                "slow_queries": stats.slow_queries,
+                "query_ms_total": round(stats.query_ms_total, 1),
+            }
+        # Routes issuing the most statements per request are the N+1 suspects
+        heaviest = sorted(self._routes.items(), key=lambda item: item[1].queries / item[1].requests, reverse=True)[:10]
+        return {
+            "engines": engines,
+            "requests": {
+                "count": self._requests,
+                "queries_p50": percentile(self._request_queries, 50),
+                "queries_p95": percentile(self._request_queries, 95),
+                "queries_max": max(self._request_queries) if self._request_queries else None,
+                "db_ms_p50": percentile(self._request_db_ms, 50),
+                "db_ms_p95": percentile(self._request_db_ms, 95),
+            },
+            "heaviest_routes": [
+                {
+                    "route": f"{method} {route}",
+                    "requests": stats.requests,
+                    "queries_avg": round(stats.queries / stats.requests, 1),
+                    "queries_max": stats.max_queries,
+                    "db_ms_avg": round(stats.db_ms_total / stats.requests, 1),
+                }
+                for (method, route), stats in heaviest
+            ],
+        }
+
+    def prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def labels(**values) -> str:
+            return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in values.items()) + "}"
+
+        engines = sorted(self._engines.items())
+        family("cadence_db_queries_total", "counter", "SQL statements executed")
+        for name, stats in engines:
+            lines.append(f"cadence_db_queries_total{labels(engine=name)} {stats.queries}")
+        family("cadence_db_query_seconds_total", "counter", "Time spent executing SQL statements")
+        for name, stats in engines:
+            lines.append(f"cadence_db_query_seconds_total{labels(engine=name)} {stats.query_ms_total / 1000:.6f}")
+        family("cadence_db_slow_queries_total", "counter", "SQL statements slower than DB_SLOW_QUERY_MS")
+        for name, stats in engines:
+            lines.append(f"cadence_db_slow_queries_total{labels(engine=name)} {stats.slow_queries}")
+        family("cadence_db_pool_checkouts_total", "counter", "Connections checked out of the pool")
+        for name, stats in engines:
+            lines.append(f"cadence_db_pool_checkouts_total{labels(engine=name)} {stats.checkouts}")
+        family("cadence_db_pool_checkout_timeouts_total", "counter", "Pool checkouts that timed out")
+        for name, stats in engines:
+            lines.append(f"cadence_db_pool_checkout_timeouts_total{labels(engine=name)} {stats.checkout_timeouts}")
+        family("cadence_db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a pooled connection")
+        for name, stats in engines:
+            lines.append(f"cadence_db_pool_checkout_wait_seconds_total{labels(engine=name)} {stats.checkout_wait_ms_total / 1000:.6f}")
+        family("cadence_db_pool_checked_out", "gauge", "Connections currently checked out")
+        for name, stats in engines:
+            checked_out = getattr(stats.pool, "checkedout", None)
+            if checked_out is not None:
+                lines.append(f"cadence_db_pool_checked_out{labels(engine=name)} {checked_out()}")
+
+        routes = sorted(self._routes.items())
+        family("cadence_http_request_queries", "histogram", "SQL statements per HTTP request")
+        for (method, route), stats in routes:
+            for bound, count in zip(QUERY_COUNT_BUCKETS, stats.buckets):
+                lines.append(f"cadence_http_request_queries_bucket{labels(method=method, route=route, le=bound)} {count}")
+            lines.append(f"cadence_http_request_queries_bucket{labels(method=method, route=route, le='+Inf')} {stats.requests}")
+            lines.append(f"cadence_http_request_queries_sum{labels(method=method, route=route)} {stats.queries}")
+            lines.append(f"cadence_http_request_queries_count{labels(method=method, route=route)} {stats.requests}")
+        family("cadence_http_request_db_seconds_total", "counter", "DB time accumulated by HTTP requests")
+        for (method, route), stats in routes:
+            lines.append(f"cadence_http_request_db_seconds_total{labels(method=method, route=route)} {stats.db_ms_total / 1000:.6f}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for stats in self._engines.values():
+            pool = stats.pool
+            stats.__init__(self.window)
+            stats.pool = pool
+        self._routes.clear()
+        self._requests = 0
+        self._request_queries.clear()
+        self._request_db_ms.clear()
+
+
+# Singleton instance
+db_metrics = DatabaseMetrics()
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time under its logging name."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            db_metrics.record_checkout(self.logging_name or "primary", (time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        db_metrics.record_checkout(self.logging_name or "primary", (time.perf_counter() - started) * 1000)
+        return connection
+
+
+def instrument_engine(engine, name: str) -> None:
+    """Attach query timing hooks to an (async) engine and register its pool for stats."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    db_metrics._engine(name).pool = sync_engine.pool
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        db_metrics.record_query(name, (time.perf_counter() - started) * 1000, statement)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+
+class QueryMetricsMiddleware:
+    """ASGI middleware recording statements and DB time per HTTP request.
+
+    The Server-Timing header reflects statements issued before the response
+    starts; a streaming body's later queries are only counted in the metrics.
+    """
+
+    def __init__(self, app, server_timing: bool = SERVER_TIMING_ENABLED):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with track_queries(scope) as stats:
+
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    total_ms = (time.perf_counter() - started) * 1000
+                    timing = (
+                        f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries", '
+                        f"app;dur={total_ms:.1f}"
+                    )
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", timing.encode())]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing if self.server_timing else send)
+            finally:
+                db_metrics.record_request(stats, scope.get("method", "-"), route_label(scope))
@@ -0,0 +1,91 @@
+"""
+Shared outbound HTTP clients.
+
+One pooled httpx.AsyncClient per upstream profile (Ollama, the diffusion
+worker, social platforms, discovery providers), created lazily and closed by
+the application's lifespan hook. Reusing pooled connections avoids paying the
+TCP (and TLS) handshake on every integration call.
+
+Usage:
+    client = get_http_client("ollama")
+    response = await client.post(url, json=payload)            # profile timeout
+    response = await client.get(url, timeout=2.0)              # per-call override
+
+Connection limits are per profile; each profile talks to one upstream (or one
+provider's hosts), so they act as per-host limits.
+"""
+
+import os
+import logging
+from typing import Dict
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (required by httpx for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true" and HTTP2_AVAILABLE
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+
+# name -> (default timeout seconds, max connections, max keep-alive connections, http2)
+# Plain-HTTP internal services stay on HTTP/1.1; HTTP/2 needs TLS (ALPN) in practice.
+HTTP_CLIENT_PROFILES: Dict[str, tuple] = {
+    "default": (30.0, 50, 10, True),
+    "ollama": (300.0, int(os.getenv("OLLAMA_MAX_CONNECTIONS", "20")), 10, False),
+    "ai_worker": (180.0, int(os.getenv("AI_WORKER_MAX_CONNECTIONS", "8")), 4, False),
+    "social": (30.0, int(os.getenv("SOCIAL_MAX_CONNECTIONS", "50")), 20, True),
+    "influencers_club": (30.0, int(os.getenv("INFLUENCERS_CLUB_MAX_CONNECTIONS", "20")), 10, True),
+    "modash": (30.0, int(os.getenv("MODASH_MAX_CONNECTIONS", "20")), 10, True),
+}
+
+
+def _build_client(name: str) -> httpx.AsyncClient:
+    timeout, max_connections, max_keepalive, http2 = HTTP_CLIENT_PROFILES.get(
+        name, HTTP_CLIENT_PROFILES["default"]
+    )
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout, connect=min(timeout, HTTP_CONNECT_TIMEOUT)),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=http2 and HTTP2_ENABLED,
+    )
+
+
+class HTTPClientRegistry:
+    """Lazily created, application-scoped httpx clients keyed by profile name."""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = _build_client(name)
+            self._clients[name] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close every pooled client (application shutdown)."""
+        for name, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP client '{name}': {e}")
+        self._clients.clear()
+
+
+# Singleton instance
+http_clients = HTTPClientRegistry()
+
+
+def get_http_client(name: str = "default") -> httpx.AsyncClient:
+    return http_clients.get(name)
@@ -0,0 +1,63 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight task instead of
+each doing the work. The first caller (the leader) starts the task; callers
+arriving while it runs await the same result (or exception). Once it finishes
+the key is released, so later calls run again; this is deduplication of
+concurrent work, not a cache.
+
+Cancelling one caller (e.g. a client disconnect) does not cancel the shared
+task for the others.
+
+Usage:
+    flights = SingleFlight("images")
+    result = await flights.do(flight_key(title, prompt), lambda: render(title, prompt))
+"""
+
+import json
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict
+
+
+def flight_key(*parts: Any) -> str:
+    """Stable key from inputs, with whitespace runs collapsed in text values."""
+    normalized = [" ".join(part.split()) if isinstance(part, str) else part for part in parts]
+    material = json.dumps(normalized, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Per-process registry of in-flight tasks keyed by request identity."""
+
+    def __init__(self, name: str = "single-flight"):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self._leaders += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._release(key, done))
+        else:
+            self._coalesced += 1
+        return await asyncio.shield(task)
+
+    def _release(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every caller has gone away
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self._leaders,
+            "coalesced": self._coalesced,
+        }
@@ -0,0 +1,21 @@
+"""
+Server-sent events helpers shared by streaming endpoints.
+
+Usage:
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+    ...
+    yield sse_event("token", {"delta": "Hello"})
+"""
+
+import json
+from typing import Any
+
+# Disable proxy buffering (nginx) and caching so events reach the client immediately
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+SSE_KEEPALIVE = ": keep-alive\n\n"
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one SSE frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -3,18 +3,22 @@ Influencers Club API client for creator discovery and enrichment.
 Handles authentication, requests, rate limiting, and data transformation.
 """
 
+import os
 import httpx
 import logging
 from typing import Optional, List, Dict, Any
-from datetime import datetime
-import asyncio
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from app.core.http_clients import get_http_client
+from app.services.rate_limiter import get_provider_limiter, parse_retry_after
+
 logger = logging.getLogger(__name__)
 
 # API Configuration
 BASE_URL = "https://api-dashboard.influencers.club"
 API_VERSION = "public/v1"
+# Published provider limit; enforced across workers by the shared "influencers_club"
+# limiter (app.services.rate_limiter, INFLUENCERS_CLUB_REQUESTS_PER_SECOND)
 RATE_LIMIT_REQUESTS = 300  # per minute
 RATE_LIMIT_RESET = 60  # seconds
 
@@ -45,35 +49,17 @@ class InfluencersClubClient:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
-        self.client = httpx.AsyncClient(
-            headers=self.headers,
-            timeout=timeout,
-            verify=True,
-            follow_redirects=True,
-        )
-        self.request_count = 0
-        self.last_reset = datetime.now()
+        # Shared connection pool; auth headers and timeout are sent per request
+        self.client = get_http_client("influencers_club")
+        self.request_count = 0  # requests made by this client
     
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """No-op: the shared HTTP pool is closed on application shutdown."""
+        return None
     
     async def _check_rate_limit(self):
-        """Check and enforce rate limiting."""
-        now = datetime.now()
-        time_elapsed = (now - self.last_reset).total_seconds()
-        
-        if time_elapsed >= RATE_LIMIT_RESET:
-            self.request_count = 0
-            self.last_reset = now
-        
-        if self.request_count >= RATE_LIMIT_REQUESTS:
-            sleep_time = RATE_LIMIT_RESET - time_elapsed
-            logger.warning(f"Rate limit reached. Sleeping for {sleep_time} seconds")
-            await asyncio.sleep(max(sleep_time, 0.1))
-            self.request_count = 0
-            self.last_reset = datetime.now()
-        
+        """Wait for a slot from the limiter shared by all clients and workers."""
+        await get_provider_limiter("influencers_club").acquire()
         self.request_count += 1
     
     @retry(
@@ -114,6 +100,9 @@ class InfluencersClubClient:
                 url,
                 json=json,
                 params=params,
+                headers=self.headers,
+                timeout=self.timeout,
+                follow_redirects=True,
             )
             response.raise_for_status()
             data = response.json()
@@ -125,6 +114,10 @@ class InfluencersClubClient:
             logger.error(f"API error: {method} {endpoint} returned {e.response.status_code}. Response: {error_text}")
             
             if e.response.status_code == 429:  # Rate limited
+                # Pause every caller for Retry-After; the retry then waits in the limiter
+                await get_provider_limiter("influencers_club").throttled(
+                    parse_retry_after(e.response.headers.get("retry-after"))
+                )
                 logger.warning("API rate limit hit, retrying...")
                 raise
             elif e.response.status_code == 401:
@@ -367,31 +360,37 @@ class InfluencersClubClient:
         handles: List[str],
         platform: str,
         enrichment_mode: str = "full",
+        max_concurrency: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Enrich multiple handles in parallel.
+        Enrich multiple handles with bounded concurrency and per-handle retries.
+        
+        For large lists, or when a per-handle report is needed, enqueue the
+        `batch_enrich_handles` job instead (see app.services.batch_enrichment).
         
         Args:
             handles: List of creator handles
             platform: Social platform
             enrichment_mode: Enrichment detail level
+            max_concurrency: Concurrent requests (default ENRICHMENT_BATCH_CONCURRENCY)
         
         Returns:
-            List of enriched profiles
+            List of enriched profiles (handles that failed are logged and omitted)
         """
-        tasks = [
-            self.enrich_handle(handle, platform, enrichment_mode)
-            for handle in handles
-        ]
+        from app.services.batch_enrichment import BatchEnricher, ENRICHMENT_BATCH_CONCURRENCY
         
+        enricher = BatchEnricher(
+            self,
+            session_factory=None,
+            concurrency=max_concurrency or ENRICHMENT_BATCH_CONCURRENCY,
+        )
         logger.info(f"Batch enriching {len(handles)} handles on {platform}")
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        return [
-            result for result in results
-            if not isinstance(result, Exception)
-        ]
+        profiles = []
+        async for outcome in enricher.stream(handles, platform, enrichment_mode):
+            if outcome.ok:
+                profiles.append(outcome.data)
+        return profiles
     
     async def search_creators_by_keyword(
         self,
@@ -496,6 +495,15 @@ class InfluencersClubClient:
         return resp.get("games", resp.get("data", []))
 
 
+def get_api_key_from_env() -> Optional[str]:
+    """INFLUENCERS_CLUB_API_KEY without surrounding quotes or a "Bearer " prefix."""
+    key = (os.getenv("INFLUENCERS_CLUB_API_KEY") or "").strip()
+    key = key.strip("'").strip('"')
+    if key.lower().startswith("bearer "):
+        key = key[7:].strip()
+    return key or None
+
+
 async def get_influencers_client(api_key: str) -> InfluencersClubClient:
     """Factory function to create an async client with proper cleanup."""
     return InfluencersClubClient(api_key)
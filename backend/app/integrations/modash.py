@@ -9,6 +9,9 @@ from typing import Optional, Dict, Any, List
 
 import httpx
 
+from app.core.http_clients import get_http_client
+from app.services.rate_limiter import get_provider_limiter, parse_retry_after
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.modash.io/v1"
@@ -18,17 +21,16 @@ class ModashClient:
     def __init__(self, api_key: str, timeout: int = 30):
         self.api_key = api_key
         self.timeout = timeout
-        self.client = httpx.AsyncClient(
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            },
-            timeout=timeout,
-            follow_redirects=True,
-        )
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        # Shared connection pool; auth headers and timeout are sent per request
+        self.client = get_http_client("modash")
 
     async def close(self):
-        await self.client.aclose()
+        # No-op: the shared HTTP pool is closed on application shutdown
+        return None
 
     async def _request(
         self,
@@ -38,12 +40,24 @@ class ModashClient:
         params: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         url = f"{BASE_URL}/{path.lstrip('/')}"
+        limiter = get_provider_limiter("modash")
+        await limiter.acquire()
         logger.debug("Modash API request: %s %s", method, url)
         try:
-            resp = await self.client.request(method, url, json=json, params=params)
+            resp = await self.client.request(
+                method,
+                url,
+                json=json,
+                params=params,
+                headers=self.headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+            )
             resp.raise_for_status()
             return resp.json()
         except httpx.HTTPStatusError as e:
+            if e.response.status_code == 429:
+                await limiter.throttled(parse_retry_after(e.response.headers.get("retry-after")))
             logger.error("Modash API error %s: %s", e.response.status_code, e.response.text)
             raise ValueError(f"Modash API error {e.response.status_code}: {e.response.text}") from e
         except httpx.RequestError as e:
@@ -1,11 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager, suppress
 import asyncio
+import hmac
+import logging
+from typing import Optional
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, read_engine, Base
 import app.models # Import all models to register them with Base
 
+logger = logging.getLogger(__name__)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Schema is managed by Alembic migrations (run via start.sh before uvicorn).
@@ -18,14 +23,54 @@ async def lifespan(app: FastAPI):
     async with AsyncSessionLocal() as session:
         await seed_roles(session)
 
+    # Job queue: ARQ + Redis-backed job state when Redis is reachable,
+    # otherwise jobs run on the bounded local worker pool
+    from app.services.job_queue import job_queue
+    await job_queue.connect()
+    job_queue.local_pool.start()
+
     from app.services.scheduled_post_runner import scheduled_post_worker
     scheduled_post_task = asyncio.create_task(scheduled_post_worker())
 
+    # Fold new campaign events into the analytics rollup tables
+    from app.services.campaign_rollup_service import ROLLUP_ENABLED, campaign_event_rollup_worker
+    rollup_task = asyncio.create_task(campaign_event_rollup_worker()) if ROLLUP_ENABLED else None
+
+    # Super-admin overview snapshot + API-call / daily-active-user counters
+    from app.services.platform_stats_service import PLATFORM_STATS_ENABLED, platform_stats, platform_stats_worker
+    platform_stats_task = asyncio.create_task(platform_stats_worker()) if PLATFORM_STATS_ENABLED else None
+
+    # Batched tracking-event writer for POST /events/batch (replays any spooled batches)
+    from app.services.event_ingest import event_ingestor
+    await event_ingestor.start()
+
     yield
 
-    scheduled_post_task.cancel()
-    with suppress(asyncio.CancelledError):
-        await scheduled_post_task
+    for task in (scheduled_post_task, rollup_task, platform_stats_task):
+        if task is None:
+            continue
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    # Flush buffered tracking events and usage counters before the engine goes away
+    await event_ingestor.close()
+    try:
+        async with AsyncSessionLocal() as session:
+            await platform_stats.flush_usage(session)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(f"Could not flush usage counters on shutdown: {exc}", exc_info=True)
+
+    # Let in-flight local jobs finish (bounded by LOCAL_JOB_DRAIN_TIMEOUT_SECONDS)
+    await job_queue.shutdown()
+
+    # Close pooled outbound HTTP clients last; the tasks above use them
+    from app.core.http_clients import http_clients
+    await http_clients.aclose()
+
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -50,6 +95,10 @@ app.add_middleware(
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 app.add_middleware(ProxyHeadersMiddleware, trusted_hosts="*")
 
+# Per-request statement counts / DB time: Server-Timing header, /health "database", /metrics
+from app.core.db_metrics import QueryMetricsMiddleware
+app.add_middleware(QueryMetricsMiddleware)
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to C(AI)DENCE Dashboard API"}
@@ -61,12 +110,54 @@ from app.services.ai_service import AIService
 
 @app.get("/health")
 async def health_check():
+    from app.services.ai_service import ai_single_flight, gemini_limiter
+    from app.services.llm_cache import llm_cache
+    from app.services.llm_metrics import llm_metrics
+    from app.services.principal_cache import principal_cache
+    from app.core.db_metrics import db_metrics
+    from app.services.analytics_service import analytics_service
+    from app.services.campaign_rollup_service import campaign_rollups
+    from app.services.creator_search import creator_search
+    from app.services.discovery_cache import discovery_cache
+    from app.services.enrichment_cache import enrichment_cache
+    from app.services.rate_limiter import provider_limiter_stats
+    from app.services.event_ingest import event_ingestor
+    from app.services.platform_stats_service import platform_stats
+
     ai_status = await AIService.get_system_status()
     return {
         "status": "ok", 
         "version": settings.PROJECT_VERSION,
-        "ai": ai_status
+        "ai": ai_status,
+        "llm_streams": llm_metrics.snapshot(),
+        "llm_cache": llm_cache.stats(),
+        "gemini_calls": gemini_limiter.stats(),
+        "ai_coalescing": ai_single_flight.stats(),
+        "principal_cache": principal_cache.stats(),
+        "database": db_metrics.snapshot(),
+        "analytics_cache": analytics_service.stats(),
+        "campaign_rollups": campaign_rollups.stats(),
+        "event_ingest": event_ingestor.stats(),
+        "platform_stats": platform_stats.stats(),
+        "creator_search": creator_search.stats(),
+        "discovery_cache": discovery_cache.stats(),
+        "enrichment_cache": enrichment_cache.stats(),
+        "provider_limits": provider_limiter_stats(),
     }
 
+@app.get("/metrics")
+async def prometheus_metrics(authorization: Optional[str] = Header(None)):
+    from fastapi.responses import PlainTextResponse
+    from app.core import db_metrics as metrics
+
+    if not metrics.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if metrics.METRICS_TOKEN and not hmac.compare_digest(
+        (authorization or "").encode(), f"Bearer {metrics.METRICS_TOKEN}".encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+
+    return PlainTextResponse(metrics.db_metrics.prometheus(), media_type="text/plain; version=0.0.4")
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -2,6 +2,8 @@
 from app.models.models import (
     User,
     Campaign,
+    CampaignEmailDelivery,
+    InfluencerEnrichmentResult,
     ActivityLog,
     Project,
     ContentGeneration,
@@ -30,11 +32,16 @@ from app.models.crm_generate_post import CRMGeneratePost
 # )
 from app.models.team import Team
 from app.models.rbac import Role, Permission
+from app.models.user_hierarchy import UserHierarchyClosure
+from app.models.analytics_rollup import CampaignEventRollupHourly, CampaignEventRollupDaily, AnalyticsRollupState
+from app.models.platform_stats import PlatformStatsSnapshot, PlatformUsageDaily, UserActivityDaily
 from app.models.social import SocialConnection, OnboardingProgress
 
 __all__ = [
     "User",
     "Campaign",
+    "CampaignEmailDelivery",
+    "InfluencerEnrichmentResult",
     "ActivityLog",
     "Project",
     "ContentGeneration",
@@ -55,6 +62,13 @@ __all__ = [
     "Team",
     "Role",
     "Permission",
+    "UserHierarchyClosure",
+    "CampaignEventRollupHourly",
+    "CampaignEventRollupDaily",
+    "AnalyticsRollupState",
+    "PlatformStatsSnapshot",
+    "PlatformUsageDaily",
+    "UserActivityDaily",
     "SocialConnection",
     "OnboardingProgress",
 ]
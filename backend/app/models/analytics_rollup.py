@@ -0,0 +1,46 @@
+"""
+Pre-aggregated campaign event rollups.
+
+campaign_events is append-only; these tables hold per (bucket, campaign,
+event type) counts and value sums at hourly and daily grain, with the
+campaign owner's organization denormalized for org-scoped reads. They are
+maintained incrementally by app.services.campaign_rollup_service using the
+event-id watermark in analytics_rollup_state.
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class _CampaignEventRollup:
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True)
+    type = Column(String, primary_key=True)  # '' for events without a type
+    organization_id = Column(Integer, nullable=True)
+    event_count = Column(Integer, nullable=False, default=0)
+    value_sum = Column(Integer, nullable=False, default=0)
+
+
+class CampaignEventRollupHourly(_CampaignEventRollup, Base):
+    __tablename__ = "campaign_event_rollups_hourly"
+    __table_args__ = (
+        Index("ix_campaign_event_rollups_hourly_org_bucket", "organization_id", "bucket_start"),
+    )
+
+
+class CampaignEventRollupDaily(_CampaignEventRollup, Base):
+    __tablename__ = "campaign_event_rollups_daily"
+    __table_args__ = (
+        Index("ix_campaign_event_rollups_daily_org_bucket", "organization_id", "bucket_start"),
+    )
+
+
+class AnalyticsRollupState(Base):
+    """Highest campaign_events.id already folded into the rollups."""
+    __tablename__ = "analytics_rollup_state"
+
+    name = Column(String, primary_key=True)
+    last_event_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -29,6 +29,7 @@ class Creator(Base):
     category = Column(String, nullable=True)  # Fashion, Tech, Fitness, etc.
     tier = Column(String, nullable=True)  # Nano, Micro, Macro, Mega
     tags = Column(JSON, nullable=True)  # ["fashion", "lifestyle", "beauty"]
+    location = Column(String, nullable=True)  # "Lisbon, PT"; discovery search facet
     
     # Metrics
     follower_count = Column(Integer, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Float, UniqueConstraint, Index, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -139,17 +139,43 @@ class CampaignInfluencer(Base):
 
 class CampaignEvent(Base):
     __tablename__ = "campaign_events"
-    
+    __table_args__ = (
+        # Per-campaign aggregates by type and time range (analytics dashboard)
+        Index("ix_campaign_events_campaign_type_created", "campaign_id", "type", "created_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     campaign_id = Column(Integer, ForeignKey("campaigns.id"))
     type = Column(String, index=True) # launch, click, view, conversion
     value = Column(Integer, default=1) # For varying weights (e.g. sale value)
     metadata_json = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())  # Event time (analytics buckets)
+    occurred_at = Column(DateTime(timezone=True), nullable=True)  # Client-reported time, when sent
+    ingested_at = Column(DateTime(timezone=True), server_default=func.now())  # Set by the database on insert; rollup settle clock
     
     campaign = relationship("Campaign", back_populates="events")
 
 
+class CampaignEmailDelivery(Base):
+    """Per-recipient outcome of a bulk campaign email send (also the resume checkpoint)."""
+    __tablename__ = "campaign_email_deliveries"
+    __table_args__ = (
+        UniqueConstraint("send_id", "email", name="uq_campaign_email_deliveries_send_email"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=True, index=True)
+    send_id = Column(String, nullable=False, index=True)  # Job id of the bulk send
+    email = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, sent, failed
+    provider = Column(String, nullable=True)
+    message_id = Column(String, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
 class ActivityLog(Base):
     __tablename__ = "activities"
 
@@ -371,3 +397,32 @@ class CreditTransaction(Base):
     
     user = relationship("User")
     credit_account = relationship("CreditAccount")
+
+
+class InfluencerEnrichmentResult(Base):
+    """
+    Per-handle outcome of a batch enrichment (also the resume checkpoint).
+
+    Successful rows double as the dedup source: a handle enriched within
+    ENRICHMENT_DEDUP_HOURS is served from `data` instead of a new API call.
+    """
+    __tablename__ = "influencer_enrichment_results"
+    __table_args__ = (
+        UniqueConstraint("batch_id", "platform", "handle", name="uq_influencer_enrichment_results_batch_handle"),
+        Index("ix_influencer_enrichment_results_lookup", "platform", "handle", "mode", "enriched_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    batch_id = Column(String, nullable=False, index=True)  # Job id of the batch
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    platform = Column(String, nullable=False)
+    handle = Column(String, nullable=False)  # Lowercase, without "@"
+    mode = Column(String, nullable=False, default="raw")  # raw, full
+    status = Column(String, nullable=False, default="pending")  # enriched, cached, failed
+    data = Column(JSON, nullable=True)  # Provider response
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    enriched_at = Column(DateTime(timezone=True), nullable=True)  # When `data` was fetched from the provider
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
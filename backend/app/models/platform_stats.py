@@ -0,0 +1,43 @@
+"""
+Platform-wide stats for the super-admin dashboard.
+
+platform_stats_snapshot holds the latest platform overview (counts and MRR)
+so /admin/overview is a primary-key lookup however many organizations and
+users exist. platform_usage_daily and user_activity_daily hold the API-call
+and daily-active-user counters behind /admin/usage. All three are written by
+app.services.platform_stats_service.
+"""
+
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Integer, Numeric, String
+
+from app.core.database import Base
+
+
+class PlatformStatsSnapshot(Base):
+    __tablename__ = "platform_stats_snapshot"
+
+    name = Column(String, primary_key=True)
+    total_organizations = Column(Integer, nullable=False, default=0)
+    active_subscriptions = Column(Integer, nullable=False, default=0)
+    total_users = Column(Integer, nullable=False, default=0)
+    pending_approvals = Column(Integer, nullable=False, default=0)
+    total_brands = Column(Integer, nullable=False, default=0)
+    mrr = Column(Numeric(12, 2), nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class PlatformUsageDaily(Base):
+    """Authenticated API calls and distinct active users per UTC day."""
+    __tablename__ = "platform_usage_daily"
+
+    day = Column(Date, primary_key=True)
+    api_calls = Column(BigInteger, nullable=False, default=0)
+    active_users = Column(Integer, nullable=False, default=0)
+
+
+class UserActivityDaily(Base):
+    """One row per user per UTC day with at least one authenticated request."""
+    __tablename__ = "user_activity_daily"
+
+    day = Column(Date, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
@@ -0,0 +1,121 @@
+"""
+User hierarchy closure table.
+
+One row per (ancestor, descendant) pair in the users.parent_user_id tree,
+including a depth-0 row for every user, so "all users under X" is an indexed
+lookup instead of a recursive CTE:
+
+    SELECT descendant_id FROM user_hierarchy_closure WHERE ancestor_id = :x
+
+Rows are maintained by mapper events on User (insert, parent_user_id change,
+delete). Writes that bypass the ORM (bulk Core inserts, raw SQL) must call
+rebuild_user_hierarchy() afterwards.
+"""
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, delete, event, exists, insert, literal, select, true, union_all
+from sqlalchemy import inspect as sa_inspect
+
+from app.core.database import Base
+from app.models.models import User
+
+
+class UserHierarchyClosure(Base):
+    __tablename__ = "user_hierarchy_closure"
+
+    ancestor_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_user_hierarchy_closure_descendant_id", "descendant_id", "ancestor_id"),
+    )
+
+
+closure = UserHierarchyClosure.__table__
+
+
+def _insert_user_paths(connection, user_id: int, parent_id) -> None:
+    """Self row plus one row per ancestor of the new user's parent."""
+    rows = select(literal(user_id), literal(user_id), literal(0))
+    if parent_id is not None:
+        rows = union_all(
+            rows,
+            select(closure.c.ancestor_id, literal(user_id), closure.c.depth + 1)
+            .where(closure.c.descendant_id == parent_id),
+        )
+    connection.execute(
+        insert(closure).from_select(["ancestor_id", "descendant_id", "depth"], rows)
+    )
+
+
+def _move_subtree(connection, user_id: int, new_parent_id) -> None:
+    """Detach user_id's subtree from its old ancestors and attach it under new_parent_id."""
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == user_id)
+
+    if new_parent_id is not None:
+        creates_cycle = connection.execute(
+            select(exists().where(closure.c.ancestor_id == user_id, closure.c.descendant_id == new_parent_id))
+        ).scalar()
+        if creates_cycle:
+            raise ValueError(f"User {new_parent_id} is in the subtree of user {user_id}; cannot make it the parent")
+
+    connection.execute(
+        delete(closure).where(
+            closure.c.descendant_id.in_(subtree),
+            closure.c.ancestor_id.not_in(subtree),
+        )
+    )
+    if new_parent_id is None:
+        return
+
+    above = closure.alias("above")
+    below = closure.alias("below")
+    connection.execute(
+        insert(closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(above.c.ancestor_id, below.c.descendant_id, above.c.depth + below.c.depth + 1)
+            .select_from(above.join(below, true()))  # intentional cross join of the two filtered sides
+            .where(above.c.descendant_id == new_parent_id, below.c.ancestor_id == user_id),
+        )
+    )
+
+
+def rebuild_user_hierarchy(connection) -> None:
+    """Recompute the whole closure table from users.parent_user_id (sync connection)."""
+    users = User.__table__
+    tree = select(
+        users.c.id.label("ancestor_id"),
+        users.c.id.label("descendant_id"),
+        literal(0).label("depth"),
+    ).cte(name="tree", recursive=True)
+    tree = tree.union_all(
+        select(tree.c.ancestor_id, users.c.id, tree.c.depth + 1)
+        .where(users.c.parent_user_id == tree.c.descendant_id)
+    )
+    connection.execute(delete(closure))
+    connection.execute(
+        insert(closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(tree.c.ancestor_id, tree.c.descendant_id, tree.c.depth),
+        )
+    )
+
+
+@event.listens_for(User, "after_insert")
+def _user_inserted(mapper, connection, target) -> None:
+    _insert_user_paths(connection, target.id, target.parent_user_id)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target) -> None:
+    if sa_inspect(target).attrs.parent_user_id.history.has_changes():
+        _move_subtree(connection, target.id, target.parent_user_id)
+
+
+@event.listens_for(User, "before_delete")
+def _user_deleted(mapper, connection, target) -> None:
+    connection.execute(
+        delete(closure).where(
+            (closure.c.ancestor_id == target.id) | (closure.c.descendant_id == target.id)
+        )
+    )
@@ -168,6 +168,8 @@ class ContentGenerationCreate(ContentGenerationBase):
     adapt_from_base: bool = False
     base_result: Optional[str] = None
     brand_id: Optional[int] = None
+    # Skip the LLM response cache and ask the model again
+    regenerate: bool = False
     # pass
 
 class ContentGeneration(ContentGenerationBase):
@@ -239,6 +241,8 @@ class DesignAssetCreate(DesignAssetBase):
     image_url: Optional[str] = None
     brand_colors: Optional[str] = None
     reference_image: Optional[str] = None
+    # Generate a fresh image instead of sharing an identical in-flight generation
+    regenerate: bool = False
 
 class DesignAsset(DesignAssetBase):
     id: int
@@ -290,7 +294,7 @@ class PresentationBase(BaseModel):
     source_type: str # 'upload' or 'powerbi'
 
 class PresentationCreate(PresentationBase):
-    pass
+    regenerate: bool = False
 
 class Presentation(PresentationBase):
     id: int
@@ -305,7 +309,9 @@ class Presentation(PresentationBase):
 # --- Discovery Schemas ---
 class DiscoveryFilter(BaseModel):
     category: Optional[str] = None
+    platform: Optional[str] = None
     min_reach: Optional[int] = 0
+    max_reach: Optional[int] = None
     min_engagement: Optional[float] = 0.0
     location: Optional[str] = None
 
@@ -313,6 +319,11 @@ class DiscoveryRequest(BaseModel):
     query: str
     filters: Optional[DiscoveryFilter] = None
 
+class BatchEnrichRequest(BaseModel):
+    platform: str
+    handles: List[str]
+    mode: str = "raw"  # raw, full
+
 class InfluencerProfile(BaseModel):
     handle: str
     platform: str
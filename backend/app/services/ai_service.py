@@ -13,20 +13,26 @@ Configuration via environment variables:
 - OPENAI_API_KEY, ANTHROPIC_API_KEY, GOOGLE_API_KEY: API keys for cloud providers
 """
 
-import asyncio
 import base64
 import os
 import json
 import random
+import time
 import logging
 import google.generativeai as genai
-from typing import Optional, List, Dict
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 from fastapi import HTTPException
 
 
 import httpx
 
+from app.core.concurrency import ConcurrencyLimiter
+from app.core.http_clients import get_http_client
+from app.core.single_flight import SingleFlight, flight_key
+from app.services.llm_cache import llm_cache, llm_cache_key
+from app.services.llm_metrics import llm_metrics
+
 # LiteLLM for provider abstraction
 try:
     import litellm
@@ -43,6 +49,21 @@ LLM_PROVIDER = os.getenv("LLM_PROVIDER", "ollama").lower()
 LLM_MODEL = os.getenv("LLM_MODEL", "")  # Empty = auto-detect
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 AI_WORKER_URL = os.getenv("AI_WORKER_URL", "http://ai_worker:8001")
+# Concurrent in-flight Gemini requests (text, image and streams) per process
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+# Let opted-in callers share identical in-flight generations
+AI_COALESCE_ENABLED = os.getenv("AI_COALESCE_ENABLED", "true").lower() == "true"
+
+# Gemini calls use the SDK's native async methods (no worker threads); this
+# bounds how many are in flight and records queue depth / wait time for /health.
+gemini_limiter = ConcurrencyLimiter("gemini", GEMINI_MAX_CONCURRENCY)
+
+# Concurrent identical generate_content / generate_image calls (coalesce=True)
+# share one model call.
+ai_single_flight = SingleFlight("ai")
+
+# (model_used, factory returning an async iterator of text deltas)
+StreamRoute = Tuple[str, Callable[[], AsyncIterator[str]]]
 
 # Set Ollama API base for LiteLLM
 if LLM_PROVIDER == "ollama":
@@ -141,25 +162,25 @@ class AIService:
             return AIService._cached_model
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                res = await client.get(f"{OLLAMA_BASE_URL}/api/tags")
-                res.raise_for_status()
-                models = [m["name"] for m in res.json().get("models", [])]
-                
-                # Preference order
-                for pref in ["qwen", "mistral", "llama3", "gemma"]:
-                    matches = [m for m in models if pref in m]
-                    if matches:
-                        AIService._cached_model = matches[0]
-                        logger.info(f"Selected Ollama model: {AIService._cached_model}")
-                        return AIService._cached_model
-                
-                # Fallback to first available
-                if models:
-                    AIService._cached_model = models[0]
-                    logger.warning(f"No preferred model found. Using: {AIService._cached_model}")
+            client = get_http_client("ollama")
+            res = await client.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5.0)
+            res.raise_for_status()
+            models = [m["name"] for m in res.json().get("models", [])]
+            
+            # Preference order
+            for pref in ["qwen", "mistral", "llama3", "gemma"]:
+                matches = [m for m in models if pref in m]
+                if matches:
+                    AIService._cached_model = matches[0]
+                    logger.info(f"Selected Ollama model: {AIService._cached_model}")
                     return AIService._cached_model
-                    
+            
+            # Fallback to first available
+            if models:
+                AIService._cached_model = models[0]
+                logger.warning(f"No preferred model found. Using: {AIService._cached_model}")
+                return AIService._cached_model
+                
         except Exception as e:
             logger.error(f"Failed to fetch Ollama models: {e}")
         
@@ -176,6 +197,11 @@ class AIService:
             await AIService._discover_ollama_model()
         
         model = AIService._get_model_name()
+
+        cache_key = llm_cache_key(f"{LLM_PROVIDER}:{model}", prompt, system_prompt, json_mode)
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         # Build messages
         messages: List[Dict] = []
@@ -201,26 +227,30 @@ class AIService:
                     messages=messages,
                     response_format={"type": "json_object"} if json_mode else None
                 )
-                return response.choices[0].message.content
+                text = response.choices[0].message.content
+                await llm_cache.set(cache_key, text)
+                return text
             except Exception as e:
                 logger.error(f"LiteLLM error: {e}")
                 # Fall through to Ollama fallback
         
         # Direct Ollama API call (default or fallback)
         try:
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                payload = {
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                }
-                if json_mode:
-                    payload["format"] = "json"
-
-                response = await client.post(f"{OLLAMA_BASE_URL}/api/generate", json=payload)
-                response.raise_for_status()
-                result = response.json()
-                return result.get("response", "")
+            client = get_http_client("ollama")
+            payload = {
+                "model": model,
+                "prompt": prompt,
+                "stream": False,
+            }
+            if json_mode:
+                payload["format"] = "json"
+
+            response = await client.post(f"{OLLAMA_BASE_URL}/api/generate", json=payload)
+            response.raise_for_status()
+            result = response.json()
+            text = result.get("response", "")
+            await llm_cache.set(cache_key, text)
+            return text
         except httpx.RequestError as e:
             logger.error(f"Ollama connection failed: {e}")
             return f"[AI Unavailable] Mock response for: {prompt[:50]}..."
@@ -237,8 +267,10 @@ class AIService:
         json_mode: bool = False,
     ) -> str:
         final_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-        try:
-            async with httpx.AsyncClient(timeout=300.0) as client:
+
+        async def _generate() -> str:
+            try:
+                client = get_http_client("ollama")
                 payload = {
                     "model": model,
                     "prompt": final_prompt,
@@ -250,9 +282,23 @@ class AIService:
                 response.raise_for_status()
                 result = response.json()
                 return result.get("response", "")
-        except Exception as e:
-            logger.error(f"Ollama model '{model}' error: {e}")
-            raise
+            except Exception as e:
+                logger.error(f"Ollama model '{model}' error: {e}")
+                raise
+
+        cache_key = llm_cache_key(f"ollama:{model}", final_prompt, json_mode=json_mode)
+        return await llm_cache.cached(cache_key, _generate)
+
+    @staticmethod
+    async def _call_gemini_text(selected_model, prompt: str) -> str:
+        """Text completion from a Gemini model, served from llm_cache when possible."""
+        async def _generate() -> str:
+            async with gemini_limiter.slot():
+                response = await selected_model.generate_content_async(prompt)
+            return response.text or ""
+
+        model_name = getattr(selected_model, "model_name", None) or "gemini"
+        return await llm_cache.cached(llm_cache_key(model_name, prompt), _generate)
 
     @staticmethod
     def _clean_text_output(text: str) -> str:
@@ -272,6 +318,59 @@ class AIService:
     #     )
     #     return await AIService._call_llm(full_prompt, system_prompt=system)
     
+    @staticmethod
+    def _content_prompt(title: str, platform: str, content_type: str, prompt: str) -> str:
+        return f"""
+You are a senior social media copywriter.
+
+Write exactly one polished, ready-to-post {platform} {content_type} in fluent English.
+
+Campaign Title:
+{title}
+
+Topic / Brief:
+{prompt}
+
+Quality requirements:
+- Zero spelling mistakes and correct grammar.
+- Clear structure: hook, value, CTA.
+- Platform-native tone for {platform}.
+- Keep it specific and practical, not generic filler.
+- Add only relevant hashtags (3-8 max).
+- Return only final post text. No explanations, no markdown fences.
+"""
+
+    @staticmethod
+    def _proofread_prompt(draft_text: str) -> str:
+        return f"""
+Proofread and lightly improve the social post below.
+Rules:
+- Fix spelling and grammar mistakes.
+- Preserve meaning, platform, and intent.
+- Keep hashtags relevant.
+- Return only the final corrected post text.
+
+Post:
+{draft_text}
+"""
+
+    @staticmethod
+    def _adapt_prompt(base_text: str, platform: str, content_type: str) -> str:
+        return f"""
+You are a senior social copy editor.
+
+Adapt the post below for {platform} as a {content_type}.
+Rules:
+- Keep the same core message and meaning.
+- Keep tone clear and professional.
+- Add/adjust hashtags and formatting to fit {platform}.
+- Do not change factual claims.
+- Return only the final post text.
+
+Base Post:
+{base_text}
+"""
+
     @staticmethod
     async def generate_content(
         title: str,
@@ -279,7 +378,14 @@ class AIService:
         content_type: Optional[str] = None,
         prompt: Optional[str] = None,
         model: Optional[str] = None,
+        coalesce: bool = False,
     ):
+        """
+        Generate a post (draft + proofreading pass).
+
+        With coalesce=True, concurrent calls with the same normalized inputs
+        share a single generation.
+        """
         # Backward compatibility for older call pattern:
         # generate_content(platform, content_type, prompt)
         if prompt is None and platform and content_type:
@@ -291,28 +397,20 @@ class AIService:
         platform = platform or "General"
         content_type = content_type or "Post"
         prompt = prompt or ""
-        requested_model_name = (model or "").strip()
-        model_key = AIService._normalize_model_name(model)
-
-        full_prompt = f"""
-You are a senior social media copywriter.
 
-Write exactly one polished, ready-to-post {platform} {content_type} in fluent English.
-
-Campaign Title:
-{title}
+        if coalesce and AI_COALESCE_ENABLED:
+            key = flight_key(
+                "content", title, platform.lower(), content_type.lower(), prompt,
+                AIService.get_effective_content_model_name(model),
+            )
+            return await ai_single_flight.do(
+                key, lambda: AIService.generate_content(title, platform, content_type, prompt, model)
+            )
 
-Topic / Brief:
-{prompt}
+        requested_model_name = (model or "").strip()
+        model_key = AIService._normalize_model_name(model)
 
-Quality requirements:
-- Zero spelling mistakes and correct grammar.
-- Clear structure: hook, value, CTA.
-- Platform-native tone for {platform}.
-- Keep it specific and practical, not generic filler.
-- Add only relevant hashtags (3-8 max).
-- Return only final post text. No explanations, no markdown fences.
-"""
+        full_prompt = AIService._content_prompt(title, platform, content_type, prompt)
 
         if model_key == "qwen":
             qwen_model = AIService._resolve_ollama_model(requested_model_name)
@@ -324,21 +422,12 @@ Quality requirements:
                 model,
                 task="content",
             )
-            response = await asyncio.to_thread(selected_model.generate_content, full_prompt)
-            draft_text = AIService._clean_text_output(response.text or "")
+            draft_text = AIService._clean_text_output(
+                await AIService._call_gemini_text(selected_model, full_prompt)
+            )
 
         # Second pass proofreading to reduce spelling/grammar errors.
-        proof_prompt = f"""
-Proofread and lightly improve the social post below.
-Rules:
-- Fix spelling and grammar mistakes.
-- Preserve meaning, platform, and intent.
-- Keep hashtags relevant.
-- Return only the final corrected post text.
-
-Post:
-{draft_text}
-"""
+        proof_prompt = AIService._proofread_prompt(draft_text)
         if model_key == "qwen":
             qwen_model = AIService._resolve_ollama_model(requested_model_name)
             proofed_text = AIService._clean_text_output(
@@ -350,8 +439,8 @@ Post:
             model,
             task="content",
         )
-        proofed = await asyncio.to_thread(selected_model.generate_content, proof_prompt)
-        final_text = AIService._clean_text_output(proofed.text or draft_text)
+        proofed_text = await AIService._call_gemini_text(selected_model, proof_prompt)
+        final_text = AIService._clean_text_output(proofed_text or draft_text)
         return final_text or f"[{selected_model_name}] No response generated."
 
     @staticmethod
@@ -365,20 +454,7 @@ Post:
         content_type = content_type or "Post"
         model_key = AIService._normalize_model_name(model)
 
-        adapt_prompt = f"""
-You are a senior social copy editor.
-
-Adapt the post below for {platform} as a {content_type}.
-Rules:
-- Keep the same core message and meaning.
-- Keep tone clear and professional.
-- Add/adjust hashtags and formatting to fit {platform}.
-- Do not change factual claims.
-- Return only the final post text.
-
-Base Post:
-{base_text}
-"""
+        adapt_prompt = AIService._adapt_prompt(base_text, platform, content_type)
         if model_key == "qwen":
             qwen_model = AIService._resolve_ollama_model(model)
             text = AIService._clean_text_output(
@@ -390,8 +466,9 @@ Base Post:
             model,
             task="content",
         )
-        response = await asyncio.to_thread(selected_model.generate_content, adapt_prompt)
-        text = AIService._clean_text_output(response.text or "")
+        text = AIService._clean_text_output(
+            await AIService._call_gemini_text(selected_model, adapt_prompt)
+        )
         return text or f"[{selected_model_name}] No response generated."
 
     @staticmethod
@@ -424,8 +501,9 @@ Text:
             model,
             task="content",
         )
-        response = await asyncio.to_thread(selected_model.generate_content, enhance_prompt)
-        rewritten = AIService._clean_text_output(response.text or "")
+        rewritten = AIService._clean_text_output(
+            await AIService._call_gemini_text(selected_model, enhance_prompt)
+        )
         return rewritten or f"[{selected_model_name}] No response generated."
 
     # @staticmethod
@@ -483,7 +561,14 @@ Text:
         reference_image: str | None = None,
         model: Optional[str] = None,
         return_meta: bool = False,
+        coalesce: bool = False,
     ) -> str | Dict[str, object]:
+        """
+        Generate a marketing visual (NanoBanana, falling back to the diffusion worker).
+
+        With coalesce=True, concurrent calls with the same normalized inputs
+        share a single generation.
+        """
         # Backward compatibility for older call pattern:
         # generate_image(style, prompt)
         if prompt is None and style is not None:
@@ -494,6 +579,20 @@ Text:
         style = style or "Minimalist"
         prompt = prompt or ""
 
+        if coalesce and AI_COALESCE_ENABLED:
+            key = flight_key(
+                "image", title, style, prompt, aspect_ratio, brand_colors, reference_image,
+                AIService._normalize_model_name(model),
+            )
+            payload = await ai_single_flight.do(
+                key,
+                lambda: AIService.generate_image(
+                    title, style, prompt, aspect_ratio, brand_colors, reference_image, model,
+                    return_meta=True,
+                ),
+            )
+            return dict(payload) if return_meta else str(payload["image_url"])
+
         style_map = {
             "Photorealistic": "ultra realistic, 8k, product photography, studio lighting",
             "3D Render": "3d render, blender, cinematic lighting",
@@ -535,26 +634,26 @@ Text:
 
         async def _generate_via_diffusion_worker() -> Dict[str, object]:
             try:
-                async with httpx.AsyncClient(timeout=180.0) as client:
-                    res = await client.post(
-                        f"{AI_WORKER_URL}/generate",
-                        json={
-                            "prompt": final_prompt,
-                            "negative_prompt": "low quality, blur, distorted",
-                            "steps": 1,
-                            "guidance_scale": 0.0,
-                        },
-                    )
-                    res.raise_for_status()
-                    payload = res.json()
-                    image_base64 = payload.get("image_base64")
-                    if not image_base64:
-                        raise RuntimeError("Diffusion worker returned no image")
-                    return {
-                        "image_url": f"data:image/png;base64,{image_base64}",
-                        "image_model_used": "IDKiro/sdxs-512-0.9",
-                        "image_fallback_used": True,
-                    }
+                client = get_http_client("ai_worker")
+                res = await client.post(
+                    f"{AI_WORKER_URL}/generate",
+                    json={
+                        "prompt": final_prompt,
+                        "negative_prompt": "low quality, blur, distorted",
+                        "steps": 1,
+                        "guidance_scale": 0.0,
+                    },
+                )
+                res.raise_for_status()
+                payload = res.json()
+                image_base64 = payload.get("image_base64")
+                if not image_base64:
+                    raise RuntimeError("Diffusion worker returned no image")
+                return {
+                    "image_url": f"data:image/png;base64,{image_base64}",
+                    "image_model_used": "IDKiro/sdxs-512-0.9",
+                    "image_fallback_used": True,
+                }
             except Exception as worker_error:
                 logger.error(f"Diffusion worker error: {worker_error}")
                 raise HTTPException(
@@ -591,7 +690,8 @@ Text:
                 model,
                 task="image",
             )
-            response = await asyncio.to_thread(selected_model.generate_content, content)
+            async with gemini_limiter.slot():
+                response = await selected_model.generate_content_async(content)
 
             # ✅ Extract image
             for candidate in response.candidates:
@@ -696,17 +796,17 @@ Text:
         # Check Ollama health if using it
         if provider == "ollama":
             try:
-                async with httpx.AsyncClient(timeout=2.0) as client:
-                    res = await client.get(f"{OLLAMA_BASE_URL}")
-                    is_up = res.status_code == 200
-                    return {
-                        "ai_engine": f"Ollama (Local)",
-                        "provider": provider,
-                        "status": "online" if is_up else "offline",
-                        "model": model,
-                        "url": OLLAMA_BASE_URL,
-                        "litellm_available": LITELLM_AVAILABLE
-                    }
+                client = get_http_client("ollama")
+                res = await client.get(f"{OLLAMA_BASE_URL}", timeout=2.0)
+                is_up = res.status_code == 200
+                return {
+                    "ai_engine": f"Ollama (Local)",
+                    "provider": provider,
+                    "status": "online" if is_up else "offline",
+                    "model": model,
+                    "url": OLLAMA_BASE_URL,
+                    "litellm_available": LITELLM_AVAILABLE
+                }
             except Exception as e:
                 logger.error(f"Health check failed: {e}")
                 return {
@@ -728,6 +828,39 @@ Text:
                 "litellm_available": LITELLM_AVAILABLE
             }
 
+    @staticmethod
+    def _chat_transcript_prompt(messages: List[dict]) -> str:
+        """Flatten a chat history into a single prompt for Gemini."""
+        transcript_lines: List[str] = []
+        for msg in messages:
+            role = (msg.get("role") or "user").strip().lower()
+            content = (msg.get("content") or "").strip()
+            if not content:
+                continue
+            if role == "system":
+                transcript_lines.append(f"System: {content}")
+            elif role == "assistant":
+                transcript_lines.append(f"Assistant: {content}")
+            else:
+                transcript_lines.append(f"User: {content}")
+
+        return (
+            "You are C(AI)DENCE, an expert AI Marketing Assistant. "
+            "Answer the user's latest message using relevant prior context. "
+            "Be concise, practical, and professional.\n\n"
+            "Conversation:\n"
+            + "\n".join(transcript_lines)
+            + "\n\nAssistant:"
+        )
+
+    @staticmethod
+    def _litellm_model_name(model: str) -> str:
+        if LLM_PROVIDER == "anthropic":
+            return f"anthropic/{model}"
+        if LLM_PROVIDER == "gemini":
+            return f"gemini/{model}" if not model.startswith("gemini/") else model
+        return model
+
     @staticmethod
     async def chat_completion(
         messages: List[dict],
@@ -753,17 +886,17 @@ Text:
         if model_key == "qwen":
             qwen_model = AIService._resolve_ollama_model(model)
             try:
-                async with httpx.AsyncClient(timeout=300.0) as client:
-                    payload = {
-                        "model": qwen_model,
-                        "messages": messages,
-                        "stream": False,
-                    }
-                    response = await client.post(f"{OLLAMA_BASE_URL}/api/chat", json=payload)
-                    response.raise_for_status()
-                    result = response.json()
-                    text = result.get("message", {}).get("content", "")
-                    return _result(text, qwen_model)
+                client = get_http_client("ollama")
+                payload = {
+                    "model": qwen_model,
+                    "messages": messages,
+                    "stream": False,
+                }
+                response = await client.post(f"{OLLAMA_BASE_URL}/api/chat", json=payload)
+                response.raise_for_status()
+                result = response.json()
+                text = result.get("message", {}).get("content", "")
+                return _result(text, qwen_model)
             except Exception as e:
                 logger.error(f"Qwen chat completion failed for model '{qwen_model}': {e}")
                 # Continue to generic fallback below.
@@ -771,30 +904,10 @@ Text:
         # Explicit Gemini route
         if model_key == "gemini":
             try:
-                transcript_lines: List[str] = []
-                for msg in messages:
-                    role = (msg.get("role") or "user").strip().lower()
-                    content = (msg.get("content") or "").strip()
-                    if not content:
-                        continue
-                    if role == "system":
-                        transcript_lines.append(f"System: {content}")
-                    elif role == "assistant":
-                        transcript_lines.append(f"Assistant: {content}")
-                    else:
-                        transcript_lines.append(f"User: {content}")
-
-                prompt = (
-                    "You are C(AI)DENCE, an expert AI Marketing Assistant. "
-                    "Answer the user's latest message using relevant prior context. "
-                    "Be concise, practical, and professional.\n\n"
-                    "Conversation:\n"
-                    + "\n".join(transcript_lines)
-                    + "\n\nAssistant:"
-                )
+                prompt = AIService._chat_transcript_prompt(messages)
                 selected_model, _ = AIService._get_google_model("Gemini", task="content")
-                response = await asyncio.to_thread(selected_model.generate_content, prompt)
-                return _result(response.text or "", "Gemini")
+                text = await AIService._call_gemini_text(selected_model, prompt)
+                return _result(text, "Gemini")
             except Exception as e:
                 logger.error(f"Gemini chat completion failed: {e}")
                 # Continue to generic fallback below.
@@ -808,12 +921,7 @@ Text:
         # Try LiteLLM for cloud providers
         if LITELLM_AVAILABLE and LLM_PROVIDER != "ollama":
             try:
-                model_name = default_model
-                if LLM_PROVIDER == "anthropic":
-                    model_name = f"anthropic/{default_model}"
-                elif LLM_PROVIDER == "gemini":
-                    model_name = f"gemini/{default_model}" if not default_model.startswith("gemini/") else default_model
-                
+                model_name = AIService._litellm_model_name(default_model)
                 response = await acompletion(model=model_name, messages=messages)
                 return _result(response.choices[0].message.content, model_name)
             except Exception as e:
@@ -821,16 +929,16 @@ Text:
         
         # Direct Ollama chat API
         try:
-            async with httpx.AsyncClient(timeout=300.0) as client:
-                payload = {
-                    "model": default_model,
-                    "messages": messages,
-                    "stream": False,
-                }
-                response = await client.post(f"{OLLAMA_BASE_URL}/api/chat", json=payload)
-                response.raise_for_status()
-                result = response.json()
-                return _result(result.get("message", {}).get("content", ""), default_model)
+            client = get_http_client("ollama")
+            payload = {
+                "model": default_model,
+                "messages": messages,
+                "stream": False,
+            }
+            response = await client.post(f"{OLLAMA_BASE_URL}/api/chat", json=payload)
+            response.raise_for_status()
+            result = response.json()
+            return _result(result.get("message", {}).get("content", ""), default_model)
         except Exception as e:
             logger.error(f"Chat completion failed: {e}")
             last_msg = messages[-1]["content"] if messages else ""
@@ -838,3 +946,218 @@ Text:
                 f"[Offline Mode] Great point about '{last_msg[:30]}'. Ensure your LLM provider is configured.",
                 "offline-fallback",
             )
+
+    # --- Streaming ---
+    #
+    # Streaming variants yield event dicts as tokens arrive:
+    #   {"type": "delta", "phase": "draft" | "final", "delta": "..."}
+    #   {"type": "done", "text": ..., "model_used": ..., "ttft_ms": ..., "duration_ms": ...}
+    # Time-to-first-token and total duration are recorded in llm_metrics.
+
+    @staticmethod
+    async def _stream_ollama(endpoint: str, payload: Dict) -> AsyncIterator[str]:
+        """Relay text deltas from Ollama's NDJSON stream (/api/generate or /api/chat)."""
+        client = get_http_client("ollama")
+        async with client.stream(
+            "POST", f"{OLLAMA_BASE_URL}{endpoint}", json={**payload, "stream": True}
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise RuntimeError(data["error"])
+                if "message" in data:
+                    delta = (data.get("message") or {}).get("content")
+                else:
+                    delta = data.get("response")
+                if delta:
+                    yield delta
+                if data.get("done"):
+                    break
+
+    @staticmethod
+    async def _stream_gemini(selected_model, prompt: str) -> AsyncIterator[str]:
+        async with gemini_limiter.slot():
+            response = await selected_model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                try:
+                    delta = chunk.text
+                except ValueError:
+                    # Chunks carrying only finish/safety metadata have no text parts
+                    continue
+                if delta:
+                    yield delta
+
+    @staticmethod
+    async def _stream_litellm(model_name: str, messages: List[dict]) -> AsyncIterator[str]:
+        response = await acompletion(model=model_name, messages=messages, stream=True)
+        async for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+    @staticmethod
+    async def _stream_text(text: str) -> AsyncIterator[str]:
+        yield text
+
+    @staticmethod
+    async def _text_stream_routes(prompt: str, model: Optional[str]) -> AsyncIterator[StreamRoute]:
+        """Single-model routing used by content generation (no fallback, like generate_content)."""
+        if AIService._normalize_model_name(model) == "qwen":
+            qwen_model = AIService._resolve_ollama_model(model)
+            yield qwen_model, lambda: AIService._stream_ollama(
+                "/api/generate", {"model": qwen_model, "prompt": prompt}
+            )
+            return
+        selected_model, selected_model_name = AIService._get_google_model(model, task="content")
+        yield selected_model_name, lambda: AIService._stream_gemini(selected_model, prompt)
+
+    @staticmethod
+    async def _chat_stream_routes(messages: List[dict], model: Optional[str]) -> AsyncIterator[StreamRoute]:
+        """Same route order as chat_completion; later routes are only built if earlier ones fail."""
+        model_key = AIService._normalize_model_name(model)
+
+        if model_key == "qwen":
+            qwen_model = AIService._resolve_ollama_model(model)
+            yield qwen_model, lambda: AIService._stream_ollama(
+                "/api/chat", {"model": qwen_model, "messages": messages}
+            )
+
+        if model_key == "gemini":
+            selected_model, _ = AIService._get_google_model("Gemini", task="content")
+            prompt = AIService._chat_transcript_prompt(messages)
+            yield "Gemini", lambda: AIService._stream_gemini(selected_model, prompt)
+
+        if LLM_PROVIDER == "ollama" and not AIService._cached_model:
+            await AIService._discover_ollama_model()
+        default_model = AIService._get_model_name()
+
+        if LITELLM_AVAILABLE and LLM_PROVIDER != "ollama":
+            model_name = AIService._litellm_model_name(default_model)
+            yield model_name, lambda: AIService._stream_litellm(model_name, messages)
+
+        yield default_model, lambda: AIService._stream_ollama(
+            "/api/chat", {"model": default_model, "messages": messages}
+        )
+
+        last_msg = messages[-1]["content"] if messages else ""
+        yield "offline-fallback", lambda: AIService._stream_text(
+            f"[Offline Mode] Great point about '{last_msg[:30]}'. Ensure your LLM provider is configured."
+        )
+
+    @staticmethod
+    async def _relay_routes(routes: AsyncIterator[StreamRoute], selected: Dict) -> AsyncIterator[str]:
+        """
+        Relay deltas from the first route that works.
+
+        A route that fails before producing any output falls through to the
+        next one; once tokens have been sent to the client, errors propagate.
+        """
+        last_error: Optional[Exception] = None
+        async for model_used, open_stream in routes:
+            selected["model_used"] = model_used
+            produced = False
+            try:
+                async for delta in open_stream():
+                    produced = True
+                    yield delta
+                return
+            except Exception as e:
+                if produced:
+                    raise
+                logger.error(f"Streaming via '{model_used}' failed before first token: {e}")
+                last_error = e
+        if last_error:
+            raise last_error
+
+    @staticmethod
+    async def _metered_stream(
+        endpoint: str,
+        passes: List[Tuple[str, Callable[[str], AsyncIterator[StreamRoute]]]],
+    ) -> AsyncIterator[Dict]:
+        """
+        Run one or more streamed passes in order (each pass receives the
+        previous pass's text), then emit a done event with per-phase texts.
+        """
+        started = time.perf_counter()
+        ttft_ms: Optional[float] = None
+        chunks = 0
+        selected: Dict[str, str] = {}
+        texts: Dict[str, str] = {}
+        previous = ""
+        try:
+            for phase, routes_for in passes:
+                parts: List[str] = []
+                async for delta in AIService._relay_routes(routes_for(previous), selected):
+                    if ttft_ms is None:
+                        ttft_ms = (time.perf_counter() - started) * 1000
+                    chunks += 1
+                    parts.append(delta)
+                    yield {"type": "delta", "phase": phase, "delta": delta}
+                previous = AIService._clean_text_output("".join(parts))
+                texts[phase] = previous
+        except Exception:
+            duration_ms = (time.perf_counter() - started) * 1000
+            llm_metrics.record_stream(endpoint, selected.get("model_used"), ttft_ms, duration_ms, chunks, error=True)
+            raise
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        llm_metrics.record_stream(endpoint, selected.get("model_used"), ttft_ms, duration_ms, chunks)
+        yield {
+            "type": "done",
+            "texts": texts,
+            "model_used": selected.get("model_used"),
+            "ttft_ms": round(ttft_ms, 1) if ttft_ms is not None else None,
+            "duration_ms": round(duration_ms, 1),
+        }
+
+    @staticmethod
+    async def stream_chat_completion(
+        messages: List[dict],
+        model: Optional[str] = None,
+    ) -> AsyncIterator[Dict]:
+        """Streaming variant of chat_completion (same routing and fallbacks)."""
+        passes = [("final", lambda _: AIService._chat_stream_routes(messages, model))]
+        async for event in AIService._metered_stream("chat", passes):
+            if event["type"] == "done":
+                event["text"] = event.pop("texts").get("final", "")
+            yield event
+
+    @staticmethod
+    async def stream_content(
+        title: str,
+        platform: Optional[str] = None,
+        content_type: Optional[str] = None,
+        prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        base_text: Optional[str] = None,
+    ) -> AsyncIterator[Dict]:
+        """
+        Streaming variant of generate_content / adapt_content_for_platform.
+
+        Generation streams the draft ("draft" phase) and then the proofread
+        pass ("final" phase); clients should replace the draft with the final
+        text as it arrives. Adaptation is a single "final" pass.
+        """
+        platform = platform or "General"
+        content_type = content_type or "Post"
+        prompt = prompt or ""
+
+        if base_text is not None:
+            adapt_prompt = AIService._adapt_prompt(base_text, platform, content_type)
+            passes = [("final", lambda _: AIService._text_stream_routes(adapt_prompt, model))]
+        else:
+            full_prompt = AIService._content_prompt(title, platform, content_type, prompt)
+            passes = [
+                ("draft", lambda _: AIService._text_stream_routes(full_prompt, model)),
+                ("final", lambda draft: AIService._text_stream_routes(AIService._proofread_prompt(draft), model)),
+            ]
+
+        label = "Qwen2.5" if AIService._normalize_model_name(model) == "qwen" else "Gemini"
+        async for event in AIService._metered_stream("content", passes):
+            if event["type"] == "done":
+                texts = event.pop("texts")
+                event["text"] = texts.get("final") or texts.get("draft") or f"[{label}] No response generated."
+            yield event
@@ -0,0 +1,326 @@
+"""
+Analytics aggregation service.
+
+The analytics dashboard totals (active campaigns, event counts by type,
+conversion revenue, influencer reach) are computed in one round trip using
+conditional aggregates (`sum(...) FILTER (WHERE type = ...)`).
+
+Event figures come from campaign_event_buckets(): the daily rollups
+(maintained by campaign_rollup_service up to its event-id watermark) plus
+the raw campaign_events above the watermark, so reads cost O(buckets) once
+the rollup worker has caught up and are exact either way.
+
+The main dashboard's campaign timeline (dashboard_timeline) is bucketed in
+SQL with date_trunc, so only one row per day / week / month leaves the
+database however many campaigns an org has.
+
+Dashboard payloads are cached per organization for
+ANALYTICS_CACHE_TTL_SECONDS, so repeated page loads within that window do
+not touch the database at all. Committed campaign inserts, updates and
+deletes drop the owning org's entries in this process right away.
+"""
+
+import os
+import logging
+from datetime import date, datetime, time, timedelta
+from itertools import chain
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from sqlalchemy import case, event, extract, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.ttl_cache import TTLLRUCache
+from app.models.analytics_rollup import AnalyticsRollupState, CampaignEventRollupDaily
+from app.models.models import (
+    Campaign, CampaignEvent, CampaignInfluencer, ChatMessage, ContentGeneration, Influencer, User, Workflow
+)
+from app.services.campaign_rollup_service import ROLLUP_STATE_NAME, bucket_expr
+
+logger = logging.getLogger(__name__)
+
+
+ANALYTICS_CACHE_ENABLED = os.getenv("ANALYTICS_CACHE_ENABLED", "true").lower() == "true"
+ANALYTICS_CACHE_TTL_SECONDS = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "30"))
+ANALYTICS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", "1000"))
+
+# Dashboard performance ranges: (bucket unit, number of buckets, label format)
+DASHBOARD_RANGES = {
+    "7d": ("day", 7, "%a"),
+    "30d": ("day", 30, "%d %b"),
+    "3m": ("week", 12, "W %V"),
+    "6m": ("month", 6, "%b"),
+}
+DEFAULT_DASHBOARD_RANGE = "6m"
+
+
+def org_scope_key(user) -> Hashable:
+    """Cache / scope key: super admins see the whole platform, everyone else their org."""
+    return "all" if user.role == "super_admin" else user.organization_id
+
+
+def org_campaign_ids(user):
+    """Campaign ids visible to the user's org (None = unrestricted)."""
+    if user.role == "super_admin":
+        return None
+    return (
+        select(Campaign.id)
+        .join(User, Campaign.owner_id == User.id)
+        .where(User.organization_id == user.organization_id)
+    )
+
+
+def org_user_ids(user):
+    """User ids in the user's org (None = unrestricted)."""
+    if user.role == "super_admin":
+        return None
+    return select(User.id).where(User.organization_id == user.organization_id)
+
+
+def campaign_event_buckets(user, since: Optional[datetime] = None):
+    """(at, type, event_count, value_sum) rows covering every event in the user's scope.
+
+    Daily rollup rows for events up to the rollup watermark, one row per raw
+    event above it. `since` filters by day for rollups and exactly for raw events.
+    """
+    rollup = CampaignEventRollupDaily
+    watermark = select(AnalyticsRollupState.last_event_id).where(
+        AnalyticsRollupState.name == ROLLUP_STATE_NAME
+    ).scalar_subquery()
+
+    rolled = select(
+        rollup.bucket_start.label("at"),
+        rollup.type.label("type"),
+        rollup.event_count.label("event_count"),
+        rollup.value_sum.label("value_sum"),
+    )
+    tail = (
+        select(
+            CampaignEvent.created_at.label("at"),
+            func.coalesce(CampaignEvent.type, "").label("type"),
+            literal(1).label("event_count"),
+            func.coalesce(CampaignEvent.value, 0).label("value_sum"),
+        )
+        .join(Campaign, CampaignEvent.campaign_id == Campaign.id)
+        .where(CampaignEvent.id > func.coalesce(watermark, 0))
+    )
+
+    if user.role != "super_admin":
+        rolled = rolled.where(rollup.organization_id == user.organization_id)
+        tail = tail.where(CampaignEvent.campaign_id.in_(org_campaign_ids(user)))
+    if since is not None:
+        rolled = rolled.where(rollup.bucket_start >= since.replace(hour=0, minute=0, second=0, microsecond=0))
+        tail = tail.where(CampaignEvent.created_at >= since)
+
+    return union_all(rolled, tail).subquery("campaign_event_buckets")
+
+
+def dashboard_totals_query(user):
+    """One statement returning every analytics dashboard total for the user's scope."""
+    campaign_ids = org_campaign_ids(user)
+    buckets = campaign_event_buckets(user)
+
+    def count_of(event_type):
+        return func.coalesce(func.sum(buckets.c.event_count).filter(buckets.c.type == event_type), 0)
+
+    events = select(
+        func.coalesce(func.sum(buckets.c.event_count), 0).label("total_events"),
+        count_of("conversion").label("conversions"),
+        count_of("click").label("clicks"),
+        count_of("view").label("views"),
+        func.coalesce(func.sum(buckets.c.value_sum).filter(buckets.c.type == "conversion"), 0).label("revenue"),
+    ).subquery("event_totals")
+
+    active_campaigns = select(func.count()).select_from(Campaign).where(Campaign.status == "active")
+    influencers = select(Influencer.id, Influencer.followers)
+    if campaign_ids is not None:
+        active_campaigns = active_campaigns.where(Campaign.id.in_(campaign_ids))
+        # Reach counts the influencers attached to the org's campaigns, not the whole platform
+        influencers = influencers.where(
+            Influencer.id.in_(
+                select(CampaignInfluencer.influencer_id).where(CampaignInfluencer.campaign_id.in_(campaign_ids))
+            )
+        )
+
+    influencers = influencers.subquery("scoped_influencers")
+    return select(
+        events.c.total_events,
+        events.c.conversions,
+        events.c.clicks,
+        events.c.views,
+        events.c.revenue,
+        active_campaigns.scalar_subquery().label("active_campaigns"),
+        select(func.count()).select_from(influencers).scalar_subquery().label("influencers"),
+        select(func.coalesce(func.sum(influencers.c.followers), 0)).scalar_subquery().label("reach"),
+    )
+
+
+def monthly_events_query(user, since: datetime):
+    """Event counts per calendar month (1-12) since `since`."""
+    buckets = campaign_event_buckets(user, since)
+    month = extract("month", buckets.c.at).label("month")
+    return (
+        select(month, func.sum(buckets.c.event_count).label("count"))
+        .group_by(month)
+        .order_by(month)
+    )
+
+
+def dashboard_counts_query(user):
+    """One statement returning the main dashboard's stat cards for the user's scope."""
+    user_ids = org_user_ids(user)
+
+    def count(model, owner_column, *criteria):
+        stmt = select(func.count()).select_from(model).where(*criteria)
+        if user_ids is not None:
+            stmt = stmt.where(owner_column.in_(user_ids))
+        return stmt.scalar_subquery()
+
+    return select(
+        count(Campaign, Campaign.owner_id, Campaign.status == "active").label("active_campaigns"),
+        count(Workflow, Workflow.user_id).label("ai_workflows"),
+        count(ContentGeneration, ContentGeneration.user_id).label("content_generated"),
+        count(ChatMessage, ChatMessage.user_id).label("ai_conversations"),
+    )
+
+
+def campaign_timeline_query(user, dialect_name: str, unit: str, since: datetime):
+    """Campaigns created per bucket since `since`, with the simulated engagement score."""
+    bucket = bucket_expr(dialect_name, Campaign.created_at, unit).label("bucket")
+    stmt = (
+        select(
+            bucket,
+            func.count().label("campaigns"),
+            func.sum(case((Campaign.status == "active", 150), else_=50)).label("engagement"),
+        )
+        .where(Campaign.created_at >= since)
+        .group_by(bucket)
+    )
+    user_ids = org_user_ids(user)
+    if user_ids is not None:
+        stmt = stmt.where(Campaign.owner_id.in_(user_ids))
+    return stmt
+
+
+def bucket_starts(unit: str, count: int, today: date) -> List[date]:
+    """The `count` most recent bucket start dates up to today, oldest first."""
+    if unit == "day":
+        return [today - timedelta(days=offset) for offset in range(count - 1, -1, -1)]
+    if unit == "week":
+        monday = today - timedelta(days=today.weekday())
+        return [monday - timedelta(weeks=offset) for offset in range(count - 1, -1, -1)]
+    starts, year, month = [], today.year, today.month
+    for _ in range(count):
+        starts.append(date(year, month, 1))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return starts[::-1]
+
+
+def _bucket_date(value) -> date:
+    # PostgreSQL returns datetimes, SQLite "YYYY-MM-DD HH:MM:SS" strings
+    return (datetime.fromisoformat(value) if isinstance(value, str) else value).date()
+
+
+class AnalyticsService:
+    """Dashboard aggregates with a short-lived per-org cache."""
+
+    def __init__(self):
+        self.enabled = ANALYTICS_CACHE_ENABLED
+        self._cache = TTLLRUCache(ANALYTICS_CACHE_MAX_ENTRIES, ANALYTICS_CACHE_TTL_SECONDS)
+        self._counters = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    async def dashboard_totals(self, db: AsyncSession, user) -> Dict[str, Any]:
+        row = (await db.execute(dashboard_totals_query(user))).one()
+        return {key: value or 0 for key, value in row._mapping.items()}
+
+    async def monthly_events(self, db: AsyncSession, user, days: int = 365) -> List[Dict[str, int]]:
+        rows = await db.execute(monthly_events_query(user, datetime.now() - timedelta(days=days)))
+        return [{"month": int(row.month), "count": int(row.count)} for row in rows if row.month is not None]
+
+    async def dashboard_counts(self, db: AsyncSession, user) -> Dict[str, int]:
+        row = (await db.execute(dashboard_counts_query(user))).one()
+        return {key: value or 0 for key, value in row._mapping.items()}
+
+    async def dashboard_timeline(self, db: AsyncSession, user, time_range: str) -> List[Dict[str, Any]]:
+        """Zero-filled campaign series for a DASHBOARD_RANGES key: [{name, campaigns, engagement}]."""
+        unit, count, label_format = DASHBOARD_RANGES[time_range]
+        starts = bucket_starts(unit, count, date.today())
+        rows = await db.execute(
+            campaign_timeline_query(user, db.bind.dialect.name, unit, datetime.combine(starts[0], time.min))
+        )
+        by_bucket = {_bucket_date(row.bucket): row for row in rows}
+        series = []
+        for start in starts:
+            row = by_bucket.get(start)
+            series.append({
+                "name": start.strftime(label_format),
+                "campaigns": row.campaigns if row else 0,
+                "engagement": int(row.engagement or 0) if row else 0,
+            })
+        return series
+
+    async def cached(self, name: str, user, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value of `name` for the user's org, computing it with loader() on a miss."""
+        if not self.enabled:
+            return await loader()
+        key = (name, org_scope_key(user))
+        value = self._cache.get(key)
+        if value is not None:
+            self._counters["hits"] += 1
+            return value
+        self._counters["misses"] += 1
+        value = await loader()
+        self._cache.set(key, value)
+        return value
+
+    def invalidate_org(self, organization_id: Optional[int]) -> None:
+        """Drop cached payloads for one org (and the platform-wide view that includes it)."""
+        removed = self._cache.delete_where(lambda key: key[1] in (organization_id, "all"))
+        self._counters["invalidations"] += removed
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._cache),
+            "ttl_seconds": ANALYTICS_CACHE_TTL_SECONDS,
+            "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else None,
+            **self._counters,
+        }
+
+
+# Singleton instance
+analytics_service = AnalyticsService()
+
+
+# --- cache invalidation on campaign writes ------------------------------------
+
+_DIRTY_ORGS_KEY = "analytics_dirty_orgs"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_campaign_orgs(session, flush_context):
+    """Remember which orgs' campaigns this transaction changed."""
+    owner_ids = {
+        obj.owner_id for obj in chain(session.new, session.dirty, session.deleted) if isinstance(obj, Campaign)
+    }
+    if not owner_ids:
+        return
+    org_ids = session.connection().execute(
+        select(User.organization_id).where(User.id.in_(owner_ids - {None}))
+    ).scalars().all()
+    session.info.setdefault(_DIRTY_ORGS_KEY, set()).update(org_ids or [None])
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_campaign_orgs(session):
+    for organization_id in session.info.pop(_DIRTY_ORGS_KEY, ()):
+        analytics_service.invalidate_org(organization_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_campaign_orgs(session, previous_transaction):
+    session.info.pop(_DIRTY_ORGS_KEY, None)
@@ -35,6 +35,7 @@ class TokenData(BaseModel):
     role: str
     organization_id: Optional[int] = None
     token_type: str = "access"
+    issued_at: Optional[int] = None
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -44,7 +45,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "token_type": "access"})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "token_type": "access"})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -87,6 +88,7 @@ def decode_access_token(token: str) -> Optional[TokenData]:
             role=role,
             organization_id=organization_id,
             token_type=token_type,
+            issued_at=payload.get("iat"),
         )
     except JWTError:
         return None
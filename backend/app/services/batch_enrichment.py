@@ -0,0 +1,347 @@
+"""
+Batch Enrichment - Bounded-concurrency Influencers Club enrichment of handle lists.
+
+Handles are normalized and deduplicated, then enriched by at most
+ENRICHMENT_BATCH_CONCURRENCY workers (calls still pass through the shared
+provider limiter in rate_limiter.py). Transient errors (provider 429/5xx,
+network errors, limiter timeouts) are retried up to ENRICHMENT_MAX_ATTEMPTS
+times with full-jitter exponential backoff; other errors fail that handle
+only. Outcomes stream out as each handle finishes.
+
+The `batch_enrich_handles` job writes outcomes to influencer_enrichment_results
+every ENRICHMENT_CHECKPOINT_SIZE handles and reports progress, so:
+    - a handle enriched within ENRICHMENT_DEDUP_HOURS (by any batch) is served
+      from the stored row instead of a new, credit-consuming API call
+    - re-running a batch with the same id (e.g. ARQ retrying a crashed job)
+      skips handles that already finished
+
+Usage:
+    enricher = BatchEnricher(client)
+    async for outcome in enricher.stream(handles, "instagram", mode="raw"):
+        ...
+    summary = await enricher.run(batch_id, handles, "instagram", ctx=ctx)
+"""
+
+import os
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import or_, select
+
+from app.core.database import AsyncSessionLocal
+from app.models.models import InfluencerEnrichmentResult
+from app.services.job_state import report_progress
+from app.services.rate_limiter import ProviderRateLimited
+
+logger = logging.getLogger(__name__)
+
+
+ENRICHMENT_BATCH_CONCURRENCY = int(os.getenv("ENRICHMENT_BATCH_CONCURRENCY", "5"))
+ENRICHMENT_MAX_ATTEMPTS = int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "3"))
+ENRICHMENT_RETRY_BASE_SECONDS = float(os.getenv("ENRICHMENT_RETRY_BASE_SECONDS", "1"))
+ENRICHMENT_RETRY_MAX_SECONDS = float(os.getenv("ENRICHMENT_RETRY_MAX_SECONDS", "30"))
+ENRICHMENT_DEDUP_HOURS = float(os.getenv("ENRICHMENT_DEDUP_HOURS", "24"))
+ENRICHMENT_CHECKPOINT_SIZE = int(os.getenv("ENRICHMENT_CHECKPOINT_SIZE", "25"))
+ENRICHMENT_BATCH_MAX_HANDLES = int(os.getenv("ENRICHMENT_BATCH_MAX_HANDLES", "1000"))
+
+ENRICHMENT_MODES = ("raw", "full")
+# Stored results that satisfy a request for each mode (a full enrichment includes raw data)
+_SATISFIES = {"raw": ("raw", "full"), "full": ("full",)}
+# Handles per IN (...) lookup
+_LOOKUP_CHUNK = 500
+
+
+def normalize_handles(handles: List[str]) -> List[str]:
+    """Strip blanks and leading "@", lowercase and drop duplicates, keeping first-seen order."""
+    seen = set()
+    unique = []
+    for handle in handles:
+        handle = (handle or "").strip().lstrip("@").strip().lower()
+        if not handle or handle in seen:
+            continue
+        seen.add(handle)
+        unique.append(handle)
+    return unique
+
+
+def is_retryable(error: Exception) -> bool:
+    """Provider throttling, 5xx and network failures are worth retrying; bad input is not."""
+    if isinstance(error, (ProviderRateLimited, httpx.HTTPStatusError, httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, ValueError):
+        message = str(error)
+        return message.startswith("Failed to connect") or message.startswith("API error 5")
+    return False
+
+
+def retry_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2^(attempt-1)))."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@dataclass
+class HandleOutcome:
+    handle: str
+    status: str  # enriched, cached, failed
+    attempts: int = 0
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    enriched_at: Optional[datetime] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed"
+
+    def report(self) -> Dict[str, Any]:
+        return {"handle": self.handle, "status": self.status, "attempts": self.attempts, "error": self.error}
+
+
+class BatchEnricher:
+    """Enrich many handles with a concurrency cap, retries and stored-result dedup."""
+
+    def __init__(
+        self,
+        client,
+        session_factory: Optional[Callable] = AsyncSessionLocal,
+        concurrency: int = ENRICHMENT_BATCH_CONCURRENCY,
+        max_attempts: int = ENRICHMENT_MAX_ATTEMPTS,
+        retry_base_seconds: float = ENRICHMENT_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = ENRICHMENT_RETRY_MAX_SECONDS,
+        dedup_hours: float = ENRICHMENT_DEDUP_HOURS,
+        checkpoint_size: int = ENRICHMENT_CHECKPOINT_SIZE,
+    ):
+        self.client = client
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.dedup_hours = dedup_hours
+        self.checkpoint_size = max(1, checkpoint_size)
+
+    # --- enrichment ------------------------------------------------------------
+
+    async def _enrich_one(self, handle: str, platform: str, mode: str) -> HandleOutcome:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                data = await self.client.enrich_handle(handle, platform, mode)
+                return HandleOutcome(handle, "enriched", attempt, data=data, enriched_at=datetime.now(timezone.utc))
+            except Exception as e:
+                if attempt >= self.max_attempts or not is_retryable(e):
+                    logger.warning(f"[BatchEnrich] {platform}/{handle} failed after {attempt} attempt(s): {e}")
+                    return HandleOutcome(handle, "failed", attempt, error=str(e)[:500] or type(e).__name__)
+                delay = retry_delay(attempt, self.retry_base_seconds, self.retry_max_seconds)
+                if isinstance(e, ProviderRateLimited):
+                    delay += e.retry_after
+                await asyncio.sleep(delay)
+
+    async def stream(
+        self,
+        handles: List[str],
+        platform: str,
+        mode: str = "raw",
+        batch_id: Optional[str] = None,
+    ) -> AsyncIterator[HandleOutcome]:
+        """
+        Yield one outcome per unique handle as soon as it is known.
+
+        Handles with a recent stored result (or already finished in `batch_id`)
+        come first as "cached"; the rest are enriched by `concurrency` workers.
+        Closing the iterator early cancels the workers.
+        """
+        handles = normalize_handles(handles)
+        stored = await self._stored_results(handles, platform, mode, batch_id)
+        for handle in handles:
+            if handle in stored:
+                yield stored[handle]
+
+        pending: asyncio.Queue = asyncio.Queue()
+        for handle in handles:
+            if handle not in stored:
+                pending.put_nowait(handle)
+        remaining = pending.qsize()
+        if not remaining:
+            return
+
+        done: asyncio.Queue = asyncio.Queue()
+
+        async def worker() -> None:
+            while True:
+                try:
+                    handle = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await done.put(await self._enrich_one(handle, platform, mode))
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.concurrency, remaining))]
+        try:
+            for _ in range(remaining):
+                yield await done.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _stored_results(
+        self,
+        handles: List[str],
+        platform: str,
+        mode: str,
+        batch_id: Optional[str],
+    ) -> Dict[str, HandleOutcome]:
+        """Recent successful results per handle (newest first wins)."""
+        if self.session_factory is None or not handles:
+            return {}
+        conditions = []
+        if self.dedup_hours > 0:
+            cutoff = datetime.now(timezone.utc) - timedelta(hours=self.dedup_hours)
+            conditions.append(InfluencerEnrichmentResult.enriched_at >= cutoff)
+        if batch_id:
+            conditions.append(InfluencerEnrichmentResult.batch_id == batch_id)
+        if not conditions:
+            return {}
+
+        found: Dict[str, HandleOutcome] = {}
+        async with self.session_factory() as session:
+            for start in range(0, len(handles), _LOOKUP_CHUNK):
+                result = await session.execute(
+                    select(InfluencerEnrichmentResult)
+                    .where(
+                        InfluencerEnrichmentResult.platform == platform,
+                        InfluencerEnrichmentResult.handle.in_(handles[start:start + _LOOKUP_CHUNK]),
+                        InfluencerEnrichmentResult.mode.in_(_SATISFIES.get(mode, (mode,))),
+                        InfluencerEnrichmentResult.status.in_(("enriched", "cached")),
+                        or_(*conditions),
+                    )
+                    .order_by(InfluencerEnrichmentResult.enriched_at.desc())
+                )
+                for row in result.scalars().all():
+                    if row.handle not in found:
+                        found[row.handle] = HandleOutcome(
+                            row.handle, "cached", 0, data=row.data, enriched_at=_utc(row.enriched_at),
+                        )
+        return found
+
+    # --- job -----------------------------------------------------------------
+
+    async def run(
+        self,
+        batch_id: str,
+        handles: List[str],
+        platform: str,
+        mode: str = "raw",
+        organization_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        ctx: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """Enrich a batch, checkpointing outcomes and reporting progress as they arrive."""
+        total = len(normalize_handles(handles))
+        counts = {"enriched": 0, "cached": 0, "failed": 0}
+        results: List[Dict[str, Any]] = []
+        buffer: List[HandleOutcome] = []
+
+        async def flush() -> None:
+            await self._checkpoint(batch_id, organization_id, user_id, platform, mode, buffer)
+            await report_progress(
+                ctx,
+                len(results) * 100 / (total or 1),
+                message=f"{counts['enriched']} enriched, {counts['cached']} cached, {counts['failed']} failed",
+                partial_result=[outcome.report() for outcome in buffer],
+            )
+            buffer.clear()
+
+        logger.info(f"[BatchEnrich] Batch {batch_id}: {total} handles on {platform} ({mode} mode)")
+        async for outcome in self.stream(handles, platform, mode, batch_id=batch_id):
+            counts[outcome.status] += 1
+            results.append(outcome.report())
+            buffer.append(outcome)
+            if len(buffer) >= self.checkpoint_size:
+                await flush()
+        if buffer:
+            await flush()
+
+        return {
+            "batch_id": batch_id,
+            "platform": platform,
+            "mode": mode,
+            "total_handles": total,
+            **counts,
+            "results": results,
+        }
+
+    async def _checkpoint(
+        self,
+        batch_id: str,
+        organization_id: Optional[int],
+        user_id: Optional[int],
+        platform: str,
+        mode: str,
+        outcomes: List[HandleOutcome],
+    ) -> None:
+        """Upsert one result row per handle, in one transaction."""
+        if self.session_factory is None or not outcomes:
+            return
+        async with self.session_factory() as session:
+            existing = await session.execute(
+                select(InfluencerEnrichmentResult).where(
+                    InfluencerEnrichmentResult.batch_id == batch_id,
+                    InfluencerEnrichmentResult.platform == platform,
+                    InfluencerEnrichmentResult.handle.in_([outcome.handle for outcome in outcomes]),
+                )
+            )
+            rows = {row.handle: row for row in existing.scalars().all()}
+
+            for outcome in outcomes:
+                row = rows.get(outcome.handle)
+                if row is None:
+                    row = InfluencerEnrichmentResult(
+                        batch_id=batch_id, organization_id=organization_id, user_id=user_id,
+                        platform=platform, handle=outcome.handle, mode=mode, attempts=0,
+                    )
+                    session.add(row)
+                row.status = outcome.status
+                row.error = outcome.error
+                row.attempts = (row.attempts or 0) + outcome.attempts
+                if outcome.ok:
+                    row.data = outcome.data
+                    row.enriched_at = outcome.enriched_at
+
+            await session.commit()
+
+
+async def batch_report(
+    session,
+    batch_id: str,
+    organization_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Stored per-handle outcomes of a batch, restricted to the organization (or user) that ran it."""
+    query = select(InfluencerEnrichmentResult).where(InfluencerEnrichmentResult.batch_id == batch_id)
+    if organization_id is not None:
+        query = query.where(InfluencerEnrichmentResult.organization_id == organization_id)
+    elif user_id is not None:
+        query = query.where(InfluencerEnrichmentResult.user_id == user_id)
+    result = await session.execute(query.order_by(InfluencerEnrichmentResult.id))
+    return [
+        {
+            "handle": row.handle,
+            "platform": row.platform,
+            "mode": row.mode,
+            "status": row.status,
+            "attempts": row.attempts,
+            "error": row.error,
+            "enriched_at": _utc(row.enriched_at).isoformat() if row.enriched_at else None,
+        }
+        for row in result.scalars().all()
+    ]
@@ -0,0 +1,171 @@
+"""
+Bulk Email Service - Batched, rate-limited campaign email sending.
+
+Recipients are processed in batches. With SendGrid configured each batch is a
+single multi-personalization request; otherwise recipients are sent
+individually within a bounded concurrency window. Provider token buckets
+(see rate_limiter.py) are applied inside cpaas_service.
+
+After every batch the per-recipient outcomes are written to
+`campaign_email_deliveries`. Those rows double as the checkpoint: re-running a
+send with the same send_id (e.g. ARQ retrying a crashed job) skips recipients
+that are already marked sent.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models.models import CampaignEmailDelivery
+from app.services.cpaas_service import cpaas_service, SENDGRID_MAX_PERSONALIZATIONS
+from app.services.job_state import report_progress
+
+logger = logging.getLogger(__name__)
+
+
+BULK_EMAIL_BATCH_SIZE = int(os.getenv("BULK_EMAIL_BATCH_SIZE", "500"))
+BULK_EMAIL_CONCURRENCY = int(os.getenv("BULK_EMAIL_CONCURRENCY", "10"))
+
+# Cap on failures echoed in the job result; the full list is in the delivery rows
+MAX_REPORTED_FAILURES = 100
+
+
+def normalize_recipients(recipients: List[str]) -> List[str]:
+    """Strip blanks and drop case-insensitive duplicates, keeping first-seen order."""
+    seen = set()
+    unique = []
+    for email in recipients:
+        email = (email or "").strip()
+        key = email.lower()
+        if not email or key in seen:
+            continue
+        seen.add(key)
+        unique.append(email)
+    return unique
+
+
+class BulkEmailSender:
+    """Send one email to many recipients with checkpointed, per-recipient results."""
+
+    def __init__(
+        self,
+        session_factory: Callable = AsyncSessionLocal,
+        sender=cpaas_service,
+        batch_size: int = BULK_EMAIL_BATCH_SIZE,
+        concurrency: int = BULK_EMAIL_CONCURRENCY,
+    ):
+        self.session_factory = session_factory
+        self.sender = sender
+        self.batch_size = max(1, min(batch_size, SENDGRID_MAX_PERSONALIZATIONS))
+        self.concurrency = max(1, concurrency)
+
+    async def send(
+        self,
+        send_id: str,
+        campaign_id: Optional[int],
+        recipients: List[str],
+        subject: str,
+        body: str,
+        ctx: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        recipients = normalize_recipients(recipients)
+
+        already_sent = await self._load_sent(send_id)
+        pending = [email for email in recipients if email.lower() not in already_sent]
+        skipped = len(recipients) - len(pending)
+        if skipped:
+            logger.info(f"[BulkEmail] Resuming send {send_id}: {skipped} recipients already sent")
+
+        sent_count = 0
+        failed_count = 0
+        failures: List[Dict[str, str]] = []
+        total = len(pending) or 1
+
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            results = await self._send_batch(batch, subject, body)
+            await self._checkpoint(send_id, campaign_id, batch, results)
+
+            for email, result in zip(batch, results):
+                if result.get("status") == "sent":
+                    sent_count += 1
+                else:
+                    failed_count += 1
+                    if len(failures) < MAX_REPORTED_FAILURES:
+                        failures.append({"email": email, "error": result.get("error", result.get("status", "failed"))})
+
+            done = start + len(batch)
+            await report_progress(
+                ctx,
+                done * 100 / total,
+                message=f"{sent_count} sent, {failed_count} failed, {skipped} skipped",
+            )
+
+        return {
+            "send_id": send_id,
+            "total_recipients": len(recipients),
+            "sent": sent_count,
+            "failed": failed_count,
+            "skipped": skipped,
+            "failures": failures,
+        }
+
+    async def _load_sent(self, send_id: str) -> set:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(CampaignEmailDelivery.email).where(
+                    CampaignEmailDelivery.send_id == send_id,
+                    CampaignEmailDelivery.status == "sent",
+                )
+            )
+            return {email.lower() for email in result.scalars().all()}
+
+    async def _send_batch(self, batch: List[str], subject: str, body: str) -> List[Dict]:
+        if self.sender.supports_email_batch:
+            return await self.sender.send_email_batch(batch, subject, body)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send_one(email: str) -> Dict:
+            async with semaphore:
+                try:
+                    return await self.sender.send_email(email, subject, body)
+                except Exception as e:
+                    logger.error(f"Failed to send to {email}: {e}")
+                    return {"status": "failed", "error": str(e)}
+
+        return await asyncio.gather(*(send_one(email) for email in batch))
+
+    async def _checkpoint(
+        self,
+        send_id: str,
+        campaign_id: Optional[int],
+        batch: List[str],
+        results: List[Dict],
+    ) -> None:
+        """Upsert one delivery row per recipient in the batch, in one transaction."""
+        async with self.session_factory() as session:
+            existing = await session.execute(
+                select(CampaignEmailDelivery).where(
+                    CampaignEmailDelivery.send_id == send_id,
+                    CampaignEmailDelivery.email.in_(batch),
+                )
+            )
+            rows = {row.email: row for row in existing.scalars().all()}
+
+            for email, result in zip(batch, results):
+                row = rows.get(email)
+                if row is None:
+                    row = CampaignEmailDelivery(send_id=send_id, campaign_id=campaign_id, email=email, attempts=0)
+                    session.add(row)
+                row.status = "sent" if result.get("status") == "sent" else "failed"
+                row.provider = result.get("provider")
+                row.message_id = result.get("message_id")
+                row.error = result.get("error")
+                row.attempts = (row.attempts or 0) + 1
+
+            await session.commit()
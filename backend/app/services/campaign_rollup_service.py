@@ -0,0 +1,254 @@
+"""
+Campaign event rollup maintenance.
+
+Folds new campaign_events rows into the hourly and daily rollup tables
+(app.models.analytics_rollup), so analytics reads cost O(buckets) instead
+of O(events):
+
+    1. lock the watermark row (analytics_rollup_state, FOR UPDATE on
+       PostgreSQL so concurrent workers serialize)
+    2. aggregate events with watermark < id <= upper bound, grouped by
+       hour / campaign / type, in the database
+    3. upsert the hourly groups and their daily sums, additively
+    4. advance the watermark - all in one transaction
+
+The upper bound only covers events inserted more than ROLLUP_SETTLE_SECONDS
+ago (by the server-set `ingested_at`, never the client-supplied event time,
+so backdated or replayed events cannot move it forward) so a slow
+transaction that allocated a lower id is not skipped. Readers combine
+the rollups with the raw tail above the watermark (see analytics_service),
+so results stay exact whether or not the worker has caught up.
+
+Run in-process by campaign_event_rollup_worker(), from the command line
+with scripts/rollup_campaign_events.py (catch up, --rebuild, --check).
+"""
+
+import os
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analytics_rollup import AnalyticsRollupState, CampaignEventRollupDaily, CampaignEventRollupHourly
+from app.models.models import Campaign, CampaignEvent, User
+
+logger = logging.getLogger(__name__)
+
+
+ROLLUP_STATE_NAME = "campaign_events"
+ROLLUP_ENABLED = os.getenv("ROLLUP_ENABLED", "true").lower() == "true"
+ROLLUP_INTERVAL_SECONDS = float(os.getenv("ROLLUP_INTERVAL_SECONDS", "60"))
+ROLLUP_BATCH_SIZE = int(os.getenv("ROLLUP_BATCH_SIZE", "100000"))
+ROLLUP_SETTLE_SECONDS = float(os.getenv("ROLLUP_SETTLE_SECONDS", "10"))
+
+RollupKey = Tuple[datetime, int, str]
+
+
+SQLITE_BUCKET_PATTERNS = {
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+    "month": "%Y-%m-01 00:00:00",
+}
+
+
+def bucket_expr(dialect_name: str, column, unit: str):
+    """Truncate a timestamp to the start of its hour / day / week (Monday) / month in SQL."""
+    if dialect_name == "postgresql":
+        return func.date_trunc(unit, column)
+    if unit == "week":
+        # Back up six days, then forward to the next Monday: the Monday on or before the date
+        return func.datetime(func.date(column, "-6 days", "weekday 1"))
+    return func.strftime(SQLITE_BUCKET_PATTERNS[unit], column)
+
+
+def _as_datetime(value) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _upsert(dialect_name: str, table):
+    """INSERT ... ON CONFLICT (pk) DO UPDATE adding counts to the existing bucket (executemany)."""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=["bucket_start", "campaign_id", "type"],
+        set_={
+            "event_count": table.c.event_count + stmt.excluded.event_count,
+            "value_sum": table.c.value_sum + stmt.excluded.value_sum,
+            "organization_id": stmt.excluded.organization_id,
+        },
+    )
+
+
+class CampaignRollupService:
+    """Incremental, watermark-driven maintenance of the campaign event rollups."""
+
+    def __init__(self):
+        self._counters = {"runs": 0, "events": 0, "errors": 0}
+        self._last_run_at = None
+
+    async def _lock_state(self, session: AsyncSession) -> AnalyticsRollupState:
+        state = (await session.execute(
+            select(AnalyticsRollupState)
+            .where(AnalyticsRollupState.name == ROLLUP_STATE_NAME)
+            .with_for_update()
+            .execution_options(populate_existing=True)  # another worker may have advanced it
+        )).scalar_one_or_none()
+        if state is None:
+            state = AnalyticsRollupState(name=ROLLUP_STATE_NAME, last_event_id=0)
+            session.add(state)
+            await session.flush()
+        return state
+
+    async def watermark(self, session: AsyncSession) -> int:
+        value = await session.scalar(
+            select(AnalyticsRollupState.last_event_id).where(AnalyticsRollupState.name == ROLLUP_STATE_NAME)
+        )
+        return value or 0
+
+    async def _upper_bound(self, session: AsyncSession, after_id: int, settle_seconds: float) -> int:
+        stmt = select(func.max(CampaignEvent.id)).where(CampaignEvent.id > after_id)
+        if settle_seconds > 0:
+            stmt = stmt.where(CampaignEvent.ingested_at <= datetime.now(timezone.utc) - timedelta(seconds=settle_seconds))
+        return await session.scalar(stmt) or after_id
+
+    async def _aggregate(self, session: AsyncSession, after_id: int, upto_id: int) -> Dict[RollupKey, list]:
+        dialect = session.bind.dialect.name
+        hour = bucket_expr(dialect, CampaignEvent.created_at, "hour").label("hour")
+        event_type = func.coalesce(CampaignEvent.type, "").label("type")
+        rows = await session.execute(
+            select(
+                hour,
+                CampaignEvent.campaign_id,
+                event_type,
+                func.max(User.organization_id).label("organization_id"),
+                func.count().label("event_count"),
+                func.coalesce(func.sum(CampaignEvent.value), 0).label("value_sum"),
+            )
+            .join(Campaign, CampaignEvent.campaign_id == Campaign.id)
+            .outerjoin(User, Campaign.owner_id == User.id)
+            .where(CampaignEvent.id > after_id, CampaignEvent.id <= upto_id)
+            .group_by(hour, CampaignEvent.campaign_id, event_type)
+        )
+        return {
+            (_as_datetime(row.hour), row.campaign_id, row.type): [row.organization_id, row.event_count, row.value_sum]
+            for row in rows
+        }
+
+    async def _apply(self, session: AsyncSession, hourly: Dict[RollupKey, list]) -> None:
+        daily: Dict[RollupKey, list] = defaultdict(lambda: [None, 0, 0])
+        for (hour, campaign_id, event_type), (org_id, count, value) in hourly.items():
+            day = daily[(hour.replace(hour=0), campaign_id, event_type)]
+            day[0] = org_id
+            day[1] += count
+            day[2] += value
+
+        dialect = session.bind.dialect.name
+        for model, groups in ((CampaignEventRollupHourly, hourly), (CampaignEventRollupDaily, daily)):
+            rows = [
+                {"bucket_start": bucket, "campaign_id": campaign_id, "type": event_type,
+                 "organization_id": org_id, "event_count": count, "value_sum": value}
+                for (bucket, campaign_id, event_type), (org_id, count, value) in groups.items()
+            ]
+            if rows:
+                await session.execute(_upsert(dialect, model.__table__), rows)
+
+    async def run_once(self, session: AsyncSession, settle_seconds: float = ROLLUP_SETTLE_SECONDS,
+                       batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+        """Fold pending events into the rollups; returns how many events were processed."""
+        processed = 0
+        while True:
+            state = await self._lock_state(session)
+            after_id = state.last_event_id
+            upto_id = min(await self._upper_bound(session, after_id, settle_seconds), after_id + batch_size)
+            if upto_id <= after_id:
+                await session.commit()
+                break
+
+            hourly = await self._aggregate(session, after_id, upto_id)
+            await self._apply(session, hourly)
+            events = sum(count for _, count, _ in hourly.values())
+            state.last_event_id = upto_id
+            await session.commit()
+
+            processed += events
+            logger.info(f"Rolled up {events} campaign events (ids {after_id + 1}..{upto_id})")
+
+        self._counters["runs"] += 1
+        self._counters["events"] += processed
+        self._last_run_at = datetime.utcnow()
+        return processed
+
+    async def rebuild(self, session: AsyncSession) -> int:
+        """Drop all rollups and re-aggregate every event (backfill)."""
+        state = await self._lock_state(session)
+        await session.execute(delete(CampaignEventRollupHourly))
+        await session.execute(delete(CampaignEventRollupDaily))
+        state.last_event_id = 0
+        await session.commit()
+        return await self.run_once(session, settle_seconds=0)
+
+    async def check(self, session: AsyncSession) -> List[Dict[str, Any]]:
+        """Compare daily rollups with raw events up to the watermark; returns mismatching buckets."""
+        upto_id = await self.watermark(session)
+        dialect = session.bind.dialect.name
+        day = bucket_expr(dialect, CampaignEvent.created_at, "day").label("day")
+        event_type = func.coalesce(CampaignEvent.type, "").label("type")
+        raw = await session.execute(
+            select(day, CampaignEvent.campaign_id, event_type,
+                   func.count().label("event_count"), func.coalesce(func.sum(CampaignEvent.value), 0).label("value_sum"))
+            .join(Campaign, CampaignEvent.campaign_id == Campaign.id)
+            .where(CampaignEvent.id <= upto_id)
+            .group_by(day, CampaignEvent.campaign_id, event_type)
+        )
+        expected = {(_as_datetime(r.day), r.campaign_id, r.type): (r.event_count, r.value_sum) for r in raw}
+
+        rolled = await session.execute(select(
+            CampaignEventRollupDaily.bucket_start, CampaignEventRollupDaily.campaign_id, CampaignEventRollupDaily.type,
+            CampaignEventRollupDaily.event_count, CampaignEventRollupDaily.value_sum,
+        ))
+        actual = {(_as_datetime(r[0]).replace(tzinfo=None), r[1], r[2]): (r[3], r[4]) for r in rolled}
+        expected = {(key[0].replace(tzinfo=None),) + key[1:]: value for key, value in expected.items()}
+
+        mismatches = []
+        for key in sorted(expected.keys() | actual.keys()):
+            if expected.get(key, (0, 0)) != actual.get(key, (0, 0)):
+                mismatches.append({
+                    "day": key[0].date().isoformat(), "campaign_id": key[1], "type": key[2],
+                    "events": expected.get(key, (0, 0)), "rollup": actual.get(key, (0, 0)),
+                })
+        return mismatches
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": ROLLUP_ENABLED,
+            "last_run_at": self._last_run_at.isoformat() if self._last_run_at else None,
+            **self._counters,
+        }
+
+
+# Singleton instance
+campaign_rollups = CampaignRollupService()
+
+
+async def campaign_event_rollup_worker(interval_seconds: float = ROLLUP_INTERVAL_SECONDS) -> None:
+    """Background loop folding new campaign events into the rollups."""
+    from app.core.database import AsyncSessionLocal
+
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                await campaign_rollups.run_once(session)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            campaign_rollups._counters["errors"] += 1
+            logger.exception(f"Campaign event rollup error: {exc}")
+
+        await asyncio.sleep(interval_seconds)
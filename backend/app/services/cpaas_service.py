@@ -6,10 +6,13 @@ Falls back to mock mode when API keys are not configured.
 
 import os
 import random
+import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
+from app.services.rate_limiter import get_provider_bucket
+
 logger = logging.getLogger(__name__)
 
 # Optional imports - graceful fallback if not installed
@@ -28,6 +31,9 @@ except ImportError:
     SENDGRID_AVAILABLE = False
     logger.warning("SendGrid SDK not installed. Email will use mock mode.")
 
+# SendGrid accepts up to 1000 personalizations per v3 mail/send request
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+
 
 class CPaaSService:
     """
@@ -86,7 +92,8 @@ class CPaaSService:
                     plain_text_content=body,
                     html_content=html_content or body
                 )
-                response = self.sendgrid_client.send(message)
+                await get_provider_bucket("sendgrid").acquire()
+                response = await asyncio.to_thread(self.sendgrid_client.send, message)
                 logger.info(f"Email sent to {to_email}, status: {response.status_code}")
                 return {
                     "status": "sent" if response.status_code == 202 else "failed",
@@ -104,6 +111,57 @@ class CPaaSService:
         logger.info(f"[Mock] Email sent to {to_email}: {subject}")
         return self._mock_response("email", "SendGrid")
 
+    @property
+    def supports_email_batch(self) -> bool:
+        """True when one request can deliver to many recipients (SendGrid personalizations)."""
+        return self.sendgrid_client is not None
+
+    async def send_email_batch(
+        self,
+        to_emails: List[str],
+        subject: str,
+        body: str,
+        html_content: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Send the same email to up to SENDGRID_MAX_PERSONALIZATIONS recipients
+        in one SendGrid request, one personalization per recipient (recipients
+        do not see each other). Returns one result dict per recipient, in order.
+        Falls back to per-recipient mock results if SendGrid is not configured.
+        """
+        if len(to_emails) > SENDGRID_MAX_PERSONALIZATIONS:
+            raise ValueError(f"At most {SENDGRID_MAX_PERSONALIZATIONS} recipients per batch")
+        
+        if self.sendgrid_client:
+            try:
+                message = Mail(
+                    from_email=self.sendgrid_from,
+                    to_emails=to_emails,
+                    subject=subject,
+                    plain_text_content=body,
+                    html_content=html_content or body,
+                    is_multiple=True
+                )
+                await get_provider_bucket("sendgrid").acquire()
+                response = await asyncio.to_thread(self.sendgrid_client.send, message)
+                logger.info(f"Batch email sent to {len(to_emails)} recipients, status: {response.status_code}")
+                result = {
+                    "status": "sent" if response.status_code == 202 else "failed",
+                    "provider": "SendGrid",
+                    "message_id": response.headers.get("X-Message-Id", "unknown"),
+                    "status_code": response.status_code,
+                    "timestamp": datetime.now().isoformat(),
+                    "mock": False
+                }
+            except Exception as e:
+                logger.error(f"SendGrid batch error: {e}")
+                result = {"status": "failed", "error": str(e), "provider": "SendGrid"}
+            return [dict(result) for _ in to_emails]
+        
+        # Mock mode
+        logger.info(f"[Mock] Batch email sent to {len(to_emails)} recipients: {subject}")
+        return [self._mock_response("email", "SendGrid") for _ in to_emails]
+
     async def send_sms(self, phone_number: str, message: str) -> Dict:
         """
         Send an SMS via Twilio.
@@ -111,7 +169,9 @@ class CPaaSService:
         """
         if self.twilio_client and self.twilio_phone:
             try:
-                msg = self.twilio_client.messages.create(
+                await get_provider_bucket("twilio").acquire()
+                msg = await asyncio.to_thread(
+                    self.twilio_client.messages.create,
                     body=message,
                     from_=self.twilio_phone,
                     to=phone_number
@@ -144,7 +204,9 @@ class CPaaSService:
                 to_number = f"whatsapp:{phone_number}" if not phone_number.startswith("whatsapp:") else phone_number
                 from_number = f"whatsapp:{self.twilio_phone}" if not self.twilio_phone.startswith("whatsapp:") else self.twilio_phone
                 
-                msg = self.twilio_client.messages.create(
+                await get_provider_bucket("twilio").acquire()
+                msg = await asyncio.to_thread(
+                    self.twilio_client.messages.create,
                     body=content,
                     from_=from_number,
                     to=to_number
@@ -0,0 +1,418 @@
+"""
+Full-text and faceted search over creators and influencers.
+
+Two backends behind one interface (creator_search.search):
+
+    - PostgreSQL: a `search_vector` generated tsvector column on creators
+      (handle weight A, name B, category C, bio D) with a GIN index, plus
+      pg_trgm GIN indexes on creator and influencer handles for partial /
+      misspelled handles (migration f7b9d1e3a5c8).
+      Ranked by ts_rank_cd with document-length normalization plus handle
+      trigram similarity. The database maintains both indexes on every write.
+    - In-memory inverted index (SQLite, tests): field-weighted BM25 with
+      prefix matching and a handle substring fallback. Built from the
+      database on first use and then maintained from committed ORM writes
+      (session after_flush / after_commit hooks, like the analytics cache).
+
+Every query term must match (prefixes allowed); a handle match alone is
+also enough. Facets (platform, follower range, minimum engagement,
+location, category) are applied as filters in either backend.
+
+Usage:
+    hits = await creator_search.search(db, "vegan recipes", SearchFilters(platform="TikTok", min_followers=10000))
+    # [SearchHit(kind="creator", id=12, score=7.4), ...]
+"""
+
+import os
+import re
+import math
+import bisect
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, and_, cast, event, func, literal, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.creator import Creator
+from app.models.models import Influencer
+
+logger = logging.getLogger(__name__)
+
+
+# auto: PostgreSQL full-text when the database is PostgreSQL, else the in-memory index
+CREATOR_SEARCH_BACKEND = os.getenv("CREATOR_SEARCH_BACKEND", "auto").lower()
+CREATOR_SEARCH_TRIGRAM_THRESHOLD = float(os.getenv("CREATOR_SEARCH_TRIGRAM_THRESHOLD", "0.3"))
+
+# BM25 parameters and per-field term weights for the in-memory index
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {"handle": 3.0, "name": 2.0, "category": 2.0, "tags": 1.5, "bio": 1.0}
+PREFIX_MATCH_FACTOR = 0.8
+HANDLE_MATCH_BONUS = 2.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
+DocKey = Tuple[str, int]  # ("creator" | "influencer", id)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def parse_engagement_rate(value) -> Optional[float]:
+    """Engagement as a float; Influencer.engagement_rate is free text such as '4.2%'."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    match = re.search(r"\d+(?:\.\d+)?", str(value))
+    return float(match.group()) if match else None
+
+
+@dataclass
+class SearchFilters:
+    platform: Optional[str] = None
+    min_followers: Optional[int] = None
+    max_followers: Optional[int] = None
+    min_engagement: Optional[float] = None
+    location: Optional[str] = None
+    category: Optional[str] = None
+
+
+@dataclass
+class SearchHit:
+    kind: str
+    id: int
+    score: float
+
+
+@dataclass
+class SearchDocument:
+    """Indexed text and facet values of one creator / influencer."""
+    key: DocKey
+    fields: Dict[str, str]
+    platform: Optional[str] = None
+    followers: int = 0
+    engagement: Optional[float] = None
+    location: Optional[str] = None
+    category: Optional[str] = None
+    handle: str = ""
+    terms: Dict[str, float] = field(default_factory=dict)
+    length: float = 0.0
+
+    def __post_init__(self):
+        terms: Dict[str, float] = defaultdict(float)
+        for name, text in self.fields.items():
+            for token in tokenize(text):
+                terms[token] += FIELD_WEIGHTS[name]
+        self.terms = dict(terms)
+        self.length = sum(self.terms.values())
+
+    def matches(self, filters: SearchFilters) -> bool:
+        if filters.platform and (self.platform or "").lower() != filters.platform.lower():
+            return False
+        if filters.min_followers is not None and self.followers < filters.min_followers:
+            return False
+        if filters.max_followers is not None and self.followers > filters.max_followers:
+            return False
+        if filters.min_engagement and (self.engagement or 0) < filters.min_engagement:
+            return False
+        if filters.location and filters.location.lower() not in (self.location or "").lower():
+            return False
+        if filters.category and filters.category.lower() not in (self.category or "").lower():
+            return False
+        return True
+
+
+def creator_document(creator: Creator) -> SearchDocument:
+    tags = creator.tags if isinstance(creator.tags, list) else []
+    return SearchDocument(
+        key=("creator", creator.id),
+        fields={
+            "handle": (creator.handle or "").lstrip("@"),
+            "name": creator.name or "",
+            "category": creator.category or "",
+            "tags": " ".join(str(tag) for tag in tags),
+            "bio": creator.bio or "",
+        },
+        platform=creator.platform,
+        followers=creator.follower_count or 0,
+        engagement=creator.engagement_rate,
+        location=creator.location,
+        category=creator.category,
+        handle=(creator.handle or "").lstrip("@").lower(),
+    )
+
+
+def influencer_document(influencer: Influencer) -> SearchDocument:
+    handle = (influencer.handle or "").lstrip("@")
+    return SearchDocument(
+        key=("influencer", influencer.id),
+        fields={"handle": handle},
+        platform=influencer.platform,
+        followers=influencer.followers or 0,
+        engagement=parse_engagement_rate(influencer.engagement_rate),
+        handle=handle.lower(),
+    )
+
+
+class InvertedIndex:
+    """Term -> postings index with BM25 scoring; documents can be replaced or removed one at a time."""
+
+    def __init__(self):
+        self.docs: Dict[DocKey, SearchDocument] = {}
+        self.postings: Dict[str, Dict[DocKey, float]] = defaultdict(dict)
+        self._sorted_terms: Optional[List[str]] = None
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, doc: SearchDocument) -> None:
+        self.remove(doc.key)
+        self.docs[doc.key] = doc
+        self._total_length += doc.length
+        for term, weight in doc.terms.items():
+            if term not in self.postings:
+                self._sorted_terms = None
+            self.postings[term][doc.key] = weight
+
+    def remove(self, key: DocKey) -> None:
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for term in doc.terms:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self.postings[term]
+                    self._sorted_terms = None
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """The token itself plus indexed terms it is a prefix of."""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        expanded = [(token, 1.0)] if token in self.postings else []
+        start = bisect.bisect_left(self._sorted_terms, token)
+        for term in self._sorted_terms[start:]:
+            if not term.startswith(token):
+                break
+            if term != token:
+                expanded.append((term, PREFIX_MATCH_FACTOR))
+        return expanded
+
+    def search(self, query: str, filters: SearchFilters, limit: int) -> List[SearchHit]:
+        tokens = tokenize(query)
+        total_docs = len(self.docs)
+        if not total_docs:
+            return []
+        avg_length = self._total_length / total_docs or 1.0
+
+        scores: Dict[DocKey, float] = defaultdict(float)
+        matched_tokens: Dict[DocKey, int] = defaultdict(int)
+        for token in tokens:
+            seen = set()
+            for term, factor in self._expand(token):
+                postings = self.postings[term]
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, tf in postings.items():
+                    length = self.docs[key].length
+                    scores[key] += factor * idf * tf * (BM25_K1 + 1) / (
+                        tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                    )
+                    seen.add(key)
+            for key in seen:
+                matched_tokens[key] += 1
+
+        # Every term must match, unless the handle itself matches the query
+        candidates = {key for key, count in matched_tokens.items() if count == len(tokens)}
+        handle_query = query.strip().lstrip("@").lower()
+        if handle_query:
+            for key, doc in self.docs.items():
+                if handle_query in doc.handle:
+                    candidates.add(key)
+                    scores[key] += HANDLE_MATCH_BONUS * (2.0 if doc.handle == handle_query else 1.0)
+
+        hits = [
+            SearchHit(kind=key[0], id=key[1], score=round(scores[key], 4))
+            for key in candidates
+            if self.docs[key].matches(filters)
+        ]
+        hits.sort(key=lambda hit: (-hit.score, hit.kind, hit.id))
+        return hits[:limit]
+
+
+# --- PostgreSQL backend -------------------------------------------------------
+
+def _tsquery(tokens: List[str]):
+    """All tokens, each also matching as a prefix: 'veg:* & recip:*'."""
+    return func.to_tsquery("simple", " & ".join(f"{token}:*" for token in tokens))
+
+
+def _pg_statement(model, tokens: List[str], handle_query: str, filters: SearchFilters, limit: int):
+    table = model.__table__
+    vector = literal_column(f"{table.name}.search_vector")
+    handle = table.c.handle
+    matches = []
+    rank = literal(0.0)
+    # Influencer rows only carry a handle, so they are matched on handle trigrams alone
+    if tokens and model is Creator:
+        tsquery = _tsquery(tokens)
+        matches.append(vector.op("@@")(tsquery))
+        # Normalization 1: divide by 1 + log(document length)
+        rank = func.ts_rank_cd(vector, tsquery, 1)
+    if handle_query:
+        matches.append(handle.op("%")(handle_query))
+        matches.append(handle.ilike(f"%{handle_query}%"))
+        rank = rank + HANDLE_MATCH_BONUS * func.similarity(handle, handle_query)
+
+    score = rank.label("score")
+    stmt = select(table.c.id, score).where(or_(*matches))
+
+    if model is Creator:
+        followers, engagement, platform = table.c.follower_count, table.c.engagement_rate, table.c.platform
+    else:
+        followers, platform = table.c.followers, table.c.platform
+        engagement = cast(
+            func.nullif(func.regexp_replace(table.c.engagement_rate, r"[^0-9.]", "", "g"), ""), Float
+        )
+    criteria = []
+    if filters.platform:
+        criteria.append(func.lower(platform) == filters.platform.lower())
+    if filters.min_followers is not None:
+        criteria.append(followers >= filters.min_followers)
+    if filters.max_followers is not None:
+        criteria.append(followers <= filters.max_followers)
+    if filters.min_engagement:
+        criteria.append(engagement >= filters.min_engagement)
+    if filters.location:
+        if model is not Creator:
+            return None  # influencers carry no location
+        criteria.append(table.c.location.ilike(f"%{filters.location}%"))
+    if filters.category:
+        if model is not Creator:
+            return None
+        criteria.append(table.c.category.ilike(f"%{filters.category}%"))
+    if criteria:
+        stmt = stmt.where(and_(*criteria))
+    return stmt.order_by(score.desc(), table.c.id).limit(limit)
+
+
+class CreatorSearchService:
+    """Dispatches searches to PostgreSQL full-text or the in-memory index."""
+
+    def __init__(self):
+        self._index: Optional[InvertedIndex] = None
+        self._counters = {"searches": 0, "index_builds": 0, "index_updates": 0}
+
+    def _use_postgres(self, db: AsyncSession) -> bool:
+        if CREATOR_SEARCH_BACKEND == "auto":
+            return db.bind.dialect.name == "postgresql"
+        return CREATOR_SEARCH_BACKEND == "postgres"
+
+    async def search(
+        self, db: AsyncSession, query: str, filters: Optional[SearchFilters] = None, limit: int = 10
+    ) -> List[SearchHit]:
+        filters = filters or SearchFilters()
+        self._counters["searches"] += 1
+        if self._use_postgres(db):
+            return await self._search_postgres(db, query, filters, limit)
+        index = await self._ensure_index(db)
+        return index.search(query, filters, limit)
+
+    async def _search_postgres(self, db: AsyncSession, query: str, filters: SearchFilters, limit: int) -> List[SearchHit]:
+        tokens = tokenize(query)
+        handle_query = query.strip().lstrip("@").lower()
+        if not tokens and not handle_query:
+            return []
+        await db.execute(select(func.set_limit(CREATOR_SEARCH_TRIGRAM_THRESHOLD)))
+        hits = []
+        for kind, model in (("creator", Creator), ("influencer", Influencer)):
+            stmt = _pg_statement(model, tokens, handle_query, filters, limit)
+            if stmt is None:
+                continue
+            rows = await db.execute(stmt)
+            hits.extend(SearchHit(kind=kind, id=row.id, score=round(float(row.score), 4)) for row in rows)
+        hits.sort(key=lambda hit: (-hit.score, hit.kind, hit.id))
+        return hits[:limit]
+
+    async def _ensure_index(self, db: AsyncSession) -> InvertedIndex:
+        if self._index is None:
+            index = InvertedIndex()
+            for creator in (await db.execute(select(Creator))).scalars():
+                index.add(creator_document(creator))
+            for influencer in (await db.execute(select(Influencer))).scalars():
+                index.add(influencer_document(influencer))
+            self._index = index
+            self._counters["index_builds"] += 1
+            logger.info(f"Built in-memory creator search index ({len(index)} documents)")
+        return self._index
+
+    def apply(self, upserts: List[SearchDocument], deletes: List[DocKey]) -> None:
+        """Apply committed writes to the in-memory index (no-op until it is built)."""
+        if self._index is None:
+            return
+        for key in deletes:
+            self._index.remove(key)
+        for doc in upserts:
+            self._index.add(doc)
+        self._counters["index_updates"] += len(upserts) + len(deletes)
+
+    def reset(self) -> None:
+        self._index = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": CREATOR_SEARCH_BACKEND,
+            "indexed_documents": len(self._index) if self._index is not None else None,
+            **self._counters,
+        }
+
+
+# Singleton instance
+creator_search = CreatorSearchService()
+
+
+# --- incremental maintenance of the in-memory index ---------------------------
+
+_PENDING_KEY = "creator_search_pending"
+_DOCUMENT_BUILDERS = {Creator: creator_document, Influencer: influencer_document}
+_DOCUMENT_KINDS = {Creator: "creator", Influencer: "influencer"}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_search_changes(session, flush_context):
+    if creator_search._index is None:
+        return
+    upserts, deletes = session.info.get(_PENDING_KEY, ({}, set()))
+    for obj in chain(session.new, session.dirty):
+        builder = _DOCUMENT_BUILDERS.get(type(obj))
+        if builder is not None:
+            doc = builder(obj)
+            upserts[doc.key] = doc
+            deletes.discard(doc.key)
+    for obj in session.deleted:
+        kind = _DOCUMENT_KINDS.get(type(obj))
+        if kind is not None:
+            key = (kind, obj.id)
+            upserts.pop(key, None)
+            deletes.add(key)
+    if upserts or deletes:
+        session.info[_PENDING_KEY] = (upserts, deletes)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_search_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        upserts, deletes = pending
+        creator_search.apply(list(upserts.values()), list(deletes))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_search_changes(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
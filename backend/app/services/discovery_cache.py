@@ -0,0 +1,206 @@
+"""
+Discovery Result Cache - Cached Influencers Club search pages.
+
+/discovery/search pages are keyed by the caller's organization and the
+canonicalized request (platform, filters, limit, page). A repeated search
+is answered without calling the provider, and no credits are deducted again.
+
+Freshness:
+    - Younger than DISCOVERY_CACHE_TTL_SECONDS: served as-is
+    - Up to DISCOVERY_CACHE_STALE_SECONDS older: served immediately while
+      one background task per key refetches the page (stale-while-revalidate)
+    - Older: a miss
+
+Tiers:
+    - In-process LRU (DISCOVERY_CACHE_MAX_ENTRIES entries)
+    - Redis (shared by all API workers), attached by JobQueue.connect() when
+      Redis is available and DISCOVERY_CACHE_REDIS_ENABLED is set
+
+Usage:
+    key = discovery_cache_key(scope, platform, filters, limit, page)
+    page = await discovery_cache.get(key)
+    if page and page.stale:
+        discovery_cache.revalidate(key, fetch)
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.core.ttl_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+
+DISCOVERY_CACHE_ENABLED = os.getenv("DISCOVERY_CACHE_ENABLED", "true").lower() == "true"
+DISCOVERY_CACHE_MAX_ENTRIES = int(os.getenv("DISCOVERY_CACHE_MAX_ENTRIES", "500"))
+DISCOVERY_CACHE_TTL_SECONDS = int(os.getenv("DISCOVERY_CACHE_TTL_SECONDS", "900"))
+DISCOVERY_CACHE_STALE_SECONDS = int(os.getenv("DISCOVERY_CACHE_STALE_SECONDS", "3600"))
+DISCOVERY_CACHE_REDIS_ENABLED = os.getenv("DISCOVERY_CACHE_REDIS_ENABLED", "true").lower() == "true"
+DISCOVERY_CACHE_KEY_PREFIX = os.getenv("DISCOVERY_CACHE_KEY_PREFIX", "cadence:discovery:")
+
+
+def _canonical(value: Any) -> Any:
+    """Drop empty values, normalize text case/whitespace and order lists of scalars."""
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, dict):
+        items = ((str(k), _canonical(v)) for k, v in value.items())
+        return {k: v for k, v in items if v not in (None, "", [], {})}
+    if isinstance(value, (list, tuple, set)):
+        items = [_canonical(v) for v in value]
+        items = [v for v in items if v not in (None, "", [], {})]
+        if all(isinstance(v, (str, int, float)) for v in items):
+            return sorted(set(items), key=lambda v: (str(type(v)), v))
+        return items
+    return value
+
+
+def discovery_cache_key(scope: Hashable, platform: str, filters: Dict[str, Any], limit: int, page: int) -> str:
+    """Hash of the organization scope and the canonicalized search request."""
+    material = json.dumps(
+        [str(scope), _canonical(platform), _canonical(filters), int(limit), int(page)],
+        sort_keys=True, default=str, ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def discovery_cache_scope(user) -> str:
+    """Entries are isolated per organization (per user when there is none)."""
+    if user.organization_id is not None:
+        return f"org:{user.organization_id}"
+    return f"user:{user.id}"
+
+
+@dataclass
+class CachedPage:
+    result: Dict[str, Any]
+    age_seconds: float
+    stale: bool
+
+    def info(self) -> Dict[str, Any]:
+        return {"hit": True, "stale": self.stale, "age_seconds": round(self.age_seconds, 1)}
+
+
+class DiscoveryResultCache:
+    """Two-tier (local LRU + optional Redis) cache of discovery result pages."""
+
+    def __init__(
+        self,
+        max_entries: int = DISCOVERY_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = DISCOVERY_CACHE_TTL_SECONDS,
+        stale_seconds: int = DISCOVERY_CACHE_STALE_SECONDS,
+        enabled: bool = DISCOVERY_CACHE_ENABLED,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._clock = clock
+        self._local = TTLLRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds + stale_seconds)
+        self._redis: Optional[Any] = None
+        self._revalidating: Dict[str, asyncio.Task] = {}
+        self._counters = {
+            "hits": 0, "stale_hits": 0, "redis_hits": 0, "misses": 0, "stores": 0,
+            "revalidations": 0, "revalidation_errors": 0, "redis_errors": 0,
+        }
+
+    def use_redis(self, redis: Optional[Any]) -> None:
+        """Attach (or detach with None) a redis.asyncio client as the shared tier."""
+        self._redis = redis if DISCOVERY_CACHE_REDIS_ENABLED else None
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(key)
+        if entry is not None or self._redis is None:
+            return entry
+        try:
+            raw = await self._redis.get(DISCOVERY_CACHE_KEY_PREFIX + key)
+        except Exception as e:
+            self._counters["redis_errors"] += 1
+            logger.warning(f"Discovery cache Redis read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        try:
+            entry = json.loads(raw)
+        except ValueError:
+            return None
+        self._counters["redis_hits"] += 1
+        self._local.set(key, entry, max(1.0, self._expires_in(entry)))
+        return entry
+
+    def _expires_in(self, entry: Dict[str, Any]) -> float:
+        return entry["stored_at"] + self.ttl_seconds + self.stale_seconds - self._clock()
+
+    async def get(self, key: str) -> Optional[CachedPage]:
+        """The cached page, or None when missing or past the stale window."""
+        if not self.enabled:
+            return None
+        entry = await self._load(key)
+        if entry is None or self._expires_in(entry) <= 0:
+            self._counters["misses"] += 1
+            return None
+        age = max(0.0, self._clock() - entry["stored_at"])
+        stale = age > self.ttl_seconds
+        self._counters["stale_hits" if stale else "hits"] += 1
+        return CachedPage(result=entry["result"], age_seconds=age, stale=stale)
+
+    async def set(self, key: str, result: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        entry = {"stored_at": self._clock(), "result": result}
+        self._local.set(key, entry)
+        self._counters["stores"] += 1
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    DISCOVERY_CACHE_KEY_PREFIX + key,
+                    json.dumps(entry, default=str),
+                    ex=self.ttl_seconds + self.stale_seconds,
+                )
+            except Exception as e:
+                self._counters["redis_errors"] += 1
+                logger.warning(f"Discovery cache Redis write failed: {e}")
+
+    def revalidate(self, key: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Optional[asyncio.Task]:
+        """Refetch a stale page in the background; at most one refresh per key per process."""
+        if key in self._revalidating:
+            return None
+        task = asyncio.ensure_future(self._revalidate(key, fetch))
+        self._revalidating[key] = task
+        task.add_done_callback(lambda done, key=key: self._revalidating.pop(key, None))
+        return task
+
+    async def _revalidate(self, key: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        self._counters["revalidations"] += 1
+        try:
+            await self.set(key, await fetch())
+        except Exception as e:
+            self._counters["revalidation_errors"] += 1
+            logger.warning(f"Discovery cache revalidation failed: {e}")
+
+    def clear(self) -> None:
+        self._local.clear()
+        for name in self._counters:
+            self._counters[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["stale_hits"] + self._counters["misses"]
+        served = self._counters["hits"] + self._counters["stale_hits"]
+        return {
+            "enabled": self.enabled,
+            "backend": "memory+redis" if self._redis is not None else "memory",
+            "entries": len(self._local),
+            "revalidating": len(self._revalidating),
+            "hit_rate": round(served / lookups, 3) if lookups else None,
+            **self._counters,
+        }
+
+
+# Singleton instance
+discovery_cache = DiscoveryResultCache()
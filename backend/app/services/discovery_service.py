@@ -8,6 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.schemas import InfluencerProfile, DiscoveryFilter
 from app.models.models import Influencer
 from app.models.creator import Creator
+from app.services.creator_search import SearchFilters, creator_search, parse_engagement_rate
+from app.services.rate_limiter import get_provider_limiter, parse_retry_after
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -72,6 +74,7 @@ class DiscoveryService:
         Priority: DB -> Modash API -> Mock
         """
         profiles = []
+        db_profiles = []
         
         # 1. Try database first
         if db:
@@ -95,8 +98,9 @@ class DiscoveryService:
         if not profiles:
             profiles = await DiscoveryService._generate_mock_profiles(query, filters)
         
-        # Sort by match score descending
-        profiles.sort(key=lambda x: x.match_score, reverse=True)
+        # Database hits keep their search rank; the rest sort by match score descending
+        ranked = len(db_profiles)
+        profiles[ranked:] = sorted(profiles[ranked:], key=lambda x: x.match_score, reverse=True)
         return profiles[:12]  # Cap at 12 results
 
     @staticmethod
@@ -106,57 +110,47 @@ class DiscoveryService:
         db: AsyncSession
     ) -> List[InfluencerProfile]:
         """
-        Search Creators and Influencers tables in database.
+        Ranked full-text search over Creators and Influencers (see creator_search).
         """
+        hits = await creator_search.search(db, query, DiscoveryService._search_filters(filters), limit=10)
+        if not hits:
+            return []
+
+        creator_ids = [hit.id for hit in hits if hit.kind == "creator"]
+        influencer_ids = [hit.id for hit in hits if hit.kind == "influencer"]
+        rows = {}
+        if creator_ids:
+            result = await db.execute(select(Creator).where(Creator.id.in_(creator_ids)))
+            rows.update((("creator", c.id), c) for c in result.scalars())
+        if influencer_ids:
+            result = await db.execute(select(Influencer).where(Influencer.id.in_(influencer_ids)))
+            rows.update((("influencer", i.id), i) for i in result.scalars())
+
+        # Keep search rank order
         profiles = []
-        search_term = f"%{query.lower()}%"
-        
-        # Search Creators table
-        stmt = select(Creator).where(
-            or_(
-                Creator.handle.ilike(search_term),
-                Creator.name.ilike(search_term),
-                Creator.category.ilike(search_term),
-                Creator.bio.ilike(search_term)
-            )
-        )
-        
-        # Apply filters
-        if filters:
-            if filters.min_reach:
-                stmt = stmt.where(Creator.follower_count >= filters.min_reach)
-            if filters.platform:
-                stmt = stmt.where(Creator.platform.ilike(f"%{filters.platform}%"))
-            if filters.engagement:
-                stmt = stmt.where(Creator.engagement_rate >= filters.engagement)
-            if filters.niche:
-                stmt = stmt.where(or_(
-                    Creator.category.ilike(f"%{filters.niche}%"),
-                    Creator.bio.ilike(f"%{filters.niche}%")
-                ))
-        
-        stmt = stmt.limit(10)
-        
-        result = await db.execute(stmt)
-        creators = result.scalars().all()
-        
-        for creator in creators:
-            profiles.append(DiscoveryService._creator_to_profile(creator))
-        
-        # Also search Influencers table for additional results
-        if len(profiles) < 10:
-            stmt = select(Influencer).where(
-                Influencer.handle.ilike(search_term)
-            ).limit(10 - len(profiles))
-            
-            result = await db.execute(stmt)
-            influencers = result.scalars().all()
-            
-            for influencer in influencers:
-                profiles.append(DiscoveryService._influencer_to_profile(influencer))
-        
+        for hit in hits:
+            row = rows.get((hit.kind, hit.id))
+            if row is None:
+                continue
+            if hit.kind == "creator":
+                profiles.append(DiscoveryService._creator_to_profile(row))
+            else:
+                profiles.append(DiscoveryService._influencer_to_profile(row))
         return profiles
 
+    @staticmethod
+    def _search_filters(filters: Optional[DiscoveryFilter]) -> SearchFilters:
+        if not filters:
+            return SearchFilters()
+        return SearchFilters(
+            platform=filters.platform,
+            min_followers=filters.min_reach or None,
+            max_followers=filters.max_reach,
+            min_engagement=filters.min_engagement or None,
+            location=filters.location,
+            category=filters.category,
+        )
+
     @staticmethod
     def _creator_to_profile(creator: Creator) -> InfluencerProfile:
         """Convert Creator model to InfluencerProfile schema."""
@@ -192,7 +186,7 @@ class DiscoveryService:
             platform=influencer.platform or "Instagram",
             avatar_color=f"hsl({hash(influencer.handle) % 360}, 70%, 50%)",
             followers=influencer.followers or 0,
-            engagement_rate=float(influencer.engagement_rate or 0.0) if influencer.engagement_rate else 0.0,
+            engagement_rate=parse_engagement_rate(influencer.engagement_rate) or 0.0,
             content_style_match=metrics.get("styles", ["Authentic"]),
             voice_analysis=metrics.get("voice", ["Trending"]),
             image_recognition_tags=metrics.get("tags", ["Campaign Member"]),
@@ -248,8 +242,12 @@ class DiscoveryService:
              if filters.location:
                  pass
 
+        limiter = get_provider_limiter("modash")
+        await limiter.acquire()
         async with aiohttp.ClientSession() as session:
             async with session.post(MODASH_BASE_URL, json=payload, headers=headers) as resp:
+                if resp.status == 429:
+                    await limiter.throttled(parse_retry_after(resp.headers.get("Retry-After")))
                 if resp.status != 200:
                     raise Exception(f"Modash API returned {resp.status}")
                 
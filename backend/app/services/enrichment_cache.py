@@ -0,0 +1,204 @@
+"""
+Enrichment Freshness Cache - Serve stored creator enrichments while fresh enough.
+
+/discovery/enrich answers from the newest stored result for the platform and
+handle in influencer_enrichment_results (written by this cache and by batch
+enrichment jobs) when it is younger than the max age for the requested mode:
+
+    - raw:  ENRICHMENT_MAX_AGE_RAW_HOURS  (a stored full result also qualifies)
+    - full: ENRICHMENT_MAX_AGE_FULL_HOURS
+
+A stored result older than ENRICHMENT_REFRESH_AHEAD_FRACTION of its max age
+is still served, and one background request refreshes it. Concurrent
+enrichments of the same handle and mode in a process share one provider
+call (app.core.single_flight).
+
+Usage:
+    data, info = await enrichment_cache.enrich(client, "instagram", "nike", "raw")
+"""
+
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.database import AsyncSessionLocal
+from app.core.single_flight import SingleFlight, flight_key
+from app.models.models import InfluencerEnrichmentResult
+from app.services.batch_enrichment import _SATISFIES, _utc, normalize_handles
+
+logger = logging.getLogger(__name__)
+
+
+ENRICHMENT_CACHE_ENABLED = os.getenv("ENRICHMENT_CACHE_ENABLED", "true").lower() == "true"
+ENRICHMENT_MAX_AGE_HOURS = {
+    "raw": float(os.getenv("ENRICHMENT_MAX_AGE_RAW_HOURS", "168")),
+    "full": float(os.getenv("ENRICHMENT_MAX_AGE_FULL_HOURS", "720")),
+}
+ENRICHMENT_REFRESH_AHEAD_FRACTION = float(os.getenv("ENRICHMENT_REFRESH_AHEAD_FRACTION", "0.8"))
+
+
+class EnrichmentFreshnessCache:
+    """Freshness policy over stored enrichment results, with refresh-ahead and coalescing."""
+
+    def __init__(
+        self,
+        session_factory: Callable = AsyncSessionLocal,
+        max_age_hours: Optional[Dict[str, float]] = None,
+        refresh_ahead_fraction: float = ENRICHMENT_REFRESH_AHEAD_FRACTION,
+        enabled: bool = ENRICHMENT_CACHE_ENABLED,
+    ):
+        self.session_factory = session_factory
+        self.max_age_hours = dict(max_age_hours or ENRICHMENT_MAX_AGE_HOURS)
+        self.refresh_ahead_fraction = refresh_ahead_fraction
+        self.enabled = enabled
+        self._flights = SingleFlight("enrichment")
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._counters = {
+            "hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0, "store_errors": 0,
+        }
+
+    def _max_age(self, mode: str) -> Optional[timedelta]:
+        hours = self.max_age_hours.get(mode)
+        return timedelta(hours=hours) if hours and hours > 0 else None
+
+    async def enrich(
+        self,
+        client,
+        platform: str,
+        handle: str,
+        mode: str = "raw",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Return (enrichment, cache info) for a handle, calling the provider only when
+        no stored result is fresh enough.
+        """
+        normalized = normalize_handles([handle])
+        max_age = self._max_age(mode)
+        if not self.enabled or not normalized or max_age is None:
+            return await client.enrich_handle(handle, platform, mode), {"hit": False}
+
+        handle = normalized[0]
+        platform = platform.lower()
+        key = flight_key(platform, handle, mode)
+
+        async def fetch() -> Dict[str, Any]:
+            data = await client.enrich_handle(handle, platform, mode)
+            await self._store(platform, handle, mode, data)
+            return data
+
+        stored = await self._lookup(platform, handle, mode, max_age)
+        if stored is None:
+            self._counters["misses"] += 1
+            return await self._flights.do(key, fetch), {"hit": False}
+
+        data, enriched_at = stored
+        age = datetime.now(timezone.utc) - enriched_at
+        refreshing = age >= max_age * self.refresh_ahead_fraction
+        if refreshing:
+            self._refresh(key, fetch)
+        self._counters["hits"] += 1
+        return data, {"hit": True, "age_seconds": round(age.total_seconds(), 1), "refreshing": refreshing}
+
+    def _refresh(self, key: str, fetch: Callable) -> None:
+        """Refetch in the background; joins an in-flight fetch for the same key if there is one."""
+        if key in self._refreshing:
+            return
+        self._counters["refreshes"] += 1
+        task = asyncio.ensure_future(self._run_refresh(key, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda done, key=key: self._refreshing.pop(key, None))
+
+    async def _run_refresh(self, key: str, fetch: Callable) -> None:
+        try:
+            await self._flights.do(key, fetch)
+        except Exception as e:
+            self._counters["refresh_errors"] += 1
+            logger.warning(f"Enrichment refresh failed: {e}")
+
+    async def _lookup(
+        self,
+        platform: str,
+        handle: str,
+        mode: str,
+        max_age: timedelta,
+    ) -> Optional[Tuple[Dict[str, Any], datetime]]:
+        cutoff = datetime.now(timezone.utc) - max_age
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(InfluencerEnrichmentResult.data, InfluencerEnrichmentResult.enriched_at)
+                .where(
+                    InfluencerEnrichmentResult.platform == platform,
+                    InfluencerEnrichmentResult.handle == handle,
+                    InfluencerEnrichmentResult.mode.in_(_SATISFIES.get(mode, (mode,))),
+                    InfluencerEnrichmentResult.status.in_(("enriched", "cached")),
+                    InfluencerEnrichmentResult.enriched_at >= cutoff,
+                )
+                .order_by(InfluencerEnrichmentResult.enriched_at.desc())
+                .limit(1)
+            )
+            row = result.first()
+        if row is None or row.data is None:
+            return None
+        return row.data, _utc(row.enriched_at)
+
+    async def _store(
+        self,
+        platform: str,
+        handle: str,
+        mode: str,
+        data: Dict[str, Any],
+    ) -> None:
+        """
+        Upsert the single interactive-enrichment row for this handle and mode.
+        The row is shared by every organization, so it has no owner and never
+        appears in an organization's batch report.
+        """
+        batch_id = f"enrich:{mode}"
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(InfluencerEnrichmentResult).where(
+                        InfluencerEnrichmentResult.batch_id == batch_id,
+                        InfluencerEnrichmentResult.platform == platform,
+                        InfluencerEnrichmentResult.handle == handle,
+                    )
+                )
+                row = result.scalars().first()
+                if row is None:
+                    row = InfluencerEnrichmentResult(
+                        batch_id=batch_id, platform=platform, handle=handle, mode=mode, attempts=0,
+                    )
+                    session.add(row)
+                row.status = "enriched"
+                row.data = data
+                row.error = None
+                row.attempts = (row.attempts or 0) + 1
+                row.enriched_at = datetime.now(timezone.utc)
+                await session.commit()
+        except IntegrityError:
+            # Another worker stored the same handle first; its result is as fresh
+            logger.debug(f"Enrichment for {platform}/{handle} already stored by another worker")
+        except Exception as e:
+            # The caller still gets the provider result
+            self._counters["store_errors"] += 1
+            logger.warning(f"Failed to store enrichment for {platform}/{handle}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "max_age_hours": self.max_age_hours,
+            "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else None,
+            "refreshing": len(self._refreshing),
+            **self._counters,
+            **self._flights.stats(),
+        }
+
+
+# Singleton instance
+enrichment_cache = EnrichmentFreshnessCache()
@@ -0,0 +1,311 @@
+"""
+High-throughput campaign event ingestion.
+
+Tracking traffic (clicks, views, conversions) is buffered in memory and
+written to campaign_events in large batches instead of one ORM row per
+event:
+
+    - submit() queues validated rows and waits until they are durable
+      (group commit): callers are acknowledged only after their rows are
+      committed to the database or written to the local spool
+    - the flusher writes everything queued once EVENT_INGEST_FLUSH_SIZE rows
+      are waiting or EVENT_INGEST_FLUSH_INTERVAL_SECONDS have passed, with
+      one multi-row INSERT (asyncpg COPY on PostgreSQL) per flush
+    - back-pressure: more than EVENT_INGEST_MAX_BUFFERED queued rows makes
+      submit() raise IngestBackpressure (the endpoint answers 429)
+    - if the database write fails, the batch is fsync'ed to an NDJSON file
+      in EVENT_INGEST_SPOOL_DIR and replayed once the database is back
+
+Delivery is at-least-once: a crash between a replayed batch's commit and the
+removal of its spool file re-inserts that batch on the next replay. A flush
+cancelled mid-write (shutdown) spools its rows before stopping.
+
+Usage:
+    await event_ingestor.start()                 # app startup
+    await event_ingestor.submit([{"campaign_id": 1, "type": "click", ...}])
+    await event_ingestor.close()                 # app shutdown: final flush
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import CampaignEvent
+
+logger = logging.getLogger(__name__)
+
+
+EVENT_INGEST_FLUSH_SIZE = int(os.getenv("EVENT_INGEST_FLUSH_SIZE", "5000"))
+EVENT_INGEST_FLUSH_INTERVAL_SECONDS = float(os.getenv("EVENT_INGEST_FLUSH_INTERVAL_SECONDS", "0.25"))
+EVENT_INGEST_MAX_BUFFERED = int(os.getenv("EVENT_INGEST_MAX_BUFFERED", "100000"))
+EVENT_INGEST_SPOOL_DIR = os.getenv("EVENT_INGEST_SPOOL_DIR", "./spool/campaign_events")
+EVENT_INGEST_REPLAY_INTERVAL_SECONDS = float(os.getenv("EVENT_INGEST_REPLAY_INTERVAL_SECONDS", "30"))
+EVENT_INGEST_MAX_BATCH = int(os.getenv("EVENT_INGEST_MAX_BATCH", "10000"))
+EVENT_INGEST_MAX_BODY_BYTES = int(os.getenv("EVENT_INGEST_MAX_BODY_BYTES", str(8 * 1024 * 1024)))
+EVENT_INGEST_COPY_ENABLED = os.getenv("EVENT_INGEST_COPY_ENABLED", "true").lower() == "true"
+# A replay claim older than this belongs to a crashed process and is taken over
+EVENT_INGEST_STALE_CLAIM_SECONDS = float(os.getenv("EVENT_INGEST_STALE_CLAIM_SECONDS", "600"))
+
+# Client-supplied occurred_at outside [now - MAX_AGE, now + MAX_FUTURE] is rejected
+EVENT_OCCURRED_AT_MAX_AGE_DAYS = float(os.getenv("EVENT_OCCURRED_AT_MAX_AGE_DAYS", "90"))
+EVENT_OCCURRED_AT_MAX_FUTURE_SECONDS = float(os.getenv("EVENT_OCCURRED_AT_MAX_FUTURE_SECONDS", "300"))
+
+# ingested_at is left to the database default so it reflects the actual insert
+EVENT_COLUMNS = ("campaign_id", "type", "value", "metadata_json", "created_at", "occurred_at")
+_TIME_COLUMNS = ("created_at", "occurred_at")
+
+
+class IngestBackpressure(Exception):
+    """Too many events are queued; the caller should retry later."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Event buffer full, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class EventIngestor:
+    """Buffered, batched, spool-backed writer for campaign_events."""
+
+    def __init__(
+        self,
+        session_factory=None,
+        flush_size: int = EVENT_INGEST_FLUSH_SIZE,
+        flush_interval: float = EVENT_INGEST_FLUSH_INTERVAL_SECONDS,
+        max_buffered: int = EVENT_INGEST_MAX_BUFFERED,
+        spool_dir: str = EVENT_INGEST_SPOOL_DIR,
+    ):
+        self._session_factory = session_factory
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        self.max_buffered = max(self.flush_size, max_buffered)
+        self.spool_dir = spool_dir
+
+        self._pending: List[Tuple[List[Dict[str, Any]], asyncio.Future]] = []
+        self._buffered = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._last_replay = 0.0
+        self._counters = {
+            "accepted": 0, "flushes": 0, "inserted": 0, "spooled": 0,
+            "replayed": 0, "backpressure": 0, "failed": 0,
+        }
+
+    # --- lifecycle -----------------------------------------------------------
+
+    def _factory(self):
+        if self._session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+
+    def _lock(self) -> asyncio.Lock:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        await self.replay_spool()
+
+    async def close(self) -> None:
+        """Stop the flusher and write out everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    # --- producer side -------------------------------------------------------
+
+    async def submit(self, rows: List[Dict[str, Any]]) -> int:
+        """Queue rows for insertion and wait until they are durable; returns len(rows)."""
+        if not rows:
+            return 0
+        if self._buffered + len(rows) > self.max_buffered:
+            self._counters["backpressure"] += 1
+            raise IngestBackpressure(retry_after=max(1.0, self.flush_interval * 4))
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((rows, future))
+        self._buffered += len(rows)
+        self._counters["accepted"] += len(rows)
+
+        if self._task is None:
+            # No background flusher (scripts, tests): flush inline
+            await self.flush()
+        elif self._buffered >= self.flush_size:
+            self._wake.set()
+        await future
+        return len(rows)
+
+    # --- flusher -------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                await self.flush()
+                if time.monotonic() - self._last_replay >= EVENT_INGEST_REPLAY_INTERVAL_SECONDS:
+                    await self.replay_spool()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.exception(f"Event ingest flusher error: {exc}")
+
+    async def flush(self) -> int:
+        """Write every queued row in one batch; resolves the waiting submitters."""
+        async with self._lock():
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, []
+            rows = [row for batch, _ in pending for row in batch]
+            try:
+                try:
+                    await self._write(rows)
+                    self._counters["inserted"] += len(rows)
+                except asyncio.CancelledError:
+                    self._spool_cancelled(pending, rows)
+                    raise
+                except Exception as exc:  # noqa: BLE001 - any DB failure falls back to the spool
+                    logger.warning(f"Event insert failed ({exc!r}); spooling {len(rows)} events")
+                    self._spool(rows)
+                    self._counters["spooled"] += len(rows)
+            except Exception as exc:  # noqa: BLE001 - neither DB nor spool: fail the submitters
+                self._counters["failed"] += len(rows)
+                logger.error(f"Event spool write failed, {len(rows)} events rejected: {exc}")
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                self._counters["flushes"] += 1
+                for _, future in pending:
+                    if not future.done():
+                        future.set_result(None)
+            finally:
+                self._buffered -= len(rows)
+            return len(rows)
+
+    def _spool_cancelled(self, pending, rows: List[Dict[str, Any]]) -> None:
+        """The write was cancelled (e.g. shutdown) with its outcome unknown: make the rows durable."""
+        try:
+            self._spool(rows)
+        except Exception as exc:  # noqa: BLE001
+            self._counters["failed"] += len(rows)
+            logger.error(f"Event flush cancelled and spool write failed, {len(rows)} events rejected: {exc}")
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self._counters["spooled"] += len(rows)
+        logger.warning(f"Event flush cancelled mid-write; spooled {len(rows)} events")
+        for _, future in pending:
+            if not future.done():
+                future.set_result(None)
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        async with self._factory()() as session:
+            await self._insert(session, rows)
+            await session.commit()
+
+    async def _insert(self, session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        if session.bind.dialect.name == "postgresql" and session.bind.dialect.driver == "asyncpg" and EVENT_INGEST_COPY_ENABLED:
+            connection = await session.connection()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                CampaignEvent.__tablename__,
+                records=[tuple(row.get(column) for column in EVENT_COLUMNS) for row in rows],
+                columns=list(EVENT_COLUMNS),
+            )
+        else:
+            # executemany; SQLAlchemy batches these into multi-row INSERTs
+            await session.execute(insert(CampaignEvent.__table__), rows)
+
+    # --- spool ---------------------------------------------------------------
+
+    def _spool(self, rows: List[Dict[str, Any]]) -> str:
+        """Durably write rows to a new NDJSON spool file; returns its path."""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        name = f"events-{time.time_ns()}-{os.getpid()}.ndjson"
+        tmp_path = os.path.join(self.spool_dir, name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            for row in rows:
+                handle.write(json.dumps(row, default=lambda value: value.isoformat()) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        path = os.path.join(self.spool_dir, name)
+        os.replace(tmp_path, path)
+        return path
+
+    def _claimable_spool_files(self) -> List[str]:
+        if not os.path.isdir(self.spool_dir):
+            return []
+        now = time.time()
+        files = []
+        for name in sorted(os.listdir(self.spool_dir)):
+            path = os.path.join(self.spool_dir, name)
+            if name.endswith(".ndjson"):
+                files.append(path)
+            elif ".ndjson.replaying-" in name and now - os.path.getmtime(path) > EVENT_INGEST_STALE_CLAIM_SECONDS:
+                files.append(path)
+        return files
+
+    async def replay_spool(self) -> int:
+        """Insert spooled batches; each file is claimed by rename so workers sharing the dir don't double-replay."""
+        self._last_replay = time.monotonic()
+        replayed = 0
+        for path in self._claimable_spool_files():
+            claimed = f"{path.split('.ndjson')[0]}.ndjson.replaying-{os.getpid()}"
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue  # another worker claimed it
+            os.utime(claimed)
+
+            with open(claimed, encoding="utf-8") as handle:
+                rows = [json.loads(line) for line in handle if line.strip()]
+            for row in rows:
+                row.setdefault("occurred_at", None)  # spooled before the column existed
+                for column in _TIME_COLUMNS:
+                    if row.get(column):
+                        row[column] = datetime.fromisoformat(row[column])
+            try:
+                await self._write(rows)
+            except Exception as exc:  # noqa: BLE001
+                os.replace(claimed, path)  # release; retry on the next replay
+                logger.warning(f"Spool replay deferred, database still unavailable: {exc!r}")
+                break
+            os.remove(claimed)
+            replayed += len(rows)
+            self._counters["replayed"] += len(rows)
+            logger.info(f"Replayed {len(rows)} spooled events from {os.path.basename(path)}")
+        return replayed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buffered": self._buffered,
+            "max_buffered": self.max_buffered,
+            "spool_files": len(self._claimable_spool_files()),
+            **self._counters,
+        }
+
+
+# Singleton instance
+event_ingestor = EventIngestor()
@@ -8,13 +8,22 @@ Usage:
     1. Start Redis: docker run -d -p 6379:6379 redis:alpine
     2. Start Worker: arq app.services.job_queue.WorkerSettings
     3. Enqueue jobs via the job_service singleton
+
+Without Redis, jobs run on a bounded in-process pool (see local_job_pool.py).
 """
 
 import os
 import json
 import logging
 from typing import Optional, Dict, Any, Callable
-from datetime import datetime, timedelta
+from datetime import timedelta
+
+from app.services.job_state import job_state, RedisJobStateBackend
+from app.services.llm_cache import llm_cache
+from app.services.discovery_cache import discovery_cache
+from app.services.principal_cache import principal_cache
+from app.services.rate_limiter import use_rate_limit_redis
+from app.services.local_job_pool import LocalJobPool, JobPoolFullError, JobPoolClosedError
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +31,7 @@ logger = logging.getLogger(__name__)
 try:
     from arq import create_pool
     from arq.connections import RedisSettings, ArqRedis
+    from arq.worker import func as arq_func
     ARQ_AVAILABLE = True
 except ImportError:
     ARQ_AVAILABLE = False
@@ -33,6 +43,8 @@ REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_DB = int(os.getenv("REDIS_DB", "0"))
+# Keep API startup fast when Redis is absent (ARQ defaults to 5 retries)
+REDIS_CONN_RETRIES = int(os.getenv("REDIS_CONN_RETRIES", "1"))
 
 
 class JobStatus:
@@ -43,27 +55,26 @@ class JobStatus:
     FAILED = "failed"
 
 
-class JobResult:
-    """Represents the result of a background job."""
-    def __init__(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
-        self.job_id = job_id
-        self.status = status
-        self.result = result
-        self.error = error
-        self.created_at = datetime.utcnow()
-    
-    def to_dict(self) -> Dict:
-        return {
-            "job_id": self.job_id,
-            "status": self.status,
-            "result": self.result,
-            "error": self.error,
-            "created_at": self.created_at.isoformat()
-        }
-
+async def run_tracked(task_func: Callable, ctx: Dict, *args, **kwargs) -> Any:
+    """
+    Run a task function while recording its lifecycle in the job state backend.
 
-# In-memory job store for synchronous fallback mode
-_job_store: Dict[str, JobResult] = {}
+    Tasks that catch their own errors and return {"success": False, ...} are
+    recorded as failed, the same as tasks that raise.
+    """
+    job_id = ctx["job_id"]
+    await job_state.mark_running(job_id)
+    try:
+        result = await task_func(ctx, *args, **kwargs)
+    except Exception as e:
+        await job_state.mark_failed(job_id, str(e))
+        raise
+    
+    if isinstance(result, dict) and result.get("success") is False:
+        await job_state.mark_failed(job_id, str(result.get("error", "Task reported failure")), result=result)
+    else:
+        await job_state.mark_completed(job_id, result)
+    return result
 
 
 class JobQueue:
@@ -71,12 +82,13 @@ class JobQueue:
     Async Job Queue Service.
     
     Uses ARQ (Redis-based) when available.
-    Falls back to synchronous execution when Redis unavailable.
+    Falls back to a bounded in-process worker pool when Redis is unavailable.
     """
     
-    def __init__(self):
+    def __init__(self, local_pool: Optional[LocalJobPool] = None):
         self.redis_pool: Optional[ArqRedis] = None
         self._connected = False
+        self.local_pool = local_pool or LocalJobPool()
     
     async def connect(self) -> bool:
         """Initialize connection to Redis."""
@@ -89,10 +101,17 @@ class JobQueue:
                 RedisSettings(
                     host=REDIS_HOST,
                     port=REDIS_PORT,
-                    database=REDIS_DB
+                    database=REDIS_DB,
+                    conn_retries=REDIS_CONN_RETRIES
                 )
             )
             self._connected = True
+            # Share job state through Redis so every API worker sees every job
+            job_state.use_backend(RedisJobStateBackend(self.redis_pool))
+            llm_cache.use_redis(self.redis_pool)
+            principal_cache.use_redis(self.redis_pool)
+            discovery_cache.use_redis(self.redis_pool)
+            use_rate_limit_redis(self.redis_pool)
             logger.info(f"Job queue connected to Redis at {REDIS_HOST}:{REDIS_PORT}")
             return True
         except Exception as e:
@@ -103,6 +122,10 @@ class JobQueue:
     async def disconnect(self):
         """Close Redis connection."""
         if self.redis_pool:
+            llm_cache.use_redis(None)
+            principal_cache.use_redis(None)
+            discovery_cache.use_redis(None)
+            use_rate_limit_redis(None)
             await self.redis_pool.close()
             self._connected = False
     
@@ -130,9 +153,13 @@ class JobQueue:
         
         Returns:
             job_id: Unique identifier for the job
+        
+        Raises:
+            JobPoolFullError: Redis is unavailable and the local queue is full
         """
         import uuid
         job_id = _job_id or str(uuid.uuid4())
+        await job_state.mark_queued(job_id, task_name)
         
         if self._connected and self.redis_pool:
             try:
@@ -147,45 +174,49 @@ class JobQueue:
                 return job_id
             except Exception as e:
                 logger.error(f"Failed to enqueue job: {e}")
-                # Fall through to sync execution
+                # Fall through to local execution
         
-        # Synchronous fallback - execute immediately
-        logger.info(f"[Sync Mode] Executing task '{task_name}' immediately")
-        return await self._execute_sync(job_id, task_name, args, kwargs)
+        # Local fallback - hand off to the in-process pool and return immediately
+        return await self._enqueue_local(job_id, task_name, args, kwargs)
     
-    async def _execute_sync(
+    async def _enqueue_local(
         self,
         job_id: str,
         task_name: str,
         args: tuple,
         kwargs: dict
     ) -> str:
-        """Execute a task synchronously (fallback mode)."""
+        """Queue a task on the local worker pool (fallback mode)."""
         from app.services.job_tasks import TASK_REGISTRY
         
-        _job_store[job_id] = JobResult(job_id, JobStatus.RUNNING)
+        task_func = TASK_REGISTRY.get(task_name)
+        if not task_func:
+            logger.error(f"[Local] Job {job_id} failed: Unknown task: {task_name}")
+            await job_state.mark_failed(job_id, f"Unknown task: {task_name}")
+            return job_id
         
+        # ARQ-compatible context so tasks can report progress in local mode too
+        ctx = {"job_id": job_id}
         try:
-            task_func = TASK_REGISTRY.get(task_name)
-            if not task_func:
-                raise ValueError(f"Unknown task: {task_name}")
-            
-            result = await task_func(None, *args, **kwargs)  # ctx is None in sync mode
-            _job_store[job_id] = JobResult(job_id, JobStatus.COMPLETED, result=result)
-            logger.info(f"[Sync] Job {job_id} completed")
-        except Exception as e:
-            logger.error(f"[Sync] Job {job_id} failed: {e}")
-            _job_store[job_id] = JobResult(job_id, JobStatus.FAILED, error=str(e))
-        
+            self.local_pool.submit(job_id, lambda: run_tracked(task_func, ctx, *args, **kwargs))
+        except (JobPoolFullError, JobPoolClosedError) as e:
+            await job_state.mark_failed(job_id, str(e))
+            raise
+        logger.info(f"[Local] Queued job {job_id} for task '{task_name}'")
         return job_id
     
+    async def shutdown(self):
+        """Drain the local pool and close the Redis connection (app shutdown)."""
+        await self.local_pool.drain()
+        await self.disconnect()
+    
     async def get_job_status(self, job_id: str) -> Optional[Dict]:
-        """Get the status of a job."""
-        # Check in-memory store first (sync mode)
-        if job_id in _job_store:
-            return _job_store[job_id].to_dict()
+        """Get the status, progress and timings of a job."""
+        state = await job_state.get(job_id)
+        if state:
+            return state
         
-        # Check Redis if connected
+        # Jobs enqueued outside this API (e.g. directly via ARQ) have no state record
         if self._connected and self.redis_pool:
             try:
                 job = await self.redis_pool.get_job(job_id)
@@ -204,9 +235,11 @@ class JobQueue:
         """Get queue health status."""
         return {
             "connected": self._connected,
-            "backend": "ARQ/Redis" if self._connected else "Synchronous (Fallback)",
+            "backend": "ARQ/Redis" if self._connected else "Local Worker Pool (Fallback)",
             "redis_host": f"{REDIS_HOST}:{REDIS_PORT}" if ARQ_AVAILABLE else None,
-            "pending_jobs": len([j for j in _job_store.values() if j.status == JobStatus.PENDING])
+            "state_backend": job_state.backend.name,
+            "pending_jobs": await job_state.backend.count_by_status(JobStatus.PENDING),
+            "local_pool": self.local_pool.stats()
         }
 
 
@@ -215,6 +248,25 @@ job_queue = JobQueue()
 
 
 # ARQ Worker Settings (for running the worker process)
+from app.services.job_tasks import TASK_REGISTRY
+
+
+def _worker_task(task_func: Callable) -> Callable:
+    async def tracked(ctx, *args, **kwargs):
+        return await run_tracked(task_func, ctx, *args, **kwargs)
+    tracked.__name__ = task_func.__name__
+    return tracked
+
+
+async def _worker_startup(ctx: Dict) -> None:
+    job_state.use_backend(RedisJobStateBackend(ctx["redis"]))
+
+
+async def _worker_shutdown(ctx: Dict) -> None:
+    from app.core.http_clients import http_clients
+    await http_clients.aclose()
+
+
 class WorkerSettings:
     """ARQ Worker configuration."""
     
@@ -224,13 +276,15 @@ class WorkerSettings:
         database=REDIS_DB
     ) if ARQ_AVAILABLE else None
     
-    # Import tasks dynamically
-    @staticmethod
-    def get_functions():
-        from app.services.job_tasks import TASK_FUNCTIONS
-        return TASK_FUNCTIONS
+    # Registered under their TASK_REGISTRY names (the names used by enqueue),
+    # wrapped so the worker records status/progress in the shared job state.
+    functions = [
+        arq_func(_worker_task(task_func), name=task_name)
+        for task_name, task_func in TASK_REGISTRY.items()
+    ] if ARQ_AVAILABLE else []
     
-    functions = property(get_functions)
+    on_startup = _worker_startup
+    on_shutdown = _worker_shutdown
     
     # Worker settings
     max_jobs = 10
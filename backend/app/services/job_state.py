@@ -0,0 +1,302 @@
+"""
+Job State Backend - Shared status/progress storage for background jobs.
+
+Every job gets a small record (status, progress percentage, partial results,
+final result/error and timings) that any API worker can read, so a client
+polling or streaming `/jobs/...` does not depend on landing on the process
+that enqueued the job.
+
+Backends:
+    - RedisJobStateBackend: one Redis hash per job (plus a list for partial
+      results), expiring after JOB_STATE_TTL_SECONDS.
+    - InMemoryJobStateBackend: process-local fake used when Redis is not
+      connected and in tests.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+JOB_STATE_TTL_SECONDS = int(os.getenv("JOB_STATE_TTL_SECONDS", "86400"))
+JOB_STATE_KEY_PREFIX = os.getenv("JOB_STATE_KEY_PREFIX", "cadence:job:")
+
+TERMINAL_STATUSES = {"completed", "failed"}
+
+# Scalar fields stored in the job hash (partial results live in a separate list)
+_STATE_FIELDS = (
+    "job_id", "task_name", "status", "progress", "message", "result", "error",
+    "created_at", "started_at", "finished_at", "updated_at", "duration_ms",
+)
+
+
+def _now_iso() -> str:
+    return datetime.utcnow().isoformat()
+
+
+class JobStateBackend:
+    """Storage interface for job state records."""
+
+    name = "base"
+
+    async def save(self, job_id: str, fields: Dict[str, Any]) -> None:
+        """Merge fields into the job record, bump its version and refresh the TTL."""
+        raise NotImplementedError
+
+    async def append_partial(self, job_id: str, item: Any) -> None:
+        """Append one partial result to the job."""
+        raise NotImplementedError
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job record (including `partial_results` and `version`) or None."""
+        raise NotImplementedError
+
+    async def delete(self, job_id: str) -> None:
+        raise NotImplementedError
+
+    async def count_by_status(self, status: str) -> Optional[int]:
+        """Count jobs with a status, or None when the backend cannot answer cheaply."""
+        return None
+
+
+class InMemoryJobStateBackend(JobStateBackend):
+    """Process-local job state store (sync fallback mode and tests)."""
+
+    name = "memory"
+
+    def __init__(self, ttl_seconds: int = JOB_STATE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._partials: Dict[str, List[Any]] = {}
+        self._expires_at: Dict[str, float] = {}
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        expired = [job_id for job_id, expires in self._expires_at.items() if expires <= now]
+        for job_id in expired:
+            self._records.pop(job_id, None)
+            self._partials.pop(job_id, None)
+            self._expires_at.pop(job_id, None)
+
+    async def save(self, job_id: str, fields: Dict[str, Any]) -> None:
+        self._prune()
+        record = self._records.setdefault(job_id, {"job_id": job_id, "version": 0})
+        record.update(fields)
+        record["version"] += 1
+        self._expires_at[job_id] = time.monotonic() + self.ttl_seconds
+
+    async def append_partial(self, job_id: str, item: Any) -> None:
+        self._partials.setdefault(job_id, []).append(item)
+        self._expires_at[job_id] = time.monotonic() + self.ttl_seconds
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        self._prune()
+        record = self._records.get(job_id)
+        if record is None:
+            return None
+        return {**record, "partial_results": list(self._partials.get(job_id, []))}
+
+    async def delete(self, job_id: str) -> None:
+        self._records.pop(job_id, None)
+        self._partials.pop(job_id, None)
+        self._expires_at.pop(job_id, None)
+
+    async def count_by_status(self, status: str) -> Optional[int]:
+        self._prune()
+        return len([r for r in self._records.values() if r.get("status") == status])
+
+
+class RedisJobStateBackend(JobStateBackend):
+    """
+    Redis-backed job state store.
+
+    Layout per job:
+        <prefix><job_id>           HASH  field -> JSON-encoded value, plus `version`
+        <prefix><job_id>:partials  LIST  JSON-encoded partial results
+    Both keys expire JOB_STATE_TTL_SECONDS after the last write.
+    """
+
+    name = "redis"
+
+    def __init__(self, redis, ttl_seconds: int = JOB_STATE_TTL_SECONDS, key_prefix: str = JOB_STATE_KEY_PREFIX):
+        # Accepts any redis.asyncio.Redis compatible client (ArqRedis included)
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.key_prefix}{job_id}"
+
+    def _partials_key(self, job_id: str) -> str:
+        return f"{self.key_prefix}{job_id}:partials"
+
+    async def save(self, job_id: str, fields: Dict[str, Any]) -> None:
+        key = self._key(job_id)
+        mapping = {name: json.dumps(value, default=str) for name, value in fields.items()}
+        mapping.setdefault("job_id", json.dumps(job_id))
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(key, mapping=mapping)
+        pipe.hincrby(key, "version", 1)
+        pipe.expire(key, self.ttl_seconds)
+        pipe.expire(self._partials_key(job_id), self.ttl_seconds)
+        await pipe.execute()
+
+    async def append_partial(self, job_id: str, item: Any) -> None:
+        key = self._partials_key(job_id)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.rpush(key, json.dumps(item, default=str))
+        pipe.expire(key, self.ttl_seconds)
+        # Partial results count as an update for watchers
+        pipe.hincrby(self._key(job_id), "version", 1)
+        await pipe.execute()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hgetall(self._key(job_id))
+        pipe.lrange(self._partials_key(job_id), 0, -1)
+        raw, partials = await pipe.execute()
+        if not raw or len(raw) <= 1:
+            # Missing, or only a stray `version` counter from append_partial
+            return None
+
+        record: Dict[str, Any] = {}
+        for name, value in raw.items():
+            name = name.decode() if isinstance(name, bytes) else name
+            if name == "version":
+                record["version"] = int(value)
+                continue
+            try:
+                record[name] = json.loads(value)
+            except (TypeError, ValueError):
+                record[name] = value.decode() if isinstance(value, bytes) else value
+        record["partial_results"] = [json.loads(item) for item in partials]
+        return record
+
+    async def delete(self, job_id: str) -> None:
+        await self.redis.delete(self._key(job_id), self._partials_key(job_id))
+
+
+class JobStateStore:
+    """
+    High-level job lifecycle API on top of a JobStateBackend.
+
+    The queue marks jobs queued/running/completed/failed; tasks report
+    progress through `report_progress(ctx, ...)`.
+    """
+
+    def __init__(self, backend: Optional[JobStateBackend] = None):
+        self.backend = backend or InMemoryJobStateBackend()
+
+    def use_backend(self, backend: JobStateBackend) -> None:
+        self.backend = backend
+        logger.info(f"Job state backend set to '{backend.name}'")
+
+    async def mark_queued(self, job_id: str, task_name: str) -> None:
+        now = _now_iso()
+        await self.backend.save(job_id, {
+            "task_name": task_name,
+            "status": "pending",
+            "progress": 0,
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    async def mark_running(self, job_id: str) -> None:
+        now = _now_iso()
+        await self.backend.save(job_id, {"status": "running", "started_at": now, "updated_at": now})
+
+    async def update_progress(
+        self,
+        job_id: str,
+        progress: float,
+        message: Optional[str] = None,
+        partial_result: Any = None,
+    ) -> None:
+        if partial_result is not None:
+            await self.backend.append_partial(job_id, partial_result)
+        fields: Dict[str, Any] = {
+            "progress": max(0.0, min(100.0, round(float(progress), 2))),
+            "updated_at": _now_iso(),
+        }
+        if message is not None:
+            fields["message"] = message
+        await self.backend.save(job_id, fields)
+
+    async def _finish(self, job_id: str, fields: Dict[str, Any]) -> None:
+        now = datetime.utcnow()
+        current = await self.backend.get(job_id) or {}
+        started_at = current.get("started_at")
+        if started_at:
+            fields["duration_ms"] = int((now - datetime.fromisoformat(started_at)).total_seconds() * 1000)
+        fields.update({"finished_at": now.isoformat(), "updated_at": now.isoformat()})
+        await self.backend.save(job_id, fields)
+
+    async def mark_completed(self, job_id: str, result: Any = None) -> None:
+        await self._finish(job_id, {"status": "completed", "progress": 100, "result": result})
+
+    async def mark_failed(self, job_id: str, error: str, result: Any = None) -> None:
+        await self._finish(job_id, {"status": "failed", "error": error, "result": result})
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.backend.get(job_id)
+
+    async def watch(
+        self,
+        job_id: str,
+        poll_interval: float = 0.5,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield the job record every time its version changes, until the job
+        reaches a terminal status or `timeout` seconds pass.
+
+        Yields None on polls without a change so callers can emit keep-alives.
+        Polling the shared backend (rather than in-process events) keeps this
+        correct when the job runs on a different worker.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        last_version = None
+        while True:
+            state = await self.backend.get(job_id)
+            if state is not None and state.get("version") != last_version:
+                last_version = state.get("version")
+                yield state
+                if state.get("status") in TERMINAL_STATUSES:
+                    return
+            else:
+                yield None
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            await asyncio.sleep(poll_interval)
+
+
+# Singleton instance (switched to Redis by JobQueue.connect / the ARQ worker)
+job_state = JobStateStore()
+
+
+async def report_progress(
+    ctx: Optional[Dict],
+    progress: float,
+    message: Optional[str] = None,
+    partial_result: Any = None,
+) -> None:
+    """
+    Report task progress from inside a job task.
+
+    `ctx` is the ARQ context (or the equivalent dict in fallback mode); this is
+    a no-op when the task is called directly without a job id.
+    """
+    job_id = ctx.get("job_id") if ctx else None
+    if not job_id:
+        return
+    try:
+        await job_state.update_progress(job_id, progress, message=message, partial_result=partial_result)
+    except Exception as e:
+        # Progress reporting must never break the task itself
+        logger.warning(f"Failed to report progress for job {job_id}: {e}")
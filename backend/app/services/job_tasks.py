@@ -9,6 +9,8 @@ import logging
 from typing import Any, Dict, Optional
 from datetime import datetime
 
+from app.services.job_state import report_progress
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,31 +82,33 @@ async def generate_presentation_task(ctx, source_type: str, title: str) -> Dict:
         return {"success": False, "error": str(e)}
 
 
-async def send_campaign_emails_task(ctx, campaign_id: int, recipients: list, subject: str, body: str) -> Dict:
-    """Background task for sending bulk campaign emails."""
-    from app.services.cpaas_service import cpaas_service
+async def send_campaign_emails_task(
+    ctx,
+    campaign_id: int,
+    recipients: list,
+    subject: str,
+    body: str,
+    send_id: Optional[str] = None
+) -> Dict:
+    """
+    Background task for sending bulk campaign emails.
     
-    logger.info(f"[Task] Sending {len(recipients)} emails for campaign {campaign_id}")
+    Per-recipient outcomes are stored in campaign_email_deliveries under
+    `send_id` (defaults to the job id), so a retried or re-enqueued send with
+    the same id continues where it stopped.
+    """
+    import uuid
+    from app.services.bulk_email_service import BulkEmailSender
     
-    sent_count = 0
-    failed_count = 0
+    send_id = send_id or (ctx or {}).get("job_id") or f"campaign-{campaign_id}-{uuid.uuid4()}"
+    logger.info(f"[Task] Sending {len(recipients)} emails for campaign {campaign_id} (send {send_id})")
     
-    for email in recipients:
-        try:
-            result = await cpaas_service.send_email(email, subject, body)
-            if result.get("status") == "sent":
-                sent_count += 1
-            else:
-                failed_count += 1
-        except Exception as e:
-            logger.error(f"Failed to send to {email}: {e}")
-            failed_count += 1
+    summary = await BulkEmailSender().send(send_id, campaign_id, recipients, subject, body, ctx=ctx)
     
     return {
         "success": True,
         "campaign_id": campaign_id,
-        "sent": sent_count,
-        "failed": failed_count,
+        **summary,
         "completed_at": datetime.utcnow().isoformat()
     }
 
@@ -135,6 +139,7 @@ async def execute_workflow_task(ctx, workflow_id: int, steps_json: str) -> Dict:
                 results.append({"step": i+1, "type": step_type, "result": result[:100]})
             else:
                 results.append({"step": i+1, "type": step_type, "result": "skipped (unknown type)"})
+            await report_progress(ctx, (i + 1) * 100 / len(steps), partial_result=results[-1])
         
         return {
             "success": True,
@@ -148,6 +153,49 @@ async def execute_workflow_task(ctx, workflow_id: int, steps_json: str) -> Dict:
         return {"success": False, "workflow_id": workflow_id, "error": str(e)}
 
 
+async def batch_enrich_handles_task(
+    ctx,
+    platform: str,
+    handles: list,
+    mode: str = "raw",
+    organization_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    batch_id: Optional[str] = None
+) -> Dict:
+    """
+    Background task for enriching a list of creator handles.
+    
+    Per-handle outcomes are stored in influencer_enrichment_results under
+    `batch_id` (defaults to the job id) as they complete, so a retried job
+    resumes and recently enriched handles are not paid for twice.
+    """
+    import uuid
+    from app.integrations.influencers_club import InfluencersClubClient, get_api_key_from_env
+    from app.services.batch_enrichment import BatchEnricher
+    from app.services.rate_limiter import rate_limit_tenant
+    
+    api_key = get_api_key_from_env()
+    if not api_key:
+        return {"success": False, "error": "INFLUENCERS_CLUB_API_KEY is not configured"}
+    
+    batch_id = batch_id or (ctx or {}).get("job_id") or f"enrich-{uuid.uuid4()}"
+    tenant = f"org:{organization_id}" if organization_id is not None else f"user:{user_id}"
+    logger.info(f"[Task] Enriching {len(handles)} {platform} handles (batch {batch_id})")
+    
+    # Share the provider rate limit fairly with interactive requests from other orgs
+    with rate_limit_tenant(tenant):
+        summary = await BatchEnricher(InfluencersClubClient(api_key)).run(
+            batch_id, handles, platform, mode,
+            organization_id=organization_id, user_id=user_id, ctx=ctx,
+        )
+    
+    return {
+        "success": True,
+        **summary,
+        "completed_at": datetime.utcnow().isoformat()
+    }
+
+
 # --- Task Registry ---
 
 # Map task names to functions (for sync fallback and routing)
@@ -157,6 +205,7 @@ TASK_REGISTRY = {
     "generate_presentation": generate_presentation_task,
     "send_campaign_emails": send_campaign_emails_task,
     "execute_workflow": execute_workflow_task,
+    "batch_enrich_handles": batch_enrich_handles_task,
 }
 
 # List of task functions (for ARQ worker)
@@ -166,4 +215,5 @@ TASK_FUNCTIONS = [
     generate_presentation_task,
     send_campaign_emails_task,
     execute_workflow_task,
+    batch_enrich_handles_task,
 ]
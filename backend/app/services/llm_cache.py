@@ -0,0 +1,148 @@
+"""
+LLM Response Cache - Content-addressed cache for text completions.
+
+Identical requests (same model, system prompt, prompt and json_mode) are
+answered from the cache instead of calling the provider again. Keys are a
+SHA-256 of those inputs, so prompts are never stored in key names.
+
+Tiers:
+    - In-process LRU (LLM_CACHE_MAX_ENTRIES entries, LLM_CACHE_TTL_SECONDS)
+    - Redis (shared by all API workers), attached by JobQueue.connect() when
+      Redis is available and LLM_CACHE_REDIS_ENABLED is set
+
+"Regenerate" requests opt out per call:
+    with llm_cache.bypass(request.regenerate):
+        text = await AIService.enhance_text(...)
+A bypassed call skips the lookup but still stores the fresh result.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.ttl_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_REDIS_ENABLED = os.getenv("LLM_CACHE_REDIS_ENABLED", "true").lower() == "true"
+LLM_CACHE_KEY_PREFIX = os.getenv("LLM_CACHE_KEY_PREFIX", "cadence:llm:")
+
+_bypass_cache: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+def llm_cache_key(
+    model: str,
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    json_mode: bool = False,
+) -> str:
+    """Hash of everything that determines the completion."""
+    material = json.dumps([model, system_prompt or "", prompt, bool(json_mode)], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Two-tier (local LRU + optional Redis) cache of completion texts."""
+
+    def __init__(
+        self,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        enabled: bool = LLM_CACHE_ENABLED,
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self._local = TTLLRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._redis: Optional[Any] = None
+        self._counters = {"hits": 0, "redis_hits": 0, "misses": 0, "bypassed": 0, "stores": 0, "redis_errors": 0}
+
+    def use_redis(self, redis: Optional[Any]) -> None:
+        """Attach (or detach with None) a redis.asyncio client as the shared tier."""
+        self._redis = redis if LLM_CACHE_REDIS_ENABLED else None
+
+    @contextmanager
+    def bypass(self, active: bool = True):
+        """Skip cache lookups for calls made inside this block (e.g. "regenerate")."""
+        token = _bypass_cache.set(bool(active) or _bypass_cache.get())
+        try:
+            yield
+        finally:
+            _bypass_cache.reset(token)
+
+    async def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        if _bypass_cache.get():
+            self._counters["bypassed"] += 1
+            return None
+
+        value = self._local.get(key)
+        if value is not None:
+            self._counters["hits"] += 1
+            return value
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(LLM_CACHE_KEY_PREFIX + key)
+            except Exception as e:
+                self._counters["redis_errors"] += 1
+                logger.warning(f"LLM cache Redis read failed: {e}")
+                raw = None
+            if raw is not None:
+                value = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+                self._local.set(key, value)
+                self._counters["hits"] += 1
+                self._counters["redis_hits"] += 1
+                return value
+
+        self._counters["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[int] = None) -> None:
+        if not self.enabled or not value:
+            return
+        ttl = ttl_seconds or self.ttl_seconds
+        self._local.set(key, value, ttl)
+        self._counters["stores"] += 1
+        if self._redis is not None:
+            try:
+                await self._redis.set(LLM_CACHE_KEY_PREFIX + key, value, ex=ttl)
+            except Exception as e:
+                self._counters["redis_errors"] += 1
+                logger.warning(f"LLM cache Redis write failed: {e}")
+
+    async def cached(self, key: str, call: Callable[[], Awaitable[str]]) -> str:
+        """Return the cached completion for `key`, or await `call()` and store its (non-empty) result."""
+        value = await self.get(key)
+        if value is not None:
+            return value
+        value = await call()
+        await self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        self._local.clear()
+        for name in self._counters:
+            self._counters[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "backend": "memory+redis" if self._redis is not None else "memory",
+            "entries": len(self._local),
+            "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else None,
+            **self._counters,
+        }
+
+
+# Singleton instance
+llm_cache = LLMResponseCache()
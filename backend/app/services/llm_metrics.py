@@ -0,0 +1,82 @@
+"""
+LLM Metrics - In-process latency counters for model calls.
+
+Streaming endpoints record time-to-first-token (TTFT) and total duration per
+endpoint; /health exposes a rolling summary (count, errors, p50/p95) so a slow
+provider shows up without digging through logs.
+"""
+
+import os
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from app.core.concurrency import percentile
+
+logger = logging.getLogger(__name__)
+
+
+# Number of recent samples kept per endpoint for percentile estimates
+LLM_METRICS_WINDOW = int(os.getenv("LLM_METRICS_WINDOW", "500"))
+
+
+class _StreamStats:
+    def __init__(self, window: int):
+        self.count = 0
+        self.errors = 0
+        self.last_model: Optional[str] = None
+        self.ttft_ms: Deque[float] = deque(maxlen=window)
+        self.duration_ms: Deque[float] = deque(maxlen=window)
+
+
+class LLMMetrics:
+    """Rolling TTFT / duration samples keyed by endpoint name."""
+
+    def __init__(self, window: int = LLM_METRICS_WINDOW):
+        self.window = max(1, window)
+        self._streams: Dict[str, _StreamStats] = {}
+
+    def record_stream(
+        self,
+        endpoint: str,
+        model: Optional[str],
+        ttft_ms: Optional[float],
+        duration_ms: float,
+        chunks: int = 0,
+        error: bool = False,
+    ) -> None:
+        stats = self._streams.setdefault(endpoint, _StreamStats(self.window))
+        stats.count += 1
+        stats.last_model = model
+        if error:
+            stats.errors += 1
+        if ttft_ms is not None:
+            stats.ttft_ms.append(ttft_ms)
+        stats.duration_ms.append(duration_ms)
+
+        ttft_label = f"{ttft_ms:.0f}ms" if ttft_ms is not None else "n/a"
+        logger.info(
+            f"[LLM] {endpoint} stream via {model}: ttft={ttft_label} "
+            f"total={duration_ms:.0f}ms chunks={chunks}{' (error)' if error else ''}"
+        )
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {
+            endpoint: {
+                "count": stats.count,
+                "errors": stats.errors,
+                "last_model": stats.last_model,
+                "ttft_ms_p50": percentile(stats.ttft_ms, 50),
+                "ttft_ms_p95": percentile(stats.ttft_ms, 95),
+                "duration_ms_p50": percentile(stats.duration_ms, 50),
+                "duration_ms_p95": percentile(stats.duration_ms, 95),
+            }
+            for endpoint, stats in self._streams.items()
+        }
+
+    def reset(self) -> None:
+        self._streams.clear()
+
+
+# Singleton instance
+llm_metrics = LLMMetrics()
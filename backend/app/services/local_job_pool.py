@@ -0,0 +1,150 @@
+"""
+Local Job Pool - Bounded in-process executor for JobQueue's fallback mode.
+
+When Redis/ARQ is unavailable, jobs are queued here instead of being awaited
+inside the HTTP request. A fixed number of worker coroutines pull from a
+bounded queue, so enqueueing returns a job id immediately; a full queue is
+reported to the caller (HTTP 429) rather than buffering without limit.
+
+Usage:
+    pool = LocalJobPool(concurrency=4, max_queue_size=100, task_timeout=300)
+    pool.submit(job_id, lambda: run_task(...))   # raises JobPoolFullError when full
+    await pool.drain()                             # on shutdown
+"""
+
+import os
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.services.job_state import job_state
+
+logger = logging.getLogger(__name__)
+
+
+LOCAL_JOB_CONCURRENCY = int(os.getenv("LOCAL_JOB_CONCURRENCY", "4"))
+LOCAL_JOB_QUEUE_SIZE = int(os.getenv("LOCAL_JOB_QUEUE_SIZE", "100"))
+LOCAL_JOB_TIMEOUT_SECONDS = float(os.getenv("LOCAL_JOB_TIMEOUT_SECONDS", "300"))
+LOCAL_JOB_DRAIN_TIMEOUT_SECONDS = float(os.getenv("LOCAL_JOB_DRAIN_TIMEOUT_SECONDS", "30"))
+
+
+class JobPoolFullError(Exception):
+    """Raised when the local queue is at capacity."""
+    pass
+
+
+class JobPoolClosedError(Exception):
+    """Raised when submitting to a pool that is shutting down."""
+    pass
+
+
+class LocalJobPool:
+    """Fixed-size pool of worker coroutines over a bounded asyncio queue."""
+
+    def __init__(
+        self,
+        concurrency: int = LOCAL_JOB_CONCURRENCY,
+        max_queue_size: int = LOCAL_JOB_QUEUE_SIZE,
+        task_timeout: Optional[float] = LOCAL_JOB_TIMEOUT_SECONDS,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.max_queue_size = max(1, max_queue_size)
+        self.task_timeout = task_timeout if task_timeout and task_timeout > 0 else None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._active = 0
+        self._closed = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        """Start the worker coroutines (must be called inside a running loop)."""
+        if self._workers:
+            return
+        self._closed = False
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"local-job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"Local job pool started ({self.concurrency} workers, queue size {self.max_queue_size})")
+
+    def submit(self, job_id: str, job_factory: Callable[[], Awaitable]) -> None:
+        """
+        Queue a job without waiting for it to run.
+
+        `job_factory` is called by a worker and must return the coroutine to run.
+        """
+        if self._closed:
+            raise JobPoolClosedError("Local job pool is shutting down")
+        if not self._workers:
+            self.start()
+        try:
+            self._queue.put_nowait((job_id, job_factory))
+        except asyncio.QueueFull:
+            raise JobPoolFullError(
+                f"Local job queue is full ({self.max_queue_size} jobs waiting)"
+            )
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id, job_factory = await self._queue.get()
+            self._active += 1
+            try:
+                await self._run(job_id, job_factory)
+            finally:
+                self._active -= 1
+                self._queue.task_done()
+
+    async def _run(self, job_id: str, job_factory: Callable[[], Awaitable]) -> None:
+        try:
+            await asyncio.wait_for(job_factory(), timeout=self.task_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"[Local] Job {job_id} timed out after {self.task_timeout}s")
+            await job_state.mark_failed(job_id, f"Job timed out after {self.task_timeout:.0f}s")
+        except asyncio.CancelledError:
+            await job_state.mark_failed(job_id, "Job cancelled during shutdown")
+            raise
+        except Exception as e:
+            # Task failures are recorded by the job factory; keep the worker alive
+            logger.error(f"[Local] Job {job_id} failed: {e}")
+
+    async def drain(self, timeout: float = LOCAL_JOB_DRAIN_TIMEOUT_SECONDS) -> None:
+        """
+        Stop accepting jobs, wait up to `timeout` seconds for queued and
+        running jobs to finish, then cancel whatever is left.
+        """
+        self._closed = True
+        if not self._workers:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Local job pool drain timed out after {timeout}s; cancelling remaining jobs")
+
+        abandoned: List[Tuple[str, Callable]] = []
+        while not self._queue.empty():
+            abandoned.append(self._queue.get_nowait())
+            self._queue.task_done()
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for job_id, _ in abandoned:
+            await job_state.mark_failed(job_id, "Job not started before shutdown")
+        logger.info("Local job pool drained")
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.concurrency,
+            "active": self._active,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queue_size": self.max_queue_size,
+            "task_timeout": self.task_timeout,
+            "accepting": not self._closed,
+        }
@@ -19,6 +19,7 @@ from sqlalchemy.future import select
 
 from app.models.models import User
 from app.models.social import OnboardingProgress, SocialConnection
+from app.services.principal_cache import principal_cache
 
 
 # Step definitions per profile type
@@ -234,6 +235,7 @@ class OnboardingService:
             user.profile_type = progress.profile_type
 
         await db.commit()
+        await principal_cache.invalidate_user(user_id)
 
         return {
             "is_complete": True,
@@ -11,8 +11,16 @@ Resolution order:
 Scope cascade:
   Global > Organization > Brand > Team
   A permission granted at a wider scope applies at narrower scopes.
+
+Unscoped checks (the common case, e.g. require_permission) run against a
+CompiledPermissions: every resource and resource:action pair is interned to a
+bit, each role's permissions_json is compiled once into a bitset, and the
+user's overrides become allow/deny masks, so a check is a few integer ops.
+Compiled forms are memoized on cached Principals (see principal_cache).
+Scoped checks (scope_type + scope_id) still evaluate overrides linearly.
 """
-from typing import Optional, List, Set, Dict
+import json
+from typing import Any, Optional, List, Set, Dict, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -21,8 +29,10 @@ from app.models.models import User
 from app.models.rbac import Role, Permission
 from app.services.auth_service import is_super_admin
 from app.services.rbac_scope import is_role_assignable
+from app.core.ttl_cache import TTLLRUCache
 
 READ_IMPLYING_ACTIONS = {"create", "update", "write"}
+SCOPE_PRIORITY = {"team": 0, "brand": 1, "organization": 2, "global": 3}
 
 # Profile type → allowed roles mapping
 PROFILE_TYPE_ROLE_CONSTRAINTS: Dict[str, Set[str]] = {
@@ -32,6 +42,106 @@ PROFILE_TYPE_ROLE_CONSTRAINTS: Dict[str, Set[str]] = {
 }
 
 
+# Interned bit positions. Only grows when a role or override is compiled, never
+# from a lookup, so arbitrary names in requests cannot grow it.
+_RESOURCE_BITS: Dict[str, int] = {}
+_PAIR_BITS: Dict[Tuple[str, Any], int] = {}
+
+# Compiled role bitsets keyed by (role name, permissions_json fingerprint)
+_ROLE_MASKS = TTLLRUCache(max_entries=256)
+
+
+def _resource_bit(resource: str) -> int:
+    bit = _RESOURCE_BITS.get(resource)
+    if bit is None:
+        bit = _RESOURCE_BITS[resource] = 1 << len(_RESOURCE_BITS)
+    return bit
+
+
+def _pair_bit(resource: str, action: Any) -> int:
+    bit = _PAIR_BITS.get((resource, action))
+    if bit is None:
+        bit = _PAIR_BITS[(resource, action)] = 1 << len(_PAIR_BITS)
+    return bit
+
+
+def _implied_actions(granted_action: Any) -> Set[Any]:
+    """Every requested action that `granted_action` satisfies (see PermissionEngine._action_grants)."""
+    implied = {granted_action}
+    if granted_action in READ_IMPLYING_ACTIONS:
+        implied.add("read")
+    if granted_action == "write":
+        implied.update({"create", "update", "delete"})
+    if granted_action == "update":
+        implied.add("write")
+    return implied
+
+
+class CompiledPermissions:
+    """Bitset form of a user's role defaults and unscoped overrides."""
+
+    __slots__ = ("role_mask", "allow_mask", "deny_mask", "denied_resources", "none_resources", "effective")
+
+    def __init__(self, role_mask: int, overrides: List[Any]):
+        self.role_mask = role_mask
+        self.allow_mask = 0
+        self.deny_mask = 0
+        self.denied_resources = 0  # an is_allowed=False override denies the whole resource
+        self.none_resources = 0  # an action="none" override denies actions no earlier override grants
+        self.effective: Optional[frozenset] = None
+
+        by_resource: Dict[str, List[Any]] = {}
+        for perm in overrides:
+            by_resource.setdefault(perm.resource, []).append(perm)
+
+        for resource, perms in by_resource.items():
+            resource_bit = _resource_bit(resource)
+            if any(p.is_allowed is False for p in perms):
+                self.denied_resources |= resource_bit
+                continue
+            perms.sort(key=lambda p: SCOPE_PRIORITY.get(p.scope_type or "global", 99))
+            candidates: Set[Any] = set()
+            for p in perms:
+                if p.action == "none":
+                    self.none_resources |= resource_bit
+                else:
+                    candidates |= _implied_actions(p.action)
+            # First matching override (most specific scope first) decides, as in _check_overrides
+            for action in candidates:
+                for p in perms:
+                    if p.action == "none":
+                        self.deny_mask |= _pair_bit(resource, action)
+                        break
+                    if PermissionEngine._action_grants(p.action, action):
+                        self.allow_mask |= _pair_bit(resource, action)
+                        break
+
+    @staticmethod
+    def compile_role(role_permissions: Set[str]) -> int:
+        mask = 0
+        for perm in role_permissions:
+            if ":" not in perm:
+                continue
+            resource, granted_action = perm.split(":", 1)
+            for action in _implied_actions(granted_action):
+                mask |= _pair_bit(resource, action)
+        return mask
+
+    def allows(self, resource: str, action: str) -> bool:
+        resource_bit = _RESOURCE_BITS.get(resource, 0)
+        if resource_bit & self.denied_resources:
+            return False
+        bit = _PAIR_BITS.get((resource, action), 0)
+        if bit & self.allow_mask:
+            return True
+        if bit & self.deny_mask or resource_bit & self.none_resources:
+            return False
+        return bool(bit & self.role_mask)
+
+    def role_allows(self, resource: str, action: str) -> bool:
+        return bool(_PAIR_BITS.get((resource, action), 0) & self.role_mask)
+
+
 class PermissionEngine:
     """Evaluates permissions for a user against a resource:action pair."""
 
@@ -39,6 +149,7 @@ class PermissionEngine:
         self.user = user
         self.role_obj = role_obj
         self._role_permissions: Optional[Set[str]] = None
+        self._compiled: Optional[CompiledPermissions] = None
 
     @classmethod
     async def for_user(cls, user_id: int, db: AsyncSession) -> "PermissionEngine":
@@ -89,14 +200,51 @@ class PermissionEngine:
         if is_super_admin(self.user.role):
             return True
 
-        # 2-3. Check explicit overrides (deny takes priority over allow)
+        # Override applicability depends on the requested scope; only unscoped checks are precompiled
+        if scope_type and scope_id:
+            override_result = self._check_overrides(resource, action, scope_type, scope_id)
+            if override_result is not None:
+                return override_result
+            return self.compiled.role_allows(resource, action)
+
+        # 2-4. Overrides (deny first), then role defaults
+        return self.compiled.allows(resource, action)
+
+    def _evaluate(
+        self,
+        resource: str,
+        action: str,
+        scope_type: Optional[str] = None,
+        scope_id: Optional[int] = None,
+    ) -> bool:
+        """Uncompiled reference evaluation (linear override scan + role set walk)."""
+        if is_super_admin(self.user.role):
+            return True
         override_result = self._check_overrides(resource, action, scope_type, scope_id)
         if override_result is not None:
             return override_result
-
-        # 4. Check role defaults
         return self._check_role_default(resource, action)
 
+    @property
+    def compiled(self) -> CompiledPermissions:
+        """The user's compiled permissions; memoized on cached Principals across requests."""
+        if self._compiled is None:
+            memoized = getattr(self.user, "memoized", None)
+            if memoized is not None and self.role_obj is getattr(self.user, "role_model", None):
+                self._compiled = memoized("compiled_permissions", self._compile)
+            else:
+                self._compiled = self._compile()
+        return self._compiled
+
+    def _compile(self) -> CompiledPermissions:
+        permissions_json = self.role_obj.permissions_json if self.role_obj else None
+        role_key = (self.user.role, json.dumps(permissions_json, sort_keys=True, default=str) if permissions_json else None)
+        role_mask = _ROLE_MASKS.get(role_key)
+        if role_mask is None:
+            role_mask = CompiledPermissions.compile_role(self._get_role_permissions())
+            _ROLE_MASKS.set(role_key, role_mask)
+        return CompiledPermissions(role_mask, list(getattr(self.user, "custom_permissions", None) or ()))
+
     def get_effective_permissions(self) -> Set[str]:
         """
         Get all effective permissions for the user as a set of 'resource:action' strings.
@@ -105,6 +253,12 @@ class PermissionEngine:
         if is_super_admin(self.user.role):
             return {"*:*"}  # Wildcard — frontend interprets as "all"
 
+        compiled = self.compiled
+        if compiled.effective is None:
+            compiled.effective = frozenset(self._build_effective_permissions())
+        return set(compiled.effective)
+
+    def _build_effective_permissions(self) -> Set[str]:
         # Start with normalized role defaults
         effective = self._normalize_permission_set(set(self._get_role_permissions()))
 
@@ -212,7 +366,7 @@ class PermissionEngine:
             return None
 
         # Sort by scope specificity (most specific first)
-        scope_priority = {"team": 0, "brand": 1, "organization": 2, "global": 3}
+        scope_priority = SCOPE_PRIORITY
 
         # Filter by applicable scope
         applicable = []
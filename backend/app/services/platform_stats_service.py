@@ -0,0 +1,283 @@
+"""
+Platform stats for the super-admin dashboard.
+
+/admin/overview reads a snapshot row (platform_stats_snapshot) instead of
+counting users, organizations and brands and loading every organization to
+sum MRR on each request:
+
+    - platform_overview_query() computes every figure in one statement with
+      conditional counts; MRR is summed in SQL from PLAN_PRICES via CASE
+    - platform_stats_worker() refreshes the snapshot every
+      PLATFORM_STATS_REFRESH_SECONDS; a missing or stale snapshot
+      (PLATFORM_STATS_MAX_AGE_SECONDS) is refreshed inline by the reader
+
+The same loop persists usage counters for /admin/usage. Each authenticated
+request calls usage_counters.record(user_id) (see app.api.deps). The
+per-process counts are flushed additively into platform_usage_daily
+(API calls per UTC day), and user ids into user_activity_daily, from which
+the distinct daily active users are derived. Rows older than
+PLATFORM_USAGE_RETENTION_DAYS are pruned.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import case, delete, func, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.brand import Brand
+from app.models.models import User
+from app.models.organization import Organization
+from app.models.platform_stats import PlatformStatsSnapshot, PlatformUsageDaily, UserActivityDaily
+
+logger = logging.getLogger(__name__)
+
+
+PLATFORM_STATS_ENABLED = os.getenv("PLATFORM_STATS_ENABLED", "true").lower() == "true"
+PLATFORM_STATS_REFRESH_SECONDS = float(os.getenv("PLATFORM_STATS_REFRESH_SECONDS", "60"))
+PLATFORM_STATS_MAX_AGE_SECONDS = float(os.getenv("PLATFORM_STATS_MAX_AGE_SECONDS", "300"))
+PLATFORM_USAGE_RETENTION_DAYS = int(os.getenv("PLATFORM_USAGE_RETENTION_DAYS", "90"))
+
+SNAPSHOT_NAME = "platform"
+
+# Monthly price per plan tier (USD)
+PLAN_PRICES = {"free": 0, "pro": 99, "enterprise": 499}
+
+OVERVIEW_FIELDS = (
+    "total_organizations", "active_subscriptions", "total_users",
+    "pending_approvals", "total_brands", "mrr",
+)
+
+
+def plan_price_expr():
+    """SQL monthly price of an organization's plan tier (0 for unknown tiers)."""
+    return case(PLAN_PRICES, value=Organization.plan_tier, else_=0)
+
+
+def platform_overview_query():
+    """One statement returning every platform overview figure."""
+    orgs = select(
+        func.count().label("total_organizations"),
+        func.count().filter(Organization.is_active == True).label("active_subscriptions"),  # noqa: E712
+        func.coalesce(func.sum(plan_price_expr()).filter(Organization.is_active == True), 0).label("mrr"),  # noqa: E712
+    ).select_from(Organization).subquery("orgs")
+    users = select(
+        func.count().label("total_users"),
+        func.count().filter(User.is_approved == False).label("pending_approvals"),  # noqa: E712
+    ).select_from(User).subquery("users")
+    brands = select(func.count().label("total_brands")).select_from(Brand).subquery("brands")
+
+    # Each side is a single aggregate row
+    return select(
+        orgs.c.total_organizations,
+        orgs.c.active_subscriptions,
+        users.c.total_users,
+        users.c.pending_approvals,
+        brands.c.total_brands,
+        orgs.c.mrr,
+    ).select_from(orgs.join(users, true()).join(brands, true()))
+
+
+def _insert(dialect_name: str, table):
+    """Dialect INSERT supporting ON CONFLICT."""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class UsageCounters:
+    """Per-process API-call and active-user counts per UTC day, awaiting flush."""
+
+    def __init__(self):
+        self._calls: Dict[date, int] = defaultdict(int)
+        self._users: Dict[date, Set[int]] = defaultdict(set)
+
+    def record(self, user_id: int) -> None:
+        day = _utc_today()
+        self._calls[day] += 1
+        self._users[day].add(user_id)
+
+    def drain(self) -> Dict[date, tuple]:
+        """Take the pending counts: {day: (api_calls, user_ids)}."""
+        pending = {day: (self._calls[day], self._users.get(day, set())) for day in self._calls}
+        self._calls = defaultdict(int)
+        self._users = defaultdict(set)
+        return pending
+
+    def restore(self, pending: Dict[date, tuple]) -> None:
+        """Put back counts whose flush failed."""
+        for day, (calls, user_ids) in pending.items():
+            self._calls[day] += calls
+            self._users[day].update(user_ids)
+
+    def pending_calls(self) -> int:
+        return sum(self._calls.values())
+
+
+class PlatformStatsService:
+    """Maintains the platform overview snapshot and the daily usage counters."""
+
+    def __init__(self, counters: Optional[UsageCounters] = None):
+        self.counters = counters or UsageCounters()
+        self._last_refresh_at: Optional[datetime] = None
+        self._counters = {"refreshes": 0, "inline_refreshes": 0, "usage_flushes": 0, "errors": 0}
+        self._last_refresh_ms = 0.0
+
+    # --- overview snapshot ---------------------------------------------------
+
+    async def refresh(self, session: AsyncSession) -> Dict[str, Any]:
+        """Recompute the overview in one query and store it as the snapshot."""
+        started = time.perf_counter()
+        row = (await session.execute(platform_overview_query())).one()
+        values = {field: getattr(row, field) or 0 for field in OVERVIEW_FIELDS}
+
+        snapshot = await session.get(PlatformStatsSnapshot, SNAPSHOT_NAME)
+        if snapshot is None:
+            snapshot = PlatformStatsSnapshot(name=SNAPSHOT_NAME)
+            session.add(snapshot)
+        for field, value in values.items():
+            setattr(snapshot, field, value)
+        snapshot.refreshed_at = datetime.now(timezone.utc)
+        await session.commit()
+
+        self._last_refresh_at = snapshot.refreshed_at
+        self._last_refresh_ms = (time.perf_counter() - started) * 1000
+        self._counters["refreshes"] += 1
+        return self._as_overview(snapshot)
+
+    async def overview(self, session: AsyncSession) -> Dict[str, Any]:
+        """The latest snapshot; refreshed inline when missing or older than PLATFORM_STATS_MAX_AGE_SECONDS."""
+        snapshot = await session.get(PlatformStatsSnapshot, SNAPSHOT_NAME)
+        if snapshot is None or snapshot.refreshed_at is None or self._age_seconds(snapshot) > PLATFORM_STATS_MAX_AGE_SECONDS:
+            self._counters["inline_refreshes"] += 1
+            return await self.refresh(session)
+        return self._as_overview(snapshot)
+
+    @staticmethod
+    def _refreshed_at(snapshot: PlatformStatsSnapshot) -> datetime:
+        refreshed_at = snapshot.refreshed_at
+        if refreshed_at.tzinfo is None:  # SQLite drops the offset
+            refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+        return refreshed_at
+
+    def _age_seconds(self, snapshot: PlatformStatsSnapshot) -> float:
+        return (datetime.now(timezone.utc) - self._refreshed_at(snapshot)).total_seconds()
+
+    def _as_overview(self, snapshot: PlatformStatsSnapshot) -> Dict[str, Any]:
+        overview = {field: int(getattr(snapshot, field) or 0) for field in OVERVIEW_FIELDS if field != "mrr"}
+        overview["mrr"] = float(snapshot.mrr or 0)
+        overview["refreshed_at"] = self._refreshed_at(snapshot)
+        return overview
+
+    # --- usage counters ------------------------------------------------------
+
+    async def flush_usage(self, session: AsyncSession) -> int:
+        """Add this process's pending counts to the daily tables; returns API calls flushed."""
+        pending = self.counters.drain()
+        if not pending:
+            return 0
+        dialect = session.bind.dialect.name
+        try:
+            calls = _insert(dialect, PlatformUsageDaily.__table__)
+            calls = calls.on_conflict_do_update(
+                index_elements=["day"],
+                set_={"api_calls": PlatformUsageDaily.__table__.c.api_calls + calls.excluded.api_calls},
+            )
+            await session.execute(calls, [
+                {"day": day, "api_calls": api_calls, "active_users": 0} for day, (api_calls, _) in pending.items()
+            ])
+
+            activity = [{"day": day, "user_id": user_id} for day, (_, user_ids) in pending.items() for user_id in user_ids]
+            if activity:
+                await session.execute(
+                    _insert(dialect, UserActivityDaily.__table__).on_conflict_do_nothing(), activity
+                )
+
+            distinct_users = (
+                select(func.count())
+                .where(UserActivityDaily.day == PlatformUsageDaily.day)
+                .scalar_subquery()
+            )
+            await session.execute(
+                update(PlatformUsageDaily)
+                .where(PlatformUsageDaily.day.in_(list(pending)))
+                .values(active_users=distinct_users)
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            self.counters.restore(pending)
+            raise
+        self._counters["usage_flushes"] += 1
+        return sum(api_calls for api_calls, _ in pending.values())
+
+    async def usage(self, session: AsyncSession, days: int = 7) -> Dict[str, Any]:
+        """Daily active users for the last `days` UTC days (zero-filled) and today's API calls."""
+        today = _utc_today()
+        start = today - timedelta(days=days - 1)
+        rows = await session.execute(
+            select(PlatformUsageDaily).where(PlatformUsageDaily.day >= start)
+        )
+        by_day = {row.day: row for row in rows.scalars()}
+        series = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            series.append({"date": day.isoformat(), "count": by_day[day].active_users if day in by_day else 0})
+        return {
+            "daily_active_users": series,
+            "active_users_today": series[-1]["count"],
+            "api_calls_today": by_day[today].api_calls if today in by_day else 0,
+        }
+
+    async def prune(self, session: AsyncSession) -> None:
+        cutoff = _utc_today() - timedelta(days=PLATFORM_USAGE_RETENTION_DAYS)
+        await session.execute(delete(UserActivityDaily).where(UserActivityDaily.day < cutoff))
+        await session.execute(delete(PlatformUsageDaily).where(PlatformUsageDaily.day < cutoff))
+        await session.commit()
+
+    async def run_once(self, session: AsyncSession) -> None:
+        await self.flush_usage(session)
+        await self.refresh(session)
+        await self.prune(session)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": PLATFORM_STATS_ENABLED,
+            "last_refresh_at": self._last_refresh_at.isoformat() if self._last_refresh_at else None,
+            "last_refresh_ms": round(self._last_refresh_ms, 1),
+            "pending_api_calls": self.counters.pending_calls(),
+            **self._counters,
+        }
+
+
+# Singleton instances
+usage_counters = UsageCounters()
+platform_stats = PlatformStatsService(usage_counters)
+
+
+async def platform_stats_worker(interval_seconds: float = PLATFORM_STATS_REFRESH_SECONDS) -> None:
+    """Background loop flushing usage counters and refreshing the overview snapshot."""
+    from app.core.database import AsyncSessionLocal
+
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                await platform_stats.run_once(session)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            platform_stats._counters["errors"] += 1
+            logger.exception(f"Platform stats refresh error: {exc}")
+
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,258 @@
+"""
+Principal Cache - Resolved users for get_current_user without per-request queries.
+
+get_current_user used to load the User row plus its role and permission
+overrides (three queries) on every authenticated request. The result is now
+cached as a read-only `Principal` snapshot keyed by (user id, token iat), so a
+fresh login always resolves from the database.
+
+Tiers:
+    - In-process LRU (PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_LOCAL_TTL_SECONDS)
+    - Redis hash per user (PRINCIPAL_CACHE_TTL_SECONDS), attached by
+      JobQueue.connect() when Redis is available and PRINCIPAL_CACHE_REDIS_ENABLED is set
+
+Write paths that change a user, their role or their overrides call
+`invalidate_user(user_id)`; role definition edits call `invalidate_all()`.
+Invalidation clears this worker's memory tier and the shared Redis tier; other
+workers' memory tiers expire within PRINCIPAL_CACHE_LOCAL_TTL_SECONDS.
+
+Endpoints that modify the caller's own row must load it from their session
+(see app.api.deps.load_current_user_row) - a Principal cannot be written.
+Secret columns (SNAPSHOT_EXCLUDED_COLUMNS) are never copied into a snapshot, so
+they do not reach Redis; endpoints that need them (password checks) load the row.
+"""
+
+import os
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from sqlalchemy import inspect as sa_inspect
+
+from app.core.ttl_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+
+PRINCIPAL_CACHE_ENABLED = os.getenv("PRINCIPAL_CACHE_ENABLED", "true").lower() == "true"
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+PRINCIPAL_CACHE_LOCAL_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_LOCAL_TTL_SECONDS", "15"))
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_REDIS_ENABLED = os.getenv("PRINCIPAL_CACHE_REDIS_ENABLED", "true").lower() == "true"
+PRINCIPAL_CACHE_KEY_PREFIX = os.getenv("PRINCIPAL_CACHE_KEY_PREFIX", "cadence:principal:")
+
+# Columns kept out of snapshots (and therefore out of the shared cache)
+SNAPSHOT_EXCLUDED_COLUMNS = frozenset({"hashed_password"})
+
+
+class Snapshot:
+    """Read-only attribute view over a dict of column values."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Dict[str, Any]):
+        object.__setattr__(self, "_values", dict(values))
+
+    @classmethod
+    def from_row(cls, row: Any) -> "Snapshot":
+        mapper = sa_inspect(type(row))
+        return cls({
+            attr.key: getattr(row, attr.key)
+            for attr in mapper.column_attrs
+            if attr.key not in SNAPSHOT_EXCLUDED_COLUMNS
+        })
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__} has no attribute '{name}'") from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(
+            f"{type(self).__name__} is read-only; load the row from the session to modify it"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._values)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} id={self._values.get('id')}>"
+
+
+class Principal(Snapshot):
+    """
+    Frozen copy of a User with its role (`role_model`) and overrides
+    (`custom_permissions`). Exposes the same attribute names as the ORM User,
+    so permission checks and response models accept it unchanged.
+    """
+
+    __slots__ = ("_memo",)
+
+    def memoized(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Derived data computed once per snapshot (e.g. compiled permissions)."""
+        try:
+            memo = object.__getattribute__(self, "_memo")
+        except AttributeError:
+            memo = {}
+            object.__setattr__(self, "_memo", memo)
+        if name not in memo:
+            memo[name] = factory()
+        return memo[name]
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        values = Snapshot.from_row(user).to_dict()
+        values["role_model"] = Snapshot.from_row(user.role_model) if user.role_model is not None else None
+        values["custom_permissions"] = tuple(Snapshot.from_row(p) for p in user.custom_permissions)
+        return cls(values)
+
+    def to_json(self) -> str:
+        values = self.to_dict()
+        values["role_model"] = values["role_model"].to_dict() if values["role_model"] is not None else None
+        values["custom_permissions"] = [p.to_dict() for p in values["custom_permissions"]]
+        return json.dumps(values, default=_encode_value)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Principal":
+        values = json.loads(raw, object_hook=_decode_value)
+        role_model = values.get("role_model")
+        values["role_model"] = Snapshot(role_model) if role_model is not None else None
+        values["custom_permissions"] = tuple(Snapshot(p) for p in values.get("custom_permissions") or ())
+        return cls(values)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode_value(obj: Dict[str, Any]) -> Any:
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+class PrincipalCache:
+    """Two-tier (local LRU + optional Redis) cache of Principals."""
+
+    def __init__(
+        self,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+        local_ttl_seconds: int = PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+        ttl_seconds: int = PRINCIPAL_CACHE_TTL_SECONDS,
+        enabled: bool = PRINCIPAL_CACHE_ENABLED,
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self._local = TTLLRUCache(max_entries=max_entries, ttl_seconds=local_ttl_seconds)
+        self._redis: Optional[Any] = None
+        self._counters = {"hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0, "redis_errors": 0}
+
+    def use_redis(self, redis: Optional[Any]) -> None:
+        """Attach (or detach with None) a redis.asyncio client as the shared tier."""
+        self._redis = redis if PRINCIPAL_CACHE_REDIS_ENABLED else None
+
+    @staticmethod
+    def _redis_key(user_id: int) -> str:
+        return f"{PRINCIPAL_CACHE_KEY_PREFIX}{user_id}"
+
+    async def get(self, user_id: int, issued_at: Optional[int]) -> Optional[Principal]:
+        if not self.enabled:
+            return None
+
+        principal = self._local.get((user_id, issued_at))
+        if principal is not None:
+            self._counters["hits"] += 1
+            return principal
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.hget(self._redis_key(user_id), str(issued_at))
+            except Exception as e:
+                self._counters["redis_errors"] += 1
+                logger.warning(f"Principal cache Redis read failed: {e}")
+                raw = None
+            if raw is not None:
+                try:
+                    principal = Principal.from_json(raw.decode("utf-8") if isinstance(raw, bytes) else raw)
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Discarding unreadable cached principal for user {user_id}: {e}")
+                else:
+                    self._local.set((user_id, issued_at), principal)
+                    self._counters["hits"] += 1
+                    self._counters["redis_hits"] += 1
+                    return principal
+
+        self._counters["misses"] += 1
+        return None
+
+    async def set(self, principal: Principal, issued_at: Optional[int]) -> None:
+        if not self.enabled:
+            return
+        self._local.set((principal.id, issued_at), principal)
+        if self._redis is not None:
+            key = self._redis_key(principal.id)
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.hset(key, str(issued_at), principal.to_json())
+                    pipe.expire(key, self.ttl_seconds)
+                    await pipe.execute()
+            except Exception as e:
+                self._counters["redis_errors"] += 1
+                logger.warning(f"Principal cache Redis write failed: {e}")
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached principal of one user (all tokens)."""
+        await self.invalidate_users([user_id])
+
+    async def invalidate_users(self, user_ids: Iterable[int]) -> None:
+        ids = {user_id for user_id in user_ids if user_id is not None}
+        if not ids:
+            return
+        self._counters["invalidations"] += 1
+        self._local.delete_where(lambda key: key[0] in ids)
+        if self._redis is not None:
+            try:
+                await self._redis.delete(*(self._redis_key(user_id) for user_id in ids))
+            except Exception as e:
+                self._counters["redis_errors"] += 1
+                logger.warning(f"Principal cache Redis invalidation failed: {e}")
+
+    async def invalidate_all(self) -> None:
+        """Drop every cached principal (e.g. after a role's permissions change)."""
+        self._counters["invalidations"] += 1
+        self._local.clear()
+        if self._redis is not None:
+            try:
+                keys = [key async for key in self._redis.scan_iter(match=f"{PRINCIPAL_CACHE_KEY_PREFIX}*")]
+                if keys:
+                    await self._redis.delete(*keys)
+            except Exception as e:
+                self._counters["redis_errors"] += 1
+                logger.warning(f"Principal cache Redis invalidation failed: {e}")
+
+    def clear(self) -> None:
+        self._local.clear()
+        for name in self._counters:
+            self._counters[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["misses"]
+        return {
+            "enabled": self.enabled,
+            "backend": "memory+redis" if self._redis is not None else "memory",
+            "entries": len(self._local),
+            "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else None,
+            **self._counters,
+        }
+
+
+# Singleton instance
+principal_cache = PrincipalCache()
@@ -0,0 +1,407 @@
+"""
+Rate Limiting - Token buckets for outbound provider calls.
+
+Each provider (SendGrid, Twilio, ...) gets one bucket per process, refilled
+continuously at `rate` tokens/second up to `capacity`. Callers `await
+bucket.acquire()` before each API request, so bulk senders stay under the
+provider's documented limits instead of discovering them through 429s.
+
+Discovery providers (Influencers Club, Modash) are called from request
+handlers in every API worker, so their limit is enforced by a
+SharedRateLimiter instead (get_provider_limiter):
+
+    - One token bucket shared by all workers in Redis (atomic Lua script),
+      attached by JobQueue.connect(); the in-process bucket is the fallback
+      when Redis is unavailable
+    - Waiters queue per tenant (organization) and are served round-robin,
+      so one organization's bulk job cannot starve the others
+    - A provider 429 blocks the bucket for its Retry-After everywhere
+    - Waits longer than PROVIDER_RATE_LIMIT_MAX_WAIT_SECONDS are rejected
+      with ProviderRateLimited instead of piling up
+
+Usage:
+    with rate_limit_tenant(f"org:{user.organization_id}"):
+        await get_provider_limiter("influencers_club").acquire()
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, Hashable, Optional
+
+from app.core.concurrency import percentile
+
+logger = logging.getLogger(__name__)
+
+
+# Provider limits (requests/second and burst size), overridable per deployment
+PROVIDER_RATE_LIMITS = {
+    "sendgrid": (
+        float(os.getenv("SENDGRID_REQUESTS_PER_SECOND", "10")),
+        int(os.getenv("SENDGRID_BURST", "20")),
+    ),
+    "twilio": (
+        float(os.getenv("TWILIO_REQUESTS_PER_SECOND", "1")),
+        int(os.getenv("TWILIO_BURST", "5")),
+    ),
+}
+
+
+class TokenBucket:
+    """Async token bucket (in-process)."""
+
+    def __init__(self, rate: float, capacity: int, name: str = "bucket"):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.name = name
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens if available right now; never waits."""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1) -> float:
+        """
+        Wait until `tokens` are available and take them.
+
+        Waiters are served in arrival order (the lock is FIFO).
+        Returns the number of seconds spent waiting.
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}")
+        started = time.monotonic()
+        async with self._lock:
+            while not self.try_acquire(tokens):
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+        return time.monotonic() - started
+
+
+_provider_buckets: Dict[str, TokenBucket] = {}
+
+
+def get_provider_bucket(provider: str) -> Optional[TokenBucket]:
+    """Return the shared bucket for a provider, or None if it has no configured limit."""
+    provider = provider.lower()
+    if provider not in _provider_buckets:
+        limits = PROVIDER_RATE_LIMITS.get(provider)
+        if not limits:
+            return None
+        rate, burst = limits
+        _provider_buckets[provider] = TokenBucket(rate, burst, name=provider)
+    return _provider_buckets[provider]
+
+
+# --- shared (multi-worker) provider limiters ------------------------------------
+
+# Discovery provider limits (requests/second and burst size) shared by every worker
+SHARED_PROVIDER_RATE_LIMITS = {
+    "influencers_club": (
+        float(os.getenv("INFLUENCERS_CLUB_REQUESTS_PER_SECOND", "5")),  # 300/minute
+        int(os.getenv("INFLUENCERS_CLUB_BURST", "10")),
+    ),
+    "modash": (
+        float(os.getenv("MODASH_REQUESTS_PER_SECOND", "2")),
+        int(os.getenv("MODASH_BURST", "5")),
+    ),
+}
+PROVIDER_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("PROVIDER_RATE_LIMIT_MAX_WAIT_SECONDS", "30"))
+PROVIDER_RATE_LIMIT_REDIS_ENABLED = os.getenv("PROVIDER_RATE_LIMIT_REDIS_ENABLED", "true").lower() == "true"
+PROVIDER_RATE_LIMIT_KEY_PREFIX = os.getenv("PROVIDER_RATE_LIMIT_KEY_PREFIX", "cadence:ratelimit:")
+
+DEFAULT_TENANT = "default"
+_tenant: ContextVar[str] = ContextVar("rate_limit_tenant", default=DEFAULT_TENANT)
+
+
+def set_rate_limit_tenant(tenant: Hashable) -> None:
+    """Attribute provider calls made by the current request to `tenant` (see app.api.deps)."""
+    _tenant.set(str(tenant))
+
+
+@contextmanager
+def rate_limit_tenant(tenant: Hashable):
+    token = _tenant.set(str(tenant))
+    try:
+        yield
+    finally:
+        _tenant.reset(token)
+
+
+class ProviderRateLimited(Exception):
+    """A provider call could not get a rate-limit slot within the allowed wait."""
+
+    def __init__(self, provider: str, retry_after: float):
+        self.provider = provider
+        self.retry_after = max(1.0, retry_after)
+        super().__init__(f"{provider} rate limit: retry after {self.retry_after:.0f}s")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+# Refill, then take `requested` tokens. Returns "0" when taken, else the
+# seconds until they could be (blocked_until from a provider 429 included).
+_TAKE_LUA = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local blocked = tonumber(redis.call('HGET', key, 'blocked_until') or '0')
+if blocked > now then
+    return tostring(blocked - now)
+end
+local tokens = tonumber(redis.call('HGET', key, 'tokens') or tostring(capacity))
+local updated = tonumber(redis.call('HGET', key, 'updated_at') or tostring(now))
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', key, 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', key, math.ceil(capacity / rate) + 3600)
+return tostring(wait)
+"""
+
+# Push blocked_until to now + seconds (never earlier than an existing block)
+_BLOCK_LUA = """
+local key = KEYS[1]
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local until_ts = now + tonumber(ARGV[1])
+local blocked = tonumber(redis.call('HGET', key, 'blocked_until') or '0')
+if until_ts > blocked then
+    redis.call('HSET', key, 'blocked_until', tostring(until_ts))
+end
+return tostring(math.max(until_ts, blocked) - now)
+"""
+
+
+class SharedRateLimiter:
+    """Provider limiter: Redis token bucket (local fallback), per-tenant fair queuing, Retry-After."""
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        capacity: int,
+        max_wait_seconds: float = PROVIDER_RATE_LIMIT_MAX_WAIT_SECONDS,
+        window: int = 500,
+    ):
+        self.name = name
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.max_wait_seconds = max_wait_seconds
+        self._local = TokenBucket(rate, self.capacity, name=name)
+        self._redis: Optional[Any] = None
+        self._blocked_until = 0.0  # monotonic
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wait_ms: Deque[float] = deque(maxlen=max(1, window))
+        self._counters = {
+            "acquired": 0, "waited": 0, "rejected": 0, "provider_throttled": 0, "redis_errors": 0,
+        }
+
+    @property
+    def redis_key(self) -> str:
+        return f"{PROVIDER_RATE_LIMIT_KEY_PREFIX}{self.name}"
+
+    def use_redis(self, redis: Optional[Any]) -> None:
+        """Attach (or detach with None) a redis.asyncio client holding the shared bucket."""
+        self._redis = redis if PROVIDER_RATE_LIMIT_REDIS_ENABLED else None
+
+    # --- token source ----------------------------------------------------------
+
+    async def _take(self) -> float:
+        """Take one token now if possible; otherwise the seconds to wait before retrying."""
+        blocked_for = self._blocked_until - time.monotonic()
+        if blocked_for > 0:
+            return blocked_for
+        if self._redis is not None:
+            try:
+                wait = await self._redis.eval(_TAKE_LUA, 1, self.redis_key, self.rate, self.capacity, 1)
+                return float(wait)
+            except Exception as e:
+                self._counters["redis_errors"] += 1
+                logger.warning(f"Rate limiter {self.name}: Redis unavailable, using local bucket: {e}")
+        if self._local.try_acquire():
+            return 0.0
+        return (1 - self._local._tokens) / self.rate
+
+    def _refund(self) -> None:
+        if self._redis is None:
+            self._local._tokens = min(self.capacity, self._local._tokens + 1)
+
+    # --- fair queue ------------------------------------------------------------
+
+    def _waiting(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """Round-robin over tenants: pop the head of the first queue, then move that tenant last."""
+        while self._queues:
+            tenant, queue = next(iter(self._queues.items()))
+            while queue and queue[0].done():  # timed out / cancelled
+                queue.popleft()
+            if not queue:
+                del self._queues[tenant]
+                continue
+            waiter = queue.popleft()
+            if queue:
+                self._queues.move_to_end(tenant)
+            else:
+                del self._queues[tenant]
+            return waiter
+        return None
+
+    async def _dispatch(self, delay: float = 0.0) -> None:
+        if delay > 0:
+            await asyncio.sleep(min(delay, 1.0))
+        while self._queues:
+            wait = await self._take()
+            if wait > 0:
+                await asyncio.sleep(min(wait, 1.0))
+                continue
+            waiter = self._next_waiter()
+            if waiter is None:
+                self._refund()
+                break
+            waiter.set_result(None)
+
+    def _ensure_dispatcher(self, delay: float = 0.0) -> None:
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is None or self._dispatcher.done() or self._dispatcher.get_loop() is not loop:
+            self._queues = OrderedDict((t, q) for t, q in self._queues.items() if q and q[0].get_loop() is loop)
+            self._dispatcher = asyncio.ensure_future(self._dispatch(delay))
+
+    async def acquire(self, tenant: Optional[Hashable] = None) -> float:
+        """
+        Wait for a slot for `tenant` (default: the current request's tenant).
+
+        Returns the seconds spent waiting; raises ProviderRateLimited when the
+        provider is blocked, or no slot comes, within max_wait_seconds.
+        """
+        started = time.monotonic()
+        blocked_for = self._blocked_until - started
+        if blocked_for > self.max_wait_seconds:
+            self._counters["rejected"] += 1
+            raise ProviderRateLimited(self.name, blocked_for)
+
+        delay = 0.0
+        if not self._queues:
+            delay = await self._take()
+            if delay <= 0:
+                self._record(0.0)
+                return 0.0
+
+        tenant = str(tenant) if tenant is not None else _tenant.get()
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(tenant, deque()).append(waiter)
+        self._ensure_dispatcher(delay)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            self._counters["rejected"] += 1
+            raise ProviderRateLimited(self.name, self._waiting() / self.rate) from None
+        waited = time.monotonic() - started
+        self._record(waited)
+        return waited
+
+    def _record(self, waited: float) -> None:
+        self._counters["acquired"] += 1
+        if waited > 0:
+            self._counters["waited"] += 1
+        self._wait_ms.append(waited * 1000)
+
+    async def throttled(self, retry_after: Optional[float]) -> None:
+        """The provider answered 429: pause every caller for Retry-After (default 1/rate)."""
+        seconds = retry_after if retry_after is not None else 1 / self.rate
+        self._counters["provider_throttled"] += 1
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        if self._redis is not None:
+            try:
+                await self._redis.eval(_BLOCK_LUA, 1, self.redis_key, seconds)
+            except Exception as e:
+                self._counters["redis_errors"] += 1
+                logger.warning(f"Rate limiter {self.name}: could not share Retry-After: {e}")
+        logger.warning(f"{self.name} returned 429; pausing calls for {seconds:.1f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis" if self._redis is not None else "memory",
+            "rate_per_second": self.rate,
+            "burst": self.capacity,
+            "waiting": self._waiting(),
+            "tenants_waiting": len(self._queues),
+            "blocked_for_seconds": round(max(0.0, self._blocked_until - time.monotonic()), 1),
+            "wait_ms_p50": percentile(self._wait_ms, 50),
+            "wait_ms_p95": percentile(self._wait_ms, 95),
+            "wait_ms_max": round(max(self._wait_ms), 1) if self._wait_ms else None,
+            **self._counters,
+        }
+
+
+_provider_limiters: Dict[str, SharedRateLimiter] = {}
+_limiter_redis: Optional[Any] = None
+
+
+def get_provider_limiter(provider: str) -> Optional[SharedRateLimiter]:
+    """Return the shared limiter for a discovery provider, or None if it has no configured limit."""
+    provider = provider.lower()
+    if provider not in _provider_limiters:
+        limits = SHARED_PROVIDER_RATE_LIMITS.get(provider)
+        if not limits:
+            return None
+        rate, burst = limits
+        limiter = SharedRateLimiter(provider, rate, burst)
+        limiter.use_redis(_limiter_redis)
+        _provider_limiters[provider] = limiter
+    return _provider_limiters[provider]
+
+
+def use_rate_limit_redis(redis: Optional[Any]) -> None:
+    """Share every provider limiter's bucket through Redis (None: per-process buckets)."""
+    global _limiter_redis
+    _limiter_redis = redis
+    for limiter in _provider_limiters.values():
+        limiter.use_redis(redis)
+
+
+def provider_limiter_stats() -> Dict[str, Any]:
+    return {name: limiter.stats() for name, limiter in _provider_limiters.items()}
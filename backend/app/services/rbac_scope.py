@@ -1,13 +1,18 @@
 """
 Helpers for user-visibility and role-assignment scope rules.
+
+Visibility follows the users.parent_user_id tree: a user sees themselves and
+everyone below them. Lookups use the user_hierarchy_closure table
+(app.models.user_hierarchy), an indexed lookup on (ancestor_id, descendant_id).
 """
 from typing import Optional, Set
 
-from sqlalchemy import exists, or_, true
+from sqlalchemy import exists, true
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.models.models import User
+from app.models.user_hierarchy import closure
 from app.services.auth_service import ROLE_HIERARCHY, is_super_admin
 
 
@@ -18,18 +23,12 @@ STRICT_CHILD_ROLE_MAP = {
 }
 
 
-def descendant_ids_cte(root_user_id: int):
-    """Recursive CTE containing all descendants of root_user_id."""
-    users = User.__table__
-    descendants = (
-        select(users.c.id)
-        .where(users.c.parent_user_id == root_user_id)
-        .cte(name="descendants", recursive=True)
-    )
-    descendants = descendants.union_all(
-        select(users.c.id).where(users.c.parent_user_id == descendants.c.id)
-    )
-    return descendants
+def descendant_ids_subquery(root_user_id: int, include_self: bool = True):
+    """SELECT of root_user_id's descendants (and itself), via the closure table."""
+    query = select(closure.c.descendant_id).where(closure.c.ancestor_id == root_user_id)
+    if not include_self:
+        query = query.where(closure.c.depth > 0)
+    return query
 
 
 def visible_users_where_clause(current_user: User):
@@ -37,11 +36,7 @@ def visible_users_where_clause(current_user: User):
     if is_super_admin(current_user.role):
         return None
 
-    descendants = descendant_ids_cte(current_user.id)
-    return or_(
-        User.id == current_user.id,
-        User.id.in_(select(descendants.c.id)),
-    )
+    return User.id.in_(descendant_ids_subquery(current_user.id))
 
 
 def visible_user_ids_subquery(current_user: User):
@@ -52,16 +47,7 @@ def visible_user_ids_subquery(current_user: User):
     if is_super_admin(current_user.role):
         return None
 
-    descendants = descendant_ids_cte(current_user.id)
-    return (
-        select(User.id)
-        .where(
-            or_(
-                User.id == current_user.id,
-                User.id.in_(select(descendants.c.id)),
-            )
-        )
-    )
+    return descendant_ids_subquery(current_user.id)
 
 
 def visible_user_filter(current_user: User, user_id_column):
@@ -81,11 +67,11 @@ async def can_manage_user(current_user: User, target_user_id: int, db: AsyncSess
     if current_user.id == target_user_id:
         return True
 
-    descendants = descendant_ids_cte(current_user.id)
     result = await db.execute(
         select(
-            exists(
-                select(descendants.c.id).where(descendants.c.id == target_user_id)
+            exists().where(
+                closure.c.ancestor_id == current_user.id,
+                closure.c.descendant_id == target_user_id,
             )
         )
     )
@@ -19,6 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.core.config import settings
+from app.core.http_clients import get_http_client
 from app.models.social import SocialConnection
 
 # OAuth configuration per platform
@@ -218,54 +219,54 @@ class SocialAuthService:
             )
         redirect_uri = f"{settings.OAUTH_REDIRECT_BASE}/{platform}"
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            token_payload = {
-                "client_id": client_id,
-                "client_secret": client_secret,
-                "code": code,
-                "redirect_uri": redirect_uri,
-                "grant_type": "authorization_code",
-            }
+        client = get_http_client("social")
+        token_payload = {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "code": code,
+            "redirect_uri": redirect_uri,
+            "grant_type": "authorization_code",
+        }
 
-            token_resp = await client.post(config["token_url"], data=token_payload)
-            if token_resp.status_code != 200:
-                raise ValueError(f"Token exchange failed: {token_resp.text}")
+        token_resp = await client.post(config["token_url"], data=token_payload)
+        if token_resp.status_code != 200:
+            raise ValueError(f"Token exchange failed: {token_resp.text}")
 
-            token_data = token_resp.json()
-            access_token = token_data.get("access_token")
-            refresh_token = token_data.get("refresh_token")
-            expires_in = token_data.get("expires_in", 3600)
+        token_data = token_resp.json()
+        access_token = token_data.get("access_token")
+        refresh_token = token_data.get("refresh_token")
+        expires_in = token_data.get("expires_in", 3600)
 
-            if not access_token:
-                raise ValueError("No access_token in response")
+        if not access_token:
+            raise ValueError("No access_token in response")
 
-            profile_params = dict(config.get("profile_params", {}))
-            profile_resp = await client.get(
-                config["profile_url"],
-                params=profile_params,
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
-            profile_data = profile_resp.json() if profile_resp.status_code == 200 else {}
+        profile_params = dict(config.get("profile_params", {}))
+        profile_resp = await client.get(
+            config["profile_url"],
+            params=profile_params,
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        profile_data = profile_resp.json() if profile_resp.status_code == 200 else {}
 
-            facebook_pages: list[dict[str, str]] = []
-            if platform == "facebook":
-                facebook_pages = await SocialAuthService._fetch_facebook_pages(client, access_token)
-            instagram_accounts: list[dict[str, str]] = []
-            if platform == "instagram":
-                instagram_accounts = await SocialAuthService._fetch_instagram_business_accounts(client, access_token)
-                if not instagram_accounts:
-                    raise ValueError(
-                        "No Instagram Business/Creator account found on your Facebook Pages. "
-                        "Connect Instagram to a Facebook Page in Meta first."
-                    )
-            whatsapp_phones: list[dict[str, str]] = []
-            if platform == "whatsapp":
-                whatsapp_phones = await SocialAuthService._fetch_whatsapp_phone_numbers(client, access_token)
-                if not whatsapp_phones:
-                    raise ValueError(
-                        "No WhatsApp Business phone numbers found. "
-                        "Ensure your Meta Business has a WhatsApp Business Account with an active phone number."
-                    )
+        facebook_pages: list[dict[str, str]] = []
+        if platform == "facebook":
+            facebook_pages = await SocialAuthService._fetch_facebook_pages(client, access_token)
+        instagram_accounts: list[dict[str, str]] = []
+        if platform == "instagram":
+            instagram_accounts = await SocialAuthService._fetch_instagram_business_accounts(client, access_token)
+            if not instagram_accounts:
+                raise ValueError(
+                    "No Instagram Business/Creator account found on your Facebook Pages. "
+                    "Connect Instagram to a Facebook Page in Meta first."
+                )
+        whatsapp_phones: list[dict[str, str]] = []
+        if platform == "whatsapp":
+            whatsapp_phones = await SocialAuthService._fetch_whatsapp_phone_numbers(client, access_token)
+            if not whatsapp_phones:
+                raise ValueError(
+                    "No WhatsApp Business phone numbers found. "
+                    "Ensure your Meta Business has a WhatsApp Business Account with an active phone number."
+                )
 
         username = _extract_nested(profile_data, config.get("username_key", "name"))
         platform_user_id = str(profile_data.get("id", ""))
@@ -437,29 +438,29 @@ class SocialAuthService:
         client_id = getattr(settings, config["client_id_attr"])
         client_secret = getattr(settings, config["client_secret_attr"])
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            token_resp = await client.post(
-                config["token_url"],
-                data={
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                    "refresh_token": connection.refresh_token,
-                    "grant_type": "refresh_token",
-                },
-            )
-            if token_resp.status_code != 200:
-                return None
+        client = get_http_client("social")
+        token_resp = await client.post(
+            config["token_url"],
+            data={
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "refresh_token": connection.refresh_token,
+                "grant_type": "refresh_token",
+            },
+        )
+        if token_resp.status_code != 200:
+            return None
 
-            token_data = token_resp.json()
-            connection.access_token = token_data.get("access_token")
-            if token_data.get("refresh_token"):
-                connection.refresh_token = token_data["refresh_token"]
-            expires_in = token_data.get("expires_in", 3600)
-            connection.token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=int(expires_in))
+        token_data = token_resp.json()
+        connection.access_token = token_data.get("access_token")
+        if token_data.get("refresh_token"):
+            connection.refresh_token = token_data["refresh_token"]
+        expires_in = token_data.get("expires_in", 3600)
+        connection.token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=int(expires_in))
 
-            await db.commit()
-            await db.refresh(connection)
-            return connection
+        await db.commit()
+        await db.refresh(connection)
+        return connection
 
     @staticmethod
     def _get_selected_whatsapp_phone(connection: SocialConnection) -> Optional[dict]:
@@ -525,63 +526,63 @@ class SocialAuthService:
             raise ValueError("WhatsApp message text, template, or media is required")
 
         results: list[dict] = []
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for to in to_numbers:
-                recipient = str(to or "").strip()
-                if not recipient:
-                    continue
-
-                payload: dict = {
-                    "messaging_product": "whatsapp",
-                    "to": recipient,
-                }
+        client = get_http_client("social")
+        for to in to_numbers:
+            recipient = str(to or "").strip()
+            if not recipient:
+                continue
 
-                if template:
-                    payload.update(
-                        {
-                            "type": "template",
-                            "template": template,
-                        }
-                    )
-                elif media_payload:
-                    payload.update(media_payload)
-                    if message:
-                        payload.setdefault("image", {})["caption"] = message
-                else:
-                    payload.update(
-                        {
-                            "type": "text",
-                            "text": {"preview_url": False, "body": message or ""},
-                        }
-                    )
+            payload: dict = {
+                "messaging_product": "whatsapp",
+                "to": recipient,
+            }
 
-                resp = await client.post(
-                    f"https://graph.facebook.com/v18.0/{phone_number_id}/messages",
-                    headers={
-                        "Authorization": f"Bearer {connection.access_token}",
-                        "Content-Type": "application/json",
-                    },
-                    json=payload,
+            if template:
+                payload.update(
+                    {
+                        "type": "template",
+                        "template": template,
+                    }
+                )
+            elif media_payload:
+                payload.update(media_payload)
+                if message:
+                    payload.setdefault("image", {})["caption"] = message
+            else:
+                payload.update(
+                    {
+                        "type": "text",
+                        "text": {"preview_url": False, "body": message or ""},
+                    }
                 )
 
-                if resp.status_code not in (200, 201):
-                    results.append(
-                        {
-                            "to": recipient,
-                            "status": "failed",
-                            "error": resp.text,
-                        }
-                    )
-                    continue
+            resp = await client.post(
+                f"https://graph.facebook.com/v18.0/{phone_number_id}/messages",
+                headers={
+                    "Authorization": f"Bearer {connection.access_token}",
+                    "Content-Type": "application/json",
+                },
+                json=payload,
+            )
 
-                data = resp.json()
+            if resp.status_code not in (200, 201):
                 results.append(
                     {
                         "to": recipient,
-                        "status": "sent",
-                        "message_id": (data.get("messages") or [{}])[0].get("id"),
+                        "status": "failed",
+                        "error": resp.text,
                     }
                 )
+                continue
+
+            data = resp.json()
+            results.append(
+                {
+                    "to": recipient,
+                    "status": "sent",
+                    "message_id": (data.get("messages") or [{}])[0].get("id"),
+                }
+            )
 
         return {
             "platform": "whatsapp",
@@ -700,23 +701,23 @@ class SocialAuthService:
         image_bytes: bytes,
     ) -> str:
         """Upload media to WhatsApp Cloud API and return media id."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(
-                f"https://graph.facebook.com/v18.0/{phone_number_id}/media",
-                headers={"Authorization": f"Bearer {access_token}"},
-                files={
-                    "file": ("image.png", image_bytes, "image/png"),
-                    "type": (None, "image/png"),
-                    "messaging_product": (None, "whatsapp"),
-                },
-            )
-            if resp.status_code not in (200, 201):
-                raise ValueError(f"WhatsApp media upload failed: {resp.text}")
-            data = resp.json()
-            media_id = str(data.get("id") or "").strip()
-            if not media_id:
-                raise ValueError("WhatsApp media upload did not return a media id")
-            return media_id
+        client = get_http_client("social")
+        resp = await client.post(
+            f"https://graph.facebook.com/v18.0/{phone_number_id}/media",
+            headers={"Authorization": f"Bearer {access_token}"},
+            files={
+                "file": ("image.png", image_bytes, "image/png"),
+                "type": (None, "image/png"),
+                "messaging_product": (None, "whatsapp"),
+            },
+        )
+        if resp.status_code not in (200, 201):
+            raise ValueError(f"WhatsApp media upload failed: {resp.text}")
+        data = resp.json()
+        media_id = str(data.get("id") or "").strip()
+        if not media_id:
+            raise ValueError("WhatsApp media upload did not return a media id")
+        return media_id
 
     @staticmethod
     async def _fetch_whatsapp_business_accounts(
@@ -832,66 +833,66 @@ class SocialAuthService:
         if not page_id or not page_access_token:
             raise ValueError("Selected Facebook page is missing id or access token")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            if image_url:
-                if image_url.startswith(("http://", "https://")):
-                    # Prefer byte-upload (`source`) for reliability, because Meta may reject
-                    # URLs that are locally hosted, private, or temporarily inaccessible.
-                    image_resp = await client.get(image_url, follow_redirects=True)
-                    if image_resp.status_code in (200, 201) and image_resp.content:
-                        content_type = image_resp.headers.get("content-type", "").split(";")[0].strip() or "image/png"
-                        resp = await client.post(
-                            f"https://graph.facebook.com/v18.0/{page_id}/photos",
-                            data={
-                                "caption": message or "",
-                                "access_token": page_access_token,
-                            },
-                            files={"source": ("generated.png", image_resp.content, content_type)},
-                        )
-                    else:
-                        resp = await client.post(
-                            f"https://graph.facebook.com/v18.0/{page_id}/photos",
-                            data={
-                                "caption": message or "",
-                                "url": image_url,
-                                "access_token": page_access_token,
-                            },
-                        )
-                elif image_url.startswith("data:"):
-                    encoded = image_url.split(",", 1)[1] if "," in image_url else image_url
-                    try:
-                        image_bytes = base64.b64decode(encoded, validate=True)
-                    except Exception as exc:  # noqa: BLE001
-                        raise ValueError(f"Invalid image data URL: {exc}") from exc
-
+        client = get_http_client("social")
+        if image_url:
+            if image_url.startswith(("http://", "https://")):
+                # Prefer byte-upload (`source`) for reliability, because Meta may reject
+                # URLs that are locally hosted, private, or temporarily inaccessible.
+                image_resp = await client.get(image_url, follow_redirects=True)
+                if image_resp.status_code in (200, 201) and image_resp.content:
+                    content_type = image_resp.headers.get("content-type", "").split(";")[0].strip() or "image/png"
                     resp = await client.post(
                         f"https://graph.facebook.com/v18.0/{page_id}/photos",
                         data={
                             "caption": message or "",
                             "access_token": page_access_token,
                         },
-                        files={"source": ("generated.png", image_bytes, "image/png")},
+                        files={"source": ("generated.png", image_resp.content, content_type)},
                     )
                 else:
-                    raise ValueError(
-                        "Facebook image must be a data URL or public image URL (http/https)."
+                    resp = await client.post(
+                        f"https://graph.facebook.com/v18.0/{page_id}/photos",
+                        data={
+                            "caption": message or "",
+                            "url": image_url,
+                            "access_token": page_access_token,
+                        },
                     )
-            else:
+            elif image_url.startswith("data:"):
+                encoded = image_url.split(",", 1)[1] if "," in image_url else image_url
+                try:
+                    image_bytes = base64.b64decode(encoded, validate=True)
+                except Exception as exc:  # noqa: BLE001
+                    raise ValueError(f"Invalid image data URL: {exc}") from exc
+
                 resp = await client.post(
-                    f"https://graph.facebook.com/v18.0/{page_id}/feed",
-                    data={"message": message, "access_token": page_access_token},
+                    f"https://graph.facebook.com/v18.0/{page_id}/photos",
+                    data={
+                        "caption": message or "",
+                        "access_token": page_access_token,
+                    },
+                    files={"source": ("generated.png", image_bytes, "image/png")},
+                )
+            else:
+                raise ValueError(
+                    "Facebook image must be a data URL or public image URL (http/https)."
                 )
+        else:
+            resp = await client.post(
+                f"https://graph.facebook.com/v18.0/{page_id}/feed",
+                data={"message": message, "access_token": page_access_token},
+            )
 
-            if resp.status_code not in (200, 201):
-                raise ValueError(f"Facebook publish failed: {resp.text}")
+        if resp.status_code not in (200, 201):
+            raise ValueError(f"Facebook publish failed: {resp.text}")
 
-            data = resp.json()
-            return {
-                "platform": "facebook",
-                "status": "published",
-                "post_id": data.get("id"),
-                "target_name": page_name,
-            }
+        data = resp.json()
+        return {
+            "platform": "facebook",
+            "status": "published",
+            "post_id": data.get("id"),
+            "target_name": page_name,
+        }
 
     @staticmethod
     async def publish_instagram_post(
@@ -936,42 +937,42 @@ class SocialAuthService:
         if not ig_business_id:
             raise ValueError("Selected Instagram account is missing instagram_business_id")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            await _validate_instagram_media_url(client, image_url)
+        client = get_http_client("social")
+        await _validate_instagram_media_url(client, image_url)
 
-            create_container = await client.post(
-                f"https://graph.facebook.com/v18.0/{ig_business_id}/media",
-                data={
-                    "image_url": image_url,
-                    "caption": caption or "",
-                    "access_token": publish_token,
-                },
-            )
-            if create_container.status_code not in (200, 201):
-                raise ValueError(_format_meta_graph_error("Instagram media creation failed", create_container.text))
-
-            container_data = create_container.json()
-            creation_id = str(container_data.get("id", "")).strip()
-            if not creation_id:
-                raise ValueError("Instagram media creation did not return an id")
-
-            publish_resp = await client.post(
-                f"https://graph.facebook.com/v18.0/{ig_business_id}/media_publish",
-                data={
-                    "creation_id": creation_id,
-                    "access_token": publish_token,
-                },
-            )
-            if publish_resp.status_code not in (200, 201):
-                raise ValueError(_format_meta_graph_error("Instagram publish failed", publish_resp.text))
+        create_container = await client.post(
+            f"https://graph.facebook.com/v18.0/{ig_business_id}/media",
+            data={
+                "image_url": image_url,
+                "caption": caption or "",
+                "access_token": publish_token,
+            },
+        )
+        if create_container.status_code not in (200, 201):
+            raise ValueError(_format_meta_graph_error("Instagram media creation failed", create_container.text))
+
+        container_data = create_container.json()
+        creation_id = str(container_data.get("id", "")).strip()
+        if not creation_id:
+            raise ValueError("Instagram media creation did not return an id")
+
+        publish_resp = await client.post(
+            f"https://graph.facebook.com/v18.0/{ig_business_id}/media_publish",
+            data={
+                "creation_id": creation_id,
+                "access_token": publish_token,
+            },
+        )
+        if publish_resp.status_code not in (200, 201):
+            raise ValueError(_format_meta_graph_error("Instagram publish failed", publish_resp.text))
 
-            publish_data = publish_resp.json()
-            return {
-                "platform": "instagram",
-                "status": "published",
-                "post_id": publish_data.get("id"),
-                "target_name": ig_name,
-            }
+        publish_data = publish_resp.json()
+        return {
+            "platform": "instagram",
+            "status": "published",
+            "post_id": publish_data.get("id"),
+            "target_name": ig_name,
+        }
 
     @staticmethod
     async def publish_linkedin_post(
@@ -999,54 +1000,54 @@ class SocialAuthService:
         author_urn = f"urn:li:person:{connection.platform_user_id}"
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                media_urn = None
-                if image_bytes:
-                    media_urn = await _upload_linkedin_image(client, connection.access_token, author_urn, image_bytes)
-
-                payload = {
-                    "author": author_urn,
-                    "lifecycleState": "PUBLISHED",
-                    "specificContent": {
-                        "com.linkedin.ugc.ShareContent": {
-                            "shareCommentary": {"text": text},
-                            "shareMediaCategory": "IMAGE" if media_urn else "NONE",
-                        }
-                    },
-                    "visibility": {
-                        "com.linkedin.ugc.MemberNetworkVisibility": visibility,
-                    },
-                }
+            client = get_http_client("social")
+            media_urn = None
+            if image_bytes:
+                media_urn = await _upload_linkedin_image(client, connection.access_token, author_urn, image_bytes)
+
+            payload = {
+                "author": author_urn,
+                "lifecycleState": "PUBLISHED",
+                "specificContent": {
+                    "com.linkedin.ugc.ShareContent": {
+                        "shareCommentary": {"text": text},
+                        "shareMediaCategory": "IMAGE" if media_urn else "NONE",
+                    }
+                },
+                "visibility": {
+                    "com.linkedin.ugc.MemberNetworkVisibility": visibility,
+                },
+            }
 
-                if media_urn:
-                    payload["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = [
-                        {
-                            "status": "READY",
-                            "media": media_urn,
-                        }
-                    ]
+            if media_urn:
+                payload["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = [
+                    {
+                        "status": "READY",
+                        "media": media_urn,
+                    }
+                ]
 
-                resp = await client.post(
-                    "https://api.linkedin.com/v2/ugcPosts",
-                    headers={
-                        "Authorization": f"Bearer {connection.access_token}",
-                        "Content-Type": "application/json",
-                        "X-Restli-Protocol-Version": "2.0.0",
-                    },
-                    json=payload,
-                )
-                if resp.status_code not in (200, 201):
-                    raise ValueError(f"LinkedIn publish failed: {resp.text}")
-
-                post_id = resp.headers.get("x-restli-id")
-                data = _safe_json(resp.text)
-                return {
-                    "platform": "linkedin",
-                    "status": "published",
-                    "post_id": post_id or data.get("id"),
-                    "author": author_urn,
-                    "has_image": bool(media_urn),
-                }
+            resp = await client.post(
+                "https://api.linkedin.com/v2/ugcPosts",
+                headers={
+                    "Authorization": f"Bearer {connection.access_token}",
+                    "Content-Type": "application/json",
+                    "X-Restli-Protocol-Version": "2.0.0",
+                },
+                json=payload,
+            )
+            if resp.status_code not in (200, 201):
+                raise ValueError(f"LinkedIn publish failed: {resp.text}")
+
+            post_id = resp.headers.get("x-restli-id")
+            data = _safe_json(resp.text)
+            return {
+                "platform": "linkedin",
+                "status": "published",
+                "post_id": post_id or data.get("id"),
+                "author": author_urn,
+                "has_image": bool(media_urn),
+            }
         except httpx.HTTPError as exc:
             raise ValueError(f"LinkedIn network error: {exc}") from exc
         except Exception as exc:  # noqa: BLE001
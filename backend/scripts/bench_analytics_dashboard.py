@@ -0,0 +1,142 @@
+"""
+Benchmark: analytics dashboard totals, per-metric queries vs. single pass.
+
+Seeds campaign_events (default 2M events spread over 50 orgs x 20 campaigns,
+with the (campaign_id, type, created_at) index), then times for one org and
+for the platform-wide super admin view:
+    - legacy: the eight count/sum queries get_analytics_dashboard used to run,
+      each filtered by `id IN (events JOIN campaigns JOIN users)`
+    - single: app.services.analytics_service.dashboard_totals_query
+and checks both return the same numbers. A cache hit costs no query at all.
+
+Usage:
+    python scripts/bench_analytics_dashboard.py [--events 2000000] [--orgs 50] [--campaigns 20] [--repeat 5]
+    python scripts/bench_analytics_dashboard.py --database-url postgresql://...   # scratch DB only
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, func, insert, select
+
+# Add the parent directory to sys.path so we can import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import Base
+from app.models.models import Campaign, CampaignEvent, CampaignInfluencer, Influencer, User
+from app.services.analytics_service import dashboard_totals_query
+
+EVENT_TYPES = ["view"] * 70 + ["click"] * 25 + ["conversion"] * 5
+
+
+def seed(engine, events: int, orgs: int, campaigns_per_org: int) -> None:
+    tables = [t.__table__ for t in (User, Campaign, Influencer, CampaignInfluencer, CampaignEvent)]
+    Base.metadata.create_all(engine, tables=tables)
+    rng = random.Random(42)
+    campaign_count = orgs * campaigns_per_org
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": org, "email": f"owner{org}@example.com", "role": "agency_admin",
+             "organization_id": org, "must_reset_password": False}
+            for org in range(1, orgs + 1)
+        ])
+        conn.execute(insert(Campaign.__table__), [
+            {"id": c, "title": f"Campaign {c}", "status": "active" if c % 3 else "draft",
+             "owner_id": (c - 1) // campaigns_per_org + 1}
+            for c in range(1, campaign_count + 1)
+        ])
+        conn.execute(insert(Influencer.__table__), [
+            {"id": i, "handle": f"creator{i}", "followers": rng.randint(1000, 1000000)}
+            for i in range(1, campaign_count + 1)
+        ])
+        conn.execute(insert(CampaignInfluencer.__table__), [
+            {"campaign_id": c, "influencer_id": c} for c in range(1, campaign_count + 1)
+        ])
+        for start in range(0, events, 50000):
+            batch = []
+            for _ in range(min(50000, events - start)):
+                event_type = rng.choice(EVENT_TYPES)
+                batch.append({
+                    "campaign_id": rng.randint(1, campaign_count),
+                    "type": event_type,
+                    "value": rng.randint(10, 500) if event_type == "conversion" else 1,
+                })
+            conn.execute(insert(CampaignEvent.__table__), batch)
+
+
+def legacy_totals(conn, user) -> dict:
+    """The per-metric queries get_analytics_dashboard issued before the single pass."""
+    if user.role == "super_admin":
+        campaign_filter = select(Campaign.id)
+        event_filter = select(CampaignEvent.id)
+    else:
+        campaign_filter = select(Campaign.id).join(User, Campaign.owner_id == User.id).where(User.organization_id == user.organization_id)
+        event_filter = select(CampaignEvent.id).join(Campaign, CampaignEvent.campaign_id == Campaign.id).join(User, Campaign.owner_id == User.id).where(User.organization_id == user.organization_id)
+
+    def count_type(event_type):
+        return conn.scalar(select(func.count(CampaignEvent.id)).where((CampaignEvent.type == event_type) & CampaignEvent.id.in_(event_filter))) or 0
+
+    return {
+        "active_campaigns": conn.scalar(select(func.count(Campaign.id)).where((Campaign.status == "active") & Campaign.id.in_(campaign_filter))) or 0,
+        "influencers": conn.scalar(select(func.count(Influencer.id))) or 0,
+        "total_events": conn.scalar(select(func.count(CampaignEvent.id)).where(CampaignEvent.id.in_(event_filter))) or 0,
+        "conversions": count_type("conversion"),
+        "reach": conn.scalar(select(func.sum(Influencer.followers))) or 0,
+        "clicks": count_type("click"),
+        "views": count_type("view"),
+        "revenue": conn.scalar(select(func.sum(CampaignEvent.value)).where((CampaignEvent.type == "conversion") & CampaignEvent.id.in_(event_filter))) or 0,
+    }
+
+
+def single_totals(conn, user) -> dict:
+    row = conn.execute(dashboard_totals_query(user)).one()
+    return {key: value or 0 for key, value in row._mapping.items()}
+
+
+def time_call(engine, fn, user, repeat: int) -> tuple:
+    samples = []
+    with engine.connect() as conn:
+        result = fn(conn, user)
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn(conn, user)
+            samples.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000000)
+    parser.add_argument("--orgs", type=int, default=50)
+    parser.add_argument("--campaigns", type=int, default=20, help="campaigns per org")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    started = time.perf_counter()
+    seed(engine, args.events, args.orgs, args.campaigns)
+    print(f"{args.events} events, {args.orgs} orgs x {args.campaigns} campaigns "
+          f"(seeded in {time.perf_counter() - started:.1f} s)")
+
+    scopes = [
+        ("org member", SimpleNamespace(role="agency_admin", organization_id=1)),
+        ("super admin", SimpleNamespace(role="super_admin", organization_id=None)),
+    ]
+    print(f"{'scope':>12} {'legacy ms':>10} {'single ms':>10} {'speedup':>8}")
+    for label, user in scopes:
+        legacy, legacy_ms = time_call(engine, legacy_totals, user, args.repeat)
+        single, single_ms = time_call(engine, single_totals, user, args.repeat)
+        # Event totals must agree; reach/influencers are now org-scoped for members
+        for key in ("active_campaigns", "total_events", "conversions", "clicks", "views", "revenue"):
+            assert legacy[key] == single[key], (key, legacy[key], single[key])
+        print(f"{label:>12} {legacy_ms:>10.1f} {single_ms:>10.1f} {legacy_ms / single_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: analytics reads over raw campaign_events vs. daily rollups.
+
+Seeds a scratch SQLite file with campaign events spread over the last year
+(default 2M events, 10 orgs x 5 campaigns), then times the analytics
+dashboard totals and the 12-month timeline for one org and for the
+platform-wide view:
+    - raw:    watermark 0, every event is read from campaign_events
+    - rollup: after campaign_rollups.rebuild(), reads cost O(day buckets)
+and checks both return the same numbers.
+
+Usage:
+    python scripts/bench_campaign_rollups.py [--events 2000000] [--orgs 10] [--campaigns 5] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add the parent directory to sys.path so we can import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import Base
+from app.models.analytics_rollup import AnalyticsRollupState, CampaignEventRollupDaily, CampaignEventRollupHourly
+from app.models.models import Campaign, CampaignEvent, CampaignInfluencer, Influencer, User
+from app.services.analytics_service import AnalyticsService
+from app.services.campaign_rollup_service import campaign_rollups
+
+EVENT_TYPES = ["view"] * 70 + ["click"] * 25 + ["conversion"] * 5
+
+
+def seed(url: str, events: int, orgs: int, campaigns_per_org: int) -> None:
+    engine = create_engine(url)
+    tables = [t.__table__ for t in (User, Campaign, Influencer, CampaignInfluencer, CampaignEvent,
+                                    CampaignEventRollupHourly, CampaignEventRollupDaily, AnalyticsRollupState)]
+    Base.metadata.create_all(engine, tables=tables)
+    rng = random.Random(42)
+    campaign_count = orgs * campaigns_per_org
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": org, "email": f"owner{org}@example.com", "role": "agency_admin",
+             "organization_id": org, "must_reset_password": False}
+            for org in range(1, orgs + 1)
+        ])
+        conn.execute(insert(Campaign.__table__), [
+            {"id": c, "title": f"Campaign {c}", "status": "active", "owner_id": (c - 1) // campaigns_per_org + 1}
+            for c in range(1, campaign_count + 1)
+        ])
+        for start in range(0, events, 50000):
+            batch = []
+            for _ in range(min(50000, events - start)):
+                event_type = rng.choice(EVENT_TYPES)
+                batch.append({
+                    "campaign_id": rng.randint(1, campaign_count),
+                    "type": event_type,
+                    "value": rng.randint(10, 500) if event_type == "conversion" else 1,
+                    "created_at": now - timedelta(seconds=rng.randint(0, 360 * 86400)),
+                })
+            conn.execute(insert(CampaignEvent.__table__), batch)
+    engine.dispose()
+
+
+async def time_reads(factory, user, repeat: int) -> tuple:
+    analytics = AnalyticsService()
+    samples = []
+    async with factory() as session:
+        result = (await analytics.dashboard_totals(session, user), await analytics.monthly_events(session, user))
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await analytics.dashboard_totals(session, user)
+            await analytics.monthly_events(session, user)
+            samples.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(samples)
+
+
+async def run(args, path: str) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    scopes = [
+        ("org member", SimpleNamespace(role="agency_admin", organization_id=1)),
+        ("super admin", SimpleNamespace(role="super_admin", organization_id=None)),
+    ]
+
+    raw = {label: await time_reads(factory, user, args.repeat) for label, user in scopes}
+
+    started = time.perf_counter()
+    async with factory() as session:
+        await campaign_rollups.rebuild(session)
+    print(f"rollup rebuild: {time.perf_counter() - started:.1f} s")
+
+    print(f"{'scope':>12} {'raw ms':>9} {'rollup ms':>10} {'speedup':>8}")
+    for label, user in scopes:
+        rolled, rollup_ms = await time_reads(factory, user, args.repeat)
+        raw_result, raw_ms = raw[label]
+        assert rolled == raw_result, (label, rolled, raw_result)
+        print(f"{label:>12} {raw_ms:>9.1f} {rollup_ms:>10.1f} {raw_ms / rollup_ms:>7.1f}x")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000000)
+    parser.add_argument("--orgs", type=int, default=10)
+    parser.add_argument("--campaigns", type=int, default=5, help="campaigns per org")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_rollups.db")
+        started = time.perf_counter()
+        seed(f"sqlite:///{path}", args.events, args.orgs, args.campaigns)
+        print(f"{args.events} events over 360 days, {args.orgs} orgs x {args.campaigns} campaigns "
+              f"(seeded in {time.perf_counter() - started:.1f} s)")
+        asyncio.run(run(args, path))
+
+
+if __name__ == "__main__":
+    main()
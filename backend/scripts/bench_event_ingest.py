@@ -0,0 +1,102 @@
+"""
+Benchmark: campaign event ingestion, one ORM insert per event vs. EventIngestor.
+
+Writes the same events to a scratch SQLite file twice:
+    - per-event: session.add(CampaignEvent(...)) + commit for every event
+    - batched:   concurrent clients submit() batches; the ingestor group-commits
+                 them with one multi-row INSERT per flush
+
+Usage:
+    python scripts/bench_event_ingest.py [--events 1000] [--clients 20] [--batch 100]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add the parent directory to sys.path so we can import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import Base
+from app.models.models import Campaign, CampaignEvent, User
+from app.services.event_ingest import EventIngestor
+
+
+def event_row(i: int) -> dict:
+    return {"campaign_id": 1, "type": "click" if i % 4 else "view", "value": 1,
+            "metadata_json": None, "created_at": datetime.now(timezone.utc)}
+
+
+async def per_event(factory, events: int) -> None:
+    # SQLite has a single writer, so per-event commits are issued one at a time
+    async with factory() as session:
+        for i in range(events):
+            session.add(CampaignEvent(**event_row(i)))
+            await session.commit()
+
+
+async def batched(factory, events: int, clients: int, batch: int, spool_dir: str) -> dict:
+    ingestor = EventIngestor(factory, spool_dir=spool_dir)
+    await ingestor.start()
+
+    async def client(indexes):
+        indexes = list(indexes)
+        for start in range(0, len(indexes), batch):
+            await ingestor.submit([event_row(i) for i in indexes[start:start + batch]])
+
+    await asyncio.gather(*(client(range(c, events, clients)) for c in range(clients)))
+    await ingestor.close()
+    return ingestor.stats()
+
+
+async def run(args, tmp: str) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench_events.db')}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add(User(id=1, email="owner@example.com", role="agency_admin", organization_id=1))
+        await session.flush()
+        session.add(Campaign(id=1, title="Bench", status="active", owner_id=1))
+        await session.commit()
+
+    started = time.perf_counter()
+    await per_event(factory, args.events)
+    per_event_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    stats = await batched(factory, args.events, args.clients, args.batch, os.path.join(tmp, "spool"))
+    batched_s = time.perf_counter() - started
+
+    async with factory() as session:
+        total = (await session.execute(select(func.count()).select_from(CampaignEvent))).scalar()
+    assert total == 2 * args.events, total
+
+    print(f"{args.events} events, {args.clients} concurrent clients, {args.batch} events per request")
+    print(f"{'mode':>10} {'seconds':>8} {'events/s':>10}")
+    print(f"{'per-event':>10} {per_event_s:>8.2f} {args.events / per_event_s:>10.0f}")
+    print(f"{'batched':>10} {batched_s:>8.2f} {args.events / batched_s:>10.0f}   ({stats['flushes']} flushes)")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=100, help="events per submit() call")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(args, tmp))
+
+
+if __name__ == "__main__":
+    main()
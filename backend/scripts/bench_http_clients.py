@@ -0,0 +1,112 @@
+"""
+Benchmark: per-call httpx.AsyncClient vs. the shared pooled clients.
+
+Starts a local stub HTTP server (uvicorn, random port) that answers like
+Ollama's /api/generate, then measures per-call latency for:
+    - per-call: `async with httpx.AsyncClient() as client` on every request
+      (what AIService / SocialAuthService used to do)
+    - pooled:   app.core.http_clients.get_http_client(...)
+
+Usage:
+    python scripts/bench_http_clients.py [--requests 500] [--concurrency 1]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+# Add the parent directory to sys.path so we can import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.http_clients import get_http_client, http_clients
+
+
+async def stub_app(scope, receive, send):
+    """Minimal ASGI app returning a small JSON body."""
+    if scope["type"] != "http":
+        return
+    while True:
+        message = await receive()
+        if not message.get("more_body"):
+            break
+    body = b'{"response": "ok", "done": true}'
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def start_stub_server() -> str:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    config = uvicorn.Config(stub_app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+async def per_call(url: str) -> float:
+    started = time.perf_counter()
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        response = await client.post(url, json={"model": "stub", "prompt": "hi", "stream": False})
+        response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def pooled(url: str) -> float:
+    started = time.perf_counter()
+    response = await get_http_client("ollama").post(url, json={"model": "stub", "prompt": "hi", "stream": False})
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def run(mode, url: str, requests: int, concurrency: int) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            return await mode(url)
+
+    await mode(url)  # warm-up (imports, first connection)
+    return await asyncio.gather(*(one() for _ in range(requests)))
+
+
+def report(name: str, samples: list) -> None:
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(f"{name:<10} mean {statistics.mean(ms):7.3f} ms   p50 {statistics.median(ms):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    base_url = start_stub_server()
+    url = f"{base_url}/api/generate"
+    print(f"Stub server at {base_url}; {args.requests} requests, concurrency {args.concurrency}")
+
+    report("per-call", await run(per_call, url, args.requests, args.concurrency))
+    report("pooled", await run(pooled, url, args.requests, args.concurrency))
+
+    await http_clients.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark: compiled permission checks vs. the uncompiled evaluation.
+
+Builds a brand_member principal with a role definition and a few overrides,
+then times, per request-shaped workload:
+    - uncompiled: new PermissionEngine per request, PermissionEngine._evaluate
+      (linear override scan + role set walk on every check)
+    - compiled:   new PermissionEngine per request, has_permission
+      (bitset checks; compiled form memoized on the cached principal)
+    - effective:  get_effective_permissions, rebuilt vs. memoized
+
+Usage:
+    python scripts/bench_permission_engine.py [--requests 20000] [--checks 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the parent directory to sys.path so we can import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.permission_engine import PermissionEngine
+from app.services.principal_cache import Principal, Snapshot
+
+ROLE_PERMISSIONS = {
+    "brand": ["read"],
+    "creators": ["read"],
+    "campaign": ["read", "write"],
+    "content": ["read", "create", "update"],
+    "analytics": ["read"],
+    "discovery": ["read"],
+    "design_studio": ["read"],
+    "ai_chat": ["read"],
+}
+
+OVERRIDES = [
+    {"resource": "crm", "action": "write", "scope_type": "global", "scope_id": None, "is_allowed": True},
+    {"resource": "analytics", "action": "none", "scope_type": "organization", "scope_id": 5, "is_allowed": True},
+    {"resource": "content", "action": "delete", "scope_type": "team", "scope_id": 9, "is_allowed": True},
+    {"resource": "marcom", "action": "read", "scope_type": "global", "scope_id": None, "is_allowed": False},
+]
+
+CHECKS = [
+    ("campaign", "read"),
+    ("content", "update"),
+    ("crm", "delete"),
+    ("analytics", "read"),
+    ("admin", "write"),
+    ("marcom", "read"),
+]
+
+
+def make_principal() -> Principal:
+    return Principal({
+        "id": 2,
+        "role": "brand_member",
+        "organization_id": 5,
+        "team_id": 9,
+        "role_model": Snapshot({"id": 6, "name": "brand_member", "permissions_json": ROLE_PERMISSIONS}),
+        "custom_permissions": tuple(Snapshot(o) for o in OVERRIDES),
+    })
+
+
+def timed(requests: int, fn) -> float:
+    started = time.perf_counter()
+    for i in range(requests):
+        fn(i)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--checks", type=int, default=3, help="permission checks per request")
+    args = parser.parse_args()
+
+    principal = make_principal()
+    checks = [CHECKS[i % len(CHECKS)] for i in range(len(CHECKS) * args.checks)]
+
+    def uncompiled(i):
+        engine = PermissionEngine.from_loaded_user(principal)
+        for resource, action in checks[i % len(CHECKS):][:args.checks]:
+            engine._evaluate(resource, action)
+
+    def compiled(i):
+        engine = PermissionEngine.from_loaded_user(principal)
+        for resource, action in checks[i % len(CHECKS):][:args.checks]:
+            engine.has_permission(resource, action)
+
+    def effective_rebuilt(i):
+        PermissionEngine.from_loaded_user(principal)._build_effective_permissions()
+
+    def effective_memoized(i):
+        PermissionEngine.from_loaded_user(principal).get_effective_permissions()
+
+    for resource, action in CHECKS:
+        engine = PermissionEngine.from_loaded_user(principal)
+        assert engine.has_permission(resource, action) == engine._evaluate(resource, action)
+
+    print(f"{args.requests} requests, {args.checks} checks per request")
+    print(f"uncompiled        {timed(args.requests, uncompiled):8.2f} us/request")
+    print(f"compiled          {timed(args.requests, compiled):8.2f} us/request")
+    print(f"effective rebuilt {timed(args.requests, effective_rebuilt):8.2f} us/request")
+    print(f"effective cached  {timed(args.requests, effective_memoized):8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: recursive CTE vs. closure-table join for user visibility.
+
+Builds a synthetic users tree (default 100k users, fan-out 10) plus its
+user_hierarchy_closure rows, then times for managers at several depths:
+    - visible: count of users visible to the manager (the filter embedded in
+      content / design / CRM / social list queries)
+    - manage:  can_manage_user-style "is target under manager" check
+each via the former recursive CTE over users.parent_user_id and via the
+closure table used by app.services.rbac_scope.
+
+Usage:
+    python scripts/bench_user_hierarchy.py [--users 100000] [--fanout 10] [--repeat 20]
+    python scripts/bench_user_hierarchy.py --database-url postgresql://...   # scratch DB only
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from sqlalchemy import create_engine, exists, func, insert, or_, select
+
+# Add the parent directory to sys.path so we can import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import Base
+from app.models.models import User
+from app.models.user_hierarchy import closure, rebuild_user_hierarchy
+from app.services.rbac_scope import descendant_ids_subquery
+
+users = User.__table__
+
+
+def descendant_ids_cte(root_user_id: int):
+    """The recursive CTE rbac_scope used before the closure table."""
+    descendants = (
+        select(users.c.id)
+        .where(users.c.parent_user_id == root_user_id)
+        .cte(name="descendants", recursive=True)
+    )
+    return descendants.union_all(
+        select(users.c.id).where(users.c.parent_user_id == descendants.c.id)
+    )
+
+
+def cte_visible(manager_id: int):
+    descendants = descendant_ids_cte(manager_id)
+    return select(func.count()).select_from(users).where(
+        or_(users.c.id == manager_id, users.c.id.in_(select(descendants.c.id)))
+    )
+
+
+def closure_visible(manager_id: int):
+    return select(func.count()).select_from(users).where(users.c.id.in_(descendant_ids_subquery(manager_id)))
+
+
+def cte_manage(manager_id: int, target_id: int):
+    descendants = descendant_ids_cte(manager_id)
+    return select(exists(select(descendants.c.id).where(descendants.c.id == target_id)))
+
+
+def closure_manage(manager_id: int, target_id: int):
+    return select(exists().where(closure.c.ancestor_id == manager_id, closure.c.descendant_id == target_id))
+
+
+def build_tree(engine, total: int, fanout: int) -> None:
+    Base.metadata.create_all(engine, tables=[users, closure])
+    rows = [
+        {
+            "id": user_id,
+            "email": f"user{user_id}@example.com",
+            "role": "agency_admin",
+            "parent_user_id": (user_id - 2) // fanout + 1 if user_id > 1 else None,
+            "must_reset_password": False,
+        }
+        for user_id in range(1, total + 1)
+    ]
+    with engine.begin() as conn:
+        for start in range(0, len(rows), 10000):
+            conn.execute(insert(users), rows[start:start + 10000])
+        rebuild_user_hierarchy(conn)
+
+
+def time_query(engine, stmt, repeat: int) -> tuple:
+    samples = []
+    with engine.connect() as conn:
+        result = conn.execute(stmt).scalar()
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(stmt).scalar()
+            samples.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    started = time.perf_counter()
+    build_tree(engine, args.users, args.fanout)
+    with engine.connect() as conn:
+        closure_rows = conn.execute(select(func.count()).select_from(closure)).scalar()
+    print(f"{args.users} users, fan-out {args.fanout}, {closure_rows} closure rows "
+          f"(built in {time.perf_counter() - started:.1f} s)")
+
+    # One manager per tree level: 1, its first child, that child's first child, ...
+    managers = []
+    user_id = 1
+    while user_id <= args.users:
+        managers.append(user_id)
+        user_id = (user_id - 1) * args.fanout + 2
+    leaf = managers.pop()  # the deepest user is the manage-check target
+
+    print(f"{'manager':>8} {'visible':>8} {'cte ms':>9} {'closure ms':>11} {'manage cte':>11} {'manage closure':>15}")
+    for manager_id in managers:
+        visible, cte_ms = time_query(engine, cte_visible(manager_id), args.repeat)
+        visible_closure, closure_ms = time_query(engine, closure_visible(manager_id), args.repeat)
+        assert visible == visible_closure
+        managed, manage_cte_ms = time_query(engine, cte_manage(manager_id, leaf), args.repeat)
+        managed_closure, manage_closure_ms = time_query(engine, closure_manage(manager_id, leaf), args.repeat)
+        assert bool(managed) == bool(managed_closure)
+        print(f"{manager_id:>8} {visible:>8} {cte_ms:>9.3f} {closure_ms:>11.3f} {manage_cte_ms:>11.3f} {manage_closure_ms:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Maintain the campaign event rollup tables from the command line.
+
+The in-process worker (ROLLUP_ENABLED) keeps the rollups current; use this
+for the initial backfill, after bulk imports that bypass the event ids, or
+to verify the rollups against raw events.
+
+Usage:
+    python scripts/rollup_campaign_events.py            # catch up from the watermark
+    python scripts/rollup_campaign_events.py --rebuild  # drop rollups and re-aggregate everything
+    python scripts/rollup_campaign_events.py --check    # compare daily rollups with raw events
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add the parent directory to sys.path so we can import app modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import AsyncSessionLocal
+from app.services.campaign_rollup_service import campaign_rollups
+
+
+async def main(args) -> int:
+    async with AsyncSessionLocal() as session:
+        if args.check:
+            mismatches = await campaign_rollups.check(session)
+            watermark = await campaign_rollups.watermark(session)
+            if not mismatches:
+                print(f"OK: daily rollups match raw events up to id {watermark}")
+                return 0
+            print(f"{len(mismatches)} mismatching bucket(s) up to id {watermark}:")
+            for row in mismatches[:50]:
+                print(f"  {row['day']} campaign={row['campaign_id']} type={row['type']!r} "
+                      f"events(count, value)={row['events']} rollup={row['rollup']}")
+            print("Run with --rebuild to recompute the rollups.")
+            return 1
+
+        started = time.perf_counter()
+        if args.rebuild:
+            processed = await campaign_rollups.rebuild(session)
+        else:
+            processed = await campaign_rollups.run_once(session, settle_seconds=0)
+        watermark = await campaign_rollups.watermark(session)
+        print(f"Rolled up {processed} event(s) in {time.perf_counter() - started:.1f} s; watermark is now {watermark}")
+        return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rebuild", action="store_true", help="drop all rollups and re-aggregate every event")
+    mode.add_argument("--check", action="store_true", help="verify daily rollups against raw events")
+    sys.exit(asyncio.run(main(parser.parse_args())))
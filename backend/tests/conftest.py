@@ -1,10 +1,46 @@
 """
 Pytest configuration for RBAC enforcement tests.
 Disables mock user behavior to properly test authentication.
+
+Also provides `sqlite_sessionmaker`, the shared in-memory database fixture.
 """
 import os
 import pytest
+import pytest_asyncio
 
 # Set testing mode BEFORE importing the app
 os.environ["DISABLE_MOCK_USER"] = "true"
 
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.core.db_metrics import instrument_engine  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def sqlite_sessionmaker():
+    """
+    Build session factories over fresh in-memory SQLite databases:
+
+        factory = await sqlite_sessionmaker(Campaign, CampaignEvent)
+
+    Only the given models' tables are created (every table when none are given).
+    Pass `metrics_name` to instrument the engine for db_metrics. Engines are
+    disposed on teardown.
+    """
+    engines = []
+
+    async def make(*models, metrics_name=None):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        engines.append(engine)
+        if metrics_name:
+            instrument_engine(engine, metrics_name)
+        tables = [model.__table__ for model in models] or None
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=tables)
+        return sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    yield make
+    for engine in engines:
+        await engine.dispose()
@@ -0,0 +1,194 @@
+"""
+Unit Tests for streamed chat/content generation
+- Relaying Ollama NDJSON deltas
+- Fallback to the next route before the first token
+- Draft + proofread phases for content
+- TTFT metrics and the chat SSE endpoint (assistant message persisted)
+"""
+
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy import select
+
+from app.api.endpoints import chat as chat_endpoints
+from app.core.database import get_db
+from app.models.models import ChatMessage, User
+from app.services import ai_service
+from app.services.ai_service import AIService
+from app.services.llm_metrics import llm_metrics
+
+
+def _ollama_client(chunks, endpoint="/api/chat"):
+    """httpx client whose transport answers like Ollama's streaming API."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == endpoint
+        assert json.loads(request.content)["stream"] is True
+        lines = []
+        for chunk in chunks:
+            if endpoint == "/api/chat":
+                lines.append({"message": {"role": "assistant", "content": chunk}, "done": False})
+            else:
+                lines.append({"response": chunk, "done": False})
+        lines.append({"done": True})
+        body = "\n".join(json.dumps(line) for line in lines).encode()
+        return httpx.Response(200, content=body)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    llm_metrics.reset()
+    yield
+    llm_metrics.reset()
+
+
+class TestStreamChatCompletion:
+    """Test AIService.stream_chat_completion"""
+
+    @pytest.mark.asyncio
+    async def test_relays_ollama_deltas(self, monkeypatch):
+        monkeypatch.setattr(ai_service, "get_http_client", lambda name: _ollama_client(["Hel", "lo", "!"]))
+
+        events = await _collect(AIService.stream_chat_completion(
+            [{"role": "user", "content": "hi"}], model="qwen2.5:0.5b"
+        ))
+
+        assert [e["delta"] for e in events if e["type"] == "delta"] == ["Hel", "lo", "!"]
+        done = events[-1]
+        assert done["type"] == "done"
+        assert done["text"] == "Hello!"
+        assert done["model_used"] == "qwen2.5:0.5b"
+        assert done["ttft_ms"] is not None
+
+        stats = llm_metrics.snapshot()["chat"]
+        assert stats["count"] == 1
+        assert stats["errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_falls_back_before_first_token(self, monkeypatch):
+        async def failing(*args, **kwargs):
+            raise httpx.ConnectError("refused")
+            yield  # pragma: no cover
+
+        monkeypatch.setattr(AIService, "_stream_ollama", staticmethod(failing))
+        monkeypatch.setattr(AIService, "_cached_model", "llama3")
+        monkeypatch.setattr(ai_service, "LITELLM_AVAILABLE", False)
+
+        events = await _collect(AIService.stream_chat_completion(
+            [{"role": "user", "content": "hello there"}], model="qwen"
+        ))
+
+        assert events[-1]["model_used"] == "offline-fallback"
+        assert events[-1]["text"].startswith("[Offline Mode]")
+
+    @pytest.mark.asyncio
+    async def test_error_after_first_token_propagates(self, monkeypatch):
+        async def broken(*args, **kwargs):
+            yield "partial"
+            raise RuntimeError("connection reset")
+
+        monkeypatch.setattr(AIService, "_stream_ollama", staticmethod(broken))
+
+        with pytest.raises(RuntimeError):
+            await _collect(AIService.stream_chat_completion(
+                [{"role": "user", "content": "hi"}], model="qwen"
+            ))
+        assert llm_metrics.snapshot()["chat"]["errors"] == 1
+
+
+class TestStreamContent:
+    """Test AIService.stream_content"""
+
+    @pytest.mark.asyncio
+    async def test_draft_then_final_phase(self, monkeypatch):
+        prompts = []
+
+        async def fake_gemini(selected_model, prompt):
+            prompts.append(prompt)
+            for chunk in (["Draft ", "post"] if len(prompts) == 1 else ["Final ", "post"]):
+                yield chunk
+
+        monkeypatch.setattr(AIService, "_stream_gemini", staticmethod(fake_gemini))
+
+        events = await _collect(AIService.stream_content("Launch", "LinkedIn", "Post", "new product", "Gemini"))
+
+        phases = [(e["phase"], e["delta"]) for e in events if e["type"] == "delta"]
+        assert phases == [("draft", "Draft "), ("draft", "post"), ("final", "Final "), ("final", "post")]
+        assert "Draft post" in prompts[1]
+        assert events[-1]["text"] == "Final post"
+        assert events[-1]["model_used"] == "Gemini"
+
+    @pytest.mark.asyncio
+    async def test_adapt_is_single_pass(self, monkeypatch):
+        monkeypatch.setattr(
+            ai_service, "get_http_client",
+            lambda name: _ollama_client(["Adapted"], endpoint="/api/generate"),
+        )
+
+        events = await _collect(AIService.stream_content(
+            "Launch", "X", "Post", "", "qwen", base_text="Base post"
+        ))
+
+        assert [e["phase"] for e in events if e["type"] == "delta"] == ["final"]
+        assert events[-1]["text"] == "Adapted"
+
+
+@pytest_asyncio.fixture
+async def session_factory(sqlite_sessionmaker):
+    factory = await sqlite_sessionmaker()
+    async with factory() as session:
+        session.add(User(id=1, email="demo@example.com", full_name="Demo User", industry="Retail"))
+        await session.commit()
+    return factory
+
+
+class TestChatStreamEndpoint:
+    """Test POST /chat/message/stream"""
+
+    @pytest.mark.asyncio
+    async def test_streams_and_persists_reply(self, monkeypatch, session_factory):
+        async def fake_stream(messages, model=None):
+            assert "Retail" in messages[0]["content"]
+            yield {"type": "delta", "phase": "final", "delta": "Hi "}
+            yield {"type": "delta", "phase": "final", "delta": "Demo"}
+            yield {"type": "done", "text": "Hi Demo", "model_used": "qwen2.5:0.5b", "ttft_ms": 1.0, "duration_ms": 2.0}
+
+        monkeypatch.setattr(AIService, "stream_chat_completion", staticmethod(fake_stream))
+        monkeypatch.setattr(chat_endpoints, "AsyncSessionLocal", session_factory)
+
+        app = FastAPI()
+        app.include_router(chat_endpoints.router, prefix="/chat")
+
+        async def override_get_db():
+            async with session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/chat/message/stream", json={"message": "hello", "session_id": "s1"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [f for f in response.text.split("\n\n") if f.strip()]
+        assert [f.splitlines()[0] for f in frames] == [
+            "event: start", "event: token", "event: token", "event: done",
+        ]
+        done = json.loads(frames[-1].splitlines()[1][len("data: "):])
+        assert done["response"] == "Hi Demo"
+        assert done["session_id"] == "s1"
+
+        async with session_factory() as session:
+            rows = (await session.execute(
+                select(ChatMessage).where(ChatMessage.session_id == "s1").order_by(ChatMessage.id)
+            )).scalars().all()
+        assert [(m.role, m.content) for m in rows] == [("user", "hello"), ("assistant", "Hi Demo")]
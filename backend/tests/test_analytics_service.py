@@ -0,0 +1,126 @@
+"""
+Unit Tests for the analytics aggregation service
+- Dashboard totals match per-metric queries, in a single statement
+- Totals are scoped to the caller's organization
+- Per-org cache hits, TTL bypass when disabled, and invalidation
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+from app.core.db_metrics import assert_max_queries
+from app.models.models import Campaign, CampaignEvent, CampaignInfluencer, Influencer, User
+from app.services.analytics_service import AnalyticsService
+
+
+@pytest_asyncio.fixture
+async def session(sqlite_sessionmaker):
+    factory = await sqlite_sessionmaker(metrics_name="test-analytics")
+    async with factory() as session:
+        yield session
+
+
+async def seed(session):
+    # Org 1: two campaigns (one active), org 2: one active campaign
+    session.add_all([
+        User(id=1, email="a@example.com", role="agency_admin", organization_id=1),
+        User(id=2, email="b@example.com", role="agency_admin", organization_id=2),
+        Campaign(id=1, title="A1", status="active", owner_id=1),
+        Campaign(id=2, title="A2", status="draft", owner_id=1),
+        Campaign(id=3, title="B1", status="active", owner_id=2),
+        Influencer(id=1, handle="one", followers=1000),
+        Influencer(id=2, handle="two", followers=500),
+        Influencer(id=3, handle="three", followers=7),
+    ])
+    await session.flush()
+    session.add_all([
+        CampaignInfluencer(campaign_id=1, influencer_id=1),
+        CampaignInfluencer(campaign_id=2, influencer_id=1),
+        CampaignInfluencer(campaign_id=3, influencer_id=2),
+    ])
+    events = [
+        (1, "view", 1), (1, "view", 1), (1, "view", 1), (1, "click", 1),
+        (2, "conversion", 40), (2, "conversion", 60),
+        (3, "view", 1), (3, "conversion", 5),
+    ]
+    session.add_all([CampaignEvent(campaign_id=c, type=t, value=v) for c, t, v in events])
+    await session.commit()
+
+
+def member(org_id):
+    return SimpleNamespace(role="agency_admin", organization_id=org_id)
+
+
+class TestDashboardTotals:
+    """Test the single-pass aggregate"""
+
+    @pytest.mark.asyncio
+    async def test_org_totals_in_one_statement(self, session):
+        await seed(session)
+        with assert_max_queries(1):
+            totals = await AnalyticsService().dashboard_totals(session, member(1))
+
+        assert totals == {
+            "total_events": 6,
+            "conversions": 2,
+            "clicks": 1,
+            "views": 3,
+            "revenue": 100,
+            "active_campaigns": 1,
+            "influencers": 1,
+            "reach": 1000,
+        }
+
+    @pytest.mark.asyncio
+    async def test_super_admin_sees_platform(self, session):
+        await seed(session)
+        totals = await AnalyticsService().dashboard_totals(session, SimpleNamespace(role="super_admin"))
+        assert totals["total_events"] == 8
+        assert totals["revenue"] == 105
+        assert totals["active_campaigns"] == 2
+        assert totals["influencers"] == 3
+        assert totals["reach"] == 1507
+
+    @pytest.mark.asyncio
+    async def test_empty_org(self, session):
+        await seed(session)
+        totals = await AnalyticsService().dashboard_totals(session, member(99))
+        assert set(totals.values()) == {0}
+
+
+class TestDashboardCache:
+    """Test the per-org TTL cache"""
+
+    @pytest.mark.asyncio
+    async def test_hit_per_org_and_invalidate(self):
+        service = AnalyticsService()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        assert await service.cached("dashboard", member(1), loader) == {"n": 1}
+        assert await service.cached("dashboard", member(1), loader) == {"n": 1}
+        assert await service.cached("dashboard", member(2), loader) == {"n": 2}
+
+        service.invalidate_org(1)
+        assert await service.cached("dashboard", member(1), loader) == {"n": 3}
+        assert await service.cached("dashboard", member(2), loader) == {"n": 2}
+        assert service.stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_always_loads(self):
+        service = AnalyticsService()
+        service.enabled = False
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return len(calls)
+
+        await service.cached("dashboard", member(1), loader)
+        await service.cached("dashboard", member(1), loader)
+        assert len(calls) == 2
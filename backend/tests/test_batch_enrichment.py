@@ -0,0 +1,164 @@
+"""
+Unit Tests for BatchEnricher
+- Concurrency cap, per-handle retries and failure isolation
+- Incremental result rows, progress reports and resume of the same batch
+- Dedup against recently enriched handles
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from app.models.models import InfluencerEnrichmentResult
+from app.services.batch_enrichment import BatchEnricher, is_retryable, normalize_handles
+from app.services.job_state import job_state
+from app.services.rate_limiter import ProviderRateLimited
+
+
+class FakeClient:
+    """Stands in for InfluencersClubClient; `errors` maps handle -> exceptions to raise in order."""
+
+    def __init__(self, errors=None, delay=0.01):
+        self.errors = {handle: list(excs) for handle, excs in (errors or {}).items()}
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def enrich_handle(self, handle, platform, enrichment_mode="full"):
+        self.calls.append(handle)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.errors.get(handle):
+                raise self.errors[handle].pop(0)
+            return {"handle": handle, "platform": platform, "mode": enrichment_mode}
+        finally:
+            self.active -= 1
+
+
+@pytest_asyncio.fixture
+async def session_factory(sqlite_sessionmaker):
+    return await sqlite_sessionmaker(InfluencerEnrichmentResult)
+
+
+async def _rows(session_factory, batch_id):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(InfluencerEnrichmentResult).where(InfluencerEnrichmentResult.batch_id == batch_id)
+        )
+        return {row.handle: row for row in result.scalars().all()}
+
+
+class TestHelpers:
+    """Test handle normalization and error classification"""
+
+    def test_normalize_handles(self):
+        assert normalize_handles(["@Nike", "nike", " adidas ", "", None, "@"]) == ["nike", "adidas"]
+
+    def test_is_retryable(self):
+        assert is_retryable(ValueError("API error 503: unavailable"))
+        assert is_retryable(ValueError("Failed to connect to API: timeout"))
+        assert is_retryable(ProviderRateLimited("influencers_club", 2))
+        assert not is_retryable(ValueError("Invalid request format: bad handle"))
+        assert not is_retryable(PermissionError("Insufficient permissions"))
+
+
+class TestStream:
+    """Test the bounded-concurrency enrichment stream"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        client = FakeClient()
+        enricher = BatchEnricher(client, session_factory=None, concurrency=3)
+
+        outcomes = [o async for o in enricher.stream([f"h{i}" for i in range(20)], "instagram")]
+
+        assert len(outcomes) == 20 and all(o.status == "enriched" for o in outcomes)
+        assert client.max_active == 3
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors_and_isolates_failures(self):
+        client = FakeClient(errors={
+            "flaky": [ValueError("API error 502: bad gateway"), ValueError("API error 503: busy")],
+            "bad": [ValueError("Invalid request format: no such handle")],
+        })
+        enricher = BatchEnricher(client, session_factory=None, retry_base_seconds=0.001)
+
+        outcomes = {o.handle: o async for o in enricher.stream(["flaky", "bad", "ok"], "tiktok")}
+
+        assert outcomes["flaky"].status == "enriched" and outcomes["flaky"].attempts == 3
+        assert outcomes["bad"].status == "failed" and outcomes["bad"].attempts == 1
+        assert "Invalid request format" in outcomes["bad"].error
+        assert outcomes["ok"].status == "enriched"
+
+    @pytest.mark.asyncio
+    async def test_closing_the_stream_cancels_workers(self):
+        client = FakeClient(delay=0.05)
+        enricher = BatchEnricher(client, session_factory=None, concurrency=2)
+
+        stream = enricher.stream([f"h{i}" for i in range(10)], "instagram")
+        await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.1)
+
+        assert len(client.calls) < 10
+
+
+class TestBatchJob:
+    """Test checkpointing, progress, resume and dedup"""
+
+    @pytest.mark.asyncio
+    async def test_rows_and_progress_written_incrementally(self, session_factory):
+        client = FakeClient(errors={"c": [PermissionError("Insufficient permissions")]})
+        enricher = BatchEnricher(client, session_factory=session_factory, checkpoint_size=2)
+        await job_state.mark_queued("job-enrich-1", "batch_enrich_handles")
+
+        summary = await enricher.run(
+            "job-enrich-1", ["a", "@B", "c", "a"], "instagram", ctx={"job_id": "job-enrich-1"},
+        )
+
+        assert summary["total_handles"] == 3
+        assert (summary["enriched"], summary["cached"], summary["failed"]) == (2, 0, 1)
+        rows = await _rows(session_factory, "job-enrich-1")
+        assert rows["b"].status == "enriched" and rows["b"].data["handle"] == "b"
+        assert rows["c"].status == "failed" and rows["c"].enriched_at is None
+
+        state = await job_state.get("job-enrich-1")
+        assert [len(chunk) for chunk in state["partial_results"]] == [2, 1]
+        assert state["progress"] == 100
+
+    @pytest.mark.asyncio
+    async def test_recent_results_are_not_enriched_again(self, session_factory):
+        await BatchEnricher(FakeClient(), session_factory=session_factory).run(
+            "batch-1", ["a", "b"], "instagram", mode="full",
+        )
+
+        client = FakeClient()
+        summary = await BatchEnricher(client, session_factory=session_factory).run(
+            "batch-2", ["a", "b", "c"], "instagram", mode="raw",
+        )
+
+        assert client.calls == ["c"]  # a full enrichment also satisfies raw
+        assert summary["cached"] == 2
+        rows = await _rows(session_factory, "batch-2")
+        assert rows["a"].status == "cached" and rows["a"].data["mode"] == "full"
+
+    @pytest.mark.asyncio
+    async def test_rerun_resumes_the_same_batch(self, session_factory):
+        first = FakeClient(errors={"b": [ValueError("Invalid request format: x")]})
+        await BatchEnricher(first, session_factory=session_factory, dedup_hours=0).run(
+            "batch-r", ["a", "b"], "youtube",
+        )
+
+        second = FakeClient()
+        summary = await BatchEnricher(second, session_factory=session_factory, dedup_hours=0).run(
+            "batch-r", ["a", "b"], "youtube",
+        )
+
+        assert second.calls == ["b"]
+        assert summary["failed"] == 0
+        rows = await _rows(session_factory, "batch-r")
+        assert rows["b"].status == "enriched" and rows["b"].attempts == 2
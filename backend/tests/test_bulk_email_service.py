@@ -0,0 +1,186 @@
+"""
+Unit Tests for BulkEmailSender and TokenBucket
+- Batched vs. per-recipient sending
+- Per-recipient delivery rows and resume from checkpoint
+- GET /communications/deliveries/{send_id} is scoped to the caller's campaigns
+- Token bucket pacing
+"""
+
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy import select
+
+from app.api.deps import require_marcom_read
+from app.api.endpoints import communications
+from app.core.database import get_db
+from app.models.models import Campaign, CampaignEmailDelivery, User
+from app.services.bulk_email_service import BulkEmailSender, normalize_recipients
+from app.services.rate_limiter import TokenBucket
+
+
+class FakeSender:
+    """Stands in for cpaas_service; fails the addresses listed in `fail`."""
+
+    def __init__(self, supports_batch=False, fail=()):
+        self.supports_email_batch = supports_batch
+        self.fail = set(fail)
+        self.single_calls = []
+        self.batch_calls = []
+
+    def _result(self, email):
+        if email in self.fail:
+            return {"status": "failed", "error": "bounced", "provider": "Fake"}
+        return {"status": "sent", "provider": "Fake", "message_id": f"id-{email}"}
+
+    async def send_email(self, to_email, subject, body):
+        self.single_calls.append(to_email)
+        return self._result(to_email)
+
+    async def send_email_batch(self, to_emails, subject, body):
+        self.batch_calls.append(list(to_emails))
+        return [self._result(email) for email in to_emails]
+
+
+@pytest_asyncio.fixture
+async def session_factory(sqlite_sessionmaker):
+    return await sqlite_sessionmaker(CampaignEmailDelivery)
+
+
+async def _deliveries(session_factory, send_id):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(CampaignEmailDelivery).where(CampaignEmailDelivery.send_id == send_id)
+        )
+        return {row.email: row for row in result.scalars().all()}
+
+
+class TestBulkEmailSender:
+    """Test the batched send pipeline"""
+
+    def test_normalize_recipients_dedupes(self):
+        assert normalize_recipients([" a@x.com", "A@x.com", "", "b@x.com"]) == ["a@x.com", "b@x.com"]
+
+    @pytest.mark.asyncio
+    async def test_batch_api_used_when_supported(self, session_factory):
+        sender = FakeSender(supports_batch=True)
+        bulk = BulkEmailSender(session_factory=session_factory, sender=sender, batch_size=2)
+
+        summary = await bulk.send("send-1", None, ["a@x.com", "b@x.com", "c@x.com"], "Hi", "Body")
+
+        assert sender.batch_calls == [["a@x.com", "b@x.com"], ["c@x.com"]]
+        assert sender.single_calls == []
+        assert summary["sent"] == 3
+
+    @pytest.mark.asyncio
+    async def test_records_per_recipient_rows(self, session_factory):
+        sender = FakeSender(fail={"bad@x.com"})
+        bulk = BulkEmailSender(session_factory=session_factory, sender=sender, concurrency=3)
+
+        summary = await bulk.send("send-1", None, ["a@x.com", "bad@x.com"], "Hi", "Body")
+
+        assert summary["sent"] == 1
+        assert summary["failed"] == 1
+        assert summary["failures"] == [{"email": "bad@x.com", "error": "bounced"}]
+        rows = await _deliveries(session_factory, "send-1")
+        assert rows["a@x.com"].status == "sent"
+        assert rows["a@x.com"].message_id == "id-a@x.com"
+        assert rows["bad@x.com"].status == "failed"
+        assert rows["bad@x.com"].error == "bounced"
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_already_sent(self, session_factory):
+        first = FakeSender(fail={"b@x.com"})
+        await BulkEmailSender(session_factory=session_factory, sender=first).send(
+            "send-1", None, ["a@x.com", "b@x.com"], "Hi", "Body"
+        )
+
+        retry = FakeSender()
+        summary = await BulkEmailSender(session_factory=session_factory, sender=retry).send(
+            "send-1", None, ["a@x.com", "b@x.com"], "Hi", "Body"
+        )
+
+        assert retry.single_calls == ["b@x.com"]
+        assert summary["skipped"] == 1
+        assert summary["sent"] == 1
+        rows = await _deliveries(session_factory, "send-1")
+        assert rows["b@x.com"].status == "sent"
+        assert rows["b@x.com"].attempts == 2
+
+
+class TestDeliveriesEndpoint:
+    """Test GET /communications/deliveries/{send_id}"""
+
+    @pytest.mark.asyncio
+    async def test_other_tenants_send_is_not_found(self, sqlite_sessionmaker):
+        factory = await sqlite_sessionmaker()
+        async with factory() as session:
+            session.add_all([
+                User(id=1, email="a@example.com", role="agency_admin", organization_id=1),
+                User(id=2, email="b@example.com", role="agency_admin", organization_id=2),
+            ])
+            await session.flush()
+            session.add(Campaign(id=1, title="A", status="active", owner_id=1))
+            await session.commit()
+        await BulkEmailSender(session_factory=factory, sender=FakeSender(fail={"bad@x.com"})).send(
+            "send-1", 1, ["a@x.com", "bad@x.com"], "Hi", "Body"
+        )
+
+        current = {"user_id": 1}
+        app = FastAPI()
+        app.include_router(communications.router, prefix="/communications")
+
+        async def override_db():
+            async with factory() as session:
+                yield session
+
+        async def override_user():
+            async with factory() as session:
+                return await session.get(User, current["user_id"])
+
+        app.dependency_overrides[get_db] = override_db
+        app.dependency_overrides[require_marcom_read] = override_user
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            own = await client.get("/communications/deliveries/send-1")
+            current["user_id"] = 2
+            other = await client.get("/communications/deliveries/send-1")
+            other_failed = await client.get("/communications/deliveries/send-1", params={"status": "failed"})
+
+        assert own.status_code == 200
+        assert own.json()["counts"] == {"sent": 1, "failed": 1}
+        assert other.status_code == 404 and other_failed.status_code == 404
+        assert "bad@x.com" not in other.text
+
+
+class TestTokenBucket:
+    """Test provider rate limiting"""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=100, capacity=2)
+
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        elapsed = time.monotonic() - started
+
+        # Two tokens come from the burst, two more need ~10ms each
+        assert elapsed >= 0.015
+
+    def test_try_acquire_does_not_wait(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+
+        assert bucket.try_acquire() is True
+        assert bucket.try_acquire() is False
+
+    @pytest.mark.asyncio
+    async def test_acquire_more_than_capacity_rejected(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+
+        with pytest.raises(ValueError):
+            await bucket.acquire(2)
@@ -0,0 +1,164 @@
+"""
+Unit Tests for the campaign event rollups
+- Incremental runs fold events above the watermark into hourly and daily buckets
+- Re-runs are idempotent; rebuild and check agree with raw events
+- Analytics reads (totals, monthly timeline) are exact before and after rollup
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+
+from app.models.analytics_rollup import CampaignEventRollupDaily, CampaignEventRollupHourly
+from app.models.models import Campaign, CampaignEvent, User
+from app.services.analytics_service import AnalyticsService
+from app.services.campaign_rollup_service import CampaignRollupService
+
+
+@pytest_asyncio.fixture
+async def session(sqlite_sessionmaker):
+    factory = await sqlite_sessionmaker()
+    async with factory() as session:
+        yield session
+
+
+NOW = datetime.utcnow().replace(minute=30, second=0, microsecond=0)
+
+
+async def seed(session):
+    session.add_all([
+        User(id=1, email="a@example.com", role="agency_admin", organization_id=1),
+        User(id=2, email="b@example.com", role="agency_admin", organization_id=2),
+        Campaign(id=1, title="A", status="active", owner_id=1),
+        Campaign(id=2, title="B", status="active", owner_id=2),
+    ])
+    await session.flush()
+    await add_events(session, [
+        (1, "view", 1, NOW - timedelta(days=40)),
+        (1, "view", 1, NOW - timedelta(days=40, minutes=10)),
+        (1, "conversion", 25, NOW - timedelta(days=40)),
+        (1, "click", 1, NOW - timedelta(hours=2)),
+        (2, "view", 1, NOW - timedelta(hours=1)),
+    ])
+
+
+async def add_events(session, events, ingested_at=None):
+    session.add_all([
+        CampaignEvent(campaign_id=c, type=t, value=v, created_at=at, ingested_at=ingested_at or at)
+        for c, t, v, at in events
+    ])
+    await session.commit()
+
+
+def member(org_id):
+    return SimpleNamespace(role="agency_admin", organization_id=org_id)
+
+
+async def rollup_rows(session, model):
+    result = await session.execute(select(model.campaign_id, model.type, model.event_count, model.value_sum, model.organization_id))
+    return sorted(result.all())
+
+
+class TestRollupMaintenance:
+    """Test incremental maintenance and consistency"""
+
+    @pytest.mark.asyncio
+    async def test_run_once_rolls_up_and_advances_watermark(self, session):
+        await seed(session)
+        service = CampaignRollupService()
+        assert await service.run_once(session, settle_seconds=0) == 5
+        assert await service.watermark(session) == 5
+
+        assert await rollup_rows(session, CampaignEventRollupDaily) == [
+            (1, "click", 1, 1, 1),
+            (1, "conversion", 1, 25, 1),
+            (1, "view", 2, 2, 1),
+            (2, "view", 1, 1, 2),
+        ]
+        hourly = await rollup_rows(session, CampaignEventRollupHourly)
+        assert sum(row[2] for row in hourly) == 5
+
+        # Nothing new: no double counting
+        assert await service.run_once(session, settle_seconds=0) == 0
+        assert await service.check(session) == []
+
+    @pytest.mark.asyncio
+    async def test_incremental_batches_add_to_buckets(self, session):
+        await seed(session)
+        service = CampaignRollupService()
+        await service.run_once(session, settle_seconds=0, batch_size=2)
+        await add_events(session, [(1, "view", 1, NOW - timedelta(days=40))])
+        assert await service.run_once(session, settle_seconds=0, batch_size=2) == 1
+
+        rows = await rollup_rows(session, CampaignEventRollupDaily)
+        assert (1, "view", 3, 3, 1) in rows
+        assert await service.check(session) == []
+
+    @pytest.mark.asyncio
+    async def test_settle_window_defers_recent_events(self, session):
+        await seed(session)
+        service = CampaignRollupService()
+        # Everything but the 40-day-old events is inside a 3 hour settle window
+        await service.run_once(session, settle_seconds=3 * 3600)
+        assert await service.watermark(session) == 3
+
+    @pytest.mark.asyncio
+    async def test_settle_window_uses_ingest_time_not_event_time(self, session):
+        await seed(session)
+        service = CampaignRollupService()
+        # A late upload of an old event has an old created_at but was just ingested
+        await add_events(session, [(1, "view", 1, NOW - timedelta(days=30))], ingested_at=NOW)
+        await service.run_once(session, settle_seconds=3 * 3600)
+        assert await service.watermark(session) == 3
+
+    @pytest.mark.asyncio
+    async def test_check_reports_drift_and_rebuild_fixes_it(self, session):
+        await seed(session)
+        service = CampaignRollupService()
+        await service.run_once(session, settle_seconds=0)
+        await session.execute(update(CampaignEventRollupDaily).values(event_count=99))
+        await session.commit()
+
+        assert len(await service.check(session)) == 4
+        assert await service.rebuild(session) == 5
+        assert await service.check(session) == []
+
+
+class TestRollupReads:
+    """Test analytics reads over rollups plus the raw tail"""
+
+    @pytest.mark.asyncio
+    async def test_reads_are_exact_before_during_and_after_rollup(self, session):
+        await seed(session)
+        analytics = AnalyticsService()
+        service = CampaignRollupService()
+
+        before = await analytics.dashboard_totals(session, member(1))
+        timeline_before = await analytics.monthly_events(session, member(1))
+
+        await service.run_once(session, settle_seconds=0, batch_size=2)  # partially rolled up
+        await add_events(session, [(1, "conversion", 5, NOW)])
+        partial = await analytics.dashboard_totals(session, member(1))
+
+        await service.run_once(session, settle_seconds=0)
+        after = await analytics.dashboard_totals(session, member(1))
+
+        assert before["total_events"] == 4 and before["revenue"] == 25
+        assert partial["total_events"] == 5 and partial["revenue"] == 30
+        assert after == partial
+        assert sum(row["count"] for row in timeline_before) == 4
+        assert await analytics.monthly_events(session, member(1)) != []
+        assert sum(row["count"] for row in await analytics.monthly_events(session, member(1))) == 5
+
+    @pytest.mark.asyncio
+    async def test_rollups_are_org_scoped(self, session):
+        await seed(session)
+        await CampaignRollupService().run_once(session, settle_seconds=0)
+        analytics = AnalyticsService()
+
+        assert (await analytics.dashboard_totals(session, member(2)))["total_events"] == 1
+        platform = await analytics.dashboard_totals(session, SimpleNamespace(role="super_admin"))
+        assert platform["total_events"] == 5
@@ -0,0 +1,101 @@
+"""
+Unit Tests for ConcurrencyLimiter and async Gemini calls
+- Concurrency bound and FIFO waiting
+- Queue-depth / wait-time stats
+- Gemini text calls use the SDK's async method under the limiter
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.concurrency import ConcurrencyLimiter
+from app.services import ai_service
+from app.services.ai_service import AIService
+from app.services.llm_cache import llm_cache
+
+
+class TestConcurrencyLimiter:
+    """Test slot accounting"""
+
+    @pytest.mark.asyncio
+    async def test_bounds_concurrency(self):
+        limiter = ConcurrencyLimiter("test", limit=2)
+        running = []
+        peak = []
+
+        async def work():
+            async with limiter.slot():
+                running.append(1)
+                peak.append(len(running))
+                await asyncio.sleep(0.01)
+                running.pop()
+
+        await asyncio.gather(*(work() for _ in range(6)))
+
+        assert max(peak) == 2
+        stats = limiter.stats()
+        assert stats["completed"] == 6
+        assert stats["active"] == 0
+        assert stats["waiting"] == 0
+        assert stats["max_waiting"] >= 4
+        assert stats["wait_ms_max"] > 0
+
+    @pytest.mark.asyncio
+    async def test_waiting_count_visible(self):
+        limiter = ConcurrencyLimiter("test", limit=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter.slot():
+                await release.wait()
+
+        tasks = [asyncio.create_task(holder()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+
+        assert limiter.stats()["active"] == 1
+        assert limiter.stats()["waiting"] == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert limiter.stats()["completed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_slot_released_on_error(self):
+        limiter = ConcurrencyLimiter("test", limit=1)
+
+        with pytest.raises(RuntimeError):
+            async with limiter.slot():
+                raise RuntimeError("boom")
+
+        async with limiter.slot():
+            pass
+        assert limiter.stats()["completed"] == 2
+
+
+class TestGeminiAsyncCalls:
+    """Test AIService Gemini paths"""
+
+    @pytest.mark.asyncio
+    async def test_text_call_uses_async_sdk_under_limiter(self, monkeypatch):
+        limiter = ConcurrencyLimiter("gemini", limit=1)
+        monkeypatch.setattr(ai_service, "gemini_limiter", limiter)
+        llm_cache.clear()
+
+        class FakeResponse:
+            text = "ok"
+
+        class FakeModel:
+            model_name = "models/fake"
+
+            def generate_content(self, prompt):
+                raise AssertionError("blocking SDK call used")
+
+            async def generate_content_async(self, prompt):
+                assert limiter.stats()["active"] == 1
+                return FakeResponse()
+
+        with llm_cache.bypass():
+            assert await AIService._call_gemini_text(FakeModel(), "hello") == "ok"
+        assert limiter.stats()["completed"] == 1
+        llm_cache.clear()
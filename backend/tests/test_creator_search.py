@@ -0,0 +1,131 @@
+"""
+Unit Tests for creator search
+- BM25 ranking with field weights and prefix matching (in-memory backend)
+- Facets: platform, follower range, engagement, location, category
+- The index follows committed creator writes and ignores rolled-back ones
+- DiscoveryService returns database hits in rank order
+"""
+
+import pytest
+import pytest_asyncio
+
+from app.models.creator import Creator
+from app.models.models import Influencer
+from app.schemas.schemas import DiscoveryFilter
+from app.services.creator_search import SearchFilters, creator_search
+from app.services.discovery_service import DiscoveryService
+
+
+@pytest_asyncio.fixture
+async def factory(sqlite_sessionmaker):
+    factory = await sqlite_sessionmaker()
+    async with factory() as session:
+        session.add_all([
+            Creator(id=1, handle="veganchef", platform="Instagram", name="Ana Vegan",
+                    category="Food", bio="Plant-based vegan recipes every day",
+                    follower_count=120000, engagement_rate=4.5, location="Lisbon, PT"),
+            Creator(id=2, handle="fitwithmo", platform="TikTok", name="Mo",
+                    category="Fitness", bio="Workouts, and the odd vegan snack",
+                    follower_count=40000, engagement_rate=7.1, location="London, UK"),
+            Creator(id=3, handle="techtom", platform="YouTube", name="Tom",
+                    category="Tech", bio="Gadget reviews", tags=["recipes"],
+                    follower_count=900000, engagement_rate=2.0),
+            Influencer(id=1, handle="@veganvibes", platform="TikTok", followers=8000, engagement_rate="9.2%"),
+        ])
+        await session.commit()
+    creator_search.reset()
+    yield factory
+    creator_search.reset()
+
+
+def ids(hits):
+    return [(hit.kind, hit.id) for hit in hits]
+
+
+class TestRanking:
+    """Test in-memory BM25 ranking"""
+
+    @pytest.mark.asyncio
+    async def test_field_weights_and_term_frequency(self, factory):
+        async with factory() as session:
+            hits = await creator_search.search(session, "vegan")
+
+        # Handle + name + bio beats a bio-only mention; the influencer matches on its handle
+        assert ids(hits)[0] == ("creator", 1)
+        assert set(ids(hits)) == {("creator", 1), ("creator", 2), ("influencer", 1)}
+        assert hits == sorted(hits, key=lambda hit: -hit.score)
+
+    @pytest.mark.asyncio
+    async def test_all_terms_must_match_with_prefixes(self, factory):
+        async with factory() as session:
+            assert ids(await creator_search.search(session, "vegan recip")) == [("creator", 1)]
+            assert ids(await creator_search.search(session, "gadget")) == [("creator", 3)]
+            assert ids(await creator_search.search(session, "@techto")) == [("creator", 3)]
+            assert await creator_search.search(session, "vegan gadget") == []
+
+
+class TestFacets:
+    """Test facet filters"""
+
+    @pytest.mark.asyncio
+    async def test_facets(self, factory):
+        async with factory() as session:
+            search = creator_search.search
+            assert set(ids(await search(session, "vegan", SearchFilters(platform="tiktok")))) == {
+                ("creator", 2), ("influencer", 1)
+            }
+            assert ids(await search(session, "vegan", SearchFilters(min_followers=10000, max_followers=100000))) == [
+                ("creator", 2)
+            ]
+            assert set(ids(await search(session, "vegan", SearchFilters(min_engagement=7.0)))) == {
+                ("creator", 2), ("influencer", 1)
+            }
+            assert ids(await search(session, "vegan", SearchFilters(location="lisbon"))) == [("creator", 1)]
+            assert ids(await search(session, "vegan", SearchFilters(category="fitness"))) == [("creator", 2)]
+
+
+class TestIndexMaintenance:
+    """Test incremental index updates"""
+
+    @pytest.mark.asyncio
+    async def test_commits_update_index_and_rollbacks_do_not(self, factory):
+        async with factory() as session:
+            await creator_search.search(session, "vegan")  # builds the index
+            builds = creator_search.stats()["index_builds"]
+
+            session.add(Creator(id=4, handle="greenbowl", platform="Instagram", bio="Vegan bowls"))
+            creator = await session.get(Creator, 1)
+            creator.bio = "Barbecue and grilling"
+            creator.name = "Ana"
+            creator.handle = "grillana"
+            await session.commit()
+
+            hits = ids(await creator_search.search(session, "vegan"))
+            assert ("creator", 4) in hits and ("creator", 1) not in hits
+            assert ids(await creator_search.search(session, "barbecue")) == [("creator", 1)]
+
+            session.add(Creator(id=5, handle="veganpending", platform="Instagram"))
+            await session.flush()
+            await session.rollback()
+            assert ("creator", 5) not in ids(await creator_search.search(session, "vegan"))
+
+            await session.delete(await session.get(Creator, 4))
+            await session.commit()
+            assert ("creator", 4) not in ids(await creator_search.search(session, "vegan"))
+
+        assert creator_search.stats()["index_builds"] == builds
+
+
+class TestDiscoveryService:
+    """Test the discovery database tier"""
+
+    @pytest.mark.asyncio
+    async def test_database_hits_in_rank_order_with_filters(self, factory):
+        async with factory() as session:
+            profiles = await DiscoveryService.search_influencers(
+                "vegan", DiscoveryFilter(platform="TikTok", min_reach=20000), db=session
+            )
+            assert [p.handle for p in profiles] == ["@fitwithmo"]
+
+            profiles = await DiscoveryService.search_influencers("vegan", db=session)
+            assert profiles[0].handle == "@veganchef"
@@ -0,0 +1,156 @@
+"""
+Unit Tests for the main dashboard stats endpoint
+- Performance series is bucketed in SQL per range and zero-filled
+- Stats, activities, series and featured campaign are scoped to the caller's org
+- Payload is cached per org and dropped when one of the org's campaigns is written
+"""
+
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from app.api.deps import get_current_active_user
+from app.api.endpoints import dashboard
+from app.core.database import get_read_db
+from app.core.db_metrics import assert_max_queries
+from app.models.models import ActivityLog, Campaign, User, Workflow
+from app.services.analytics_service import AnalyticsService, analytics_service, bucket_starts
+
+TODAY = date.today()
+NOON = time(12, 0)
+
+
+@pytest_asyncio.fixture
+async def factory(sqlite_sessionmaker):
+    factory = await sqlite_sessionmaker(metrics_name="test-dashboard-stats")
+    async with factory() as session:
+        session.add_all([
+            User(id=1, email="a@example.com", role="agency_admin", organization_id=1),
+            User(id=2, email="b@example.com", role="agency_admin", organization_id=2),
+        ])
+        await session.flush()
+        session.add_all([
+            Campaign(title="today", status="active", owner_id=1, created_at=datetime.combine(TODAY, NOON)),
+            Campaign(title="today 2", status="draft", owner_id=1, created_at=datetime.combine(TODAY, NOON)),
+            Campaign(title="3 days", status="active", owner_id=1,
+                     created_at=datetime.combine(TODAY - timedelta(days=3), NOON)),
+            Campaign(title="old", status="active", owner_id=1,
+                     created_at=datetime.combine(TODAY - timedelta(days=400), NOON)),
+            Campaign(title="other org", status="active", owner_id=2, created_at=datetime.combine(TODAY, NOON)),
+            Workflow(name="wf", user_id=1),
+            Workflow(name="wf other", user_id=2),
+            ActivityLog(action="Created", details="mine", user_id=1),
+            ActivityLog(action="Created", details="theirs", user_id=2),
+        ])
+        await session.commit()
+    analytics_service.clear()
+    yield factory
+    analytics_service.clear()
+
+
+def member(org_id):
+    return SimpleNamespace(role="agency_admin", organization_id=org_id)
+
+
+class TestDashboardTimeline:
+    """Test SQL bucketing and zero-fill"""
+
+    def test_bucket_starts(self):
+        assert bucket_starts("day", 3, date(2026, 3, 2)) == [date(2026, 2, 28), date(2026, 3, 1), date(2026, 3, 2)]
+        assert bucket_starts("week", 2, date(2026, 3, 4)) == [date(2026, 2, 23), date(2026, 3, 2)]
+        assert bucket_starts("month", 3, date(2026, 2, 15)) == [date(2025, 12, 1), date(2026, 1, 1), date(2026, 2, 1)]
+
+    @pytest.mark.asyncio
+    async def test_daily_series_is_zero_filled_and_scoped(self, factory):
+        async with factory() as session:
+            series = await AnalyticsService().dashboard_timeline(session, member(1), "7d")
+
+        assert len(series) == 7
+        assert series[-1] == {"name": TODAY.strftime("%a"), "campaigns": 2, "engagement": 200}
+        assert series[-4]["campaigns"] == 1
+        assert sum(point["campaigns"] for point in series) == 3
+
+    @pytest.mark.asyncio
+    async def test_weekly_and_monthly_buckets(self, factory):
+        analytics = AnalyticsService()
+        async with factory() as session:
+            weekly = await analytics.dashboard_timeline(session, member(1), "3m")
+            monthly = await analytics.dashboard_timeline(session, member(1), "6m")
+            platform = await analytics.dashboard_timeline(session, SimpleNamespace(role="super_admin"), "6m")
+
+        assert len(weekly) == 12 and weekly[-1]["name"] == f"W {TODAY.strftime('%V')}"
+        assert sum(point["campaigns"] for point in weekly) == 3
+        assert len(monthly) == 6 and monthly[-1]["name"] == TODAY.strftime("%b")
+        assert sum(point["campaigns"] for point in monthly) == 3
+        assert sum(point["campaigns"] for point in platform) == 4
+
+
+@pytest_asyncio.fixture
+async def client(factory):
+    current = {"user": None}
+
+    async def override_get_read_db():
+        async with factory() as session:
+            yield session
+
+    async def override_user():
+        return current["user"]
+
+    app = FastAPI()
+    app.include_router(dashboard.router, prefix="/dashboard")
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_current_active_user] = override_user
+
+    async with factory() as session:
+        current["user"] = await session.get(User, 1)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        client.current = current
+        yield client
+
+
+class TestDashboardStatsEndpoint:
+    """Test GET /dashboard/stats"""
+
+    @pytest.mark.asyncio
+    async def test_payload_is_org_scoped(self, client):
+        response = await client.get("/dashboard/stats?range=7d")
+        assert response.status_code == 200
+        payload = response.json()
+
+        assert payload["stats"]["active_campaigns"] == 3
+        assert payload["stats"]["ai_workflows"] == 1
+        assert [a["details"] for a in payload["activities"]] == ["mine"]
+        assert payload["performance"][-1]["campaigns"] == 2
+        assert payload["featuredCampaign"]["status"] == "active"
+
+    @pytest.mark.asyncio
+    async def test_cached_until_campaign_write(self, client, factory):
+        with assert_max_queries(4):
+            first = (await client.get("/dashboard/stats?range=7d")).json()
+        with assert_max_queries(0):
+            assert (await client.get("/dashboard/stats?range=7d")).json() == first
+
+        # Another org's write leaves org 1's entry alone
+        async with factory() as session:
+            session.add(Campaign(title="new other", status="active", owner_id=2))
+            await session.commit()
+        with assert_max_queries(0):
+            await client.get("/dashboard/stats?range=7d")
+
+        async with factory() as session:
+            session.add(Campaign(title="new", status="active", owner_id=1))
+            await session.commit()
+        refreshed = (await client.get("/dashboard/stats?range=7d")).json()
+        assert refreshed["stats"]["active_campaigns"] == 4
+        assert refreshed["performance"][-1]["campaigns"] == 3
+
+    @pytest.mark.asyncio
+    async def test_unknown_range_falls_back_to_months(self, client):
+        payload = (await client.get("/dashboard/stats?range=ytd")).json()
+        assert len(payload["performance"]) == 6
@@ -0,0 +1,237 @@
+"""
+Unit Tests for database metrics
+- Statements counted per engine and per tracked request
+- Pool checkout waits and timeouts recorded by TimedAsyncQueuePool
+- QueryMetricsMiddleware records one sample per HTTP request, per route,
+  and adds a Server-Timing header
+- Slow queries are logged with their route
+- Prometheus exposition and the assert_max_queries test helper
+- GET /metrics is off by default and honours METRICS_TOKEN
+- Engine options derived from settings
+"""
+
+import logging
+
+import pytest
+import pytest_asyncio
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.endpoints import dashboard
+from app.core import db_metrics as db_metrics_module
+from app.core.database import _engine_kwargs, get_read_db
+from app.core.db_metrics import (
+    QueryMetricsMiddleware,
+    TimedAsyncQueuePool,
+    assert_max_queries,
+    db_metrics,
+    instrument_engine,
+    track_queries,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    db_metrics.reset()
+    yield
+    db_metrics.reset()
+
+
+class TestQueryTracking:
+    """Test statement counting"""
+
+    @pytest.mark.asyncio
+    async def test_counts_queries_in_scope(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        instrument_engine(engine, "test-count")
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            with track_queries() as stats:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+        await engine.dispose()
+
+        assert stats.count == 2
+        assert stats.duration_ms >= 0
+        assert db_metrics.snapshot()["engines"]["test-count"]["queries"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_statement_does_not_break_timing(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        instrument_engine(engine, "test-error")
+        async with engine.connect() as conn:
+            with pytest.raises(exc.OperationalError):
+                await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.execute(text("SELECT 1"))
+        await engine.dispose()
+
+        assert db_metrics.snapshot()["engines"]["test-error"]["queries"] == 1
+
+
+class TestTimedPool:
+    """Test pool checkout instrumentation"""
+
+    @pytest.mark.asyncio
+    async def test_checkout_and_timeout_recorded(self):
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            poolclass=TimedAsyncQueuePool,
+            pool_logging_name="test-pool",
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        instrument_engine(engine, "test-pool")
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+        await engine.dispose()
+
+        stats = db_metrics.snapshot()["engines"]["test-pool"]
+        assert stats["checkouts"] == 1
+        assert stats["checkout_timeouts"] == 1
+        assert stats["checkout_wait_ms_max"] >= 50
+        assert "Pool size: 1" in stats["pool"]
+
+
+def make_app(engine):
+    async def get_conn():
+        async with engine.connect() as conn:
+            yield conn
+
+    app = FastAPI()
+    app.add_middleware(QueryMetricsMiddleware, server_timing=True)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int, conn=Depends(get_conn)):
+        for _ in range(item_id):
+            await conn.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    return app
+
+
+class TestMiddleware:
+    """Test per-request recording"""
+
+    @pytest.mark.asyncio
+    async def test_request_stats(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        instrument_engine(engine, "test-http")
+
+        transport = httpx.ASGITransport(app=make_app(engine))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/items/3")
+            assert response.status_code == 200
+            assert 'desc="3 queries"' in response.headers["server-timing"]
+            assert (await client.get("/items/1")).status_code == 200
+            assert (await client.get("/nowhere")).status_code == 404
+        await engine.dispose()
+
+        snapshot = db_metrics.snapshot()
+        assert snapshot["requests"]["count"] == 3
+        assert snapshot["requests"]["queries_max"] == 3
+        heaviest = snapshot["heaviest_routes"][0]
+        assert heaviest["route"] == "GET /items/{item_id}"
+        assert heaviest["queries_avg"] == 2.0
+
+        exposition = db_metrics.prometheus()
+        assert 'cadence_http_request_queries_bucket{method="GET",route="/items/{item_id}",le="2"} 1' in exposition
+        assert 'cadence_http_request_queries_count{method="GET",route="/items/{item_id}"} 2' in exposition
+        assert 'route="unmatched"' in exposition
+        assert 'cadence_db_queries_total{engine="test-http"} 4' in exposition
+
+    @pytest.mark.asyncio
+    async def test_slow_query_logged_with_route(self, caplog, monkeypatch):
+        monkeypatch.setattr(db_metrics, "slow_query_ms", 0.000001)
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        instrument_engine(engine, "test-slow")
+
+        transport = httpx.ASGITransport(app=make_app(engine))
+        with caplog.at_level(logging.WARNING, logger="app.core.db_metrics"):
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await client.get("/items/1")
+        await engine.dispose()
+
+        assert "GET /items/{item_id}: SELECT 1" in caplog.text
+        assert db_metrics.snapshot()["engines"]["test-slow"]["slow_queries"] == 1
+
+
+@pytest_asyncio.fixture
+async def dashboard_client(sqlite_sessionmaker):
+    factory = await sqlite_sessionmaker(metrics_name="test-dashboard")
+
+    async def override_get_read_db():
+        async with factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.add_middleware(QueryMetricsMiddleware)
+    app.include_router(dashboard.router, prefix="/dashboard")
+    app.dependency_overrides[get_read_db] = override_get_read_db
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+class TestAssertMaxQueries:
+    """Test the N+1 guard used by endpoint tests"""
+
+    @pytest.mark.asyncio
+    async def test_endpoint_within_budget(self, dashboard_client):
+        with assert_max_queries(1) as stats:
+            response = await dashboard_client.get("/dashboard/activities")
+        assert response.status_code == 200
+        assert stats.count == 1
+
+    @pytest.mark.asyncio
+    async def test_over_budget_lists_statements(self, dashboard_client):
+        with pytest.raises(AssertionError) as excinfo:
+            with assert_max_queries(0):
+                await dashboard_client.get("/dashboard/campaigns")
+        assert "got 1" in str(excinfo.value)
+        assert "FROM campaigns" in str(excinfo.value)
+
+
+class TestEngineOptions:
+    """Test settings-derived engine kwargs"""
+
+    def test_sqlite_has_no_pool_sizing(self):
+        kwargs = _engine_kwargs("sqlite+aiosqlite:///./x.db", "primary")
+        assert "pool_size" not in kwargs
+        assert kwargs["echo"] is False
+
+    def test_asyncpg_pool_and_timeouts(self):
+        kwargs = _engine_kwargs("postgresql+asyncpg://u:p@db/app", "replica")
+        assert kwargs["poolclass"] is TimedAsyncQueuePool
+        assert kwargs["pool_logging_name"] == "replica"
+        assert kwargs["pool_pre_ping"] is True
+        assert kwargs["connect_args"]["server_settings"]["statement_timeout"] == "30000"
+        assert kwargs["connect_args"]["statement_cache_size"] == 100
+
+
+class TestMetricsEndpoint:
+    """Test access to GET /metrics"""
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default_and_token_protected(self, monkeypatch):
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.get("/metrics")).status_code == 404
+
+            monkeypatch.setattr(db_metrics_module, "METRICS_ENABLED", True)
+            monkeypatch.setattr(db_metrics_module, "METRICS_TOKEN", "scrape-secret")
+            assert (await client.get("/metrics")).status_code == 401
+            wrong = await client.get("/metrics", headers={"Authorization": "Bearer nope"})
+            assert wrong.status_code == 401
+
+            response = await client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+            assert response.status_code == 200
+            assert "cadence_db_queries_total" in response.text
@@ -0,0 +1,175 @@
+"""
+Unit Tests for the discovery result cache
+- Equivalent filter sets (order, case, whitespace) share one key; orgs do not
+- Fresh, stale (served while one background refresh runs) and expired entries
+- /discovery/search serves repeats from cache without calling the provider or deducting credits
+"""
+
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy import func, select
+
+from app.api.deps import require_discovery_read
+from app.api.endpoints import discovery
+from app.core.database import get_db
+from app.models.models import CreditTransaction, User
+from app.services.discovery_cache import DiscoveryResultCache, discovery_cache, discovery_cache_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def discover_creators(self, platform, filters, limit, page):
+        self.calls += 1
+        return {"accounts": [{"username": f"creator{self.calls}", "platform": platform}], "total": 1}
+
+
+class TestCacheKey:
+    """Test filter canonicalization"""
+
+    def test_equivalent_requests_share_a_key(self):
+        a = discovery_cache_key("org:1", "Instagram", {
+            "ai_search": "Fitness  Coaches", "location": ["US", "GB"], "is_verified": None,
+        }, 20, 1)
+        b = discovery_cache_key("org:1", "instagram", {
+            "location": ["gb", "us"], "ai_search": "fitness coaches",
+        }, 20, 1)
+        assert a == b
+        assert discovery_cache_key("org:2", "instagram", {"location": ["gb", "us"], "ai_search": "fitness coaches"}, 20, 1) != a
+        assert discovery_cache_key("org:1", "instagram", {"location": ["gb", "us"], "ai_search": "fitness coaches"}, 20, 2) != a
+
+
+class TestFreshness:
+    """Test TTL and stale-while-revalidate"""
+
+    @pytest.mark.asyncio
+    async def test_fresh_stale_and_expired(self):
+        clock = Clock()
+        cache = DiscoveryResultCache(ttl_seconds=60, stale_seconds=300, enabled=True, clock=clock)
+        await cache.set("k", {"accounts": [1]})
+
+        page = await cache.get("k")
+        assert page.result == {"accounts": [1]} and not page.stale
+
+        clock.now += 120
+        page = await cache.get("k")
+        assert page.stale and page.age_seconds == 120
+
+        fetches = []
+
+        async def fetch():
+            fetches.append(1)
+            return {"accounts": [2]}
+
+        task = cache.revalidate("k", fetch)
+        assert cache.revalidate("k", fetch) is None  # one refresh per key
+        await task
+        assert len(fetches) == 1
+        page = await cache.get("k")
+        assert page.result == {"accounts": [2]} and not page.stale
+
+        clock.now += 1000
+        assert await cache.get("k") is None
+        assert cache.stats()["misses"] == 1
+
+
+@pytest_asyncio.fixture
+async def api(sqlite_sessionmaker):
+    factory = await sqlite_sessionmaker()
+    async with factory() as session:
+        session.add_all([
+            User(id=1, email="a@example.com", role="agency_admin", organization_id=1),
+            User(id=2, email="b@example.com", role="agency_member", organization_id=1),
+            User(id=3, email="c@example.com", role="agency_admin", organization_id=2),
+        ])
+        await session.commit()
+
+    client = FakeClient()
+    current = {"user_id": 1}
+    app = FastAPI()
+    app.include_router(discovery.router, prefix="/discovery")
+
+    async def override_db():
+        async with factory() as session:
+            yield session
+
+    async def override_user():
+        async with factory() as session:
+            return await session.get(User, current["user_id"])
+
+    async def override_client():
+        return client
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[require_discovery_read] = override_user
+    app.dependency_overrides[discovery.get_ic_client] = override_client
+
+    discovery_cache.clear()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        yield http, client, current, factory
+    discovery_cache.clear()
+
+
+class TestDiscoverySearchEndpoint:
+    """Test cached /discovery/search pages"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_search_is_cached_per_org_and_free(self, api):
+        http, client, current, factory = api
+        body = {"query": "Vegan chefs who post weekly recipes", "filters": {"platform": "Instagram"}}
+
+        first = (await http.post("/discovery/search", json=body)).json()
+        assert first["cache"]["hit"] is False
+        assert first["credits_deducted"] > 0
+
+        # Same org, different user and spelling: served from cache
+        current["user_id"] = 2
+        repeat = (await http.post("/discovery/search", json={"query": "vegan  CHEFS who post weekly recipes", "filters": {"platform": "instagram"}})).json()
+        assert repeat["cache"]["hit"] is True
+        assert repeat["credits_deducted"] == 0
+        assert repeat["accounts"] == first["accounts"]
+        assert client.calls == 1
+
+        # Another org pays for its own search
+        current["user_id"] = 3
+        other = (await http.post("/discovery/search", json=body)).json()
+        assert other["cache"]["hit"] is False
+        assert client.calls == 2
+
+        async with factory() as session:
+            charged = await session.scalar(
+                select(func.count()).select_from(CreditTransaction)
+                .where(CreditTransaction.transaction_type == "discovery_search")
+            )
+        assert charged == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_page_is_served_and_refreshed(self, api, monkeypatch):
+        http, client, current, factory = api
+        clock = Clock()
+        monkeypatch.setattr(discovery_cache, "_clock", clock)
+        params = {"platform": "tiktok", "ai_search": "dance creators with high energy videos"}
+
+        await http.post("/discovery/search", params=params)
+        clock.now += discovery_cache.ttl_seconds + 1
+        stale = (await http.post("/discovery/search", params=params)).json()
+        assert stale["cache"]["stale"] is True
+        assert stale["accounts"][0]["username"] == "creator1"
+
+        await asyncio.gather(*discovery_cache._revalidating.values())
+        fresh = (await http.post("/discovery/search", params=params)).json()
+        assert fresh["cache"] == {"hit": True, "stale": False, "age_seconds": 0.0}
+        assert fresh["accounts"][0]["username"] == "creator2"
@@ -0,0 +1,122 @@
+"""
+Unit Tests for the enrichment freshness cache
+- Fresh stored results are served without a provider call; a full result satisfies raw
+- Expired results are refetched; near-expiry results are refreshed in the background
+- Concurrent enrichments of one handle share a single provider call
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from app.models.models import InfluencerEnrichmentResult
+from app.services.enrichment_cache import EnrichmentFreshnessCache
+
+
+class FakeClient:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def enrich_handle(self, handle, platform, enrichment_mode="full"):
+        self.calls.append((handle, platform, enrichment_mode))
+        await asyncio.sleep(self.delay)
+        return {"handle": handle, "mode": enrichment_mode, "version": len(self.calls)}
+
+
+@pytest_asyncio.fixture
+async def session_factory(sqlite_sessionmaker):
+    return await sqlite_sessionmaker(InfluencerEnrichmentResult)
+
+
+async def _store(session_factory, handle, mode, age_hours, data):
+    async with session_factory() as session:
+        session.add(InfluencerEnrichmentResult(
+            batch_id="batch-1", platform="instagram", handle=handle, mode=mode, status="enriched",
+            data=data, attempts=1, enriched_at=datetime.now(timezone.utc) - timedelta(hours=age_hours),
+        ))
+        await session.commit()
+
+
+class TestFreshness:
+    """Test serving stored enrichments by age"""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self, session_factory):
+        cache = EnrichmentFreshnessCache(session_factory=session_factory, max_age_hours={"raw": 24}, enabled=True)
+        client = FakeClient()
+
+        first, info = await cache.enrich(client, "Instagram", "@Nike", "raw")
+        assert info == {"hit": False}
+
+        again, info = await cache.enrich(client, "instagram", "nike", "raw")
+        assert info["hit"] is True and info["refreshing"] is False
+        assert again == first
+        assert client.calls == [("nike", "instagram", "raw")]
+
+        async with session_factory() as session:
+            row = (await session.execute(select(InfluencerEnrichmentResult))).scalar_one()
+        assert (row.batch_id, row.handle, row.status) == ("enrich:raw", "nike", "enriched")
+        assert (row.organization_id, row.user_id) == (None, None)  # shared across organizations
+
+    @pytest.mark.asyncio
+    async def test_full_result_satisfies_raw_but_not_the_reverse(self, session_factory):
+        await _store(session_factory, "nike", "full", 1, {"email": "hi@nike.com"})
+        cache = EnrichmentFreshnessCache(
+            session_factory=session_factory, max_age_hours={"raw": 24, "full": 24}, enabled=True,
+        )
+        client = FakeClient()
+
+        data, info = await cache.enrich(client, "instagram", "nike", "raw")
+        assert info["hit"] and data == {"email": "hi@nike.com"}
+
+        await _store(session_factory, "adidas", "raw", 1, {"raw": True})
+        _, info = await cache.enrich(client, "instagram", "adidas", "full")
+        assert info == {"hit": False}
+        assert client.calls == [("adidas", "instagram", "full")]
+
+    @pytest.mark.asyncio
+    async def test_expired_result_is_refetched(self, session_factory):
+        await _store(session_factory, "nike", "raw", 48, {"old": True})
+        cache = EnrichmentFreshnessCache(session_factory=session_factory, max_age_hours={"raw": 24}, enabled=True)
+        client = FakeClient()
+
+        data, info = await cache.enrich(client, "instagram", "nike", "raw")
+
+        assert info == {"hit": False}
+        assert data["version"] == 1
+
+    @pytest.mark.asyncio
+    async def test_near_expiry_is_served_and_refreshed_in_background(self, session_factory):
+        await _store(session_factory, "nike", "raw", 22, {"old": True})
+        cache = EnrichmentFreshnessCache(
+            session_factory=session_factory, max_age_hours={"raw": 24}, refresh_ahead_fraction=0.8, enabled=True,
+        )
+        client = FakeClient(delay=0.01)
+
+        data, info = await cache.enrich(client, "instagram", "nike", "raw")
+        assert data == {"old": True} and info["refreshing"] is True
+        await cache.enrich(client, "instagram", "nike", "raw")  # one refresh per handle
+        await asyncio.gather(*cache._refreshing.values())
+
+        data, info = await cache.enrich(client, "instagram", "nike", "raw")
+        assert data["version"] == 1 and info["refreshing"] is False
+        assert len(client.calls) == 1
+        assert cache.stats()["refreshes"] == 1
+
+
+class TestCoalescing:
+    """Test concurrent enrichments of the same handle"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self, session_factory):
+        cache = EnrichmentFreshnessCache(session_factory=session_factory, max_age_hours={"raw": 24}, enabled=True)
+        client = FakeClient(delay=0.02)
+
+        results = await asyncio.gather(*(cache.enrich(client, "tiktok", "dancer", "raw") for _ in range(5)))
+
+        assert len(client.calls) == 1
+        assert all(data == results[0][0] for data, _ in results)
+        assert cache.stats()["coalesced"] == 4
@@ -0,0 +1,259 @@
+"""
+Unit Tests for campaign event ingestion
+- Concurrent submits are group-committed in one flush
+- Database failures spool batches to disk; replay inserts them later
+- Closing during a slow write spools the in-flight batch instead of dropping it
+- A full buffer raises IngestBackpressure (429 from the endpoint)
+- POST /events/batch accepts JSON arrays and NDJSON, rejecting invalid or foreign events by index
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.api.deps import require_campaign_write
+from app.api.endpoints import events as events_endpoint
+from app.core.database import get_db
+from app.models.models import Campaign, CampaignEvent, User
+from app.services.event_ingest import EventIngestor, IngestBackpressure
+
+
+@pytest_asyncio.fixture
+async def factory(sqlite_sessionmaker):
+    factory = await sqlite_sessionmaker()
+    async with factory() as session:
+        session.add_all([
+            User(id=1, email="a@example.com", role="agency_admin", organization_id=1),
+            User(id=2, email="b@example.com", role="agency_admin", organization_id=2),
+        ])
+        await session.flush()
+        session.add_all([
+            Campaign(id=1, title="A", status="active", owner_id=1),
+            Campaign(id=2, title="B", status="active", owner_id=2),
+        ])
+        await session.commit()
+    return factory
+
+
+def event_row(campaign_id=1, event_type="click", value=1):
+    return {
+        "campaign_id": campaign_id,
+        "type": event_type,
+        "value": value,
+        "metadata_json": None,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+async def event_count(factory):
+    async with factory() as session:
+        return (await session.execute(select(func.count()).select_from(CampaignEvent))).scalar()
+
+
+class BrokenFactory:
+    """Session factory whose sessions fail on the first statement (database down)."""
+
+    def __call__(self):
+        engine = create_async_engine("sqlite+aiosqlite:////nonexistent-dir/events.db")
+        return AsyncSession(engine)
+
+
+class TestEventIngestor:
+    """Test buffering, group commit, spool and back-pressure"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submits_share_one_flush(self, factory, tmp_path):
+        ingestor = EventIngestor(factory, flush_size=1000, flush_interval=0.05, spool_dir=str(tmp_path))
+        await ingestor.start()
+        try:
+            await asyncio.gather(*(ingestor.submit([event_row()] * 10) for _ in range(20)))
+        finally:
+            await ingestor.close()
+
+        assert await event_count(factory) == 200
+        stats = ingestor.stats()
+        assert stats["inserted"] == 200
+        assert stats["flushes"] < 20
+        assert stats["buffered"] == 0
+
+    @pytest.mark.asyncio
+    async def test_size_threshold_wakes_flusher(self, factory, tmp_path):
+        ingestor = EventIngestor(factory, flush_size=5, flush_interval=60, spool_dir=str(tmp_path))
+        await ingestor.start()
+        try:
+            await asyncio.wait_for(ingestor.submit([event_row()] * 5), timeout=5)
+        finally:
+            await ingestor.close()
+        assert await event_count(factory) == 5
+
+    @pytest.mark.asyncio
+    async def test_database_failure_spools_then_replays(self, factory, tmp_path):
+        ingestor = EventIngestor(BrokenFactory(), spool_dir=str(tmp_path))
+        assert await ingestor.submit([event_row(), event_row(event_type="conversion", value=40)]) == 2
+        assert ingestor.stats()["spooled"] == 2
+        assert len(os.listdir(tmp_path)) == 1
+
+        # Still down: the file is released for the next attempt
+        assert await ingestor.replay_spool() == 0
+        assert ingestor.stats()["spool_files"] == 1
+
+        ingestor._session_factory = factory
+        assert await ingestor.replay_spool() == 2
+        assert os.listdir(tmp_path) == []
+        async with factory() as session:
+            values = sorted((await session.execute(select(CampaignEvent.value))).scalars().all())
+        assert values == [1, 40]
+
+    @pytest.mark.asyncio
+    async def test_close_during_slow_write_spools_the_batch(self, factory, tmp_path):
+        ingestor = EventIngestor(factory, flush_size=1, flush_interval=60, spool_dir=str(tmp_path))
+        writing = asyncio.Event()
+
+        async def slow_write(rows):
+            writing.set()
+            await asyncio.sleep(60)
+
+        ingestor._write = slow_write
+        await ingestor.start()
+        pending = asyncio.ensure_future(ingestor.submit([event_row(), event_row(value=7)]))
+        await asyncio.wait_for(writing.wait(), timeout=5)
+
+        await ingestor.close()
+
+        assert await asyncio.wait_for(pending, timeout=1) == 2
+        assert ingestor.stats()["spooled"] == 2
+        assert len(os.listdir(tmp_path)) == 1
+
+        del ingestor._write
+        assert await ingestor.replay_spool() == 2
+        assert await event_count(factory) == 2
+
+    @pytest.mark.asyncio
+    async def test_unwritable_spool_fails_submitters(self, tmp_path):
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        ingestor = EventIngestor(BrokenFactory(), spool_dir=str(blocker))
+        with pytest.raises(OSError):
+            await ingestor.submit([event_row()])
+        assert ingestor.stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_raises_backpressure(self, factory, tmp_path):
+        ingestor = EventIngestor(factory, flush_size=5, max_buffered=10, flush_interval=60, spool_dir=str(tmp_path))
+        ingestor._task = object()  # flusher "running" but stalled
+        ingestor._wake = asyncio.Event()
+        pending = asyncio.ensure_future(ingestor.submit([event_row()] * 10))
+        await asyncio.sleep(0)
+
+        with pytest.raises(IngestBackpressure):
+            await ingestor.submit([event_row()])
+        assert ingestor.stats()["backpressure"] == 1
+
+        ingestor._task = None
+        await ingestor.flush()
+        assert await pending == 10
+
+
+@pytest_asyncio.fixture
+async def client(factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(events_endpoint, "event_ingestor", EventIngestor(factory, spool_dir=str(tmp_path)))
+
+    async def override_get_db():
+        async with factory() as session:
+            yield session
+
+    async def override_user():
+        async with factory() as session:
+            return await session.get(User, 1)
+
+    app = FastAPI()
+    app.include_router(events_endpoint.router, prefix="/events")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[require_campaign_write] = override_user
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+class TestEventBatchEndpoint:
+    """Test POST /events/batch"""
+
+    @pytest.mark.asyncio
+    async def test_json_array(self, client, factory):
+        occurred_at = (datetime.now(timezone.utc) - timedelta(days=1)).replace(microsecond=0)
+        response = await client.post("/events/batch", json=[
+            {"campaign_id": 1, "type": "view"},
+            {"campaign_id": 1, "type": "conversion", "value": 120, "metadata": {"order": "A-1"},
+             "occurred_at": occurred_at.isoformat()},
+        ])
+        assert response.status_code == 202
+        assert response.json() == {"accepted": 2, "rejected": []}
+
+        async with factory() as session:
+            event = (await session.execute(select(CampaignEvent).where(CampaignEvent.type == "conversion"))).scalar_one()
+        assert event.value == 120
+        assert json.loads(event.metadata_json) == {"order": "A-1"}
+        assert event.created_at.replace(tzinfo=None) == occurred_at.replace(tzinfo=None)
+        assert event.occurred_at.replace(tzinfo=None) == occurred_at.replace(tzinfo=None)
+        assert event.ingested_at is not None
+
+    @pytest.mark.asyncio
+    async def test_occurred_at_outside_range_is_rejected(self, client, factory):
+        now = datetime.now(timezone.utc)
+        response = await client.post("/events/batch", json=[
+            {"campaign_id": 1, "type": "click", "occurred_at": (now - timedelta(days=365)).isoformat()},
+            {"campaign_id": 1, "type": "click", "occurred_at": (now + timedelta(days=1)).isoformat()},
+            {"campaign_id": 1, "type": "click"},
+        ])
+        assert response.status_code == 202
+        payload = response.json()
+        assert payload["accepted"] == 1
+        assert [item["index"] for item in payload["rejected"]] == [0, 1]
+        assert all(item["error"].startswith("occurred_at:") for item in payload["rejected"])
+
+        async with factory() as session:
+            event = (await session.execute(select(CampaignEvent))).scalar_one()
+        assert event.occurred_at is None
+
+    @pytest.mark.asyncio
+    async def test_ndjson_with_partial_rejection(self, client, factory):
+        body = "\n".join([
+            json.dumps({"campaign_id": 1, "type": "click"}),
+            json.dumps({"campaign_id": 1, "type": "bogus"}),
+            "",
+            json.dumps({"campaign_id": 2, "type": "click"}),  # another org's campaign
+            json.dumps({"campaign_id": 1, "type": "view", "value": -3}),
+        ])
+        response = await client.post(
+            "/events/batch", content=body, headers={"Content-Type": "application/x-ndjson"}
+        )
+        assert response.status_code == 202
+        payload = response.json()
+        assert payload["accepted"] == 1
+        assert [item["index"] for item in payload["rejected"]] == [1, 2, 3]
+        assert "Campaign not found" in payload["rejected"][1]["error"]
+        assert await event_count(factory) == 1
+
+    @pytest.mark.asyncio
+    async def test_malformed_body(self, client):
+        response = await client.post("/events/batch", content=b"{not json", headers={"Content-Type": "application/json"})
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_backpressure_maps_to_429(self, client, monkeypatch):
+        async def full(rows):
+            raise IngestBackpressure(retry_after=2)
+
+        monkeypatch.setattr(events_endpoint.event_ingestor, "submit", full)
+        response = await client.post("/events/batch", json=[{"campaign_id": 1, "type": "view"}])
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "2"
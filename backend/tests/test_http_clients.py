@@ -0,0 +1,38 @@
+"""
+Unit Tests for the shared HTTP client registry
+"""
+
+import pytest
+
+from app.core.http_clients import HTTPClientRegistry
+
+
+class TestHTTPClientRegistry:
+    """Test pooled client lifecycle"""
+
+    @pytest.mark.asyncio
+    async def test_same_profile_reuses_client(self):
+        registry = HTTPClientRegistry()
+
+        assert registry.get("ollama") is registry.get("ollama")
+        assert registry.get("ollama") is not registry.get("social")
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_profile_timeout_applied(self):
+        registry = HTTPClientRegistry()
+
+        assert registry.get("ollama").timeout.read == 300.0
+        assert registry.get("unknown-profile").timeout.read == 30.0
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_and_recreates(self):
+        registry = HTTPClientRegistry()
+        client = registry.get("social")
+
+        await registry.aclose()
+
+        assert client.is_closed
+        assert registry.get("social") is not client
+        await registry.aclose()
@@ -10,10 +10,10 @@ Unit Tests for InfluencersClubClient
 import pytest
 import httpx
 from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime
 from tenacity import RetryError
 
 from app.integrations.influencers_club import InfluencersClubClient, RATE_LIMIT_REQUESTS, RATE_LIMIT_RESET
+from app.services.rate_limiter import get_provider_limiter
 
 
 class TestInfluencersClubClientInitialization:
@@ -89,18 +89,21 @@ class TestInfluencersClubClientRateLimiting:
         assert client.request_count == 5
 
     @pytest.mark.asyncio
-    async def test_rate_limit_resets_after_window(self):
-        """Test rate limit resets after time window elapsed"""
+    async def test_clients_share_one_limiter(self):
+        """Test every client instance draws from the shared provider limiter"""
         # Arrange
-        client = InfluencersClubClient(api_key="test_key")
-        client.request_count = RATE_LIMIT_REQUESTS + 1  # Over limit
-        client.last_reset = datetime.now() - __import__('datetime').timedelta(seconds=RATE_LIMIT_RESET + 1)
+        limiter = get_provider_limiter("influencers_club")
+        acquired = limiter.stats()["acquired"]
+        first = InfluencersClubClient(api_key="test_key")
+        second = InfluencersClubClient(api_key="test_key")
         
         # Act
-        await client._check_rate_limit()
+        await first._check_rate_limit()
+        await second._check_rate_limit()
         
         # Assert
-        assert client.request_count == 1  # Reset
+        assert limiter.stats()["acquired"] == acquired + 2
+        assert limiter.rate == RATE_LIMIT_REQUESTS / RATE_LIMIT_RESET
 
 
 class TestInfluencersClubClientDiscovery:
@@ -0,0 +1,148 @@
+"""
+Unit Tests for job state tracking
+- In-memory job state backend (the test fake for Redis)
+- JobQueue fallback lifecycle recording
+- Server-sent events stream on /jobs/stream/{job_id}
+"""
+
+import pytest
+import httpx
+from fastapi import FastAPI
+
+from app.services import job_state as job_state_module
+from app.services.job_state import InMemoryJobStateBackend, JobStateStore, report_progress
+from app.services.job_queue import JobQueue
+from app.services.job_tasks import TASK_REGISTRY
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """Fresh in-memory store installed as the module singleton."""
+    fresh = JobStateStore(InMemoryJobStateBackend())
+    monkeypatch.setattr(job_state_module, "job_state", fresh)
+    monkeypatch.setattr("app.services.job_queue.job_state", fresh)
+    return fresh
+
+
+class TestInMemoryJobStateBackend:
+    """Test the in-process backend"""
+
+    @pytest.mark.asyncio
+    async def test_save_merges_and_bumps_version(self):
+        backend = InMemoryJobStateBackend()
+        await backend.save("job-1", {"status": "pending"})
+        await backend.save("job-1", {"progress": 50})
+
+        state = await backend.get("job-1")
+        assert state["status"] == "pending"
+        assert state["progress"] == 50
+        assert state["version"] == 2
+        assert state["partial_results"] == []
+
+    @pytest.mark.asyncio
+    async def test_records_expire_after_ttl(self):
+        backend = InMemoryJobStateBackend(ttl_seconds=0)
+        await backend.save("job-1", {"status": "pending"})
+
+        assert await backend.get("job-1") is None
+
+    @pytest.mark.asyncio
+    async def test_count_by_status(self):
+        backend = InMemoryJobStateBackend()
+        await backend.save("a", {"status": "pending"})
+        await backend.save("b", {"status": "running"})
+
+        assert await backend.count_by_status("pending") == 1
+
+
+class TestJobLifecycle:
+    """Test lifecycle recording through the local queue fallback"""
+
+    @pytest.mark.asyncio
+    async def test_progress_and_partial_results(self, store):
+        await store.mark_queued("job-1", "execute_workflow")
+        await store.mark_running("job-1")
+        await report_progress({"job_id": "job-1"}, 40, message="step 2", partial_result={"step": 1})
+
+        state = await store.get("job-1")
+        assert state["status"] == "running"
+        assert state["progress"] == 40
+        assert state["message"] == "step 2"
+        assert state["partial_results"] == [{"step": 1}]
+
+    @pytest.mark.asyncio
+    async def test_report_progress_without_job_is_noop(self, store):
+        await report_progress(None, 10)
+        await report_progress({}, 10)
+
+    @pytest.mark.asyncio
+    async def test_completed_job_has_timings(self, store):
+        await store.mark_queued("job-1", "generate_content")
+        await store.mark_running("job-1")
+        await store.mark_completed("job-1", {"ok": True})
+
+        state = await store.get("job-1")
+        assert state["status"] == "completed"
+        assert state["progress"] == 100
+        assert state["result"] == {"ok": True}
+        assert state["finished_at"] is not None
+        assert state["duration_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_local_fallback_records_failure_result(self, store, monkeypatch):
+        async def failing_task(ctx, value):
+            return {"success": False, "error": f"bad {value}"}
+
+        monkeypatch.setitem(TASK_REGISTRY, "failing_task", failing_task)
+        queue = JobQueue()
+        job_id = await queue.enqueue("failing_task", "input")
+        await queue.local_pool.drain()
+
+        status = await queue.get_job_status(job_id)
+        assert status["status"] == "failed"
+        assert status["error"] == "bad input"
+        assert status["task_name"] == "failing_task"
+
+    @pytest.mark.asyncio
+    async def test_watch_stops_at_terminal_status(self, store):
+        await store.mark_queued("job-1", "generate_content")
+        await store.mark_completed("job-1", "done")
+
+        states = [s async for s in store.watch("job-1", poll_interval=0.01, timeout=1)]
+        assert [s["status"] for s in states if s] == ["completed"]
+
+
+class TestJobStreamEndpoint:
+    """Test the SSE endpoint"""
+
+    @pytest.mark.asyncio
+    async def test_stream_emits_update_and_end(self, store):
+        from app.api.endpoints import jobs
+
+        app = FastAPI()
+        app.include_router(jobs.router, prefix="/jobs")
+        await store.mark_queued("job-1", "generate_content")
+        await store.mark_completed("job-1", "done")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/jobs/stream/job-1")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: update" in response.text
+        assert '"status": "completed"' in response.text
+        assert "event: end" in response.text
+
+    @pytest.mark.asyncio
+    async def test_stream_unknown_job_404(self, store):
+        from app.api.endpoints import jobs
+
+        app = FastAPI()
+        app.include_router(jobs.router, prefix="/jobs")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/jobs/stream/missing")
+
+        assert response.status_code == 404
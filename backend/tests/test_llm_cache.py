@@ -0,0 +1,198 @@
+"""
+Unit Tests for the LLM response cache
+- Content-addressed keys
+- LRU eviction and TTL expiry
+- Redis tier read-through
+- Regenerate bypass and AIService integration
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.ttl_cache import TTLLRUCache
+from app.services import ai_service
+from app.services.ai_service import AIService
+from app.services.llm_cache import LLMResponseCache, llm_cache, llm_cache_key
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        value = self.data.get(key)
+        return value.encode() if value is not None else None
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class TestTTLLRUCache:
+    """Test the in-memory tier"""
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLLRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_entries_expire(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("app.core.ttl_cache.time.monotonic", lambda: now[0])
+        cache = TTLLRUCache(max_entries=10, ttl_seconds=60)
+        cache.set("a", 1)
+
+        now[0] += 59
+        assert cache.get("a") == 1
+        now[0] += 2
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestLLMResponseCache:
+    """Test keys, tiers and bypass"""
+
+    def test_key_covers_all_inputs(self):
+        base = llm_cache_key("m", "prompt", "system", False)
+
+        assert base == llm_cache_key("m", "prompt", "system", False)
+        assert base != llm_cache_key("m2", "prompt", "system", False)
+        assert base != llm_cache_key("m", "prompt!", "system", False)
+        assert base != llm_cache_key("m", "prompt", None, False)
+        assert base != llm_cache_key("m", "prompt", "system", True)
+
+    @pytest.mark.asyncio
+    async def test_cached_calls_once(self):
+        cache = LLMResponseCache()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            return "answer"
+
+        assert await cache.cached("k", call) == "answer"
+        assert await cache.cached("k", call) == "answer"
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_results_not_stored(self):
+        cache = LLMResponseCache()
+
+        async def call():
+            return ""
+
+        await cache.cached("k", call)
+        assert await cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_bypass_skips_lookup_but_refreshes(self):
+        cache = LLMResponseCache()
+        await cache.set("k", "old")
+
+        async def call():
+            return "new"
+
+        with cache.bypass(True):
+            assert await cache.cached("k", call) == "new"
+        assert await cache.get("k") == "new"
+        assert cache.stats()["bypassed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_bypass_false_is_noop(self):
+        cache = LLMResponseCache()
+        await cache.set("k", "value")
+
+        with cache.bypass(False):
+            assert await cache.get("k") == "value"
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_shared_between_instances(self, monkeypatch):
+        redis = FakeRedis()
+        writer, reader = LLMResponseCache(), LLMResponseCache()
+        writer.use_redis(redis)
+        reader.use_redis(redis)
+
+        await writer.set("k", "shared")
+
+        assert await reader.get("k") == "shared"
+        assert reader.stats()["redis_hits"] == 1
+        # Promoted to the local tier
+        reader.use_redis(None)
+        assert await reader.get("k") == "shared"
+
+    @pytest.mark.asyncio
+    async def test_bypass_propagates_to_gathered_tasks(self):
+        cache = LLMResponseCache()
+        await cache.set("k", "cached")
+
+        with cache.bypass():
+            results = await asyncio.gather(cache.get("k"), cache.get("k"))
+        assert results == [None, None]
+
+
+class TestAIServiceCaching:
+    """Test cache integration in AIService"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        llm_cache.clear()
+        yield
+        llm_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_enhance_text_gemini_cached(self, monkeypatch):
+        calls = []
+
+        class FakeResponse:
+            text = "Better copy"
+
+        class FakeModel:
+            model_name = "models/fake-gemini"
+
+            async def generate_content_async(self, prompt):
+                calls.append(prompt)
+                return FakeResponse()
+
+        monkeypatch.setattr(AIService, "gemini_model", FakeModel())
+
+        assert await AIService.enhance_text("copy", "Gemini") == "Better copy"
+        assert await AIService.enhance_text("copy", "Gemini") == "Better copy"
+        assert len(calls) == 1
+
+        with llm_cache.bypass():
+            await AIService.enhance_text("copy", "Gemini")
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_call_llm_failure_not_cached(self, monkeypatch):
+        import httpx
+
+        attempts = []
+
+        def handler(request):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise httpx.ConnectError("refused")
+            return httpx.Response(200, json={"response": "{\"ok\": true}"})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(ai_service, "get_http_client", lambda name: client)
+        monkeypatch.setattr(ai_service, "LLM_PROVIDER", "ollama")
+        monkeypatch.setattr(AIService, "_cached_model", "llama3")
+
+        first = await AIService._call_llm("prompt", json_mode=True)
+        second = await AIService._call_llm("prompt", json_mode=True)
+        third = await AIService._call_llm("prompt", json_mode=True)
+
+        assert first.startswith("[AI Unavailable]")
+        assert second == third == "{\"ok\": true}"
+        assert len(attempts) == 2
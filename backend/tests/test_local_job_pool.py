@@ -0,0 +1,130 @@
+"""
+Unit Tests for LocalJobPool
+- Immediate return from JobQueue.enqueue in fallback mode
+- Concurrency cap, bounded queue back-pressure and per-task timeouts
+- Graceful drain on shutdown
+"""
+
+import asyncio
+
+import pytest
+
+from app.services import job_state as job_state_module
+from app.services.job_state import InMemoryJobStateBackend, JobStateStore
+from app.services.job_queue import JobQueue
+from app.services.job_tasks import TASK_REGISTRY
+from app.services.local_job_pool import LocalJobPool, JobPoolFullError, JobPoolClosedError
+
+
+@pytest.fixture
+def store(monkeypatch):
+    fresh = JobStateStore(InMemoryJobStateBackend())
+    monkeypatch.setattr(job_state_module, "job_state", fresh)
+    monkeypatch.setattr("app.services.job_queue.job_state", fresh)
+    monkeypatch.setattr("app.services.local_job_pool.job_state", fresh)
+    return fresh
+
+
+class TestLocalJobPool:
+    """Test the bounded executor"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self, store):
+        pool = LocalJobPool(concurrency=2, max_queue_size=10, task_timeout=5)
+        running = 0
+        peak = 0
+
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for i in range(6):
+            pool.submit(f"job-{i}", job)
+        await pool.drain()
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_full_queue_raises(self, store):
+        pool = LocalJobPool(concurrency=1, max_queue_size=1, task_timeout=5)
+        release = asyncio.Event()
+
+        pool.submit("job-1", release.wait)
+        await asyncio.sleep(0)  # worker picks up job-1
+        pool.submit("job-2", release.wait)
+
+        with pytest.raises(JobPoolFullError):
+            pool.submit("job-3", release.wait)
+
+        release.set()
+        await pool.drain()
+
+    @pytest.mark.asyncio
+    async def test_task_timeout_marks_job_failed(self, store):
+        pool = LocalJobPool(concurrency=1, max_queue_size=5, task_timeout=0.01)
+        await store.mark_queued("slow", "generate_content")
+
+        pool.submit("slow", lambda: asyncio.sleep(1))
+        await pool.drain()
+
+        state = await store.get("slow")
+        assert state["status"] == "failed"
+        assert "timed out" in state["error"]
+
+    @pytest.mark.asyncio
+    async def test_drain_rejects_new_jobs_and_fails_abandoned(self, store):
+        pool = LocalJobPool(concurrency=1, max_queue_size=5, task_timeout=5)
+        await store.mark_queued("waiting", "generate_content")
+
+        pool.submit("running", lambda: asyncio.sleep(1))
+        await asyncio.sleep(0)
+        pool.submit("waiting", lambda: asyncio.sleep(0))
+        await pool.drain(timeout=0.01)
+
+        assert (await store.get("waiting"))["status"] == "failed"
+        with pytest.raises(JobPoolClosedError):
+            pool.submit("late", lambda: asyncio.sleep(0))
+
+
+class TestJobQueueLocalFallback:
+    """Test JobQueue behaviour without Redis"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_returns_before_task_finishes(self, store, monkeypatch):
+        release = asyncio.Event()
+
+        async def slow_task(ctx):
+            await release.wait()
+            return {"success": True}
+
+        monkeypatch.setitem(TASK_REGISTRY, "slow_task", slow_task)
+        queue = JobQueue(LocalJobPool(concurrency=1, max_queue_size=5, task_timeout=5))
+
+        job_id = await queue.enqueue("slow_task")
+        await asyncio.sleep(0.01)
+        assert (await queue.get_job_status(job_id))["status"] == "running"
+
+        release.set()
+        await queue.shutdown()
+        assert (await queue.get_job_status(job_id))["status"] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_enqueue_full_pool_marks_job_failed(self, store, monkeypatch):
+        async def noop_task(ctx):
+            return {"success": True}
+
+        monkeypatch.setitem(TASK_REGISTRY, "noop_task", noop_task)
+        queue = JobQueue(LocalJobPool(concurrency=1, max_queue_size=1, task_timeout=5))
+        queue.local_pool.start()
+        queue.local_pool.submit("blocker", lambda: asyncio.sleep(0.05))
+        await asyncio.sleep(0)
+        queue.local_pool.submit("waiting", lambda: asyncio.sleep(0))
+
+        with pytest.raises(JobPoolFullError):
+            await queue.enqueue("noop_task", _job_id="rejected")
+
+        assert (await queue.get_job_status("rejected"))["status"] == "failed"
+        await queue.shutdown()
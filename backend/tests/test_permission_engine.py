@@ -0,0 +1,113 @@
+"""
+Unit Tests for the compiled PermissionEngine
+- Compiled checks agree with the uncompiled reference evaluation
+- Deny / "none" override precedence by scope
+- Compiled permissions memoized on cached principals
+"""
+
+import itertools
+import random
+
+from app.services.permission_engine import PermissionEngine, _PAIR_BITS
+from app.services.principal_cache import Principal, Snapshot
+
+RESOURCES = ["campaign", "content", "crm", "analytics", "admin"]
+ACTIONS = ["read", "write", "create", "update", "delete", "none", "export"]
+SCOPES = [("global", None), ("organization", 5), ("brand", 7), ("team", 9)]
+
+
+def make_user(role="brand_member", permissions_json=None, overrides=()):
+    role_model = Snapshot({"id": 1, "name": role, "permissions_json": permissions_json}) if permissions_json is not None else None
+    return Principal({
+        "id": 2,
+        "role": role,
+        "organization_id": 5,
+        "team_id": 9,
+        "role_model": role_model,
+        "custom_permissions": tuple(Snapshot(o) for o in overrides),
+    })
+
+
+def override(resource, action, scope=("global", None), is_allowed=True):
+    return {"resource": resource, "action": action, "scope_type": scope[0], "scope_id": scope[1], "is_allowed": is_allowed}
+
+
+class TestCompiledChecks:
+    """Test compiled checks against the reference evaluation"""
+
+    def test_matches_reference_for_random_users(self):
+        rng = random.Random(42)
+        for _ in range(200):
+            permissions_json = {
+                resource: rng.sample(ACTIONS[:5], rng.randint(0, 3))
+                for resource in rng.sample(RESOURCES, rng.randint(0, 4))
+            }
+            overrides = [
+                override(
+                    rng.choice(RESOURCES),
+                    rng.choice(ACTIONS),
+                    rng.choice(SCOPES),
+                    is_allowed=rng.random() > 0.2,
+                )
+                for _ in range(rng.randint(0, 4))
+            ]
+            user = make_user(rng.choice(["brand_member", "viewer", "creator"]), permissions_json, overrides)
+            engine = PermissionEngine.from_loaded_user(user)
+            for resource, action in itertools.product(RESOURCES + ["unknown"], ACTIONS + ["unknown"]):
+                assert engine.has_permission(resource, action) == engine._evaluate(resource, action), (
+                    permissions_json, overrides, resource, action,
+                )
+                assert engine.has_permission(resource, action, "brand", 7) == engine._evaluate(resource, action, "brand", 7)
+
+    def test_role_fallback_when_role_has_no_permissions(self):
+        engine = PermissionEngine.from_loaded_user(make_user("viewer"))
+        assert engine.has_permission("campaign", "read") is True
+        assert engine.has_permission("campaign", "write") is False
+
+    def test_deny_override_beats_role_and_allow(self):
+        user = make_user(
+            "brand_member",
+            {"crm": ["write"]},
+            [override("crm", "write"), override("crm", "read", ("team", 9), is_allowed=False)],
+        )
+        engine = PermissionEngine.from_loaded_user(user)
+        assert engine.has_permission("crm", "read") is False
+        assert engine.has_permission("crm", "delete") is False
+
+    def test_specific_grant_precedes_global_none(self):
+        user = make_user(
+            "brand_member",
+            {"content": ["write"]},
+            [override("content", "none"), override("content", "read", ("team", 9))],
+        )
+        engine = PermissionEngine.from_loaded_user(user)
+        assert engine.has_permission("content", "read") is True
+        assert engine.has_permission("content", "write") is False
+
+    def test_unknown_names_are_not_interned(self):
+        engine = PermissionEngine.from_loaded_user(make_user("viewer"))
+        before = len(_PAIR_BITS)
+        assert engine.has_permission("no-such-resource", "no-such-action") is False
+        assert len(_PAIR_BITS) == before
+
+    def test_super_admin_bypass(self):
+        engine = PermissionEngine.from_loaded_user(make_user("super_admin"))
+        assert engine.has_permission("anything", "delete") is True
+        assert engine.get_effective_permissions() == {"*:*"}
+
+
+class TestMemoization:
+    """Test that compiled forms are reused per principal"""
+
+    def test_compiled_once_per_principal(self):
+        user = make_user("brand_member", {"campaign": ["read"]}, [override("content", "write")])
+        first = PermissionEngine.from_loaded_user(user)
+        second = PermissionEngine.from_loaded_user(user)
+        assert first.compiled is second.compiled
+
+    def test_effective_permissions_are_copies(self):
+        user = make_user("brand_member", {"campaign": ["create"]})
+        effective = PermissionEngine.from_loaded_user(user).get_effective_permissions()
+        assert effective == {"campaign:read", "campaign:create"}
+        effective.add("admin:write")
+        assert "admin:write" not in PermissionEngine.from_loaded_user(user).get_effective_permissions()
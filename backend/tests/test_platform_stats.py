@@ -0,0 +1,124 @@
+"""
+Unit Tests for the platform stats snapshot and usage counters
+- Overview figures (conditional counts, SQL-side MRR) come from one statement
+- The snapshot is served as-is until stale, then refreshed inline
+- Usage counters flush additively into daily API calls and distinct active users
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+from app.core.db_metrics import assert_max_queries
+from app.models.brand import Brand
+from app.models.models import User
+from app.models.organization import Organization
+from app.models.platform_stats import PlatformStatsSnapshot
+from app.services.platform_stats_service import PlatformStatsService, UsageCounters
+
+
+@pytest_asyncio.fixture
+async def session(sqlite_sessionmaker):
+    factory = await sqlite_sessionmaker(metrics_name="test-platform-stats")
+    async with factory() as session:
+        session.add_all([
+            Organization(id=1, name="Free", slug="free", plan_tier="free"),
+            Organization(id=2, name="Pro", slug="pro", plan_tier="pro"),
+            Organization(id=3, name="Ent", slug="ent", plan_tier="enterprise"),
+            Organization(id=4, name="Lapsed", slug="lapsed", plan_tier="enterprise", is_active=False),
+            Organization(id=5, name="Legacy", slug="legacy", plan_tier="legacy-tier"),
+        ])
+        await session.flush()
+        session.add_all([
+            User(id=1, email="a@example.com", role="agency_admin", organization_id=2, is_approved=True),
+            User(id=2, email="b@example.com", role="agency_member", organization_id=2, is_approved=False),
+            User(id=3, email="c@example.com", role="agency_admin", organization_id=3, is_approved=True),
+            Brand(name="Brand", organization_id=2),
+        ])
+        await session.commit()
+        yield session
+
+
+class TestPlatformOverview:
+    """Test the overview snapshot"""
+
+    @pytest.mark.asyncio
+    async def test_refresh_in_one_statement(self, session):
+        service = PlatformStatsService(UsageCounters())
+        with assert_max_queries(3) as stats:  # overview + snapshot lookup + upsert
+            overview = await service.refresh(session)
+
+        assert stats.count <= 3
+        assert {k: v for k, v in overview.items() if k != "refreshed_at"} == {
+            "total_organizations": 5,
+            "active_subscriptions": 4,
+            "total_users": 3,
+            "pending_approvals": 1,
+            "total_brands": 1,
+            "mrr": 598.0,  # pro + enterprise; inactive and unknown tiers add nothing
+        }
+
+    @pytest.mark.asyncio
+    async def test_snapshot_served_until_stale(self, session):
+        service = PlatformStatsService(UsageCounters())
+        first = await service.overview(session)  # no snapshot yet: computed inline
+        assert service.stats()["inline_refreshes"] == 1
+
+        session.add(Organization(id=6, name="New", slug="new", plan_tier="pro"))
+        await session.commit()
+        with assert_max_queries(1):
+            assert await service.overview(session) == first
+
+        stale = datetime.now(timezone.utc) - timedelta(hours=1)
+        await session.execute(update(PlatformStatsSnapshot).values(refreshed_at=stale))
+        await session.commit()
+        refreshed = await service.overview(session)
+        assert refreshed["total_organizations"] == 6
+        assert refreshed["mrr"] == 697.0
+
+
+class TestUsageCounters:
+    """Test API-call and daily-active-user counters"""
+
+    @pytest.mark.asyncio
+    async def test_flush_is_additive_and_counts_distinct_users(self, session):
+        counters = UsageCounters()
+        service = PlatformStatsService(counters)
+        for user_id in (1, 1, 2):
+            counters.record(user_id)
+        assert await service.flush_usage(session) == 3
+
+        # A second worker's flush for the same day
+        for user_id in (2, 3):
+            counters.record(user_id)
+        assert await service.flush_usage(session) == 2
+        assert await service.flush_usage(session) == 0
+
+        usage = await service.usage(session, days=7)
+        assert usage["api_calls_today"] == 5
+        assert usage["active_users_today"] == 3
+        assert len(usage["daily_active_users"]) == 7
+        assert [day["count"] for day in usage["daily_active_users"][:-1]] == [0] * 6
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_counts(self, session):
+        counters = UsageCounters()
+        service = PlatformStatsService(counters)
+        counters.record(1)
+        await session.close()
+        await session.bind.dispose()
+
+        class Broken:
+            bind = session.bind
+
+            async def execute(self, *args, **kwargs):
+                raise RuntimeError("database down")
+
+            async def rollback(self):
+                pass
+
+        with pytest.raises(RuntimeError):
+            await service.flush_usage(Broken())
+        assert counters.pending_calls() == 1
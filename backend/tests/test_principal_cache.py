@@ -0,0 +1,283 @@
+"""
+Unit Tests for the principal cache
+- Principal snapshots (read-only, JSON round-trip, no password hash, permission checks)
+- get_current_user served from the cache, keyed by token issue time
+- Redis tier read-through and invalidation
+- Invalidation from the admin user patch
+"""
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, HTTPException
+from sqlalchemy.orm import selectinload
+from sqlalchemy.future import select
+
+from app.api.deps import get_current_user, load_current_user_row
+from app.api.endpoints import admin as admin_endpoints
+from app.api.endpoints.auth import ChangePasswordRequest, change_password, get_current_active_user
+from app.core.database import get_db
+from app.models.models import User
+from app.models.rbac import Permission, Role
+from app.services.auth_service import create_access_token, decode_access_token, get_password_hash, verify_password
+from app.services.permission_engine import PermissionEngine
+from app.services.principal_cache import Principal, PrincipalCache, principal_cache
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def hset(self, key, field, value):
+        self.calls.append(lambda: self.redis.data.setdefault(key, {}).__setitem__(field, value))
+
+    def expire(self, key, seconds):
+        self.calls.append(lambda: None)
+
+    async def execute(self):
+        for call in self.calls:
+            call()
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def hget(self, key, field):
+        value = self.data.get(key, {}).get(field)
+        return value.encode() if value is not None else None
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, match=None):
+        prefix = (match or "").rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+
+@pytest.fixture(autouse=True)
+def reset_principal_cache():
+    principal_cache.clear()
+    principal_cache.use_redis(None)
+    yield
+    principal_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def session_factory(sqlite_sessionmaker):
+    factory = await sqlite_sessionmaker()
+    async with factory() as session:
+        session.add(Role(id=1, name="brand_member", permissions_json={"campaign": ["read"]}))
+        session.add(User(
+            id=2, email="member@example.com", full_name="Member", role="brand_member",
+            role_id=1, organization_id=5, is_active=True, is_approved=True,
+            hashed_password="$2b$12$not-a-real-hash",
+        ))
+        session.add(Permission(user_id=2, resource="content", action="write", scope_type="global", is_allowed=True))
+        await session.commit()
+    return factory
+
+
+async def load_user(session, user_id=2):
+    result = await session.execute(
+        select(User).options(
+            selectinload(User.custom_permissions),
+            selectinload(User.role_model),
+        ).where(User.id == user_id)
+    )
+    return result.scalar_one()
+
+
+def token_for(user_id=2):
+    return create_access_token({"user_id": user_id, "email": "member@example.com", "role": "brand_member"})
+
+
+class TestPrincipal:
+    """Test the frozen user snapshot"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_read_only_and_round_trips(self, session_factory):
+        async with session_factory() as session:
+            principal = Principal.from_user(await load_user(session))
+
+        with pytest.raises(AttributeError):
+            principal.role = "root"
+
+        restored = Principal.from_json(principal.to_json())
+        assert restored.email == "member@example.com"
+        assert restored.created_at == principal.created_at
+        assert restored.role_model.permissions_json == {"campaign": ["read"]}
+        assert [(p.resource, p.action) for p in restored.custom_permissions] == [("content", "write")]
+
+    @pytest.mark.asyncio
+    async def test_password_hash_is_not_cached(self, session_factory):
+        redis = FakeRedis()
+        cache = PrincipalCache()
+        cache.use_redis(redis)
+        async with session_factory() as session:
+            principal = Principal.from_user(await load_user(session))
+        await cache.set(principal, 1)
+
+        cached = "".join(value for fields in redis.data.values() for value in fields.values())
+        assert "member@example.com" in cached
+        assert "hashed_password" not in cached and "not-a-real-hash" not in cached
+        with pytest.raises(AttributeError):
+            principal.hashed_password
+
+    @pytest.mark.asyncio
+    async def test_permission_engine_accepts_principal(self, session_factory):
+        async with session_factory() as session:
+            principal = Principal.from_user(await load_user(session))
+
+        engine = PermissionEngine.from_loaded_user(principal)
+        assert engine.has_permission("campaign", "read") is True
+        assert engine.has_permission("content", "write") is True
+        assert engine.has_permission("campaign", "delete") is False
+
+
+class TestGetCurrentUser:
+    """Test cached principal resolution"""
+
+    @pytest.mark.asyncio
+    async def test_access_tokens_carry_issue_time(self):
+        assert decode_access_token(token_for()).issued_at is not None
+
+    @pytest.mark.asyncio
+    async def test_second_request_skips_database(self, session_factory):
+        token = token_for()
+        async with session_factory() as session:
+            first = await get_current_user(token=token, db=session)
+            (await session.get(User, 2)).role = "viewer"
+            await session.commit()
+            second = await get_current_user(token=token, db=session)
+
+        assert isinstance(first, Principal)
+        assert second is first
+        assert second.role == "brand_member"
+        assert principal_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reloads_user(self, session_factory):
+        token = token_for()
+        async with session_factory() as session:
+            await get_current_user(token=token, db=session)
+            (await session.get(User, 2)).role = "viewer"
+            await session.commit()
+            await principal_cache.invalidate_user(2)
+            reloaded = await get_current_user(token=token, db=session)
+
+        assert reloaded.role == "viewer"
+
+    @pytest.mark.asyncio
+    async def test_change_password_checks_the_session_row(self, session_factory):
+        async with session_factory() as session:
+            (await session.get(User, 2)).hashed_password = get_password_hash("old-password")
+            await session.commit()
+
+        async with session_factory() as session:
+            principal = await get_current_user(token=token_for(), db=session)
+            with pytest.raises(HTTPException) as exc:
+                await change_password(
+                    ChangePasswordRequest(current_password="wrong", new_password="new-password"), session, principal
+                )
+            assert exc.value.status_code == 400
+            result = await change_password(
+                ChangePasswordRequest(current_password="old-password", new_password="new-password"), session, principal
+            )
+
+        assert result == {"message": "Password updated successfully"}
+        async with session_factory() as session:
+            assert verify_password("new-password", (await session.get(User, 2)).hashed_password)
+
+    @pytest.mark.asyncio
+    async def test_writers_get_the_session_row(self, session_factory):
+        async with session_factory() as session:
+            principal = await get_current_user(token=token_for(), db=session)
+            row = await load_current_user_row(principal, session)
+            assert isinstance(row, User)
+            assert row in session
+
+
+class TestRedisTier:
+    """Test the shared tier"""
+
+    @pytest.mark.asyncio
+    async def test_read_through_and_invalidate(self, session_factory):
+        redis = FakeRedis()
+        async with session_factory() as session:
+            principal = Principal.from_user(await load_user(session))
+
+        worker_a = PrincipalCache()
+        worker_b = PrincipalCache()
+        worker_a.use_redis(redis)
+        worker_b.use_redis(redis)
+
+        await worker_a.set(principal, 1700000000)
+        shared = await worker_b.get(2, 1700000000)
+        assert shared.email == "member@example.com"
+        assert worker_b.stats()["redis_hits"] == 1
+        assert await worker_b.get(2, 1700000001) is None
+
+        await worker_a.invalidate_user(2)
+        assert redis.data == {}
+        assert await worker_a.get(2, 1700000000) is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_all_clears_every_user(self, session_factory):
+        redis = FakeRedis()
+        async with session_factory() as session:
+            principal = Principal.from_user(await load_user(session))
+
+        cache = PrincipalCache()
+        cache.use_redis(redis)
+        await cache.set(principal, 1)
+        await cache.invalidate_all()
+
+        assert redis.data == {}
+        assert len(cache._local) == 0
+
+
+class TestAdminInvalidation:
+    """Test that admin writes drop the cached principal"""
+
+    @pytest.mark.asyncio
+    async def test_user_patch_invalidates(self, session_factory):
+        token = token_for()
+        async with session_factory() as session:
+            await get_current_user(token=token, db=session)
+        assert len(principal_cache._local) == 1
+
+        app = FastAPI()
+        app.include_router(admin_endpoints.router, prefix="/admin")
+
+        async def override_get_db():
+            async with session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_current_active_user] = lambda: User(
+            id=1, email="root@example.com", role="super_admin", is_active=True, is_approved=True,
+        )
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.patch("/admin/users/2", json={"is_active": False})
+
+        assert response.status_code == 200
+        assert len(principal_cache._local) == 0
+
+        async with session_factory() as session:
+            reloaded = await get_current_user(token=token, db=session)
+        assert reloaded.is_active is False
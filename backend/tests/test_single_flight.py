@@ -0,0 +1,195 @@
+"""
+Unit Tests for single-flight request coalescing
+- Concurrent identical calls share one task
+- Shared exceptions, release after completion
+- Caller cancellation does not cancel the shared work
+- AIService.generate_content / generate_image with coalesce=True
+- POST /design/generate coalesces unless regenerate is set
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.deps import require_design_create
+from app.api.endpoints import design
+from app.core.single_flight import SingleFlight, flight_key
+from app.services.ai_service import AIService, ai_single_flight
+from app.services.llm_cache import llm_cache
+
+
+class TestSingleFlight:
+    """Test SingleFlight.do"""
+
+    def test_flight_key_normalizes_whitespace(self):
+        assert flight_key("a  b\n", 1) == flight_key(" a b", 1)
+        assert flight_key("a b", 1) != flight_key("a b", 2)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_task(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"value": 42}
+
+        results = await asyncio.gather(*(flights.do("k", work) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert all(result == {"value": 42} for result in results)
+        assert flights.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+    @pytest.mark.asyncio
+    async def test_key_released_after_completion(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            return len(calls)
+
+        assert await flights.do("k", work) == 1
+        assert await flights.do("k", work) == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_shared(self):
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("model down")
+
+        results = await asyncio.gather(
+            flights.do("k", work), flights.do("k", work), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flights.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(flights.do("k", work))
+        follower = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        release.set()
+
+        assert await follower == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+
+class TestAIServiceCoalescing:
+    """Test coalesce=True on AIService generation"""
+
+    @pytest.fixture(autouse=True)
+    def no_cache(self):
+        llm_cache.clear()
+        with llm_cache.bypass():
+            yield
+        llm_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_generate_content_coalesced(self, monkeypatch):
+        calls = []
+
+        class FakeModel:
+            model_name = "models/fake"
+
+            async def generate_content_async(self, prompt):
+                calls.append(prompt)
+                await asyncio.sleep(0.01)
+                return SimpleNamespace(text="Post text")
+
+        monkeypatch.setattr(AIService, "gemini_model", FakeModel())
+
+        results = await asyncio.gather(*(
+            AIService.generate_content("Launch", "LinkedIn", "Post", "brief  text", "Gemini", coalesce=True)
+            for _ in range(3)
+        ))
+
+        assert results == ["Post text"] * 3
+        assert len(calls) == 2  # one draft + one proofread for all three callers
+
+    @pytest.mark.asyncio
+    async def test_generate_content_without_opt_in_not_coalesced(self, monkeypatch):
+        calls = []
+
+        class FakeModel:
+            model_name = "models/fake"
+
+            async def generate_content_async(self, prompt):
+                calls.append(prompt)
+                await asyncio.sleep(0.01)
+                return SimpleNamespace(text="Post text")
+
+        monkeypatch.setattr(AIService, "gemini_model", FakeModel())
+
+        await asyncio.gather(*(
+            AIService.generate_content("Launch", "LinkedIn", "Post", "brief", "Gemini")
+            for _ in range(3)
+        ))
+
+        assert len(calls) == 6
+
+    @pytest.mark.asyncio
+    async def test_generate_image_coalesced(self, monkeypatch):
+        calls = []
+
+        class FakeNano:
+            async def generate_content_async(self, content):
+                calls.append(content)
+                await asyncio.sleep(0.01)
+                part = SimpleNamespace(inline_data=SimpleNamespace(data=b"png-bytes"))
+                return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+        monkeypatch.setattr(AIService, "nano_model", FakeNano())
+        leaders_before = ai_single_flight.stats()["leaders"]
+
+        meta, url = await asyncio.gather(
+            AIService.generate_image(title="Launch", style="Minimalist", prompt="p", return_meta=True, coalesce=True),
+            AIService.generate_image(title="Launch", style="Minimalist", prompt="p", coalesce=True),
+        )
+
+        assert len(calls) == 1
+        assert meta["image_model_used"] == "NanoBanana"
+        assert url == meta["image_url"]
+        assert ai_single_flight.stats()["leaders"] == leaders_before + 1
+
+
+class TestDesignGenerateCoalescing:
+    """Test the regenerate flag on POST /design/generate"""
+
+    @pytest.mark.asyncio
+    async def test_regenerate_disables_coalescing(self, monkeypatch):
+        seen = []
+
+        async def fake_generate_image(**kwargs):
+            seen.append(kwargs["coalesce"])
+            return {"image_url": "data:image/png;base64,eA==", "image_model_used": "NanoBanana"}
+
+        monkeypatch.setattr(AIService, "generate_image", staticmethod(fake_generate_image))
+        app = FastAPI()
+        app.include_router(design.router, prefix="/design")
+        app.dependency_overrides[require_design_create] = lambda: SimpleNamespace(id=1)
+        body = {"title": "Launch", "style": "Minimalist", "aspect_ratio": "1:1", "prompt": "p"}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.post("/design/generate", json=body)).status_code == 200
+            assert (await client.post("/design/generate", json={**body, "regenerate": True})).status_code == 200
+
+        assert seen == [True, False]
@@ -0,0 +1,122 @@
+"""
+Unit Tests for the user hierarchy closure table
+- Maintained on user create, re-parent and delete
+- Matches a full rebuild from parent_user_id
+- rbac_scope visibility and can_manage_user use it
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.models.models import User
+from app.models.user_hierarchy import closure, rebuild_user_hierarchy
+from app.services.rbac_scope import can_manage_user, visible_user_filter, visible_users_where_clause
+
+
+@pytest_asyncio.fixture
+async def session(sqlite_sessionmaker):
+    factory = await sqlite_sessionmaker()
+    async with factory() as session:
+        yield session
+
+
+async def add_user(session, user_id, parent_id=None, role="agency_admin"):
+    session.add(User(id=user_id, email=f"user{user_id}@example.com", role=role, parent_user_id=parent_id))
+    await session.commit()
+
+
+async def closure_rows(session):
+    result = await session.execute(select(closure.c.ancestor_id, closure.c.descendant_id, closure.c.depth))
+    return sorted(result.all())
+
+
+async def rebuilt_rows(session):
+    await session.run_sync(lambda s: rebuild_user_hierarchy(s.connection()))
+    return await closure_rows(session)
+
+
+async def build_tree(session):
+    # 1 ─┬─ 2 ── 3
+    #    └─ 4
+    # 5
+    for user_id, parent_id in [(1, None), (2, 1), (3, 2), (4, 1), (5, None)]:
+        await add_user(session, user_id, parent_id)
+
+
+class TestClosureMaintenance:
+    """Test that ORM writes keep the closure table in sync"""
+
+    @pytest.mark.asyncio
+    async def test_insert_adds_ancestor_paths(self, session):
+        await build_tree(session)
+        rows = await closure_rows(session)
+        assert (1, 3, 2) in rows
+        assert (2, 3, 1) in rows
+        assert (3, 3, 0) in rows
+        assert rows == await rebuilt_rows(session)
+
+    @pytest.mark.asyncio
+    async def test_reparent_moves_subtree(self, session):
+        await build_tree(session)
+        user = await session.get(User, 2)
+        user.parent_user_id = 5
+        await session.commit()
+
+        rows = await closure_rows(session)
+        assert (1, 3, 2) not in rows
+        assert (5, 3, 2) in rows
+        assert rows == await rebuilt_rows(session)
+
+    @pytest.mark.asyncio
+    async def test_detach_to_root(self, session):
+        await build_tree(session)
+        user = await session.get(User, 2)
+        user.parent_user_id = None
+        await session.commit()
+
+        assert await closure_rows(session) == await rebuilt_rows(session)
+
+    @pytest.mark.asyncio
+    async def test_reparent_under_own_descendant_is_rejected(self, session):
+        await build_tree(session)
+        user = await session.get(User, 1)
+        user.parent_user_id = 3
+        with pytest.raises(ValueError):
+            await session.commit()
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_paths(self, session):
+        await build_tree(session)
+        await session.delete(await session.get(User, 4))
+        await session.commit()
+
+        rows = await closure_rows(session)
+        assert all(4 not in (ancestor, descendant) for ancestor, descendant, _ in rows)
+
+
+class TestScopeHelpers:
+    """Test visibility queries against the closure table"""
+
+    @pytest.mark.asyncio
+    async def test_visible_users(self, session):
+        await build_tree(session)
+        manager = await session.get(User, 2)
+        result = await session.execute(select(User.id).where(visible_users_where_clause(manager)))
+        assert sorted(result.scalars().all()) == [2, 3]
+
+        result = await session.execute(select(User.id).where(visible_user_filter(await session.get(User, 1), User.id)))
+        assert sorted(result.scalars().all()) == [1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_super_admin_is_unrestricted(self, session):
+        await add_user(session, 1, role="super_admin")
+        assert visible_users_where_clause(await session.get(User, 1)) is None
+
+    @pytest.mark.asyncio
+    async def test_can_manage_user(self, session):
+        await build_tree(session)
+        root = await session.get(User, 1)
+        assert await can_manage_user(root, 3, session) is True
+        assert await can_manage_user(root, 5, session) is False
+        assert await can_manage_user(await session.get(User, 3), 2, session) is False
@@ -1,4 +1,4 @@
-import { API_BASE_URL } from "./core";
+import { API_BASE_URL, authenticatedFetch } from "./core";
 
 export interface DashboardStats {
     active_campaigns: number;
@@ -39,7 +39,7 @@ export interface DashboardData {
 }
 
 export async function fetchDashboardStats(range: string = "6m"): Promise<DashboardData> {
-    const res = await fetch(`${API_BASE_URL}/dashboard/stats?range=${range}`);
+    const res = await authenticatedFetch(`${API_BASE_URL}/dashboard/stats?range=${range}`);
     if (!res.ok) throw new Error("Failed to fetch dashboard data");
     return res.json();
 }
@@ -25,6 +25,7 @@ export interface GenerateDesignRequest {
     brand_colors?: string;
     reference_image?: string;
     brand_id?: number | null;
+    regenerate?: boolean;
 }
 
 export interface DesignAssetsPage {